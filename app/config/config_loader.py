@@ -1,12 +1,15 @@
 """Loads and validates configuration with strict validation."""
 
+import hashlib
 import json
+import marshal
+import os
 import random
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from app.utils.path_resolver import get_app_resource_path
+from app.utils.path_resolver import get_app_resource_path, resolve_data_file_path
 
 # Import logging service - may not be initialized during config loading
 try:
@@ -248,6 +251,117 @@ def _load_merged_config_with_style_override(config_path: Path, style_ref: str) -
     return _deep_merge_dicts(style_cfg, base)
 
 
+# Merged + expanded config cached per (config.json, style selection). Bump the
+# version whenever merge / $ref expansion semantics change; the Python version
+# is part of the key because marshal's format is version-specific.
+CONFIG_SNAPSHOT_VERSION = 1
+_CONFIG_SNAPSHOT_MAGIC = b"CARACFG\x00"
+
+
+def _file_sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _describe_config_sources(paths: List[Path]) -> List[Tuple[str, int, int, str]]:
+    """(path, size, mtime_ns, sha256) per source file, for snapshot staleness checks."""
+    sources: List[Tuple[str, int, int, str]] = []
+    for path in paths:
+        stat = path.stat()
+        sources.append((str(path), stat.st_size, stat.st_mtime_ns, _file_sha256(path)))
+    return sources
+
+
+def _config_sources_unchanged(sources: Any) -> bool:
+    """True if every recorded source still has its size and mtime, or else its content hash."""
+    if not isinstance(sources, list) or not sources:
+        return False
+    for entry in sources:
+        if not isinstance(entry, tuple) or len(entry) != 4:
+            return False
+        path_str, size, mtime_ns, digest = entry
+        path = Path(path_str)
+        try:
+            stat = path.stat()
+            if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                continue
+            # Touched (checkout, copy) but possibly identical: fall back to the hash
+            if stat.st_size != size or _file_sha256(path) != digest:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _config_snapshot_key(config_path: Path, selection: str) -> Dict[str, Any]:
+    return {
+        "version": CONFIG_SNAPSHOT_VERSION,
+        "python": list(sys.version_info[:2]),
+        "config_path": str(config_path.resolve()),
+        "selection": selection,
+    }
+
+
+def _config_snapshot_path(config_path: Path, selection: str) -> Optional[Path]:
+    """User-data location of the snapshot for this config file and style selection."""
+    digest = hashlib.sha1(
+        f"{config_path.resolve()}\n{selection}".encode("utf-8")
+    ).hexdigest()[:12]
+    try:
+        path, _ = resolve_data_file_path(f"config_snapshot.{digest}.bin")
+    except OSError:
+        return None
+    return path
+
+
+def _read_config_snapshot(snapshot_path: Path, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the cached config if the snapshot matches ``key`` and its sources are unchanged."""
+    try:
+        with open(snapshot_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(_CONFIG_SNAPSHOT_MAGIC):
+        return None
+    try:
+        payload = marshal.loads(data[len(_CONFIG_SNAPSHOT_MAGIC):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("key") != key:
+        return None
+    config = payload.get("config")
+    if not isinstance(config, dict) or not _config_sources_unchanged(payload.get("sources")):
+        return None
+    return config
+
+
+def _write_config_snapshot(
+    snapshot_path: Path,
+    key: Dict[str, Any],
+    source_paths: List[Path],
+    config: Dict[str, Any],
+) -> None:
+    """Write the snapshot atomically; any failure just leaves the next launch uncached."""
+    tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    try:
+        payload = {"key": key, "sources": _describe_config_sources(source_paths), "config": config}
+        data = _CONFIG_SNAPSHOT_MAGIC + marshal.dumps(payload)
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, snapshot_path)
+    except (OSError, ValueError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _debug_random_colors_enabled(config: Any) -> bool:
+    debug_section = config.get("debug") if isinstance(config, dict) else None
+    return isinstance(debug_section, dict) and bool(debug_section.get("enable_debug_rand_colors", False))
+
+
 def _apply_debug_random_placeholder_colors(config: Any) -> None:
     """Optionally override placeholder color constants with random RGB values.
 
@@ -316,6 +430,8 @@ _REQUIRED_CONFIG_KEY_PATHS: tuple[str, ...] = (
     "default_style_config",
     "game_analysis.accuracy_formula.formula",
     "game_analysis.accuracy_formula.value_on_error",
+    "game_analysis.analysis_store.embed_pgn_tag",
+    "game_analysis.analysis_store.sidecar_enabled",
     "game_analysis.assessment_thresholds.good_move_max_cpl",
     "game_analysis.assessment_thresholds.inaccuracy_max_cpl",
     "game_analysis.assessment_thresholds.mistake_max_cpl",
@@ -373,11 +489,18 @@ _REQUIRED_CONFIG_KEY_PATHS: tuple[str, ...] = (
     "online_import.chesscom.request_delay_onerror_seconds",
     "online_import.chesscom.request_delay_seconds",
     "online_import.chesscom.request_retry_limit",
+    "parallel_processing.pdf_render.max_cached_boards",
+    "parallel_processing.pdf_render.max_workers_cap",
+    "parallel_processing.process_pool.games_per_task",
     "parallel_processing.process_pool.max_workers_cap",
     "parallel_processing.process_pool.reserved_cores",
     "pgn.export.fixed_width",
     "pgn.export.use_fixed_width",
     "pgn.import.strip_pua_characters",
+    "pgn.tag_payload.binary_analysis",
+    "pgn.tag_payload.codec",
+    "pgn.tag_payload.level",
+    "resources.eco_index_filename",
     "resources.ecolists_path",
     "resources.encyclopedia_db_path",
     "resources.encyclopedia_search_results_limit",
@@ -2851,6 +2974,7 @@ _REQUIRED_CONFIG_KEY_PATHS: tuple[str, ...] = (
     "ui.positional_heatmap.colors.positive",
     "ui.positional_heatmap.enabled",
     "ui.positional_heatmap.max_cache_size",
+    "ui.positional_heatmap.precompute_game_positions",
     "ui.positional_heatmap.rules.backward_pawn.description",
     "ui.positional_heatmap.rules.backward_pawn.enabled",
     "ui.positional_heatmap.rules.backward_pawn.name",
@@ -3123,16 +3247,23 @@ _REQUIRED_CONFIG_KEY_PATHS: tuple[str, ...] = (
 class ConfigLoader:
     """Strict configuration loader that fails fast on validation errors."""
     
-    def __init__(self, config_path: Optional[Path] = None) -> None:
+    def __init__(self, config_path: Optional[Path] = None, use_snapshot: Optional[bool] = None) -> None:
         """Initialize the config loader.
         
         Args:
             config_path: Path to config.json. If None, uses default location.
+            use_snapshot: Read/write the pre-merged config snapshot. Defaults to
+                True for the application's own config.json only.
         """
+        if use_snapshot is None:
+            use_snapshot = config_path is None
         if config_path is None:
             config_path = get_app_resource_path("app/config/config.json")
         
         self.config_path = config_path
+        self.use_snapshot = use_snapshot
+        # True when the last load was served from the snapshot.
+        self.loaded_from_snapshot = False
         self._config: Dict[str, Any] = {}
     
     def load(self) -> Dict[str, Any]:
@@ -3152,30 +3283,44 @@ class ConfigLoader:
         if not self.config_path.is_file():
             self._fail(f"Configuration path is not a file: {self.config_path}")
         
-        try:
-            self._config = _load_merged_config(self.config_path)
-        except (OSError, json.JSONDecodeError, TypeError, FileNotFoundError) as e:
-            self._fail(f"Invalid JSON in configuration file: {e}")
-
-        # Debug: optionally replace placeholder colors with random colors
-        # before $ref expansion so every placeholder key becomes distinct.
-        _apply_debug_random_placeholder_colors(self._config)
-
-        # Expand placeholder constants before strict validation
-        try:
-            self._config = _expand_config_refs(self._config)
-        except ValueError as e:
-            self._fail(str(e))
-        
-        # Validate required keys
-        self._validate()
+        if not self._load_snapshot("default"):
+            try:
+                self._config = _load_merged_config(self.config_path)
+            except (OSError, json.JSONDecodeError, TypeError, FileNotFoundError) as e:
+                self._fail(f"Invalid JSON in configuration file: {e}")
+
+            # Debug: optionally replace placeholder colors with random colors
+            # before $ref expansion so every placeholder key becomes distinct.
+            random_colors = _debug_random_colors_enabled(self._config)
+            _apply_debug_random_placeholder_colors(self._config)
+
+            # Expand placeholder constants before strict validation
+            try:
+                self._config = _expand_config_refs(self._config)
+            except ValueError as e:
+                self._fail(str(e))
+
+            # Validate required keys
+            self._validate()
+
+            if not random_colors:
+                style_ref = self._config.get("default_style_config")
+                sources = [self.config_path]
+                if isinstance(style_ref, str) and style_ref.strip():
+                    sources.append(
+                        resolve_style_config_path(base_config_path=self.config_path, style_ref=style_ref.strip())
+                    )
+                self._save_snapshot("default", sources)
         
         # Log configuration loaded
         # NOTE: Pass config to get_instance to ensure logging service uses correct config
         try:
             from app.services.logging_service import LoggingService
             logging_service = LoggingService.get_instance(self._config)
-            logging_service.info(f"Configuration loaded: path={self.config_path}, validation=passed")
+            logging_service.info(
+                f"Configuration loaded: path={self.config_path}, validation=passed, "
+                f"snapshot={'hit' if self.loaded_from_snapshot else 'miss'}"
+            )
         except Exception:
             pass  # Silently ignore if logging not available during config loading
         
@@ -3193,11 +3338,16 @@ class ConfigLoader:
         if not self.config_path.is_file():
             self._fail(f"Configuration path is not a file: {self.config_path}")
 
+        selection = f"style:{style_ref}"
+        if self._load_snapshot(selection):
+            return self._config
+
         try:
             self._config = _load_merged_config_with_style_override(self.config_path, style_ref)
         except (OSError, json.JSONDecodeError, TypeError, FileNotFoundError) as e:
             self._fail(f"Invalid JSON in configuration file: {e}")
 
+        random_colors = _debug_random_colors_enabled(self._config)
         _apply_debug_random_placeholder_colors(self._config)
 
         try:
@@ -3206,7 +3356,51 @@ class ConfigLoader:
             self._fail(str(e))
 
         self._validate()
+
+        if not random_colors and isinstance(style_ref, str) and style_ref.strip():
+            style_path = resolve_style_config_path(base_config_path=self.config_path, style_ref=style_ref.strip())
+            self._save_snapshot(selection, [self.config_path, style_path])
         return self._config
+
+    def _load_snapshot(self, selection: str) -> bool:
+        """Serve the merged, expanded config from the snapshot if its sources are unchanged.
+
+        Args:
+            selection: "default" or "style:<ref>" (one snapshot per style selection).
+
+        Returns:
+            True if ``self._config`` was loaded from the snapshot and has every required key.
+        """
+        self.loaded_from_snapshot = False
+        if not self.use_snapshot:
+            return False
+        snapshot_path = _config_snapshot_path(self.config_path, selection)
+        if snapshot_path is None:
+            return False
+        config = _read_config_snapshot(snapshot_path, _config_snapshot_key(self.config_path, selection))
+        if config is None:
+            return False
+        previous = self._config
+        self._config = config
+        # A snapshot from a build with other required keys falls back to a full load
+        if not all(self._has_key(key) for key in self._get_required_keys()):
+            self._config = previous
+            return False
+        self.loaded_from_snapshot = True
+        return True
+
+    def _save_snapshot(self, selection: str, source_paths: List[Path]) -> None:
+        """Persist the validated config for the next launch (best effort)."""
+        if not self.use_snapshot:
+            return
+        snapshot_path = _config_snapshot_path(self.config_path, selection)
+        if snapshot_path is not None:
+            _write_config_snapshot(
+                snapshot_path,
+                _config_snapshot_key(self.config_path, selection),
+                source_paths,
+                self._config,
+            )
     
     def _validate(self) -> None:
         """Validate that required configuration keys exist.
@@ -6,6 +6,8 @@ from typing import Dict, Any, List, Optional, Tuple
 from app.models.progress_model import ProgressModel
 from app.models.database_model import DatabaseModel
 from app.services.progress_service import ProgressService
+from app.services.analysis_sidecar_store import AnalysisSidecarStore
+from app.utils.pgn_tag_compression import configure_payload_codec
 from app.controllers.board_controller import BoardController
 from app.controllers.database_controller import DatabaseController
 from app.controllers.game_controller import GameController
@@ -248,6 +250,11 @@ class AppController:
         # Connect ProgressService to ProgressModel
         # Services update models through the controller
         progress_service.set_model(self.progress_model)
+        
+        # Open the binary analysis store if enabled (game_analysis.analysis_store)
+        AnalysisSidecarStore.configure(self.config)
+        # Codec for new CARAAnalysisData/CARAAnnotations/CARANotes tags (pgn.tag_payload)
+        configure_payload_codec(self.config)
     
     def _on_bulk_analysis_finished_refresh_player_stats(self, _success: bool, _message: str) -> None:
         """Bulk analysis thread finished (success, error, or cancel): resume player-stats recalculation."""
@@ -288,7 +288,14 @@ class DatabaseController:
                 raise ValueError(f"Tags missing from parsed game dict. This indicates a bug in PgnService._extract_game_data().")
             position_hashes = game_dict.get("position_hashes")
             position_hashes_fuzzy = game_dict.get("position_hashes_fuzzy")
-            model.add_game(game_data, tags=tags, position_hashes=position_hashes, position_hashes_fuzzy=position_hashes_fuzzy)
+            position_pawn_keys = game_dict.get("position_pawn_keys")
+            model.add_game(
+                game_data,
+                tags=tags,
+                position_hashes=position_hashes,
+                position_hashes_fuzzy=position_hashes_fuzzy,
+                position_pawn_keys=position_pawn_keys,
+            )
             games_added += 1
         
         # The first game added is at start_count index
@@ -444,6 +451,7 @@ class DatabaseController:
         tags_list: Optional[List[List[str]]] = None,
         position_hashes_list: Optional[List[Optional[List[int]]]] = None,
         position_hashes_fuzzy_list: Optional[List[Optional[List[int]]]] = None,
+        position_pawn_keys_list: Optional[List[Optional[List[int]]]] = None,
     ) -> DatabaseModel:
         """Add a new PGN database from file.
         
@@ -466,6 +474,7 @@ class DatabaseController:
             tags_list=tags_list,
             position_hashes_list=position_hashes_list,
             position_hashes_fuzzy_list=position_hashes_fuzzy_list,
+            position_pawn_keys_list=position_pawn_keys_list,
         )
         
         # Add to panel model
@@ -785,6 +794,7 @@ class DatabaseController:
             tags_list = []  # Collect tags for batch addition
             position_hashes_list = []  # Collect hashes for batch addition
             position_hashes_fuzzy_list = []
+            position_pawn_keys_list = []
             for file_pos, game_dict in enumerate(parse_result.games, start=1):
                 game_data = GameData(
                     game_number=0,  # Will be set by model when adding
@@ -813,6 +823,7 @@ class DatabaseController:
                 tags_list.append(tags)
                 position_hashes_list.append(game_dict.get("position_hashes"))
                 position_hashes_fuzzy_list.append(game_dict.get("position_hashes_fuzzy"))
+                position_pawn_keys_list.append(game_dict.get("position_pawn_keys"))
                 
                 # Update progress more frequently for better feedback
                 # Update every 10 games, or every game for first 10, or on last game
@@ -841,6 +852,7 @@ class DatabaseController:
                 tags_list=tags_list,
                 position_hashes_list=position_hashes_list,
                 position_hashes_fuzzy_list=position_hashes_fuzzy_list,
+                position_pawn_keys_list=position_pawn_keys_list,
             )
             
             # Set the new database as active
@@ -1038,6 +1050,7 @@ class DatabaseController:
                 tags_list = []  # Collect tags for batch addition
                 position_hashes_list = []
                 position_hashes_fuzzy_list = []
+                position_pawn_keys_list = []
                 for file_pos, game_dict in enumerate(games, start=1):
                     game_data = GameData(
                         game_number=0,  # Will be set by model when adding
@@ -1066,6 +1079,7 @@ class DatabaseController:
                     tags_list.append(tags)
                     position_hashes_list.append(game_dict.get("position_hashes"))
                     position_hashes_fuzzy_list.append(game_dict.get("position_hashes_fuzzy"))
+                    position_pawn_keys_list.append(game_dict.get("position_pawn_keys"))
                     games_added += 1
                     
                     # Update progress every 10 games or on last game of file
@@ -1085,6 +1099,7 @@ class DatabaseController:
                     tags_list=tags_list,
                     position_hashes_list=position_hashes_list,
                     position_hashes_fuzzy_list=position_hashes_fuzzy_list,
+                    position_pawn_keys_list=position_pawn_keys_list,
                 )
                 
                 opened_count += 1
@@ -1239,12 +1254,14 @@ class DatabaseController:
             tags_list = [game_dict.get("tags", []) for game_dict in parse_result.games]
             position_hashes_list = [game_dict.get("position_hashes") for game_dict in parse_result.games]
             position_hashes_fuzzy_list = [game_dict.get("position_hashes_fuzzy") for game_dict in parse_result.games]
+            position_pawn_keys_list = [game_dict.get("position_pawn_keys") for game_dict in parse_result.games]
             model.add_games_batch(
                 games_data,
                 mark_unsaved=False,
                 tags_list=tags_list,
                 position_hashes_list=position_hashes_list,
                 position_hashes_fuzzy_list=position_hashes_fuzzy_list,
+                position_pawn_keys_list=position_pawn_keys_list,
             )
             
             # Final progress update
@@ -107,7 +107,8 @@ Visibility Settings:
     def scan_highlight_rule_frequency(self, parent: Any = None) -> Optional[str]:
         """Scan analyzed games in the active DB for highlight rule frequency.
 
-        Recomputes summary highlights per game (same pipeline as the UI), counts
+        Recomputes summary highlights per game (same pipeline as the UI, batched
+        across worker processes and cached by analysis checksum), counts
         ``rule_type`` hits (with ply locations), copies a text report to the
         clipboard, and shows a clickable frequency table.
 
@@ -116,10 +117,9 @@ Visibility Settings:
         """
         from collections import defaultdict
 
-        from app.services.analysis_data_storage_service import AnalysisDataStorageService
         from app.services.game_highlight_rules_service import GameHighlightRulesService
         from app.services.game_highlights.rule_catalog import list_builtin_rules
-        from app.services.game_summary_service import GameSummaryService
+        from app.services.highlight_batch_service import HighlightBatchService
         from app.services.progress_service import ProgressService
         from app.views.dialogs.highlight_rule_frequency_dialog import (
             HighlightFrequencyRow,
@@ -169,7 +169,6 @@ Visibility Settings:
         total_highlights = 0
 
         progress = ProgressService.get_instance()
-        summary_service = GameSummaryService(self.config)
         total = len(analyzed_games)
 
         try:
@@ -181,47 +180,36 @@ Visibility Settings:
             )
             QApplication.processEvents()
 
-            for index, game in enumerate(analyzed_games):
-                try:
-                    moves = AnalysisDataStorageService.load_analysis_data(game)
-                    if not moves:
-                        skipped += 1
-                    else:
-                        summary = summary_service.calculate_summary(
-                            moves, len(moves), game.result or ""
-                        )
-                        if summary is None:
-                            skipped += 1
-                        else:
-                            scanned += 1
-                            seen_in_game: set[str] = set()
-                            for highlight in summary.highlights or []:
-                                rule_type = (highlight.rule_type or "").strip()
-                                if not rule_type:
-                                    rule_type = "(missing_rule_type)"
-                                hit_counts[rule_type] += 1
-                                total_highlights += 1
-                                seen_in_game.add(rule_type)
-                                hit_locations[rule_type].append(
-                                    (game, self._ref_ply_for_highlight(highlight))
-                                )
-                            for rule_type in seen_in_game:
-                                game_counts[rule_type] += 1
-                except Exception:
-                    skipped += 1
-
-                should_update = (
-                    (index + 1) <= 10
-                    or (index + 1) % 10 == 0
-                    or (index + 1) == total
+            def report_progress(completed: int, total_games: int) -> None:
+                percent = int((completed / total_games) * 100) if total_games else 100
+                progress.report_progress(
+                    f"Scanning game {completed}/{total_games}...",
+                    percent,
                 )
-                if should_update:
-                    percent = int(((index + 1) / total) * 100)
-                    progress.report_progress(
-                        f"Scanning game {index + 1}/{total}...",
-                        percent,
+                QApplication.processEvents()
+
+            per_game_highlights = HighlightBatchService.get_instance(self.config).detect_for_games(
+                analyzed_games, progress_callback=report_progress
+            )
+            for game, highlights in zip(analyzed_games, per_game_highlights):
+                if highlights is None:
+                    # No usable analysis, or detection failed for the game
+                    skipped += 1
+                    continue
+                scanned += 1
+                seen_in_game: set[str] = set()
+                for highlight in highlights:
+                    rule_type = (highlight.rule_type or "").strip()
+                    if not rule_type:
+                        rule_type = "(missing_rule_type)"
+                    hit_counts[rule_type] += 1
+                    total_highlights += 1
+                    seen_in_game.add(rule_type)
+                    hit_locations[rule_type].append(
+                        (game, self._ref_ply_for_highlight(highlight))
                     )
-                    QApplication.processEvents()
+                for rule_type in seen_in_game:
+                    game_counts[rule_type] += 1
         finally:
             progress.hide_progress()
 
@@ -276,6 +264,34 @@ Visibility Settings:
             )
         return report
 
+    def set_rule_profiling(self, enabled: bool) -> None:
+        """Enable or disable per-rule profiling of highlight and heatmap rules."""
+        from app.services.rule_profiler import set_rule_profiling_enabled
+
+        set_rule_profiling_enabled(enabled)
+        state = "enabled" if enabled else "disabled"
+        self._set_status(f"DEBUG: Rule profiling {state}")
+
+    def copy_rule_profile_report_to_clipboard(self) -> None:
+        """Copy the per-rule profile report to clipboard and write it to the log."""
+        from app.services.logging_service import LoggingService
+        from app.services.rule_profiler import get_rule_profile
+
+        report = get_rule_profile().format_report()
+        try:
+            LoggingService.get_instance().info(report)
+        except Exception:
+            pass
+        self._copy_to_clipboard(report)
+        self._set_status("DEBUG: Rule profile report copied to clipboard")
+
+    def reset_rule_profile(self) -> None:
+        """Discard all collected per-rule profile stats."""
+        from app.services.rule_profiler import get_rule_profile
+
+        get_rule_profile().reset()
+        self._set_status("DEBUG: Rule profile reset")
+
     @staticmethod
     def _ref_ply_for_highlight(highlight: Any) -> int:
         """Convert highlight move number/side to a board ply index."""
@@ -148,9 +148,8 @@ class GameController:
         self.config = config
         self.board_controller = board_controller
         
-        # Initialize opening service
+        # Shared opening service; loads on first lookup (warmed up in the background after startup)
         self.opening_service = OpeningService.get_instance(config)
-        self.opening_service.load()
         
         # Get opening repeat indicator from config
         self.opening_repeat_indicator = config.get('resources', {}).get('opening_repeat_indicator', '*')
@@ -7,6 +7,7 @@ from PyQt6.QtCore import Qt
 
 from app.models.game_model import GameModel
 from app.models.database_model import DatabaseModel, GameData
+from app.services.analysis_data_storage_service import AnalysisDataStorageService
 from app.services.pgn_service import PgnService
 from app.utils.game_tags_utils import (
     PGN_TAG_NAME_GAME_TAGS,
@@ -219,7 +220,9 @@ class MetadataController:
             
             # STEP 3: Regenerate PGN (required for saving/copying)
             new_pgn = PgnService.export_game_to_pgn(chess_game)
+            old_pgn = game.pgn
             game.pgn = new_pgn  # Update game.pgn (critical for saving/copying)
+            AnalysisDataStorageService.sync_sidecar_after_pgn_edit(game, old_pgn)
             
             # STEP 4: Update corresponding GameData fields (for database columns)
             self._update_gamedata_fields(game, tag_name, new_value)
@@ -380,7 +383,9 @@ class MetadataController:
             new_pgn = PgnService.export_game_to_pgn(chess_game)
             
             # Update the game's PGN
+            old_pgn = game.pgn
             game.pgn = new_pgn
+            AnalysisDataStorageService.sync_sidecar_after_pgn_edit(game, old_pgn)
             
             # Update corresponding GameData fields if this tag corresponds to a database column
             self._update_gamedata_fields(game, tag_name, tag_value)
@@ -477,7 +482,9 @@ class MetadataController:
             new_pgn = PgnService.export_game_to_pgn(chess_game)
             
             # Update the game's PGN
+            old_pgn = game.pgn
             game.pgn = new_pgn
+            AnalysisDataStorageService.sync_sidecar_after_pgn_edit(game, old_pgn)
             
             # Update corresponding GameData fields if this tag corresponds to a database column
             tag_to_field_mapping = {
@@ -19,8 +19,12 @@ from app.services.progress_service import ProgressService
 from app.controllers.game_controller import GameController
 from app.services.logging_service import LoggingService
 from app.services.opening_service import OpeningService
+from app.services.opening_tree_index import OpeningTreeIndex, flatten_move_list
 from app.services.user_settings_service import UserSettingsService
 
+# Plies kept in the per-session opening-tree index (the Openings view's deepest default).
+_OPENING_TREE_INDEX_DEPTH = 12
+
 # Sentinel: use callback / default resolution for selected-games snapshot (see _schedule_dropdown_update).
 _DEFAULT_SELECTION_GAMES = object()
 
@@ -164,6 +168,7 @@ class PlayerStatsCalculationWorker(QThread):
         use_all_databases: bool,
         player_games: Optional[List["GameData"]] = None,
         time_series_user_settings: Optional[Dict[str, Any]] = None,
+        highlight_settings: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Initialize the stats calculation worker.
 
@@ -173,6 +178,7 @@ class PlayerStatsCalculationWorker(QThread):
             use_all_databases: Whether to use all databases or just active (ignored if player_games is set).
             player_games: If set, use this list for the player's games instead of querying databases.
             time_series_user_settings: Snapshot of user time-series prefs (main thread) for binning.
+            highlight_settings: Snapshot of highlight rule settings (main thread) for per-game highlights.
         """
         super().__init__()
         self.stats_controller = stats_controller
@@ -182,6 +188,7 @@ class PlayerStatsCalculationWorker(QThread):
         self._time_series_user_settings: Dict[str, Any] = (
             dict(time_series_user_settings) if time_series_user_settings else {}
         )
+        self._highlight_settings = highlight_settings
         self._cancelled = False
         self._mutex = QMutex()
     
@@ -273,6 +280,7 @@ class PlayerStatsCalculationWorker(QThread):
                 progress_callback,
                 cancellation_check,
                 time_series_user_settings=self._time_series_user_settings,
+                highlight_settings=self._highlight_settings,
             )
             
             if self._is_cancelled():
@@ -391,6 +399,8 @@ class PlayerStatsController(QObject):
         self._last_analyzed_games: List["GameData"] = []
         # Move lists from last successful worker run, index-aligned with _current_analyzed_games (see stats_ready).
         self._session_precomputed_moves: List[Optional[List[MoveData]]] = []
+        # (session key, OpeningTreeIndex, session lists) for the current stats result; see _session_opening_tree_index.
+        self._opening_tree_cache: Optional[Tuple[Tuple[Any, ...], OpeningTreeIndex, Tuple[Any, ...]]] = None
         self._last_unavailable_reason: str = "no_player"
         self._current_player: Optional[str] = None
         self._use_all_databases: bool = False
@@ -880,6 +890,61 @@ class PlayerStatsController(QObject):
         except Exception:
             return None
 
+    def _session_opening_tree_index(self, max_depth: int) -> OpeningTreeIndex:
+        """Return the opening-tree trie for the current stats session, building it on first use.
+
+        The trie is keyed on the current player and the identity of the session
+        lists (games, summaries, precomputed moves); every stats result or reset
+        replaces those lists, so a stale trie is never served.
+        """
+        analyzed_games = getattr(self, "_current_analyzed_games", []) or []
+        summaries = getattr(self, "current_game_summaries", []) or []
+        session_moves = getattr(self, "_session_precomputed_moves", None)
+        key = (self._current_player, id(analyzed_games), id(summaries), id(session_moves))
+        cached = self._opening_tree_cache
+        if cached is not None and cached[0] == key and cached[1].max_depth >= max_depth:
+            return cached[1]
+
+        index = OpeningTreeIndex(max(max_depth, _OPENING_TREE_INDEX_DEPTH))
+        with_accuracy = len(summaries) == len(analyzed_games)
+        for gi, game in enumerate(analyzed_games):
+            if not getattr(game, "analyzed", False):
+                continue
+            moves = self._analysis_moves_for_session_game(gi, game)
+            if not moves:
+                continue
+
+            is_white_game = (game.white == self._current_player)
+            game_accuracy = 0.0
+            opening_phase_accuracy = 0.0
+            if with_accuracy:
+                # Per-game accuracy for this player:
+                # - Overall game accuracy (used for "Game Acc" column)
+                # - Opening-phase accuracy (used for "Opening Acc" column)
+                summary = summaries[gi]
+                if is_white_game:
+                    player_stats = summary.white_stats
+                    phase_stats = summary.white_opening
+                else:
+                    player_stats = summary.black_stats
+                    phase_stats = summary.black_opening
+                if player_stats and player_stats.accuracy is not None:
+                    game_accuracy = player_stats.accuracy
+                if phase_stats and phase_stats.accuracy is not None:
+                    opening_phase_accuracy = phase_stats.accuracy
+
+            index.add_game(
+                gi,
+                flatten_move_list(moves, index.max_depth),
+                is_white_game,
+                game_accuracy,
+                opening_phase_accuracy,
+            )
+
+        # Hold the lists themselves so their ids cannot be reused while cached.
+        self._opening_tree_cache = (key, index, (analyzed_games, summaries, session_moves))
+        return index
+
     def get_opening_tree(
         self,
         max_depth: int = 12,
@@ -909,162 +974,20 @@ class PlayerStatsController(QObject):
             }
 
         Only sequences that appear in at least min_games games are kept.
-        """
-        tree: Dict[str, Any] = {
-            "games": 0,
-            "white_games": 0,
-            "black_games": 0,
-            "children": {},
-        }
 
+        The tree is exported from the session's OpeningTreeIndex, which is built
+        once per stats result and reused for every depth / min_games change.
+        """
         if not self._current_player:
-            return tree
+            return {"games": 0, "white_games": 0, "black_games": 0, "children": {}}
 
         analyzed_games = getattr(self, "_current_analyzed_games", []) or []
         summaries = getattr(self, "current_game_summaries", []) or []
         if not analyzed_games or not summaries or len(analyzed_games) != len(summaries):
-            return tree
-
-        total_games_used = 0
-
-        for gi, (game, summary) in enumerate(zip(analyzed_games, summaries)):
-            if not getattr(game, "analyzed", False):
-                continue
-            moves = self._analysis_moves_for_session_game(gi, game)
-            if not moves:
-                continue
-
-            is_white_game = (game.white == self._current_player)
-
-            # Per-game accuracy for this player:
-            # - Overall game accuracy (used for "Game Acc" column)
-            # - Opening-phase accuracy (used for "Opening Acc" column)
-            if is_white_game:
-                player_stats = summary.white_stats
-                phase_stats = summary.white_opening
-            else:
-                player_stats = summary.black_stats
-                phase_stats = summary.black_opening
-
-            game_accuracy = player_stats.accuracy if player_stats and player_stats.accuracy is not None else 0.0
-            opening_phase_accuracy = phase_stats.accuracy if phase_stats and phase_stats.accuracy is not None else 0.0
-
-            node = tree
-            ply_count = 0
-            for move in moves:
-                if ply_count >= max_depth:
-                    break
-
-                # White move
-                if move.white_move:
-                    ply_count += 1
-                    if ply_count > max_depth:
-                        break
-                    san = move.white_move
-                    children = node.setdefault("children", {})
-                    child = children.setdefault(
-                        san,
-                        {
-                            "games": 0,
-                            "white_games": 0,
-                            "black_games": 0,
-                            # Aggregated overall game accuracy for this player in games
-                            # that reached this node.
-                            "game_accuracy_sum": 0.0,
-                            "game_accuracy_count": 0,
-                            # Aggregated opening-phase accuracy for this player in games
-                            # that reached this node.
-                            "opening_accuracy_sum": 0.0,
-                            "opening_accuracy_count": 0,
-                            "children": {},
-                        },
-                    )
-                    child["games"] += 1
-                    if is_white_game:
-                        child["white_games"] += 1
-                    else:
-                        child["black_games"] += 1
-                    child["game_accuracy_sum"] += float(game_accuracy)
-                    child["game_accuracy_count"] += 1
-                    child["opening_accuracy_sum"] += float(opening_phase_accuracy)
-                    child["opening_accuracy_count"] += 1
-
-                    # Attach ECO info (opening family) if available and not already set
-                    fen_after = getattr(move, "fen_white", "") or ""
-                    if fen_after and "eco" not in child:
-                        eco, name = self._opening_service.get_opening_info(fen_after)
-                        if eco or name:
-                            if eco:
-                                child["eco"] = eco
-                            if name:
-                                child["opening_name"] = name
-
-                    node = child
-
-                # Black move
-                if move.black_move and ply_count < max_depth:
-                    ply_count += 1
-                    if ply_count > max_depth:
-                        break
-                    san = move.black_move
-                    children = node.setdefault("children", {})
-                    child = children.setdefault(
-                        san,
-                        {
-                            "games": 0,
-                            "white_games": 0,
-                            "black_games": 0,
-                            "game_accuracy_sum": 0.0,
-                            "game_accuracy_count": 0,
-                            "opening_accuracy_sum": 0.0,
-                            "opening_accuracy_count": 0,
-                            "children": {},
-                        },
-                    )
-                    child["games"] += 1
-                    if is_white_game:
-                        child["white_games"] += 1
-                    else:
-                        child["black_games"] += 1
-                    child["game_accuracy_sum"] += float(game_accuracy)
-                    child["game_accuracy_count"] += 1
-                    child["opening_accuracy_sum"] += float(opening_phase_accuracy)
-                    child["opening_accuracy_count"] += 1
-
-                    fen_after = getattr(move, "fen_black", "") or ""
-                    if fen_after and "eco" not in child:
-                        eco, name = self._opening_service.get_opening_info(fen_after)
-                        if eco or name:
-                            if eco:
-                                child["eco"] = eco
-                            if name:
-                                child["opening_name"] = name
-
-                    node = child
-
-            total_games_used += 1
-            tree["games"] += 1
-            if is_white_game:
-                tree["white_games"] += 1
-            else:
-                tree["black_games"] += 1
-
-        # Prune nodes that are rarely played
-        def prune(node: Dict[str, Any]) -> None:
-            children = node.get("children", {})
-            to_delete = []
-            for san, child in children.items():
-                if child.get("games", 0) < min_games:
-                    to_delete.append(san)
-                else:
-                    prune(child)
-            for san in to_delete:
-                del children[san]
-
-        if min_games > 1:
-            prune(tree)
+            return {"games": 0, "white_games": 0, "black_games": 0, "children": {}}
 
-        return tree
+        index = self._session_opening_tree_index(max_depth)
+        return index.to_tree(max_depth, min_games, self._opening_service.get_opening_info)
 
     def get_games_for_opening_path(
         self,
@@ -1079,7 +1002,6 @@ class PlayerStatsController(QObject):
         ref_ply is set to the ply index of the last move in the SAN path so the
         Search Results tab can jump directly to the defining move of that opening.
         """
-        matches: List[Tuple["GameData", int]] = []
         if not san_path or not self._current_player:
             return []
         
@@ -1087,53 +1009,18 @@ class PlayerStatsController(QObject):
         if not analyzed_games:
             return []
         
-        max_plies = min(max_depth, len(san_path))
-        
-        for gi, game in enumerate(analyzed_games):
-            if not getattr(game, "analyzed", False):
-                continue
-            moves = self._analysis_moves_for_session_game(gi, game)
-            if not moves:
-                continue
-            
-            path_idx = 0
-            ply_count = 0
-            matched = True
-            
-            for move in moves:
-                if ply_count >= max_plies:
-                    break
-                # White move
-                if move.white_move:
-                    if path_idx >= len(san_path):
-                        break
-                    ply_count += 1
-                    if ply_count > max_plies:
-                        break
-                    if move.white_move != san_path[path_idx]:
-                        matched = False
-                        break
-                    path_idx += 1
-                # Black move
-                if move.black_move and ply_count < max_plies:
-                    if path_idx >= len(san_path):
-                        break
-                    ply_count += 1
-                    if ply_count > max_plies:
-                        break
-                    if move.black_move != san_path[path_idx]:
-                        matched = False
-                        break
-                    path_idx += 1
-            
-            if matched and path_idx == len(san_path):
-                # ply_count now points at the last move in san_path
-                ref_ply = int(ply_count) if ply_count > 0 else 0
-                matches.append((game, ref_ply))
-        
+        if len(san_path) > max_depth:
+            return []
+
+        index = self._session_opening_tree_index(max_depth)
+        # ref_ply points at the last move in san_path
+        ref_ply = len(san_path)
+        matches: List[Tuple["GameData", int]] = [
+            (analyzed_games[gi], ref_ply) for gi in index.games_for_path(san_path)
+        ]
         if not matches:
             return []
-        
+
         # Map games to source display names (database file names)
         games_only = [g for (g, _) in matches]
         mapped = self._map_games_to_sources(games_only)  # List[Tuple[GameData, str]]
@@ -1673,6 +1560,7 @@ class PlayerStatsController(QObject):
             self._use_all_databases,
             player_games=player_games_arg,
             time_series_user_settings=ts_user,
+            highlight_settings=self.summary_service.get_highlight_settings(),
         )
         self._stats_worker.stats_ready.connect(self._on_stats_worker_ready)
         self._stats_worker.stats_unavailable.connect(self._on_stats_worker_unavailable)
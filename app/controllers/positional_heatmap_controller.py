@@ -1,12 +1,86 @@
 """Controller for positional heat-map feature."""
 
-from typing import Dict, Any, Optional
+import io
+from typing import Dict, Any, List, Optional
 
+import chess
+import chess.pgn
+from PyQt6.QtCore import QMutex, QMutexLocker, QThread
+
+from app.services.logging_service import LoggingService
 from app.services.positional_heatmap.rule_registry import RuleRegistry
 from app.services.positional_heatmap.positional_analyzer import PositionalAnalyzer
 from app.models.positional_heatmap_model import PositionalHeatmapModel
 
 
+class HeatmapPrecomputeThread(QThread):
+    """Background thread that fills the analyzer cache for every mainline ply of a game.
+
+    Positions from the current ply onwards are computed first (the likely
+    stepping direction), then the earlier ones. Positions already cached are
+    skipped, so restarting the job for the same game is cheap.
+    """
+
+    def __init__(self, analyzer: PositionalAnalyzer, pgn_text: str, start_ply: int = 0,
+                 max_positions: Optional[int] = None) -> None:
+        """Initialize the precompute thread.
+
+        Args:
+            analyzer: Shared PositionalAnalyzer whose cache is filled.
+            pgn_text: PGN of the game to precompute.
+            start_ply: Ply to start from (0 = starting position).
+            max_positions: Optional cap on positions (keeps the job within the cache size).
+        """
+        super().__init__()
+        self.analyzer = analyzer
+        self.pgn_text = pgn_text
+        self.start_ply = max(0, start_ply)
+        self.max_positions = max_positions
+        # Own flag rather than requestInterruption(), which Qt ignores before the thread runs
+        self._cancelled = False
+        self._mutex = QMutex()
+
+    def cancel(self) -> None:
+        """Cancel the precompute job (returns at once; the thread stops after its current position)."""
+        with QMutexLocker(self._mutex):
+            self._cancelled = True
+
+    def _is_cancelled(self) -> bool:
+        """Check if the job is cancelled."""
+        with QMutexLocker(self._mutex):
+            return self._cancelled
+
+    def run(self) -> None:
+        """Analyze each mainline position that is not cached yet."""
+        try:
+            boards = self._mainline_boards()
+            order = boards[self.start_ply:] + boards[:self.start_ply][::-1]
+            if self.max_positions is not None:
+                order = order[:self.max_positions]
+            for board in order:
+                if self._is_cancelled():
+                    return
+                if not self.analyzer.is_cached(board):
+                    self.analyzer.analyze_board(board)
+        except Exception as e:
+            logging_service = LoggingService.get_instance()
+            logging_service.error(f"Error in HeatmapPrecomputeThread: {e}", exc_info=e)
+
+    def _mainline_boards(self) -> List[chess.Board]:
+        """Parse the game and return one board per mainline ply (ply 0 first)."""
+        chess_game = chess.pgn.read_game(io.StringIO(self.pgn_text or ""))
+        if chess_game is None:
+            return []
+        board = chess_game.board()
+        boards = [board.copy(stack=False)]
+        for move in chess_game.mainline_moves():
+            if self._is_cancelled():
+                break
+            board.push(move)
+            boards.append(board.copy(stack=False))
+        return boards
+
+
 class PositionalHeatmapController:
     """Controller for managing positional heat-map feature.
     
@@ -28,33 +102,96 @@ class PositionalHeatmapController:
         
         # Get positional heat-map configuration
         heatmap_config = config.get('ui', {}).get('positional_heatmap', {})
+        self.precompute_enabled = bool(heatmap_config.get('precompute_game_positions', True))
         
         # Initialize components
         self.registry = RuleRegistry(heatmap_config)
         self.analyzer = PositionalAnalyzer(heatmap_config, self.registry)
         self.model = PositionalHeatmapModel(heatmap_config, self.analyzer)
+        self._precompute_thread: Optional[HeatmapPrecomputeThread] = None
+        self._retired_threads: List[HeatmapPrecomputeThread] = []
         
         # Connect to board position changes
         if board_controller:
             board_controller.get_board_model().position_changed.connect(self._on_position_changed)
+        
+        # Precompute the whole game when a new game becomes active
+        if game_controller:
+            game_controller.get_game_model().active_game_changed.connect(self._on_active_game_changed)
     
     def _on_position_changed(self) -> None:
         """Handle position change from board model."""
         if self.model.is_visible:
-            # Clear cache when position changes to ensure fresh evaluation
-            self.analyzer.clear_cache()
+            # Cache is keyed by FEN and rules do not change between positions,
+            # so precomputed plies are served without re-evaluation
             board = self.board_controller.get_board_model().board
             self.model.update_position(board)
     
+    def _on_active_game_changed(self, game) -> None:
+        """Handle active game change from game model."""
+        if self.model.is_visible:
+            self._start_precompute()
+        else:
+            self._stop_precompute()
+    
     def toggle_visibility(self) -> None:
         """Toggle heat-map visibility."""
         self.model.set_visible(not self.model.is_visible)
         if self.model.is_visible:
             # Clear cache to ensure fresh evaluation with updated rules
+            self._stop_precompute()
             self.analyzer.clear_cache()
             # Update scores when enabling
             board = self.board_controller.get_board_model().board
             self.model.update_position(board)
+            self._start_precompute()
+        else:
+            self._stop_precompute()
+    
+    def _start_precompute(self) -> None:
+        """Start precomputing heat-maps for every ply of the active game in the background."""
+        self._stop_precompute()
+        if not self.precompute_enabled or not self.game_controller:
+            return
+        game_model = self.game_controller.get_game_model()
+        game = game_model.active_game
+        if game is None or not getattr(game, "pgn", ""):
+            return
+        # Two cache entries per position (one per perspective); never evict what we just computed
+        max_positions = max(1, self.analyzer.max_cache_size // 2) if self.analyzer.cache_enabled else 0
+        if max_positions == 0:
+            return
+        thread = HeatmapPrecomputeThread(
+            self.analyzer,
+            game.pgn,
+            start_ply=game_model.get_active_move_ply(),
+            max_positions=max_positions,
+        )
+        self._precompute_thread = thread
+        thread.start(QThread.Priority.LowPriority)
+    
+    def _stop_precompute(self) -> None:
+        """Cancel the running precompute job (if any) without blocking the GUI thread."""
+        thread = self._precompute_thread
+        self._precompute_thread = None
+        if thread is None:
+            return
+        thread.cancel()
+        self._retire_thread(thread)
+    
+    def _retire_thread(self, thread: HeatmapPrecomputeThread) -> None:
+        # Keep a reference until it stops (a QThread must not be destroyed while running)
+        if thread.isRunning():
+            self._retired_threads.append(thread)
+            thread.finished.connect(
+                lambda: self._retired_threads.remove(thread) if thread in self._retired_threads else None
+            )
+    
+    def cleanup(self) -> None:
+        """Stop background work (called on application shutdown)."""
+        self._stop_precompute()
+        for thread in list(self._retired_threads):
+            thread.wait(2000)
     
     def get_model(self) -> PositionalHeatmapModel:
         """Get the positional heat-map model.
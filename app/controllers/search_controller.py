@@ -1,15 +1,75 @@
 """Controller for managing database search operations."""
 
+import dataclasses
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
+from PyQt6.QtCore import QMutex, QMutexLocker, QThread, pyqtSignal
+
 from app.models.database_model import DatabaseModel, GameData
-from app.models.search_criteria import SearchQuery
+from app.models.search_criteria import SearchCriteria, SearchQuery
 from app.services.database_search_service import DatabaseSearchService
 from app.services.progress_service import ProgressService
 from app.services.logging_service import LoggingService
 
 
+class DatabaseSearchWorker(QThread):
+    """Worker thread that runs one search and streams its matches in batches."""
+
+    batch_found = pyqtSignal(int, list, int, int)  # database_index, matches, games_scanned, games_total
+    search_finished = pyqtSignal(bool)  # cancelled
+
+    def __init__(
+        self,
+        databases: List[DatabaseModel],
+        criteria: List[SearchCriteria],
+        database_names: List[str],
+        candidates: Optional[List[Optional[List[GameData]]]] = None,
+    ) -> None:
+        """Initialize the search worker.
+
+        Args:
+            databases: Databases to search.
+            criteria: Search criteria.
+            database_names: Display names parallel to ``databases``.
+            candidates: Optional per-database games to test instead of all games.
+        """
+        super().__init__()
+        self.databases = databases
+        self.criteria = criteria
+        self.database_names = database_names
+        self.candidates = candidates
+        self._cancelled = False
+        self._mutex = QMutex()
+
+    def cancel(self) -> None:
+        """Cancel the search."""
+        with QMutexLocker(self._mutex):
+            self._cancelled = True
+
+    def _is_cancelled(self) -> bool:
+        """Check if the search is cancelled."""
+        with QMutexLocker(self._mutex):
+            return self._cancelled
+
+    def run(self) -> None:
+        """Evaluate the criteria and emit matches after every scanned chunk."""
+        try:
+            for batch in DatabaseSearchService.iter_search_batches(
+                self.databases,
+                self.criteria,
+                self.database_names,
+                candidates=self.candidates,
+            ):
+                if self._is_cancelled():
+                    break
+                self.batch_found.emit(batch.database_index, batch.matches, batch.scanned, batch.total)
+        except Exception as e:
+            logging_service = LoggingService.get_instance()
+            logging_service.error(f"Error in DatabaseSearchWorker: {e}", exc_info=e)
+        self.search_finished.emit(self._is_cancelled())
+
+
 class SearchController:
     """Controller for orchestrating database search operations.
     
@@ -27,17 +87,35 @@ class SearchController:
         self.config = config
         self.database_controller = database_controller
         self.progress_service = ProgressService.get_instance()
+        # Running streamed search (see start_search)
+        self._search_worker: Optional[DatabaseSearchWorker] = None
+        self._retired_workers: List[DatabaseSearchWorker] = []
+        self._search_model: Optional[DatabaseModel] = None
+        self._search_scope = ""
+        self._search_databases: List[DatabaseModel] = []
+        self._search_revisions: List[int] = []
+        self._search_criteria: List[SearchCriteria] = []
+        self._search_matches: List[List[GameData]] = []
+        self._search_found = 0
+        # Last completed search: (criteria, databases, their data revisions, matches per database).
+        # A strictly narrower follow-up query only re-tests these matches.
+        self._last_search: Optional[Tuple[List[SearchCriteria], List[DatabaseModel], List[int], List[List[GameData]]]] = None
     
-    def perform_search(self, search_query: SearchQuery, active_database: Optional[DatabaseModel]) -> Tuple[Optional[DatabaseModel], str]:
-        """Perform a search operation and create a search results model.
+    def start_search(self, search_query: SearchQuery, active_database: Optional[DatabaseModel]) -> Tuple[Optional[DatabaseModel], str]:
+        """Start a search on a worker thread; matches are appended to the returned model as found.
+        
+        Cancels a search that is still running. If the previous completed search was over
+        the same, unchanged databases and the new criteria are strictly narrower (see
+        DatabaseSearchService.is_refinement), only its matches are tested again.
         
         Args:
             search_query: SearchQuery with scope and criteria.
             active_database: Currently active database (for "active" scope).
             
         Returns:
-            Tuple of (search_results_model, status_message).
-            If search fails or no results, model is None and status_message explains why.
+            Tuple of (search_results_model, status_message). The model starts empty and
+            fills while the search runs; it is None (and the message explains why) if
+            the search cannot start.
         """
         logging_service = LoggingService.get_instance()
         search_scope = search_query.scope if search_query else "unknown"
@@ -46,7 +124,6 @@ class SearchController:
             logging_service.debug(f"Search failed: scope={search_scope}, reason=no_criteria")
             return None, "No search criteria provided"
         
-        # Determine which databases to search
         databases_to_search, database_names = self._get_databases_to_search(
             search_query.scope,
             active_database
@@ -56,31 +133,140 @@ class SearchController:
             logging_service.debug(f"Search failed: scope={search_scope}, reason=no_databases")
             return None, "No database available for search"
         
-        # Perform search using service
-        matching_results = DatabaseSearchService.search_databases(
-            databases_to_search,
-            search_query.criteria,
-            database_names
-        )
-        
-        # Format status message
-        num_games = len(matching_results)
-        num_databases = len(databases_to_search)
-        status_message = self._format_search_status_message(num_games, num_databases)
+        self.cancel_search()
+        criteria = [dataclasses.replace(c) for c in search_query.criteria]
+        candidates = self._refinement_candidates(criteria, databases_to_search)
+        if DatabaseSearchService.uses_position_index(criteria):
+            # Index deferred games here: the worker must only read the position index,
+            # which the GUI thread updates when games are edited or removed.
+            for database in databases_to_search:
+                database.ensure_position_index()
         
-        # Create search results model
-        search_results_model = self._create_search_results_model(matching_results)
-        
-        # Debug log: search success
-        logging_service.debug(f"Search completed: scope={search_scope}, games_found={num_games}, success=true")
+        model = DatabaseModel(config=self.config)
+        worker = DatabaseSearchWorker(databases_to_search, criteria, database_names, candidates)
+        self._search_worker = worker
+        self._search_model = model
+        self._search_scope = search_scope
+        self._search_databases = list(databases_to_search)
+        self._search_revisions = [db.data_revision() for db in databases_to_search]
+        self._search_criteria = criteria
+        self._search_matches = [[] for _ in databases_to_search]
+        self._search_found = 0
+        worker.batch_found.connect(
+            lambda index, matches, scanned, total: self._on_search_batch(worker, index, matches, scanned, total)
+        )
+        worker.search_finished.connect(lambda cancelled: self._on_search_finished(worker, cancelled))
         
-        return search_results_model, status_message
-
+        logging_service.debug(
+            f"Search started: scope={search_scope}, databases={len(databases_to_search)}, "
+            f"refining_previous={candidates is not None}"
+        )
+        status_message = "Searching..."
+        self.progress_service.show_progress()
+        self.progress_service.report_progress(status_message, 0)
+        worker.start()
+        return model, status_message
+    
+    def is_search_running(self) -> bool:
+        """Return True while a search worker is streaming matches."""
+        return self._search_worker is not None
+    
+    def cancel_search(self) -> None:
+        """Cancel the running search, if any; matches found so far stay in its model."""
+        worker = self._search_worker
+        if worker is None:
+            return
+        self._search_worker = None
+        worker.cancel()
+        self.progress_service.hide_progress()
+        self._retire_worker(worker)
+    
+    def cleanup(self) -> None:
+        """Stop the running search (called on application shutdown)."""
+        worker = self._search_worker
+        self.cancel_search()
+        if worker is not None and worker.isRunning():
+            worker.wait(2000)
+    
+    def _retire_worker(self, worker: DatabaseSearchWorker) -> None:
+        # Keep a reference until it stops (a QThread must not be destroyed while running)
+        if worker.isRunning():
+            self._retired_workers.append(worker)
+            worker.finished.connect(lambda: self._retired_workers.remove(worker) if worker in self._retired_workers else None)
+    
+    def _refinement_candidates(
+        self,
+        criteria: List[SearchCriteria],
+        databases: List[DatabaseModel],
+    ) -> Optional[List[Optional[List[GameData]]]]:
+        """Return the last search's matches if the new search can be answered from them."""
+        if self._last_search is None:
+            return None
+        previous_criteria, previous_databases, previous_revisions, previous_matches = self._last_search
+        if len(previous_databases) != len(databases):
+            return None
+        for previous, database, revision in zip(previous_databases, databases, previous_revisions):
+            if previous is not database or database.data_revision() != revision:
+                return None
+        if not DatabaseSearchService.is_refinement(previous_criteria, criteria):
+            return None
+        return [list(matches) for matches in previous_matches]
+    
+    def _on_search_batch(
+        self,
+        worker: DatabaseSearchWorker,
+        database_index: int,
+        matches: List[tuple],
+        scanned: int,
+        total: int,
+    ) -> None:
+        """Append a batch of matches to the results model and report progress."""
+        if worker is not self._search_worker or self._search_model is None:
+            return  # Batch from a cancelled search, delivered late
+        if matches:
+            self._search_matches[database_index].extend(item[0] for item in matches)
+            self._search_found += len(matches)
+            self._append_search_results(self._search_model, matches)
+        percent = int(scanned * 100 / total) if total else 100
+        found = self._search_found
+        self.progress_service.report_progress(
+            f"Searching: {found} game{'s' if found != 1 else ''} found ({scanned}/{total} checked)",
+            percent,
+        )
+    
+    def _on_search_finished(self, worker: DatabaseSearchWorker, cancelled: bool) -> None:
+        """Report the final count and remember the matches for refinement."""
+        if worker is not self._search_worker:
+            return
+        self._search_worker = None
+        self.progress_service.hide_progress()
+        num_databases = len(self._search_databases)
+        if cancelled:
+            self.progress_service.set_status(f"Search cancelled: {self._search_found} game(s) found so far")
+        else:
+            revisions = [db.data_revision() for db in self._search_databases]
+            if revisions == self._search_revisions:
+                self._last_search = (
+                    self._search_criteria,
+                    self._search_databases,
+                    revisions,
+                    self._search_matches,
+                )
+            else:
+                self._last_search = None
+            self.progress_service.set_status(self._format_search_status_message(self._search_found, num_databases))
+        LoggingService.get_instance().debug(
+            f"Search completed: scope={self._search_scope}, games_found={self._search_found}, "
+            f"cancelled={cancelled}, success=true"
+        )
+    
     def create_search_results_model(self, matching_results: List[Tuple[GameData, str]]) -> DatabaseModel:
         """Create a DatabaseModel for search results from a list of (game, source_name) tuples.
 
         Used when opening pattern games in a Search Results tab (e.g. from Player Stats).
         """
+        # The new model replaces the Search Results tab; stop filling the old one
+        self.cancel_search()
         return self._create_search_results_model(matching_results)
 
     def _get_databases_to_search(
@@ -161,7 +347,18 @@ class SearchController:
             DatabaseModel populated with search results.
         """
         search_results_model = DatabaseModel(config=self.config)
+        self._append_search_results(search_results_model, matching_results)
+        return search_results_model
+    
+    def _append_search_results(self, model: DatabaseModel, matching_results: List[tuple]) -> None:
+        """Append copies of matched games (tagged with their source database) to a results model.
         
+        Args:
+            model: Search results model.
+            matching_results: Tuples (GameData, database_name) or (GameData, database_name, ref_ply).
+        """
+        game_copies: List[GameData] = []
+        tags_list: List[List[str]] = []
         for item in matching_results:
             # Support tuples of (game, db_name) and (game, db_name, ref_ply)
             if len(item) == 3:
@@ -194,9 +391,9 @@ class SearchController:
                 ref_ply=ref_ply,
             )
             
+            game_copies.append(game_copy)
             # Extract tags from existing game's PGN (game is being copied for search results)
-            tags = search_results_model._extract_tags_from_game(game_copy)
-            search_results_model.add_game(game_copy, tags=tags)
+            tags_list.append(list(model._extract_tags_from_game(game_copy)))
         
-        return search_results_model
+        model.add_games_batch(game_copies, tags_list=tags_list)
 
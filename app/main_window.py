@@ -40,7 +40,7 @@ from app.controllers.engine_controller import TASK_GAME_ANALYSIS, TASK_EVALUATIO
 from app.services.pgn_cleaning_service import PgnCleaningService
 from app.utils.font_utils import resolve_font_family, scale_font_size
 from app.utils.tooltip_utils import wrap_tooltip_text
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 
 
 class MainWindow(QMainWindow):
@@ -85,6 +85,9 @@ class MainWindow(QMainWindow):
         self._setup_ui()
         self._setup_shortcuts()
         
+        # Background service loading, started by start_service_warmup() once shown.
+        self._service_warmup = None
+
         # First-run welcome dialog (deferred until the window is shown).
         self._welcome_dialog_pending = False
         self._welcome_dialog_done = False
@@ -854,9 +857,9 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             search_query = dialog.get_search_query()
             if search_query and search_query.criteria:
-                # Delegate search to controller
+                # Delegate search to controller; matches stream into the results tab
                 search_controller = self.controller.get_search_controller()
-                search_results_model, status_message = search_controller.perform_search(
+                search_results_model, status_message = search_controller.start_search(
                     search_query,
                     active_database
                 )
@@ -1293,6 +1296,16 @@ class MainWindow(QMainWindow):
             manual_analysis_controller = self.controller.get_manual_analysis_controller()
             if manual_analysis_controller:
                 manual_analysis_controller.stop_analysis(synchronous=True)
+            
+            # Stop background heat-map precompute
+            self.controller.get_positional_heatmap_controller().cleanup()
+
+            # Stop a running database search
+            self.controller.get_search_controller().cleanup()
+
+            # Skip service warm-up steps that have not started yet
+            if self._service_warmup is not None:
+                self._service_warmup.cancel()
         except Exception as e:
             # Log error but don't prevent shutdown
             logging_service.error(f"Error during cleanup on shutdown: {e}", exc_info=e)
@@ -1300,6 +1313,35 @@ class MainWindow(QMainWindow):
         self._save_user_settings()
         event.accept()
 
+    def start_service_warmup(self, on_finished: Optional[Callable[[], None]] = None) -> None:
+        """Load heavy services on a background thread after the window is shown.
+
+        Order follows first use: the ECO book (game loading, opening labels),
+        the merged Polyglot books (analysis), then the opening encyclopedia.
+        Anything needed earlier loads itself on demand; see ServiceWarmup.
+
+        Args:
+            on_finished: Called on the warm-up thread when every service is loaded.
+        """
+        if self._service_warmup is not None:
+            return
+        from app.services.opening_service import OpeningService
+        from app.services.opening_encyclopedia_service import OpeningEncyclopediaService
+        from app.services.service_warmup import ServiceWarmup
+
+        warmup = ServiceWarmup()
+        warmup.add("opening book", OpeningService.get_instance(self.config).load, priority=0)
+        game_analysis_controller = self.controller.get_game_analysis_controller()
+        if game_analysis_controller is not None:
+            warmup.add("polyglot books", game_analysis_controller.book_move_service.load, priority=10)
+        warmup.add(
+            "opening encyclopedia",
+            OpeningEncyclopediaService.get_instance(self.config).load,
+            priority=20,
+        )
+        self._service_warmup = warmup
+        warmup.start(on_finished)
+
     def showEvent(self, event) -> None:
         """Handle first paint/show for deferred welcome dialogs."""
         super().showEvent(event)
@@ -2437,6 +2479,19 @@ class MainWindow(QMainWindow):
         """DEBUG: Count highlight rule hits across analyzed games in the active DB."""
         self.controller.get_debug_controller().scan_highlight_rule_frequency(parent=self)
 
+    def _debug_toggle_rule_profiling(self) -> None:
+        """DEBUG: Enable or disable per-rule timing for highlight and heatmap rules."""
+        enabled = self.debug_rule_profiling_action.isChecked()
+        self.controller.get_debug_controller().set_rule_profiling(enabled)
+
+    def _debug_copy_rule_profile_report(self) -> None:
+        """DEBUG: Copy the per-rule profile report to clipboard."""
+        self.controller.get_debug_controller().copy_rule_profile_report_to_clipboard()
+
+    def _debug_reset_rule_profile(self) -> None:
+        """DEBUG: Discard collected per-rule profile stats."""
+        self.controller.get_debug_controller().reset_rule_profile()
+
     def _update_moves_list_menu(self) -> None:
         """Update the Moves List menu with current profiles and columns."""
         from app.views.menus.moves_list_menu import rebuild_moves_list_menu
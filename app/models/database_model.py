@@ -6,8 +6,10 @@ from PyQt6.QtWidgets import QApplication
 from typing import Optional, List, Dict, Any, Set, Tuple, Callable
 from datetime import datetime
 from collections import Counter
+from operator import attrgetter
 import time
 
+from app.models.database_sort_keys import DatabaseSortKeys
 from app.utils.time_control_utils import get_tc_type
 
 
@@ -138,6 +140,9 @@ class DatabaseModel(QAbstractTableModel):
     COL_TAGS = 20
     COL_PGN = 21
     
+    # Deferred position-index entries indexed between UI event pumps
+    POSITION_INDEX_CHUNK = 2048
+    
     def __init__(self, file_path: Optional[str] = None, config: Optional[Dict[str, Any]] = None) -> None:
         """Initialize the database model.
         
@@ -166,6 +171,30 @@ class DatabaseModel(QAbstractTableModel):
         # Fuzzy (ignore castling + en-passant)
         self._position_index_fuzzy: Dict[int, List[Tuple[int, int]]] = {}
         self._position_reverse_fuzzy: Dict[int, List[Tuple[int, int]]] = {}
+        # Pawn structure + side to move (see app.utils.position_keys)
+        self._position_index_pawns: Dict[int, List[Tuple[int, int]]] = {}
+        self._position_reverse_pawns: Dict[int, List[Tuple[int, int]]] = {}
+        # Batch-added games not yet in the index: id(game) -> (game, hashes, fuzzy hashes, pawn keys).
+        # Indexed in chunks on first position lookup so opening a file shows rows at once.
+        self._position_index_pending: Dict[
+            int, Tuple[GameData, Optional[List[int]], Optional[List[int]], Optional[List[int]]]
+        ] = {}
+        # True while ensure_position_index pumps UI events between chunks (no nested pumping).
+        self._position_index_pumping = False
+
+        # Typed sort keys for parsed columns (dates, Elo, TC type), reused across sorts.
+        self._sort_keys = DatabaseSortKeys({
+            self.COL_WHITE_ELO: (attrgetter("white_elo"), self._elo_sort_key),
+            self.COL_BLACK_ELO: (attrgetter("black_elo"), self._elo_sort_key),
+            self.COL_DATE: (attrgetter("date"), self._parse_date_for_sort),
+            self.COL_TC_TYPE: (attrgetter("time_control"), self._tc_type_sort_key),
+        })
+        # id(game) -> row; rebuilt lazily after rows are reordered or removed.
+        self._row_index: Optional[Dict[int, int]] = None
+        # Bumped on every row or data change notification (see data_revision).
+        self._data_revision = 0
+        for signal in (self.dataChanged, self.rowsInserted, self.rowsRemoved, self.layoutChanged, self.modelReset):
+            signal.connect(self._bump_data_revision)
 
     def set_config(self, config: Dict[str, Any]) -> None:
         """Update config and refresh cached theme-driven assets."""
@@ -173,9 +202,21 @@ class DatabaseModel(QAbstractTableModel):
         ui_cfg = (self._config.get("ui") or {})
         db_panel_cfg = ui_cfg.get("panels", {}).get("database", {})
         self._pgn_preview_max_len = db_panel_cfg.get("pgn_col_max_chars", 250)
+        self._sort_keys.invalidate_column(self.COL_TC_TYPE)
         self._unsaved_icon = None
         self._emit_unsaved_icon_data_change()
 
+    def data_revision(self) -> int:
+        """Counter that changes whenever rows are added, removed, reordered or their data changes.
+
+        Lets callers tell whether results computed from this model (e.g. search matches)
+        still describe it.
+        """
+        return self._data_revision
+
+    def _bump_data_revision(self, *args: Any) -> None:
+        self._data_revision += 1
+
     def _get_unsaved_indicator_color(self) -> QColor:
         """Return the configured unsaved table-indicator color."""
         db_panel_cfg = ((self._config.get("ui") or {}).get("panels", {}) or {}).get("database", {})
@@ -394,6 +435,7 @@ class DatabaseModel(QAbstractTableModel):
         tags: List[str] = None,
         position_hashes: Optional[List[int]] = None,
         position_hashes_fuzzy: Optional[List[int]] = None,
+        position_pawn_keys: Optional[List[int]] = None,
     ) -> None:
         """Add a game to the model.
         
@@ -419,6 +461,8 @@ class DatabaseModel(QAbstractTableModel):
         row = len(self._games)
         self.beginInsertRows(self.index(row, 0).parent(), row, row)
         self._games.append(game)
+        if self._row_index is not None:
+            self._row_index[id(game)] = row
         # Mark game as having unsaved changes if requested (newly added games are unsaved by default)
         if mark_unsaved:
             self._unsaved_games.add(game)
@@ -436,7 +480,7 @@ class DatabaseModel(QAbstractTableModel):
             )
         except Exception:
             pass
-        self._position_index_add_game(game, position_hashes, position_hashes_fuzzy)
+        self._position_index_add_game(game, position_hashes, position_hashes_fuzzy, position_pawn_keys)
         elapsed_ms = int((time.perf_counter() - start_ts) * 1000)
         try:
             from app.services.logging_service import LoggingService
@@ -468,6 +512,7 @@ class DatabaseModel(QAbstractTableModel):
         tags_list: List[List[str]] = None,
         position_hashes_list: Optional[List[Optional[List[int]]]] = None,
         position_hashes_fuzzy_list: Optional[List[Optional[List[int]]]] = None,
+        position_pawn_keys_list: Optional[List[Optional[List[int]]]] = None,
     ) -> None:
         """Add multiple games to the model in a single batch operation.
         
@@ -495,6 +540,8 @@ class DatabaseModel(QAbstractTableModel):
             raise ValueError(f"position_hashes_list length ({len(position_hashes_list)}) must match games length ({len(games)})")
         if position_hashes_fuzzy_list is not None and len(position_hashes_fuzzy_list) != len(games):
             raise ValueError(f"position_hashes_fuzzy_list length ({len(position_hashes_fuzzy_list)}) must match games length ({len(games)})")
+        if position_pawn_keys_list is not None and len(position_pawn_keys_list) != len(games):
+            raise ValueError(f"position_pawn_keys_list length ({len(position_pawn_keys_list)}) must match games length ({len(games)})")
         
         # Set game numbers for all games
         start_count = len(self._games)
@@ -511,6 +558,9 @@ class DatabaseModel(QAbstractTableModel):
         
         # Add all games to the list
         self._games.extend(games)
+        if self._row_index is not None:
+            for offset, game in enumerate(games):
+                self._row_index[id(game)] = start_count + offset
         
         # Mark games as unsaved if requested
         if mark_unsaved:
@@ -518,40 +568,16 @@ class DatabaseModel(QAbstractTableModel):
         
         self.endInsertRows()
         
-        # Position-indexing can be expensive; log once before and once after.
-        start_ts = time.perf_counter()
-        try:
-            from app.services.logging_service import LoggingService
-            LoggingService.get_instance().debug(
-                "Position search index: start indexing batch "
-                f"games_added={len(games)} "
-                f"position_hashes_list_provided={(position_hashes_list is not None)} "
-                f"position_hashes_fuzzy_list_provided={(position_hashes_fuzzy_list is not None)}"
+        # Position-indexing is the expensive part of opening a file; defer it to the
+        # first position lookup (see _ensure_position_index).
+        pending = self._position_index_pending
+        for i, g in enumerate(games):
+            pending[id(g)] = (
+                g,
+                position_hashes_list[i] if position_hashes_list is not None else None,
+                position_hashes_fuzzy_list[i] if position_hashes_fuzzy_list is not None else None,
+                position_pawn_keys_list[i] if position_pawn_keys_list is not None else None,
             )
-        except Exception:
-            pass
-
-        if position_hashes_list is None:
-            for g in games:
-                self._position_index_add_game(g, None, None)
-        else:
-            if position_hashes_fuzzy_list is None:
-                for g, h in zip(games, position_hashes_list):
-                    self._position_index_add_game(g, h, None)
-            else:
-                for g, h, hf in zip(games, position_hashes_list, position_hashes_fuzzy_list):
-                    self._position_index_add_game(g, h, hf)
-
-        elapsed_ms = int((time.perf_counter() - start_ts) * 1000)
-        try:
-            from app.services.logging_service import LoggingService
-            LoggingService.get_instance().debug(
-                "Position search index: completed indexing batch "
-                f"games_indexed={len(games)} "
-                f"elapsed_ms={elapsed_ms}"
-            )
-        except Exception:
-            pass
         
         # Cache tags from all games in this batch (use provided tags)
         all_tags: Set[str] = set()
@@ -575,12 +601,17 @@ class DatabaseModel(QAbstractTableModel):
         if len(self._games) > 0:
             self.beginRemoveRows(self.index(0, 0).parent(), 0, len(self._games) - 1)
             self._games.clear()
+            self._row_index = None
+            self._sort_keys.clear()
             self._unsaved_games.clear()
             self._unique_tags.clear()
             self._position_index.clear()
             self._position_reverse.clear()
             self._position_index_fuzzy.clear()
             self._position_reverse_fuzzy.clear()
+            self._position_index_pawns.clear()
+            self._position_reverse_pawns.clear()
+            self._position_index_pending.clear()
             self.endRemoveRows()
             self._emit_stats_relevant_data_change()
     
@@ -612,13 +643,15 @@ class DatabaseModel(QAbstractTableModel):
         for row in rows_to_remove:
             if 0 <= row < len(self._games):
                 game = self._games[row]
+                self._position_index_pending.pop(id(game), None)
                 self._position_index_remove_game(game)
-                self._position_index_remove_game_fuzzy(game)
                 self._unsaved_games.discard(game)
                 # Emit signal for this single row removal
                 self.beginRemoveRows(parent, row, row)
                 self._games.pop(row)
+                self._row_index = None
                 self.endRemoveRows()
+        self._sort_keys.discard(games_to_remove)
         self._emit_stats_relevant_data_change()
 
     def get_position_matches(self, position_hash: int) -> Dict[int, int]:
@@ -629,6 +662,7 @@ class DatabaseModel(QAbstractTableModel):
             return {}
         if not h:
             return {}
+        self._ensure_position_index()
         out: Dict[int, int] = {}
         for gid, ply in self._position_index.get(h, []):
             if gid not in out:
@@ -643,56 +677,116 @@ class DatabaseModel(QAbstractTableModel):
             return {}
         if not h:
             return {}
+        self._ensure_position_index()
         out: Dict[int, int] = {}
         for gid, ply in self._position_index_fuzzy.get(h, []):
             if gid not in out:
                 out[gid] = int(ply)
         return out
 
-    def _position_index_remove_game(self, game: GameData) -> None:
-        gid = id(game)
-        entries = self._position_reverse.pop(gid, [])
-        if not entries:
-            return
-        for h, ply in entries:
-            bucket = self._position_index.get(int(h))
-            if not bucket:
-                continue
-            # Remove all entries for this gid.
-            bucket = [(g, p) for (g, p) in bucket if g != gid]
-            if bucket:
-                self._position_index[int(h)] = bucket
+    def get_position_matches_pawns(self, pawn_key: int) -> Dict[int, int]:
+        """Return dict of id(game) -> first ply where this pawn structure occurs (same side to move)."""
+        try:
+            h = int(pawn_key)
+        except Exception:
+            return {}
+        if not h:
+            return {}
+        self._ensure_position_index()
+        out: Dict[int, int] = {}
+        for gid, ply in self._position_index_pawns.get(h, []):
+            if gid not in out:
+                out[gid] = int(ply)
+        return out
+
+    def get_position_occurrences(self, key: int, kind: str = "exact") -> Dict[int, List[int]]:
+        """Return dict of id(game) -> every ply (ascending) where a position key occurs.
+
+        Args:
+            key: Zobrist hash ("exact"), fuzzy hash ("fuzzy") or pawn structure key ("pawns").
+            kind: Which index to read.
+        """
+        index = {
+            "exact": self._position_index,
+            "fuzzy": self._position_index_fuzzy,
+            "pawns": self._position_index_pawns,
+        }.get(kind)
+        if index is None:
+            raise ValueError(f"Unknown position index kind: {kind}")
+        try:
+            h = int(key)
+        except Exception:
+            return {}
+        if not h:
+            return {}
+        self._ensure_position_index()
+        out: Dict[int, List[int]] = {}
+        # Each game's entries are appended in ply order
+        for gid, ply in index.get(h, []):
+            plies = out.get(gid)
+            if plies is None:
+                out[gid] = [ply]
             else:
-                self._position_index.pop(int(h), None)
+                plies.append(ply)
+        return out
 
-    def _position_index_remove_game_fuzzy(self, game: GameData) -> None:
-        gid = id(game)
-        entries = self._position_reverse_fuzzy.pop(gid, [])
+    def get_position_hashes_fuzzy(self, game: GameData) -> Optional[List[int]]:
+        """Return the indexed per-ply fuzzy hashes of a game's main line (index 0 = start).
+
+        Fuzzy hashes ignore castling rights and en passant, so they double as
+        opening-book keys (see OpeningService.get_final_eco_for_game). Returns
+        None if the game is not indexed.
+        """
+        pending = self._position_index_pending.pop(id(game), None)
+        if pending is not None:
+            self._position_index_add_game(*pending)
+        entries = self._position_reverse_fuzzy.get(id(game))
         if not entries:
-            return
+            return None
+        hashes: List[int] = []
+        for ply, (h, entry_ply) in enumerate(entries):
+            if entry_ply != ply:
+                return None
+            hashes.append(int(h))
+        return hashes
+
+    def _position_index_remove_game(self, game: GameData) -> None:
+        """Drop a game from all position indexes."""
+        gid = id(game)
+        self._unindex_position_entries(self._position_index, self._position_reverse.pop(gid, []), gid)
+        self._unindex_position_entries(self._position_index_fuzzy, self._position_reverse_fuzzy.pop(gid, []), gid)
+        self._unindex_position_entries(self._position_index_pawns, self._position_reverse_pawns.pop(gid, []), gid)
+
+    @staticmethod
+    def _unindex_position_entries(
+        index: Dict[int, List[Tuple[int, int]]], entries: List[Tuple[int, int]], gid: int
+    ) -> None:
         for h, ply in entries:
-            bucket = self._position_index_fuzzy.get(int(h))
+            bucket = index.get(int(h))
             if not bucket:
                 continue
+            # Remove all entries for this gid.
             bucket = [(g, p) for (g, p) in bucket if g != gid]
             if bucket:
-                self._position_index_fuzzy[int(h)] = bucket
+                index[int(h)] = bucket
             else:
-                self._position_index_fuzzy.pop(int(h), None)
+                index.pop(int(h), None)
 
     def _position_index_add_game(
         self,
         game: GameData,
         position_hashes: Optional[List[int]],
         position_hashes_fuzzy: Optional[List[int]],
+        position_pawn_keys: Optional[List[int]] = None,
     ) -> None:
-        # Ensure idempotent (e.g. reindexing).
+        # Ensure idempotent (e.g. reindexing); new hashes supersede a deferred entry.
+        self._position_index_pending.pop(id(game), None)
         self._position_index_remove_game(game)
-        self._position_index_remove_game_fuzzy(game)
         hashes = position_hashes
         hashes_fuzzy = position_hashes_fuzzy
+        pawn_keys = position_pawn_keys
         computed_from_pgn = False
-        if not hashes or not hashes_fuzzy:
+        if not hashes or not hashes_fuzzy or not pawn_keys:
             computed = self._compute_position_hashes_from_pgn(getattr(game, "pgn", "") or "")
             if computed:
                 computed_from_pgn = True
@@ -700,39 +794,118 @@ class DatabaseModel(QAbstractTableModel):
                     hashes = computed[0]
                 if not hashes_fuzzy:
                     hashes_fuzzy = computed[1]
+                if not pawn_keys:
+                    pawn_keys = computed[2]
         if not hashes:
             return
 
         gid = id(game)
-        rev: List[Tuple[int, int]] = []
-        for ply, h in enumerate(hashes):
-            try:
-                hh = int(h)
-            except Exception:
-                continue
-            if not hh:
-                continue
-            self._position_index.setdefault(hh, []).append((gid, int(ply)))
-            rev.append((hh, int(ply)))
+        rev = self._index_position_hashes(self._position_index, gid, hashes)
         if rev:
             self._position_reverse[gid] = rev
 
         if hashes_fuzzy:
-            revf: List[Tuple[int, int]] = []
-            for ply, h in enumerate(hashes_fuzzy):
+            revf = self._index_position_hashes(self._position_index_fuzzy, gid, hashes_fuzzy)
+            if revf:
+                self._position_reverse_fuzzy[gid] = revf
+
+        if pawn_keys:
+            revp = self._index_position_hashes(self._position_index_pawns, gid, pawn_keys)
+            if revp:
+                self._position_reverse_pawns[gid] = revp
+
+    @staticmethod
+    def _index_position_hashes(
+        index: Dict[int, List[Tuple[int, int]]], gid: int, hashes: List[int]
+    ) -> List[Tuple[int, int]]:
+        """Add one game's per-ply hashes to an index; return its (hash, ply) reverse entries."""
+        rev: List[Tuple[int, int]] = []
+        append = rev.append
+        bucket_for = index.get
+        for ply, h in enumerate(hashes):
+            if type(h) is not int:
                 try:
-                    hh = int(h)
+                    h = int(h)
                 except Exception:
                     continue
-                if not hh:
-                    continue
-                self._position_index_fuzzy.setdefault(hh, []).append((gid, int(ply)))
-                revf.append((hh, int(ply)))
-            if revf:
-                self._position_reverse_fuzzy[gid] = revf
+            if not h:
+                continue
+            entry = (gid, ply)
+            bucket = bucket_for(h)
+            if bucket is None:
+                index[h] = [entry]
+            else:
+                bucket.append(entry)
+            append((h, ply))
+        return rev
 
-    def _compute_position_hashes_from_pgn(self, pgn_text: str) -> Optional[Tuple[List[int], List[int]]]:
-        """Compute per-ply Zobrist hashes from a PGN main line.
+    def ensure_position_index(self) -> None:
+        """Index batch-added games still pending now, keeping the progress UI responsive.
+
+        Call on the GUI thread before searching from a worker thread: the worker
+        then only reads the index, which the GUI thread changes on edits. UI events
+        are pumped between chunks, so the model may change meanwhile; removed or
+        reindexed games drop out of the pending set and are skipped.
+        """
+        if self._position_index_pumping:
+            # Called again from a pumped event: finish the remaining games without nesting
+            self._ensure_position_index()
+            return
+        self._position_index_pumping = True
+        try:
+            self._ensure_position_index(pump_events=True)
+        finally:
+            self._position_index_pumping = False
+
+    def _ensure_position_index(self, pump_events: bool = False) -> None:
+        """Index all batch-added games still pending, in chunks.
+
+        Lookups call this with pump_events False: they may run on a worker thread or
+        in the middle of a caller's iteration, where processing UI events is unsafe.
+        """
+        pending = self._position_index_pending
+        if not pending:
+            return
+        total = len(pending)
+        start_ts = time.perf_counter()
+        try:
+            from app.services.logging_service import LoggingService
+            LoggingService.get_instance().debug(
+                "Position search index: start indexing deferred games "
+                f"games_pending={total}"
+            )
+        except Exception:
+            pass
+        # Pop per game: rows removed or reindexed while events are pumped drop out of pending.
+        gids = list(pending)
+        chunk = self.POSITION_INDEX_CHUNK
+        for start in range(0, total, chunk):
+            for gid in gids[start:start + chunk]:
+                entry = pending.pop(gid, None)
+                if entry is not None:
+                    self._position_index_add_game(*entry)
+            if not pending:
+                break
+            if pump_events and start + chunk < total:
+                try:
+                    from app.services.bulk_operation_stats import pump_bulk_ui_events
+
+                    pump_bulk_ui_events()
+                except Exception:
+                    pass
+        elapsed_ms = int((time.perf_counter() - start_ts) * 1000)
+        try:
+            from app.services.logging_service import LoggingService
+            LoggingService.get_instance().debug(
+                "Position search index: completed indexing deferred games "
+                f"games_indexed={total} "
+                f"elapsed_ms={elapsed_ms}"
+            )
+        except Exception:
+            pass
+
+    def _compute_position_hashes_from_pgn(self, pgn_text: str) -> Optional[Tuple[List[int], List[int], List[int]]]:
+        """Compute per-ply Zobrist hashes, fuzzy hashes and pawn structure keys from a PGN main line.
 
         Used as a fallback when hashes were not provided by the PGN loader.
         """
@@ -741,6 +914,7 @@ class DatabaseModel(QAbstractTableModel):
             import chess.pgn
             from io import StringIO
             from chess.polyglot import zobrist_hash
+            from app.utils.position_keys import pawn_structure_key
 
             if not pgn_text or not str(pgn_text).strip():
                 return None
@@ -750,6 +924,7 @@ class DatabaseModel(QAbstractTableModel):
                 return None
             board = g.board()
             hashes: List[int] = [int(zobrist_hash(board))]
+            pawn_keys: List[int] = [pawn_structure_key(board)]
             # fuzzy: ignore castling/ep
             cr0 = getattr(board, "castling_rights", 0)
             ep0 = getattr(board, "ep_square", None)
@@ -765,6 +940,7 @@ class DatabaseModel(QAbstractTableModel):
                 node = node.variation(0)
                 board.push(node.move)
                 hashes.append(int(zobrist_hash(board)))
+                pawn_keys.append(pawn_structure_key(board))
                 cr0 = getattr(board, "castling_rights", 0)
                 ep0 = getattr(board, "ep_square", None)
                 try:
@@ -774,7 +950,7 @@ class DatabaseModel(QAbstractTableModel):
                 finally:
                     board.castling_rights = cr0
                     board.ep_square = ep0
-            return (hashes, hashes_fuzzy)
+            return (hashes, hashes_fuzzy, pawn_keys)
         except Exception:
             return None
     
@@ -813,24 +989,11 @@ class DatabaseModel(QAbstractTableModel):
         
         # Reorder: highlighted games first, then others
         self._games = highlighted + others
+        self._row_index = None
         
         # Note: game_number is NOT updated - it always reflects the original assignment
         
-        # Map old persistent indexes to new positions
-        new_persistent_indexes = []
-        for old_index, game in persistent_games:
-            if game is not None:
-                new_row = self.find_game(game)
-                if new_row is not None:
-                    new_index = self.index(new_row, old_index.column())
-                    new_persistent_indexes.append(new_index)
-                else:
-                    new_persistent_indexes.append(QModelIndex())
-            else:
-                new_persistent_indexes.append(QModelIndex())
-        
-        # Update persistent indexes
-        self.changePersistentIndexList(old_persistent_indexes, new_persistent_indexes)
+        self._remap_persistent_indexes(old_persistent_indexes, persistent_games)
         
         # Notify views that layout has changed
         self.layoutChanged.emit()
@@ -950,9 +1113,10 @@ class DatabaseModel(QAbstractTableModel):
             import chess.pgn
             from io import StringIO
             pgn_io = StringIO(game.pgn)
-            chess_game = chess.pgn.read_game(pgn_io)
-            if chess_game and chess_game.headers:
-                return set(chess_game.headers.keys())
+            # Headers only: skips parsing the movetext
+            headers = chess.pgn.read_headers(pgn_io)
+            if headers:
+                return set(headers.keys())
         except Exception:
             pass
         
@@ -1053,10 +1217,12 @@ class DatabaseModel(QAbstractTableModel):
         Returns:
             Row index if found, None otherwise.
         """
-        try:
-            return self._games.index(game)
-        except ValueError:
-            return None
+        if self._row_index is None:
+            self._row_index = {id(g): row for row, g in enumerate(self._games)}
+        row = self._row_index.get(id(game))
+        if row is not None and row < len(self._games) and self._games[row] is game:
+            return row
+        return None
     
     def update_game(self, game: 'GameData', *, reindex_positions: bool = True) -> bool:
         """Update a game in the model and notify views.
@@ -1326,75 +1492,9 @@ class DatabaseModel(QAbstractTableModel):
         if column == self.COL_UNSAVED or column == self.COL_FILE_NUM:
             return
         
-        # Define key extraction function for each column type
-        def get_sort_key(game: GameData) -> Any:
-            """Extract sort key value from a game for the current column.
-            
-            Returns:
-                Sort key value appropriate for the column type.
-            """
-            if column == self.COL_NUM:
-                # Sort by game_number (the value displayed in "#" column)
-                # This sorts by the actual game number, whether from file_position or incremental
-                return game.game_number
-            elif column == self.COL_FILE_NUM:
-                # Sort by file position (use tuple to ensure None sorts last)
-                # Return (0, position) for file games, (1, 0) for non-file games
-                # This ensures file games sort first, then non-file games
-                if game.file_position > 0:
-                    return (0, game.file_position)
-                else:
-                    return (1, 0)
-            elif column == self.COL_WHITE:
-                return game.white or ""
-            elif column == self.COL_BLACK:
-                return game.black or ""
-            elif column == self.COL_WHITE_ELO:
-                # Parse as integer, treat empty as 0
-                try:
-                    return int(game.white_elo) if game.white_elo else 0
-                except (ValueError, TypeError):
-                    return 0
-            elif column == self.COL_BLACK_ELO:
-                # Parse as integer, treat empty as 0
-                try:
-                    return int(game.black_elo) if game.black_elo else 0
-                except (ValueError, TypeError):
-                    return 0
-            elif column == self.COL_RESULT:
-                return game.result or ""
-            elif column == self.COL_DATE:
-                # Parse dates for proper chronological sorting
-                return self._parse_date_for_sort(game.date)
-            elif column == self.COL_EVENT:
-                return game.event or ""
-            elif column == self.COL_SITE:
-                return game.site or ""
-            elif column == self.COL_MOVES:
-                return game.moves
-            elif column == self.COL_ECO:
-                return game.eco or ""
-            elif column == self.COL_TIMECONTROL:
-                return getattr(game, "time_control", "") or ""
-            elif column == self.COL_TC_TYPE:
-                tc = getattr(game, "time_control", "") or ""
-                return get_tc_type(tc, (self._config.get("ui") or {}).get("panels", {}).get("database", {}).get("tc_type"))
-            elif column == self.COL_ANALYZED:
-                return game.analyzed
-            elif column == self.COL_ANNOTATED:
-                return getattr(game, "annotated", False)
-            elif column == self.COL_NOTES:
-                return getattr(game, "has_notes", False)
-            elif column == self.COL_SOURCE_DB:
-                return game.source_database or ""
-            elif column == self.COL_REF_PLY:
-                return getattr(game, "ref_ply", 0)
-            elif column == self.COL_TAGS:
-                return getattr(game, "game_tags", "") or ""
-            elif column == self.COL_PGN:
-                return game.pgn or ""
-            else:
-                return None
+        keys = self._sort_key_values(column)
+        if keys is None:
+            return
         
         # Notify views that layout is about to change
         self.layoutAboutToBeChanged.emit()
@@ -1408,31 +1508,18 @@ class DatabaseModel(QAbstractTableModel):
             else:
                 persistent_games.append((old_index, None))
         
-        # Sort the games list using key function
-        # Use reverse=True for descending order
+        # Stable argsort over the key list (same order as list.sort(key=..., reverse=...));
+        # an already ordered list costs one linear pass
         reverse = (order == Qt.SortOrder.DescendingOrder)
-        self._games.sort(key=get_sort_key, reverse=reverse)
+        games = self._games
+        permutation = sorted(range(len(games)), key=keys.__getitem__, reverse=reverse)
+        self._games = [games[i] for i in permutation]
+        self._row_index = None
         
         # Note: game_number is NOT updated during sorting - it always reflects
         # the original assignment (file_position when loaded, or incremental when pasted/imported)
         
-        # Map old persistent indexes to new positions based on game objects
-        new_persistent_indexes = []
-        for old_index, game in persistent_games:
-            if old_index.isValid() and game is not None:
-                # Find the new row position of this game after sorting
-                try:
-                    new_row = self._games.index(game)
-                    new_index = self.index(new_row, old_index.column(), old_index.parent())
-                    new_persistent_indexes.append(new_index)
-                except ValueError:
-                    # Game not found (shouldn't happen, but handle gracefully)
-                    new_persistent_indexes.append(QModelIndex())
-            else:
-                new_persistent_indexes.append(QModelIndex())
-        
-        # Update persistent indexes
-        self.changePersistentIndexList(old_persistent_indexes, new_persistent_indexes)
+        self._remap_persistent_indexes(old_persistent_indexes, persistent_games)
         
         # Notify views that layout has changed
         self.layoutChanged.emit()
@@ -1444,6 +1531,66 @@ class DatabaseModel(QAbstractTableModel):
             bottom_right = self.index(len(self._games) - 1, self.columnCount() - 1)
             self.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.DisplayRole])
     
+    def _sort_key_values(self, column: int) -> Optional[List[Any]]:
+        """Return the sort key of every row for a column, or None if the column is not sortable."""
+        games = self._games
+        if self._sort_keys.handles(column):
+            return self._sort_keys.keys_for(column, games)
+        if column == self.COL_NUM:
+            # Sort by game_number (the value displayed in "#" column)
+            return [game.game_number for game in games]
+        if column == self.COL_MOVES:
+            return [game.moves for game in games]
+        if column == self.COL_ANALYZED:
+            return [game.analyzed for game in games]
+        if column == self.COL_REF_PLY:
+            return [getattr(game, "ref_ply", 0) for game in games]
+        if column in (self.COL_ANNOTATED, self.COL_NOTES):
+            attr = "annotated" if column == self.COL_ANNOTATED else "has_notes"
+            return [getattr(game, attr, False) for game in games]
+        text_attrs = {
+            self.COL_WHITE: "white",
+            self.COL_BLACK: "black",
+            self.COL_RESULT: "result",
+            self.COL_EVENT: "event",
+            self.COL_SITE: "site",
+            self.COL_ECO: "eco",
+            self.COL_TIMECONTROL: "time_control",
+            self.COL_SOURCE_DB: "source_database",
+            self.COL_TAGS: "game_tags",
+            self.COL_PGN: "pgn",
+        }
+        attr = text_attrs.get(column)
+        if attr is None:
+            return None
+        return [getattr(game, attr, "") or "" for game in games]
+    
+    def _remap_persistent_indexes(
+        self,
+        old_persistent_indexes: List[QModelIndex],
+        persistent_games: List[Tuple[QModelIndex, Optional[GameData]]],
+    ) -> None:
+        """Point persistent indexes (selection, current row) at their games' new rows."""
+        new_persistent_indexes = []
+        for old_index, game in persistent_games:
+            new_row = self.find_game(game) if old_index.isValid() and game is not None else None
+            if new_row is not None:
+                new_persistent_indexes.append(self.index(new_row, old_index.column(), old_index.parent()))
+            else:
+                new_persistent_indexes.append(QModelIndex())
+        self.changePersistentIndexList(old_persistent_indexes, new_persistent_indexes)
+    
+    @staticmethod
+    def _elo_sort_key(elo: str) -> int:
+        # Parse as integer, treat empty as 0
+        try:
+            return int(elo) if elo else 0
+        except (ValueError, TypeError):
+            return 0
+    
+    def _tc_type_sort_key(self, time_control: str) -> Any:
+        return get_tc_type(time_control or "", (self._config.get("ui") or {}).get("panels", {}).get("database", {}).get("tc_type"))
+    
     def _parse_date_for_sort(self, date_str: str) -> tuple:
         """Parse a date string for sorting purposes.
         
@@ -0,0 +1,62 @@
+"""Typed per-game sort keys for DatabaseModel columns (no Qt)."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# (source value getter, source value -> typed sort key)
+SortKeySpec = Tuple[Callable[[Any], Any], Callable[[Any], Any]]
+
+
+class DatabaseSortKeys:
+    """Sort keys for derived columns (dates, Elo, time-control type), kept per game.
+
+    Each entry remembers the source value it was computed from, so a key is
+    recomputed only when that game's field actually changed, whether or not the
+    edit went through the model. Columns without a converter sort on the raw
+    field and are not cached.
+    """
+
+    def __init__(self, specs: Dict[int, SortKeySpec]) -> None:
+        """Initialize with the derived columns.
+
+        Args:
+            specs: Column -> (getter, converter); the converter must be a pure function
+                of the getter's value.
+        """
+        self._specs = specs
+        # column -> id(game) -> (source value, key)
+        self._keys: Dict[int, Dict[int, Tuple[Any, Any]]] = {column: {} for column in specs}
+
+    def handles(self, column: int) -> bool:
+        return column in self._specs
+
+    def keys_for(self, column: int, games: Sequence[Any]) -> List[Any]:
+        """Return the sort key of every game (in order) for a derived column."""
+        getter, convert = self._specs[column]
+        cache = self._keys[column]
+        cached = cache.get
+        keys: List[Any] = []
+        append = keys.append
+        for game, value in zip(games, map(getter, games)):
+            entry = cached(id(game))
+            if entry is None or entry[0] != value:
+                entry = (value, convert(value))
+                cache[id(game)] = entry
+            append(entry[1])
+        return keys
+
+    def discard(self, games: Sequence[Any]) -> None:
+        """Forget removed games."""
+        for cache in self._keys.values():
+            for game in games:
+                cache.pop(id(game), None)
+
+    def invalidate_column(self, column: int) -> None:
+        """Drop a column's keys (its converter's inputs changed, e.g. config)."""
+        if column in self._keys:
+            self._keys[column].clear()
+
+    def clear(self) -> None:
+        for cache in self._keys.values():
+            cache.clear()
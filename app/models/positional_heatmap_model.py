@@ -37,28 +37,9 @@ class PositionalHeatmapModel(QObject):
         Args:
             board: Current chess position.
         """
-        # Analyze from both perspectives to get scores for all pieces
-        # First analyze from White's perspective
-        white_scores = self.analyzer.analyze_position(board, chess.WHITE)
-        # Then analyze from Black's perspective
-        black_scores = self.analyzer.analyze_position(board, chess.BLACK)
-        
-        # Combine scores: use White perspective for White pieces, Black perspective for Black pieces
-        combined_scores = {}
-        
-        # Add White piece scores (from White's perspective)
-        for square, score in white_scores.items():
-            piece = board.piece_at(square)
-            if piece and piece.color == chess.WHITE:
-                combined_scores[square] = score
-        
-        # Add Black piece scores (from Black's perspective)
-        for square, score in black_scores.items():
-            piece = board.piece_at(square)
-            if piece and piece.color == chess.BLACK:
-                combined_scores[square] = score
-        
-        self._scores = combined_scores
+        # Analyze from both perspectives: White pieces scored from White's
+        # perspective, Black pieces from Black's (cache hits after precompute)
+        self._scores = self.analyzer.analyze_board(board)
         self.scores_changed.emit(self._scores)
     
     def get_scores(self) -> Dict[chess.Square, float]:
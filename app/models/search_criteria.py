@@ -24,6 +24,8 @@ class SearchField(Enum):
     CUSTOM_TAG = "custom_tag"  # For PGN tags not in standard columns
     POSITION = "position"  # Exact position match (zobrist hash)
     POSITION_FUZZY = "position_fuzzy"  # Position match ignoring castling + en-passant
+    PAWN_STRUCTURE = "pawn_structure"  # Same pawns on the same squares, same side to move
+    POSITION_SEQUENCE = "position_sequence"  # Exact positions in order, within ply limits
 
 
 class SearchOperator(Enum):
@@ -1,7 +1,7 @@
-"""Service for storing and loading game analysis results in PGN tags."""
+"""Service for storing and loading game analysis results in PGN tags or the sidecar store."""
 
 import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 from io import StringIO
 from datetime import datetime
 
@@ -11,9 +11,20 @@ from app.models.moveslist_model import MoveData
 from app.services.pgn_service import PgnService
 from app.models.database_model import GameData
 from app.services.logging_service import LoggingService
+from app.services.analysis_sidecar_store import (
+    AnalysisSidecarStore,
+    analysis_game_key,
+    decode_segment,
+    segment_checksum,
+)
+from app.utils.pgn_header_utils import read_header_tag_values
+from app.services.analysis_payload_codec import decode_moves, encode_moves, is_binary_moves
 from app.utils.pgn_tag_compression import (
-    decode_and_decompress_to_str,
-    compress_and_encode_from_str,
+    PayloadCodecUnavailableError,
+    decode_payload,
+    decode_payloads,
+    encode_payload,
+    encode_payloads,
     compute_checksum,
 )
 
@@ -75,6 +86,15 @@ class AnalysisDataStorageService:
     in a custom PGN tag [CARAAnalysisData "..."] for persistence across sessions.
     Also stores [CARAAnalysisInfo "..."] with app version and datetime, and
     [CARAAnalysisChecksum "..."] for data integrity validation.
+
+    The tag payload is the compact column encoding of analysis_payload_codec
+    (or JSON when pgn.tag_payload.binary_analysis is off), compressed with the
+    configured pgn_tag_compression codec. JSON payloads from older versions are
+    still read.
+
+    When the sidecar store is enabled (game_analysis.analysis_store.sidecar_enabled),
+    analysis is also written to AnalysisSidecarStore and read from there first; the
+    PGN tag is then only embedded if game_analysis.analysis_store.embed_pgn_tag is set.
     """
     
     TAG_NAME = "CARAAnalysisData"
@@ -89,12 +109,16 @@ class AnalysisDataStorageService:
             game: GameData instance to check.
             
         Returns:
-            True if CARAAnalysisData tag exists, False otherwise.
+            True if the sidecar store or a CARAAnalysisData tag has analysis, False otherwise.
         """
         # Check if game is None or has no PGN
         if game is None or not hasattr(game, 'pgn') or game.pgn is None:
             return False
         
+        store = AnalysisSidecarStore.active()
+        if store is not None and analysis_game_key(game.pgn) in store:
+            return True
+        
         try:
             # Parse PGN to check for tag
             pgn_io = StringIO(game.pgn)
@@ -117,12 +141,19 @@ class AnalysisDataStorageService:
             game: GameData instance to read from.
             
         Returns:
-            Decompressed JSON string if tag exists and is valid, None otherwise.
+            Decompressed JSON string if tag exists and is valid (or the same JSON
+            built from the sidecar store), None otherwise.
         """
         # Check if game is None or has no PGN
         if game is None or not hasattr(game, 'pgn') or game.pgn is None:
             return None
         
+        store = AnalysisSidecarStore.active()
+        if store is not None:
+            stored_moves = store.get(analysis_game_key(game.pgn))
+            if stored_moves is not None:
+                return AnalysisDataStorageService._moves_to_json(stored_moves)
+        
         try:
             # Parse PGN to read tag
             pgn_io = StringIO(game.pgn)
@@ -136,80 +167,44 @@ class AnalysisDataStorageService:
                 return None
             
             encoded = chess_game.headers[AnalysisDataStorageService.TAG_NAME]
-            json_str = decode_and_decompress_to_str(encoded)
-            return json_str
+            payload = decode_payload(encoded)
+            if is_binary_moves(payload):
+                return AnalysisDataStorageService._moves_to_json(decode_moves(payload))
+            return payload.decode("utf-8")
         except Exception:
             # On any error, return None
             return None
     
     @staticmethod
     def store_analysis_data(game: GameData, moves: List[MoveData], config: Optional[Dict[str, Any]] = None) -> bool:
-        """Store analysis data in PGN tag.
+        """Store analysis data in the sidecar store (if enabled) and/or the PGN tag.
         
         Args:
             game: GameData instance to update.
             moves: List of MoveData instances to store.
-            config: Optional configuration dictionary to get app version.
+            config: Optional configuration dictionary to get app version and
+                the analysis_store embed_pgn_tag setting.
             
         Returns:
             True if storage was successful, False otherwise.
         """
         try:
-            # Serialize moves to JSON
-            moves_data = []
-            for move in moves:
-                move_dict = {
-                    "move_number": move.move_number,
-                    "white_move": move.white_move,
-                    "black_move": move.black_move,
-                    "eval_white": move.eval_white,
-                    "eval_black": move.eval_black,
-                    "cpl_white": move.cpl_white,
-                    "cpl_black": move.cpl_black,
-                    "cpl_white_2": move.cpl_white_2,
-                    "cpl_white_3": move.cpl_white_3,
-                    "cpl_black_2": move.cpl_black_2,
-                    "cpl_black_3": move.cpl_black_3,
-                    "assess_white": move.assess_white,
-                    "assess_black": move.assess_black,
-                    "best_white": move.best_white,
-                    "best_black": move.best_black,
-                    "best_white_2": move.best_white_2,
-                    "best_white_3": move.best_white_3,
-                    "best_black_2": move.best_black_2,
-                    "best_black_3": move.best_black_3,
-                    "white_is_top3": move.white_is_top3,
-                    "black_is_top3": move.black_is_top3,
-                    "white_depth": move.white_depth,
-                    "black_depth": move.black_depth,
-                    "white_seldepth": move.white_seldepth,
-                    "black_seldepth": move.black_seldepth,
-                    "eco": move.eco,
-                    "opening_name": move.opening_name,
-                    "comment": move.comment,
-                    "white_capture": move.white_capture,
-                    "black_capture": move.black_capture,
-                    "white_material": move.white_material,
-                    "black_material": move.black_material,
-                    "white_queens": move.white_queens,
-                    "white_rooks": move.white_rooks,
-                    "white_bishops": move.white_bishops,
-                    "white_knights": move.white_knights,
-                    "white_pawns": move.white_pawns,
-                    "black_queens": move.black_queens,
-                    "black_rooks": move.black_rooks,
-                    "black_bishops": move.black_bishops,
-                    "black_knights": move.black_knights,
-                    "black_pawns": move.black_pawns,
-                    "fen_white": move.fen_white,
-                    "fen_black": move.fen_black
-                }
-                moves_data.append(move_dict)
-            
-            json_str = json.dumps(moves_data, ensure_ascii=False)
-            data_bytes = json_str.encode("utf-8")
+            store = AnalysisSidecarStore.active()
+            if store is not None:
+                try:
+                    store.put(analysis_game_key(game.pgn), moves)
+                except OSError as e:
+                    LoggingService.get_instance().error(f"Error writing analysis store: {e}", exc_info=e)
+                    store = None
+            if store is not None and not AnalysisDataStorageService._embed_pgn_tag(config):
+                # Sidecar only: drop any stale tag so the two copies cannot disagree
+                AnalysisDataStorageService._remove_analysis_tags(game)
+                game.analyzed = True
+                return True
+
+            data_bytes = AnalysisDataStorageService._moves_to_payload(moves, config)
             checksum = compute_checksum(data_bytes)
-            encoded = compress_and_encode_from_str(json_str, compresslevel=9)
+            encoded = encode_payload(data_bytes)
             
             # Get app version from config
             app_version = config.get('version', '1.0') if config else '1.0'
@@ -245,7 +240,7 @@ class AnalysisDataStorageService:
                 "Wrote CARAAnalysisData tag: "
                 f"game_number={getattr(game, 'game_number', None)} "
                 f"moves={len(moves)} "
-                f"json_bytes={len(data_bytes)} "
+                f"payload_bytes={len(data_bytes)} "
                 f"encoded_len={len(encoded)} "
                 f"checksum={checksum} "
                 f"info={info_str!r}"
@@ -261,7 +256,9 @@ class AnalysisDataStorageService:
     
     @staticmethod
     def load_analysis_data(game: GameData) -> Optional[List[MoveData]]:
-        """Load analysis data from PGN tag.
+        """Load analysis data from the sidecar store, else from the PGN tag.
+
+        Loading never writes the sidecar store; it is only filled by store_analysis_data.
         
         Args:
             game: GameData instance to read from.
@@ -274,6 +271,12 @@ class AnalysisDataStorageService:
         if game is None or not hasattr(game, 'pgn') or game.pgn is None:
             return None
         
+        store = AnalysisSidecarStore.active()
+        if store is not None:
+            stored_moves = store.get(analysis_game_key(game.pgn))
+            if stored_moves is not None:
+                return stored_moves
+        
         try:
             # Parse PGN to read tag
             pgn_io = StringIO(game.pgn)
@@ -288,14 +291,17 @@ class AnalysisDataStorageService:
             
             encoded = chess_game.headers[AnalysisDataStorageService.TAG_NAME]
             try:
-                json_str = decode_and_decompress_to_str(encoded)
+                payload = decode_payload(encoded)
+            except PayloadCodecUnavailableError:
+                # Written elsewhere with a codec not installed here; keep the tag.
+                raise
             except ValueError:
                 AnalysisDataStorageService._remove_corrupted_analysis_tags(game)
                 raise
             
             if AnalysisDataStorageService.TAG_CHECKSUM in chess_game.headers:
                 stored_checksum = chess_game.headers[AnalysisDataStorageService.TAG_CHECKSUM]
-                calculated_checksum = compute_checksum(json_str.encode("utf-8"))
+                calculated_checksum = compute_checksum(payload)
                 
                 if stored_checksum != calculated_checksum:
                     # Checksum mismatch - data may be corrupted
@@ -305,61 +311,7 @@ class AnalysisDataStorageService:
                     logging_service.warning(f"Analysis data checksum mismatch. Stored: {stored_checksum[:16]}..., Calculated: {calculated_checksum[:16]}...")
                     return None
             
-            # Deserialize JSON
-            moves_data = json.loads(json_str)
-            
-            # Convert to MoveData instances
-            moves = []
-            for move_dict in moves_data:
-                move = MoveData(
-                    move_number=move_dict.get("move_number", 0),
-                    white_move=move_dict.get("white_move", ""),
-                    black_move=move_dict.get("black_move", ""),
-                    eval_white=move_dict.get("eval_white", ""),
-                    eval_black=move_dict.get("eval_black", ""),
-                    cpl_white=move_dict.get("cpl_white", ""),
-                    cpl_black=move_dict.get("cpl_black", ""),
-                    cpl_white_2=move_dict.get("cpl_white_2", ""),
-                    cpl_white_3=move_dict.get("cpl_white_3", ""),
-                    cpl_black_2=move_dict.get("cpl_black_2", ""),
-                    cpl_black_3=move_dict.get("cpl_black_3", ""),
-                    assess_white=move_dict.get("assess_white", ""),
-                    assess_black=move_dict.get("assess_black", ""),
-                    best_white=move_dict.get("best_white", ""),
-                    best_black=move_dict.get("best_black", ""),
-                    best_white_2=move_dict.get("best_white_2", ""),
-                    best_white_3=move_dict.get("best_white_3", ""),
-                    best_black_2=move_dict.get("best_black_2", ""),
-                    best_black_3=move_dict.get("best_black_3", ""),
-                    white_is_top3=move_dict.get("white_is_top3", False),
-                    black_is_top3=move_dict.get("black_is_top3", False),
-                    white_depth=move_dict.get("white_depth", 0),
-                    black_depth=move_dict.get("black_depth", 0),
-                    white_seldepth=move_dict.get("white_seldepth", 0),
-                    black_seldepth=move_dict.get("black_seldepth", 0),
-                    eco=move_dict.get("eco", ""),
-                    opening_name=move_dict.get("opening_name", ""),
-                    comment=move_dict.get("comment", ""),
-                    white_capture=move_dict.get("white_capture", ""),
-                    black_capture=move_dict.get("black_capture", ""),
-                    white_material=move_dict.get("white_material", 0),
-                    black_material=move_dict.get("black_material", 0),
-                    white_queens=move_dict.get("white_queens", 0),
-                    white_rooks=move_dict.get("white_rooks", 0),
-                    white_bishops=move_dict.get("white_bishops", 0),
-                    white_knights=move_dict.get("white_knights", 0),
-                    white_pawns=move_dict.get("white_pawns", 0),
-                    black_queens=move_dict.get("black_queens", 0),
-                    black_rooks=move_dict.get("black_rooks", 0),
-                    black_bishops=move_dict.get("black_bishops", 0),
-                    black_knights=move_dict.get("black_knights", 0),
-                    black_pawns=move_dict.get("black_pawns", 0),
-                    fen_white=move_dict.get("fen_white", ""),
-                    fen_black=move_dict.get("fen_black", "")
-                )
-                moves.append(move)
-            
-            return moves
+            return AnalysisDataStorageService._moves_from_payload(payload)
         except ValueError as e:
             # Re-raise ValueError (decompression errors) so controller can handle them
             raise
@@ -369,6 +321,305 @@ class AnalysisDataStorageService:
             logging_service.error(f"Error loading analysis data: {e}", exc_info=e)
             return None
     
+    @staticmethod
+    def read_analysis_payload(pgn_text: str) -> Optional[Tuple[Union[str, bytes], Optional[str]]]:
+        """Read the raw analysis payload and checksum for one game.
+
+        With the sidecar store enabled, the game's store segment (bytes) is returned
+        if present; otherwise the CARAAnalysisData tag value from the PGN headers.
+        Neither path parses the game, so this is cheap enough to run on the calling
+        thread before handing the payload to a worker process.
+
+        Args:
+            pgn_text: Full PGN text of one game.
+
+        Returns:
+            Tuple of (payload, checksum or None), or None if there is no stored analysis.
+        """
+        store = AnalysisSidecarStore.active()
+        if store is not None:
+            segment = store.get_segment(analysis_game_key(pgn_text or ""))
+            if segment is not None:
+                return segment, segment_checksum(segment)
+        tags = read_header_tag_values(
+            pgn_text or "",
+            (AnalysisDataStorageService.TAG_NAME, AnalysisDataStorageService.TAG_CHECKSUM),
+        )
+        encoded = tags.get(AnalysisDataStorageService.TAG_NAME)
+        if not encoded:
+            return None
+        return encoded, tags.get(AnalysisDataStorageService.TAG_CHECKSUM)
+
+    @staticmethod
+    def decode_analysis_payload(encoded: Union[str, bytes], checksum: Optional[str] = None) -> Optional[List[MoveData]]:
+        """Decode a payload from read_analysis_payload without touching the surrounding PGN.
+
+        Args:
+            encoded: Tag value as stored in the PGN header, or a sidecar store segment.
+            checksum: Optional CARAAnalysisChecksum (or segment checksum) to validate against.
+
+        Returns:
+            List of MoveData instances, or None if the checksum does not match.
+
+        Raises:
+            ValueError: If decoding or decompression fails.
+        """
+        if isinstance(encoded, (bytes, bytearray)):
+            if checksum is not None and checksum != segment_checksum(encoded):
+                return None
+            return decode_segment(encoded)
+        payload = decode_payload(encoded)
+        if checksum is not None and checksum != compute_checksum(payload):
+            return None
+        return AnalysisDataStorageService._moves_from_payload(payload)
+
+    @staticmethod
+    def encode_analysis_payloads(
+        moves_lists: List[List[MoveData]], config: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, str]]:
+        """Build CARAAnalysisData values for many games at once (thread-safe, no Qt).
+
+        Args:
+            moves_lists: Analysis rows per game.
+            config: Optional configuration dictionary (pgn.tag_payload settings).
+
+        Returns:
+            (tag value, checksum) per game, in input order.
+        """
+        payloads = [AnalysisDataStorageService._moves_to_payload(moves, config) for moves in moves_lists]
+        return list(zip(encode_payloads(payloads), (compute_checksum(p) for p in payloads)))
+
+    @staticmethod
+    def decode_analysis_payloads(
+        payloads: List[Tuple[str, Optional[str]]]
+    ) -> List[Optional[List[MoveData]]]:
+        """Decode many CARAAnalysisData values (thread-safe, no Qt).
+
+        Args:
+            payloads: (tag value, checksum or None) per game.
+
+        Returns:
+            MoveData rows per game, or None where decoding or the checksum fails.
+        """
+        results: List[Optional[List[MoveData]]] = []
+        decoded = decode_payloads(encoded for encoded, _ in payloads)
+        for payload, (_, checksum) in zip(decoded, payloads):
+            if payload is None or (checksum is not None and checksum != compute_checksum(payload)):
+                results.append(None)
+                continue
+            try:
+                results.append(AnalysisDataStorageService._moves_from_payload(payload))
+            except ValueError:
+                results.append(None)
+        return results
+
+    @staticmethod
+    def _moves_to_payload(moves: List[MoveData], config: Optional[Dict[str, Any]] = None) -> bytes:
+        """Uncompressed tag payload: binary columns, or JSON if binary_analysis is disabled."""
+        settings = ((config or {}).get("pgn") or {}).get("tag_payload") or {}
+        if settings.get("binary_analysis", True):
+            try:
+                return encode_moves(moves)
+            except ValueError:
+                pass  # Text the binary layout cannot hold: JSON is lossless
+        return AnalysisDataStorageService._moves_to_json(moves).encode("utf-8")
+
+    @staticmethod
+    def _moves_from_payload(payload: bytes) -> List[MoveData]:
+        """Decode an uncompressed tag payload of either kind (see _moves_to_payload)."""
+        if is_binary_moves(payload):
+            return decode_moves(payload)
+        return AnalysisDataStorageService._moves_from_json(payload.decode("utf-8"))
+
+    @staticmethod
+    def _moves_to_json(moves: List[MoveData]) -> str:
+        """Serialize MoveData rows to the JSON array stored in CARAAnalysisData."""
+        moves_data = []
+        for move in moves:
+            move_dict = {
+                "move_number": move.move_number,
+                "white_move": move.white_move,
+                "black_move": move.black_move,
+                "eval_white": move.eval_white,
+                "eval_black": move.eval_black,
+                "cpl_white": move.cpl_white,
+                "cpl_black": move.cpl_black,
+                "cpl_white_2": move.cpl_white_2,
+                "cpl_white_3": move.cpl_white_3,
+                "cpl_black_2": move.cpl_black_2,
+                "cpl_black_3": move.cpl_black_3,
+                "assess_white": move.assess_white,
+                "assess_black": move.assess_black,
+                "best_white": move.best_white,
+                "best_black": move.best_black,
+                "best_white_2": move.best_white_2,
+                "best_white_3": move.best_white_3,
+                "best_black_2": move.best_black_2,
+                "best_black_3": move.best_black_3,
+                "white_is_top3": move.white_is_top3,
+                "black_is_top3": move.black_is_top3,
+                "white_depth": move.white_depth,
+                "black_depth": move.black_depth,
+                "white_seldepth": move.white_seldepth,
+                "black_seldepth": move.black_seldepth,
+                "eco": move.eco,
+                "opening_name": move.opening_name,
+                "comment": move.comment,
+                "white_capture": move.white_capture,
+                "black_capture": move.black_capture,
+                "white_material": move.white_material,
+                "black_material": move.black_material,
+                "white_queens": move.white_queens,
+                "white_rooks": move.white_rooks,
+                "white_bishops": move.white_bishops,
+                "white_knights": move.white_knights,
+                "white_pawns": move.white_pawns,
+                "black_queens": move.black_queens,
+                "black_rooks": move.black_rooks,
+                "black_bishops": move.black_bishops,
+                "black_knights": move.black_knights,
+                "black_pawns": move.black_pawns,
+                "fen_white": move.fen_white,
+                "fen_black": move.fen_black
+            }
+            moves_data.append(move_dict)
+        return json.dumps(moves_data, ensure_ascii=False)
+
+    @staticmethod
+    def _moves_from_json(json_str: str) -> List[MoveData]:
+        """Convert the stored JSON array back into MoveData instances."""
+        moves_data = json.loads(json_str)
+        
+        # Convert to MoveData instances
+        moves = []
+        for move_dict in moves_data:
+            move = MoveData(
+                move_number=move_dict.get("move_number", 0),
+                white_move=move_dict.get("white_move", ""),
+                black_move=move_dict.get("black_move", ""),
+                eval_white=move_dict.get("eval_white", ""),
+                eval_black=move_dict.get("eval_black", ""),
+                cpl_white=move_dict.get("cpl_white", ""),
+                cpl_black=move_dict.get("cpl_black", ""),
+                cpl_white_2=move_dict.get("cpl_white_2", ""),
+                cpl_white_3=move_dict.get("cpl_white_3", ""),
+                cpl_black_2=move_dict.get("cpl_black_2", ""),
+                cpl_black_3=move_dict.get("cpl_black_3", ""),
+                assess_white=move_dict.get("assess_white", ""),
+                assess_black=move_dict.get("assess_black", ""),
+                best_white=move_dict.get("best_white", ""),
+                best_black=move_dict.get("best_black", ""),
+                best_white_2=move_dict.get("best_white_2", ""),
+                best_white_3=move_dict.get("best_white_3", ""),
+                best_black_2=move_dict.get("best_black_2", ""),
+                best_black_3=move_dict.get("best_black_3", ""),
+                white_is_top3=move_dict.get("white_is_top3", False),
+                black_is_top3=move_dict.get("black_is_top3", False),
+                white_depth=move_dict.get("white_depth", 0),
+                black_depth=move_dict.get("black_depth", 0),
+                white_seldepth=move_dict.get("white_seldepth", 0),
+                black_seldepth=move_dict.get("black_seldepth", 0),
+                eco=move_dict.get("eco", ""),
+                opening_name=move_dict.get("opening_name", ""),
+                comment=move_dict.get("comment", ""),
+                white_capture=move_dict.get("white_capture", ""),
+                black_capture=move_dict.get("black_capture", ""),
+                white_material=move_dict.get("white_material", 0),
+                black_material=move_dict.get("black_material", 0),
+                white_queens=move_dict.get("white_queens", 0),
+                white_rooks=move_dict.get("white_rooks", 0),
+                white_bishops=move_dict.get("white_bishops", 0),
+                white_knights=move_dict.get("white_knights", 0),
+                white_pawns=move_dict.get("white_pawns", 0),
+                black_queens=move_dict.get("black_queens", 0),
+                black_rooks=move_dict.get("black_rooks", 0),
+                black_bishops=move_dict.get("black_bishops", 0),
+                black_knights=move_dict.get("black_knights", 0),
+                black_pawns=move_dict.get("black_pawns", 0),
+                fen_white=move_dict.get("fen_white", ""),
+                fen_black=move_dict.get("fen_black", "")
+            )
+            moves.append(move)
+        
+        return moves
+    
+    @staticmethod
+    def sync_sidecar_after_pgn_edit(game: GameData, old_pgn: Optional[str]) -> None:
+        """Keep the sidecar entry of a game in step with an edit of its PGN.
+
+        Call after game.pgn was rewritten. If the edit removed the CARAAnalysisData
+        tag, the stored analysis is removed as well; if it changed the store key
+        (Event, Site, Date, Round, White, Black or the main line), the entry is
+        moved to the new key so it is not orphaned.
+
+        Args:
+            game: GameData instance whose pgn was just rewritten.
+            old_pgn: PGN text before the edit.
+        """
+        store = AnalysisSidecarStore.active()
+        if store is None or not game or not getattr(game, 'pgn', None) or not old_pgn:
+            return
+        old_key = analysis_game_key(old_pgn)
+        if old_key not in store:
+            return
+        tag_names = (AnalysisDataStorageService.TAG_NAME,)
+        try:
+            if read_header_tag_values(old_pgn, tag_names) and not read_header_tag_values(game.pgn, tag_names):
+                store.remove(old_key)
+                return
+            new_key = analysis_game_key(game.pgn)
+            if new_key == old_key:
+                return
+            moves = store.get(old_key)
+            if moves is not None:
+                store.put(new_key, moves)
+            store.remove(old_key)
+        except OSError as e:
+            LoggingService.get_instance().error(f"Error writing analysis store: {e}", exc_info=e)
+
+    @staticmethod
+    def _embed_pgn_tag(config: Optional[Dict[str, Any]]) -> bool:
+        """Whether CARAAnalysisData is embedded in the PGN (always, unless disabled for the sidecar)."""
+        settings = ((config or {}).get("game_analysis") or {}).get("analysis_store") or {}
+        return bool(settings.get("embed_pgn_tag", True))
+
+    @staticmethod
+    def _remove_analysis_tags(game: GameData) -> bool:
+        """Remove the three analysis tags from a game's PGN.
+
+        Returns:
+            True if any tag was removed (game.pgn was rewritten), False otherwise.
+        """
+        if not game or not hasattr(game, 'pgn') or not game.pgn:
+            return False
+        tag_names = (
+            AnalysisDataStorageService.TAG_NAME,
+            AnalysisDataStorageService.TAG_INFO,
+            AnalysisDataStorageService.TAG_CHECKSUM,
+        )
+        # Header-only check first: most games have nothing to remove
+        if not read_header_tag_values(game.pgn, tag_names):
+            return False
+        
+        # Parse the current PGN
+        pgn_io = StringIO(game.pgn)
+        chess_game = chess.pgn.read_game(pgn_io)
+        
+        if not chess_game:
+            return False
+        
+        removed = False
+        for tag_name in tag_names:
+            if tag_name in chess_game.headers:
+                del chess_game.headers[tag_name]
+                removed = True
+        if not removed:
+            return False
+        
+        # Regenerate PGN text
+        game.pgn = PgnService.export_game_to_pgn(chess_game)
+        return True
+
     @staticmethod
     def _remove_corrupted_analysis_tags(game: GameData) -> None:
         """Remove corrupted analysis tags from a game's PGN.
@@ -381,44 +632,11 @@ class AnalysisDataStorageService:
             game: GameData instance to clean up.
         """
         try:
-            # Check if game has PGN
-            if not game or not hasattr(game, 'pgn') or not game.pgn:
-                return
-            
-            # Parse the current PGN
-            pgn_io = StringIO(game.pgn)
-            chess_game = chess.pgn.read_game(pgn_io)
-            
-            if not chess_game:
-                return
-            
-            # Check if any analysis tags exist
-            has_analysis_tags = (
-                AnalysisDataStorageService.TAG_NAME in chess_game.headers or
-                AnalysisDataStorageService.TAG_INFO in chess_game.headers or
-                AnalysisDataStorageService.TAG_CHECKSUM in chess_game.headers
-            )
-            
-            if not has_analysis_tags:
-                return
-            
-            # Remove all three analysis tags
-            if AnalysisDataStorageService.TAG_NAME in chess_game.headers:
-                del chess_game.headers[AnalysisDataStorageService.TAG_NAME]
-            if AnalysisDataStorageService.TAG_INFO in chess_game.headers:
-                del chess_game.headers[AnalysisDataStorageService.TAG_INFO]
-            if AnalysisDataStorageService.TAG_CHECKSUM in chess_game.headers:
-                del chess_game.headers[AnalysisDataStorageService.TAG_CHECKSUM]
-            
-            # Regenerate PGN text
-            new_pgn = PgnService.export_game_to_pgn(chess_game)
-            
-            # Update game's PGN
-            game.pgn = new_pgn
-            
-            # Update analyzed field
-            game.analyzed = False
+            old_pgn = game.pgn
+            if AnalysisDataStorageService._remove_analysis_tags(game):
+                AnalysisDataStorageService.sync_sidecar_after_pgn_edit(game, old_pgn)
+                # Update analyzed field
+                game.analyzed = False
         except Exception:
             # On any error, silently ignore (don't break the loading process)
             pass
-
@@ -0,0 +1,127 @@
+"""Compact binary encoding of MoveData rows for the CARAAnalysisData tag (no Qt).
+
+Rows are stored column by column: each integer field as an int32 array, the
+top-3 flags as one byte per row, and each text field as an array of indexes
+into a string table shared by the whole game. Columns of similar values
+compress far better than row-wise JSON objects with repeated keys, and
+decoding needs no JSON parsing.
+
+Layout (little-endian):
+    magic (6s), layout version (B), string index width (B), rows (I), strings (I)
+    INT_FIELDS columns (rows x i each), flags (rows x B),
+    TEXT_FIELDS columns (rows x H or I each),
+    UTF-8 strings separated by NUL (compresses better than an offset table)
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List
+
+from app.models.moveslist_model import MoveData
+from app.services.analysis_sidecar_store import INT_FIELDS, TEXT_FIELDS
+
+MAGIC = b"CARAMV"
+LAYOUT_VERSION = 1
+
+_HEADER = struct.Struct("<6sBBII")
+_FLAG_WHITE_TOP3 = 1
+_FLAG_BLACK_TOP3 = 2
+
+
+def is_binary_moves(data: bytes) -> bool:
+    """Whether an analysis payload uses this encoding (older payloads are JSON)."""
+    return data[:len(MAGIC)] == MAGIC
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def encode_moves(moves: List[MoveData]) -> bytes:
+    """Encode MoveData rows (lossless for every stored field).
+
+    Raises:
+        ValueError: If a text field contains a NUL character (use JSON instead).
+    """
+    rows = len(moves)
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+    text_columns: List[List[int]] = []
+    for name in TEXT_FIELDS:
+        column = []
+        for move in moves:
+            value = getattr(move, name, "")
+            text = "" if value is None else str(value)
+            string_id = string_ids.get(text)
+            if string_id is None:
+                if "\x00" in text:
+                    raise ValueError(f"NUL character in {name}")
+                string_id = len(strings)
+                string_ids[text] = string_id
+                strings.append(text)
+            column.append(string_id)
+        text_columns.append(column)
+    index_width = 2 if len(strings) <= 0xFFFF else 4
+    index_code = "H" if index_width == 2 else "I"
+
+    parts = [_HEADER.pack(MAGIC, LAYOUT_VERSION, index_width, rows, len(strings))]
+    for name in INT_FIELDS:
+        parts.append(struct.pack(f"<{rows}i", *[_as_int(getattr(move, name, 0)) for move in moves]))
+    parts.append(bytes(
+        (_FLAG_WHITE_TOP3 if getattr(move, "white_is_top3", False) else 0)
+        | (_FLAG_BLACK_TOP3 if getattr(move, "black_is_top3", False) else 0)
+        for move in moves
+    ))
+    for column in text_columns:
+        parts.append(struct.pack(f"<{rows}{index_code}", *column))
+    parts.append("\x00".join(strings).encode("utf-8"))
+    return b"".join(parts)
+
+
+def decode_moves(data: bytes) -> List[MoveData]:
+    """Decode rows written by encode_moves.
+
+    Raises:
+        ValueError: If the payload is not in this encoding or is truncated.
+    """
+    try:
+        magic, version, index_width, rows, string_count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION or index_width not in (2, 4):
+            raise ValueError("Not a binary analysis payload")
+        offset = _HEADER.size
+        int_columns = []
+        for _name in INT_FIELDS:
+            int_columns.append(struct.unpack_from(f"<{rows}i", data, offset))
+            offset += 4 * rows
+        flags = data[offset:offset + rows]
+        if len(flags) != rows:
+            raise ValueError("Truncated binary analysis payload")
+        offset += rows
+        index_code = "H" if index_width == 2 else "I"
+        text_columns = []
+        for _name in TEXT_FIELDS:
+            text_columns.append(struct.unpack_from(f"<{rows}{index_code}", data, offset))
+            offset += index_width * rows
+        strings = data[offset:].decode("utf-8").split("\x00") if string_count else []
+        if len(strings) != string_count:
+            raise ValueError("Truncated binary analysis payload")
+    except struct.error as e:
+        raise ValueError(f"Truncated binary analysis payload: {e}") from e
+
+    names = INT_FIELDS + TEXT_FIELDS
+    moves: List[MoveData] = []
+    try:
+        for row in range(rows):
+            values = [column[row] for column in int_columns]
+            values.extend(strings[column[row]] for column in text_columns)
+            fields = dict(zip(names, values))
+            fields["white_is_top3"] = bool(flags[row] & _FLAG_WHITE_TOP3)
+            fields["black_is_top3"] = bool(flags[row] & _FLAG_BLACK_TOP3)
+            moves.append(MoveData(**fields))
+    except IndexError as e:
+        raise ValueError("Corrupted binary analysis payload: string index out of range") from e
+    return moves
@@ -0,0 +1,442 @@
+"""Binary sidecar store for game analysis, outside the PGN text (no Qt).
+
+Analysis rows (MoveData) are stored as fixed-width records: numeric fields
+inline, text fields as indexes into a small per-game string table. Each stored
+game is one self-contained segment appended to a single memory-mapped file, so
+reading a game's analysis is a dict lookup plus struct unpacking instead of
+parsing the PGN header, base64-decoding, gunzipping and ``json.loads``.
+
+Games are keyed by analysis_game_key(), a digest of the identifying headers and
+the main line, which does not change when comments or the CARAAnalysis* tags
+are rewritten. A later segment for the same key supersedes earlier ones; dead
+segments are dropped by compaction.
+
+File layout (little-endian):
+    header:  magic (8s), format version (I), record size (I)
+    segment: key (16s), row count (I), string count (I), string bytes (I), CRC-32 of body (I)
+             body: rows x RECORD, (string count + 1) x string end offset (I), UTF-8 strings
+A segment with row count DELETED_ROWS removes its key.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.moveslist_model import MoveData
+from app.utils.pgn_header_utils import read_header_tag_values
+
+MAGIC = b"CARAANLS"
+FORMAT_VERSION = 1
+DEFAULT_FILENAME = "analysis_store.caraanalysis"
+
+# MoveData integer fields, in record order.
+INT_FIELDS: Tuple[str, ...] = (
+    "move_number",
+    "white_depth",
+    "black_depth",
+    "white_seldepth",
+    "black_seldepth",
+    "white_material",
+    "black_material",
+    "white_queens",
+    "white_rooks",
+    "white_bishops",
+    "white_knights",
+    "white_pawns",
+    "black_queens",
+    "black_rooks",
+    "black_bishops",
+    "black_knights",
+    "black_pawns",
+)
+# MoveData text fields, in record order (stored as string table indexes).
+TEXT_FIELDS: Tuple[str, ...] = (
+    "white_move",
+    "black_move",
+    "eval_white",
+    "eval_black",
+    "cpl_white",
+    "cpl_black",
+    "cpl_white_2",
+    "cpl_white_3",
+    "cpl_black_2",
+    "cpl_black_3",
+    "assess_white",
+    "assess_black",
+    "best_white",
+    "best_black",
+    "best_white_2",
+    "best_white_3",
+    "best_black_2",
+    "best_black_3",
+    "eco",
+    "opening_name",
+    "comment",
+    "white_capture",
+    "black_capture",
+    "fen_white",
+    "fen_black",
+)
+_FLAG_WHITE_TOP3 = 1
+_FLAG_BLACK_TOP3 = 2
+
+RECORD = struct.Struct("<" + "i" * len(INT_FIELDS) + "I" + "I" * len(TEXT_FIELDS))
+_FILE_HEADER = struct.Struct("<8sII")
+_SEGMENT_HEADER = struct.Struct("<16sIIII")
+_OFFSET = struct.Struct("<I")
+DELETED_ROWS = 0xFFFFFFFF
+
+# Compact once dead segments take more than this many bytes and outweigh live ones.
+COMPACT_MIN_DEAD_BYTES = 1 << 20
+
+_HEADER_KEY_TAGS = ("Event", "Site", "Date", "Round", "White", "Black")
+_COMMENT_RE = re.compile(r"\{[^}]*\}|;[^\n]*")
+_VARIATION_RE = re.compile(r"\([^()]*\)")
+_NOISE_RE = re.compile(r"\$\d+|\d+\.(?:\.\.)?|[!?]+|1-0|0-1|1/2-1/2|\*")
+
+
+def analysis_game_key(pgn_text: str) -> bytes:
+    """Stable store key of a game: Seven Tag Roster identity plus main-line moves.
+
+    Comments, variations, NAGs and other header tags (including the CARAAnalysis*
+    tags) do not affect the key, so it survives annotation edits and re-export.
+    """
+    text = pgn_text or ""
+    headers = read_header_tag_values(text, _HEADER_KEY_TAGS)
+    lines = text.splitlines()
+    first_move_line = 0
+    while first_move_line < len(lines) and (
+        not lines[first_move_line].strip() or lines[first_move_line].lstrip().startswith("[")
+    ):
+        first_move_line += 1
+    movetext = _COMMENT_RE.sub(" ", "\n".join(lines[first_move_line:]))
+    while True:
+        stripped = _VARIATION_RE.sub(" ", movetext)
+        if stripped == movetext:
+            break
+        movetext = stripped
+    moves = _NOISE_RE.sub(" ", movetext).split()
+    identity = "\x1f".join(headers.get(tag, "") for tag in _HEADER_KEY_TAGS)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(identity.encode("utf-8"))
+    digest.update(b"\x1e")
+    digest.update(" ".join(moves).encode("utf-8"))
+    return digest.digest()
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def encode_segment(key: bytes, moves: List[MoveData]) -> bytes:
+    """Serialize one game's analysis rows into a store segment."""
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+    records = bytearray()
+    for move in moves:
+        values: List[int] = [_as_int(getattr(move, name, 0)) for name in INT_FIELDS]
+        flags = 0
+        if getattr(move, "white_is_top3", False):
+            flags |= _FLAG_WHITE_TOP3
+        if getattr(move, "black_is_top3", False):
+            flags |= _FLAG_BLACK_TOP3
+        values.append(flags)
+        for name in TEXT_FIELDS:
+            value = getattr(move, name, "")
+            text = "" if value is None else str(value)
+            string_id = string_ids.get(text)
+            if string_id is None:
+                string_id = len(strings)
+                string_ids[text] = string_id
+                strings.append(text)
+            values.append(string_id)
+        records += RECORD.pack(*values)
+    blob = bytearray()
+    offsets = bytearray(_OFFSET.pack(0))
+    for text in strings:
+        blob += text.encode("utf-8")
+        offsets += _OFFSET.pack(len(blob))
+    body = bytes(records) + bytes(offsets) + bytes(blob)
+    header = _SEGMENT_HEADER.pack(key, len(moves), len(strings), len(blob), zlib.crc32(body))
+    return header + body
+
+
+def _segment_size(row_count: int, string_count: int, string_bytes: int) -> int:
+    if row_count == DELETED_ROWS:
+        return _SEGMENT_HEADER.size
+    return _SEGMENT_HEADER.size + row_count * RECORD.size + (string_count + 1) * _OFFSET.size + string_bytes
+
+
+def decode_segment(buffer: Any, offset: int = 0) -> List[MoveData]:
+    """Rebuild MoveData rows from a segment in ``buffer`` (bytes, mmap or memoryview).
+
+    Raises:
+        ValueError: If the segment is truncated or fails its CRC check.
+    """
+    if len(buffer) < offset + _SEGMENT_HEADER.size:
+        raise ValueError("Truncated analysis segment")
+    _key, row_count, string_count, string_bytes, crc = _SEGMENT_HEADER.unpack_from(buffer, offset)
+    if row_count == DELETED_ROWS:
+        return []
+    body_start = offset + _SEGMENT_HEADER.size
+    body_end = offset + _segment_size(row_count, string_count, string_bytes)
+    if len(buffer) < body_end:
+        raise ValueError("Truncated analysis segment")
+    body = memoryview(buffer)[body_start:body_end]
+    try:
+        if zlib.crc32(body) != crc:
+            raise ValueError("Analysis segment checksum mismatch")
+        offsets_start = row_count * RECORD.size
+        blob_start = offsets_start + (string_count + 1) * _OFFSET.size
+        ends = struct.unpack_from(f"<{string_count + 1}I", body, offsets_start)
+        blob = bytes(body[blob_start:])
+        strings = [blob[ends[i]:ends[i + 1]].decode("utf-8") for i in range(string_count)]
+        int_count = len(INT_FIELDS)
+        moves: List[MoveData] = []
+        for values in RECORD.iter_unpack(body[:offsets_start]):
+            move = MoveData(**dict(zip(INT_FIELDS, values[:int_count])))
+            flags = values[int_count]
+            move.white_is_top3 = bool(flags & _FLAG_WHITE_TOP3)
+            move.black_is_top3 = bool(flags & _FLAG_BLACK_TOP3)
+            for name, string_id in zip(TEXT_FIELDS, values[int_count + 1:]):
+                setattr(move, name, strings[string_id])
+            moves.append(move)
+        return moves
+    finally:
+        body.release()
+
+
+def segment_checksum(segment: bytes) -> str:
+    """Change-detecting identifier of a segment (key plus body CRC), e.g. for result caches.
+
+    Raises:
+        ValueError: If ``segment`` is shorter than a segment header.
+    """
+    if len(segment) < _SEGMENT_HEADER.size:
+        raise ValueError("Truncated analysis segment")
+    key, _rows, _count, _size, crc = _SEGMENT_HEADER.unpack_from(segment, 0)
+    return f"sidecar:{key.hex()}:{crc:08x}"
+
+
+class AnalysisSidecarStore:
+    """Append-only, memory-mapped analysis store in one file.
+
+    Thread-safe. The active store (see configure) is used by
+    AnalysisDataStorageService when the ``game_analysis.analysis_store.sidecar_enabled``
+    setting is on.
+    """
+
+    _active: Optional["AnalysisSidecarStore"] = None
+    _active_lock = threading.Lock()
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._map: Optional[mmap.mmap] = None
+        self._file_size = 0
+        # key -> (offset, size) of the live segment
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._dead_bytes = 0
+        self._open()
+
+    # Active store -----------------------------------------------------------------
+
+    @classmethod
+    def configure(cls, config: Optional[Dict[str, Any]]) -> Optional["AnalysisSidecarStore"]:
+        """Open (or close) the active store according to the configuration."""
+        settings = ((config or {}).get("game_analysis") or {}).get("analysis_store") or {}
+        if not settings.get("sidecar_enabled", False):
+            cls.set_active(None)
+            return None
+        from app.utils.path_resolver import resolve_data_file_path
+
+        path, _ = resolve_data_file_path(str(settings.get("filename") or DEFAULT_FILENAME))
+        with cls._active_lock:
+            current = cls._active
+        if current is not None and current.path == path:
+            return current
+        try:
+            store = cls(path)
+        except OSError as e:
+            from app.services.logging_service import LoggingService
+            LoggingService.get_instance().error(f"Analysis store could not be opened: path={path}: {e}", exc_info=e)
+            store = None
+        cls.set_active(store)
+        return store
+
+    @classmethod
+    def set_active(cls, store: Optional["AnalysisSidecarStore"]) -> None:
+        with cls._active_lock:
+            previous = cls._active
+            cls._active = store
+        if previous is not None and previous is not store:
+            previous.close()
+
+    @classmethod
+    def active(cls) -> Optional["AnalysisSidecarStore"]:
+        """The configured store, or None if the sidecar is disabled."""
+        return cls._active
+
+    # Reading ----------------------------------------------------------------------
+
+    def __contains__(self, key: bytes) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def get(self, key: bytes) -> Optional[List[MoveData]]:
+        """Analysis rows stored for a game key, or None if absent or unreadable."""
+        with self._lock:
+            location = self._index.get(key)
+            if location is None or self._map is None:
+                return None
+            try:
+                return decode_segment(self._map, location[0])
+            except ValueError:
+                self._drop_unreadable(key)
+                return None
+
+    def get_segment(self, key: bytes) -> Optional[bytes]:
+        """Raw segment bytes for a game key (cheap to ship to worker processes)."""
+        with self._lock:
+            location = self._index.get(key)
+            if location is None or self._map is None:
+                return None
+            offset, size = location
+            return bytes(self._map[offset:offset + size])
+
+    # Writing ----------------------------------------------------------------------
+
+    def put(self, key: bytes, moves: List[MoveData]) -> None:
+        """Store a game's analysis rows, superseding any earlier ones for the key."""
+        self._append(key, encode_segment(key, moves))
+
+    def remove(self, key: bytes) -> None:
+        """Drop a game's analysis rows (appends a deletion marker)."""
+        with self._lock:
+            if key not in self._index:
+                return
+            self._append(key, _SEGMENT_HEADER.pack(key, DELETED_ROWS, 0, 0, 0))
+
+    def compact(self) -> None:
+        """Rewrite the file with live segments only."""
+        with self._lock:
+            if self._map is None:
+                return
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            new_index: Dict[bytes, Tuple[int, int]] = {}
+            with open(tmp_path, "wb") as out:
+                out.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+                position = _FILE_HEADER.size
+                for key, (offset, size) in self._index.items():
+                    out.write(self._map[offset:offset + size])
+                    new_index[key] = (position, size)
+                    position += size
+                out.flush()
+                os.fsync(out.fileno())
+            self._close_map()
+            os.replace(tmp_path, self.path)
+            self._index = new_index
+            self._dead_bytes = 0
+            self._remap()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_map()
+
+    # Internals --------------------------------------------------------------------
+
+    def _open(self) -> None:
+        with self._lock:
+            if self.path.exists() and self.path.stat().st_size >= _FILE_HEADER.size:
+                with open(self.path, "rb") as f:
+                    magic, version, record_size = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+                if magic == MAGIC and version == FORMAT_VERSION and record_size == RECORD.size:
+                    self._remap()
+                    self._scan()
+                    return
+                from app.services.logging_service import LoggingService
+                LoggingService.get_instance().warning(
+                    f"Analysis store has an unknown format and will be replaced: path={self.path}"
+                )
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+            self._remap()
+
+    def _scan(self) -> None:
+        """Build the key index from segment headers; a torn tail segment is cut off."""
+        buffer = self._map
+        end = self._file_size
+        position = _FILE_HEADER.size
+        index: Dict[bytes, Tuple[int, int]] = {}
+        dead = 0
+        while position + _SEGMENT_HEADER.size <= end:
+            key, row_count, string_count, string_bytes, _crc = _SEGMENT_HEADER.unpack_from(buffer, position)
+            size = _segment_size(row_count, string_count, string_bytes)
+            if position + size > end:
+                break
+            previous = index.pop(key, None)
+            if previous is not None:
+                dead += previous[1]
+            if row_count == DELETED_ROWS:
+                dead += size
+            else:
+                index[key] = (position, size)
+            position += size
+        self._index = index
+        self._dead_bytes = dead
+        if position < end:
+            self._close_map()
+            with open(self.path, "r+b") as f:
+                f.truncate(position)
+            self._remap()
+
+    def _append(self, key: bytes, segment: bytes) -> None:
+        with self._lock:
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(segment)
+                f.flush()
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._dead_bytes += previous[1]
+            _key, row_count, _count, _size, _crc = _SEGMENT_HEADER.unpack_from(segment, 0)
+            if row_count == DELETED_ROWS:
+                self._dead_bytes += len(segment)
+            else:
+                self._index[key] = (offset, len(segment))
+            self._remap()
+            live_bytes = self._file_size - self._dead_bytes
+            if self._dead_bytes > COMPACT_MIN_DEAD_BYTES and self._dead_bytes > live_bytes:
+                self.compact()
+
+    def _drop_unreadable(self, key: bytes) -> None:
+        from app.services.logging_service import LoggingService
+        LoggingService.get_instance().warning(f"Analysis store segment is corrupted and was dropped: key={key.hex()}")
+        self.remove(key)
+
+    def _remap(self) -> None:
+        self._close_map()
+        self._file_size = self.path.stat().st_size
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
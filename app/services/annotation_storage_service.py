@@ -12,6 +12,7 @@ from app.services.pgn_service import PgnService
 from app.models.annotation_model import Annotation, AnnotationType, AnnotationKey, normalize_annotation_key
 from app.services.logging_service import LoggingService
 from app.utils.pgn_tag_compression import (
+    PayloadCodecUnavailableError,
     decode_and_decompress_to_str,
     compress_and_encode_from_str,
     compute_checksum,
@@ -170,7 +171,7 @@ class AnnotationStorageService:
             json_str = json.dumps(payload, ensure_ascii=False)
             data_bytes = json_str.encode("utf-8")
             checksum = compute_checksum(data_bytes)
-            encoded = compress_and_encode_from_str(json_str, compresslevel=9)
+            encoded = compress_and_encode_from_str(json_str)
             
             app_version = config.get('version', '1.0') if config else '1.0'
             current_datetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -216,6 +217,9 @@ class AnnotationStorageService:
             encoded = chess_game.headers[AnnotationStorageService.TAG_NAME]
             try:
                 json_str = decode_and_decompress_to_str(encoded)
+            except PayloadCodecUnavailableError:
+                # Written elsewhere with a codec not installed here; keep the tag.
+                raise
             except ValueError:
                 AnnotationStorageService._remove_corrupted_annotation_tags(game)
                 raise
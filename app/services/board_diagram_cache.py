@@ -0,0 +1,227 @@
+"""Thread-safe raster cache of mini-board diagrams for PDF reports.
+
+Boards are painted straight onto QImage (never QWidget/QPixmap), so they can be
+rendered on worker threads. Piece sprites are rasterized once per square size
+from the configured SVG set; each board is then squares + sprites + arrow,
+matching MiniChessBoardWidget. Rendered boards are keyed by piece placement,
+arrow move and pixel size, so a position shown twice is only painted once.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import chess
+from PyQt6.QtCore import QPointF, QRectF, QRect, Qt
+from PyQt6.QtGui import QBrush, QColor, QImage, QPainter
+from PyQt6.QtSvg import QSvgRenderer
+
+from app.utils.concurrency_utils import get_process_pool_max_workers
+from app.utils.path_resolver import get_app_resource_path
+from app.views.widgets.mini_chessboard_widget import (
+    PIECE_COLORS,
+    PIECE_TYPES,
+    MiniBoardStyle,
+    board_square_size,
+    paint_board_squares,
+    paint_move_arrow,
+)
+
+# Default upper bound for cached boards (a 112pt board at 4x is ~0.8 MB).
+DEFAULT_MAX_CACHED_BOARDS = 96
+# Default cap for render threads (QPainter work is mostly outside the GIL).
+DEFAULT_MAX_RENDER_WORKERS = 8
+
+# (piece placement, arrow UCI or "", square size in pixels)
+DiagramKey = Tuple[str, str, int]
+
+
+@dataclass(frozen=True)
+class DiagramRequest:
+    """One board to draw: position, optional last move (fen_before + san), display size."""
+
+    fen: str
+    size: int
+    fen_before: str = ""
+    san: str = ""
+
+
+def get_render_max_workers(config: Optional[Dict[str, Any]] = None) -> int:
+    """Threads for diagram/report rendering (parallel_processing.pdf_render.max_workers_cap)."""
+    render_config = (config or {}).get('parallel_processing', {}).get('pdf_render', {})
+    cap = render_config.get('max_workers_cap')
+    if cap is None:
+        cap = DEFAULT_MAX_RENDER_WORKERS
+    return max(1, min(get_process_pool_max_workers(os.cpu_count(), config), int(cap)))
+
+
+class BoardDiagramCache:
+    """Renders and caches board diagrams as QImage; safe to use from several threads."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        *,
+        render_scale: int = 1,
+        max_workers: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            config: Configuration dictionary (board style and pdf_render settings).
+            render_scale: Supersampling factor applied to requested display sizes.
+            max_workers: Render threads for prepare(); defaults to get_render_max_workers.
+            max_entries: Cached boards kept (least recently used are dropped first).
+        """
+        render_config = config.get('parallel_processing', {}).get('pdf_render', {})
+        self.style = MiniBoardStyle.from_config(config)
+        self.render_scale = max(1, int(render_scale))
+        self.max_workers = max_workers if max_workers is not None else get_render_max_workers(config)
+        if max_entries is None:
+            max_entries = render_config.get('max_cached_boards', DEFAULT_MAX_CACHED_BOARDS)
+        self.max_entries = max(1, int(max_entries))
+        self._images: "OrderedDict[DiagramKey, QImage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sprites: Dict[int, Dict[Tuple[str, str], QImage]] = {}
+        self._sprite_lock = threading.Lock()
+        self.rendered = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._images)
+
+    def key(self, fen: str, fen_before: str = "", san: str = "", *, size: int) -> DiagramKey:
+        """Cache key: side to move, castling etc. do not change the picture."""
+        placement = (fen or chess.STARTING_FEN).split(" ", 1)[0]
+        arrow = ""
+        if fen_before and san:
+            try:
+                arrow = chess.Board(fen_before).parse_san(san).uci()
+            except ValueError:
+                pass
+        return (placement, arrow, board_square_size(int(size) * self.render_scale))
+
+    def image(self, fen: str, fen_before: str = "", san: str = "", *, size: int) -> QImage:
+        """Board image at ``size`` display points times the render scale (border included)."""
+        key = self.key(fen, fen_before, san, size=size)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+        return self._store(key, self._render(key))
+
+    def prepare(self, requests: Iterable[DiagramRequest]) -> int:
+        """Render every missing board of ``requests`` up front, in parallel.
+
+        Returns:
+            Number of boards rendered.
+        """
+        wanted = dict.fromkeys(
+            self.key(request.fen, request.fen_before, request.san, size=request.size)
+            for request in requests
+        )
+        with self._lock:
+            keys: List[DiagramKey] = [key for key in wanted if key not in self._images]
+        # Never render more than fits; the oldest would be evicted unused.
+        keys = keys[:self.max_entries]
+        if not keys:
+            return 0
+        workers = min(self.max_workers, len(keys))
+        if workers <= 1:
+            images = [self._render(key) for key in keys]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                images = list(executor.map(self._render, keys))
+        for key, image in zip(keys, images):
+            self._store(key, image)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached boards (sprites are kept)."""
+        with self._lock:
+            self._images.clear()
+
+    def _store(self, key: DiagramKey, image: QImage) -> QImage:
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+            self.rendered += 1
+        return image
+
+    def _piece_sprites(self, square_size: int) -> Dict[Tuple[str, str], QImage]:
+        """Pieces rasterized into square-sized images with the configured padding.
+
+        SVG renderers are created here rather than taken from the widget cache:
+        those belong to the GUI thread, while this may run on a worker.
+        """
+        with self._sprite_lock:
+            sprites = self._sprites.get(square_size)
+            if sprites is not None:
+                return sprites
+            sprites = {}
+            pieces_dir = get_app_resource_path(self.style.svg_path)
+            padding = square_size * self.style.piece_padding_ratio
+            piece_rect = QRectF(padding, padding, square_size - padding * 2, square_size - padding * 2)
+            for color in PIECE_COLORS:
+                for piece_type in PIECE_TYPES:
+                    renderer = QSvgRenderer(str(pieces_dir / f"{color}{piece_type}.svg"))
+                    if not renderer.isValid():
+                        continue
+                    sprite = QImage(square_size, square_size, QImage.Format.Format_ARGB32_Premultiplied)
+                    sprite.fill(Qt.GlobalColor.transparent)
+                    painter = QPainter(sprite)
+                    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+                    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+                    renderer.render(painter, piece_rect)
+                    painter.end()
+                    sprites[(color, piece_type)] = sprite
+            self._sprites[square_size] = sprites
+            return sprites
+
+    def _render(self, key: DiagramKey) -> QImage:
+        placement, arrow, square_size = key
+        style = self.style
+        border = style.border_size
+        total = square_size * 8 + border * 2
+        try:
+            board: Optional[chess.BaseBoard] = chess.BaseBoard(placement)
+        except ValueError:
+            board = None
+        sprites = self._piece_sprites(square_size)
+
+        image = QImage(total, total, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.white)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+        if border > 0:
+            painter.fillRect(QRect(0, 0, total, total), QBrush(QColor(*style.border_color)))
+        paint_board_squares(
+            painter, border, border, square_size, style.light_square_color, style.dark_square_color
+        )
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        if board is not None:
+            for square, piece in board.piece_map().items():
+                sprite = sprites.get(('w' if piece.color == chess.WHITE else 'b', piece.symbol().lower()))
+                if sprite is None:
+                    continue
+                col = chess.square_file(square)
+                row = 7 - chess.square_rank(square)
+                painter.drawImage(
+                    QPointF(border + col * square_size, border + row * square_size), sprite
+                )
+        if arrow:
+            paint_move_arrow(
+                painter, chess.Move.from_uci(arrow), style.arrow_color, border, border, square_size
+            )
+        painter.end()
+        return image
@@ -1,44 +1,110 @@
 """Book move service for detecting opening book moves using ECO and Polyglot formats."""
 
+import struct
+import threading
 import chess
 import chess.polyglot
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 
+from app.services.eco_index import book_hash
 from app.services.opening_service import OpeningService
 from app.utils.path_resolver import get_app_resource_path
 
+# Polyglot entry: key (u64), move (u16), weight (u16), learn (u32), big-endian.
+_POLYGLOT_ENTRY = struct.Struct(">QHHI")
+
+# Standard castling as (king from, king to) -> Polyglot target (king takes own rook).
+_POLYGLOT_CASTLING_TARGETS = {
+    (chess.E1, chess.G1): chess.H1,
+    (chess.E1, chess.C1): chess.A1,
+    (chess.E8, chess.G8): chess.H8,
+    (chess.E8, chess.C8): chess.A8,
+}
+
+
+def polyglot_move_codes(move: chess.Move, is_king_move: bool = False) -> Tuple[int, ...]:
+    """Return the raw Polyglot move encodings a played move can appear under.
+
+    Polyglot books store castling as the king capturing its own rook, so a
+    king move e1g1 may be stored as e1h1. Both forms are returned only for king
+    moves between the castling squares: a rook or queen going e1g1 must not
+    match a book entry for a rook going e1h1 (python-chess checks the same).
+    """
+    promotion = (move.promotion - 1) if move.promotion else 0
+    code = move.to_square | (move.from_square << 6) | (promotion << 12)
+    rook_square = _POLYGLOT_CASTLING_TARGETS.get((move.from_square, move.to_square))
+    if rook_square is None or promotion or not is_king_move:
+        return (code,)
+    return (code, rook_square | (move.from_square << 6))
+
 
 class BookMoveService:
     """Service for detecting if moves are in opening books (ECO or Polyglot format).
-    
+
     This service provides a hybrid approach:
     1. First checks ECO database (position-based lookup)
     2. Then checks Polyglot opening books (move-based lookup)
+
+    Both checks work on Zobrist hashes: the ECO theory graph is probed with the
+    book hash of the position after the move, and the configured Polyglot books
+    are merged into one in-memory table (Polyglot key -> distinct raw moves),
+    built on first use.
     """
-    
+
     def __init__(self, config: Dict[str, Any], opening_service: OpeningService) -> None:
         """Initialize the book move service.
-        
+
         Args:
             config: Configuration dictionary.
             opening_service: OpeningService instance for ECO lookup.
         """
         self.config = config
         self.opening_service = opening_service
-        self._polyglot_readers: List[chess.polyglot.PolyglotReader] = []
+        self._polyglot_moves: Dict[int, Tuple[int, ...]] = {}
         self._is_loaded = False
-        
-        # Load Polyglot books if enabled
+        self._load_lock = threading.Lock()
+
         book_config = config.get("game_analysis", {}).get("book_move_detection", {})
-        if book_config.get("use_opening_book", False):
-            self._load_polyglot_books()
-    
+        self._use_opening_book = bool(book_config.get("use_opening_book", False))
+
     def _load_polyglot_books(self) -> None:
-        """Load Polyglot opening book files."""
+        """Merge the configured Polyglot book files into the in-memory move table.
+
+        Entries with weight 0 (deleted entries) are ignored, as in
+        chess.polyglot's find_all. Thread-safe.
+        """
         if self._is_loaded:
             return
-        
+        with self._load_lock:
+            if self._is_loaded:
+                return
+            table: Dict[int, Tuple[int, ...]] = {}
+            for book_file_path in self._book_file_paths():
+                try:
+                    data = book_file_path.read_bytes()
+                except OSError:
+                    # Silently skip files that can't be opened
+                    continue
+                usable = len(data) - len(data) % _POLYGLOT_ENTRY.size
+                for key, raw_move, weight, _learn in _POLYGLOT_ENTRY.iter_unpack(memoryview(data)[:usable]):
+                    if not weight:
+                        continue
+                    moves = table.get(key)
+                    if moves is None:
+                        table[key] = (raw_move,)
+                    elif raw_move not in moves:
+                        table[key] = moves + (raw_move,)
+            self._polyglot_moves = table
+            self._is_loaded = True
+
+    def load(self) -> None:
+        """Build the merged Polyglot table now if book detection is enabled (idempotent)."""
+        if self._use_opening_book:
+            self._load_polyglot_books()
+
+    def _book_file_paths(self) -> List[Path]:
+        """Resolve the configured Polyglot book files that exist."""
         book_config = self.config.get("game_analysis", {}).get("book_move_detection", {})
         book_files = book_config.get("opening_book_files", [])
         books_path_str = self.config.get("resources", {}).get(
@@ -47,68 +113,121 @@ class BookMoveService:
         books_path = Path(str(books_path_str))
         if not books_path.is_absolute():
             books_path = get_app_resource_path(str(books_path))
-        
+
         if not books_path.exists():
-            self._is_loaded = True
-            return
-        
-        # Load each book file
+            return []
+
+        paths = []
         for book_file_name in book_files:
             book_file_path = books_path / book_file_name
             if book_file_path.exists() and book_file_path.is_file():
-                try:
-                    reader = chess.polyglot.open_reader(str(book_file_path))
-                    self._polyglot_readers.append(reader)
-                except Exception:
-                    # Silently skip files that can't be opened
-                    continue
-        
-        self._is_loaded = True
-    
+                paths.append(book_file_path)
+        return paths
+
+    def is_polyglot_move(self, polyglot_key: int, move: chess.Move, is_king_move: bool = False) -> bool:
+        """Check if a move is listed in the Polyglot books for a position.
+
+        Args:
+            polyglot_key: chess.polyglot.zobrist_hash of the position before the move.
+            move: Move to check.
+            is_king_move: Whether the moving piece is the king (castling encoding).
+
+        Returns:
+            True if any configured book contains the move, False otherwise.
+        """
+        if not self._use_opening_book:
+            return False
+        if not self._is_loaded:
+            self._load_polyglot_books()
+        book_moves = self._polyglot_moves.get(polyglot_key)
+        if not book_moves:
+            return False
+        return any(code in book_moves for code in polyglot_move_codes(move, is_king_move))
+
     def is_book_move(self, board: chess.Board, move: chess.Move) -> bool:
         """Check if a move is in the opening book (ECO or Polyglot).
-        
+
         Args:
-            board: Chess board position before the move.
+            board: Chess board position before the move (pushed and popped, so
+                it is unchanged on return).
             move: Move to check.
-            
+
         Returns:
             True if the move is in the book, False otherwise.
         """
-        # 1. Check ECO database first (position-based)
-        # Note: ECO lookup is position-based, so we check if the position
-        # after the move is in ECO database
-        board_copy = board.copy()
-        board_copy.push(move)
-        fen_after = board_copy.fen()
-        if self.opening_service.is_book_position(fen_after):
+        if not move:
+            return False
+        polyglot_key = chess.polyglot.zobrist_hash(board)
+        is_king_move = board.king(board.turn) == move.from_square
+        board.push(move)
+        try:
+            key_after = book_hash(board)
+        finally:
+            board.pop()
+        # 1. Check ECO database first (position after the move)
+        if self.opening_service.is_book_key(key_after):
             return True
-        
         # 2. Check Polyglot books (move-based)
-        for reader in self._polyglot_readers:
-            try:
-                for entry in reader.find_all(board):
-                    # Compare moves - check exact match first
-                    if entry.move == move:
-                        return True
-                    # Also check by from/to squares and promotion
-                    if (entry.move.from_square == move.from_square and
-                        entry.move.to_square == move.to_square and
-                        entry.move.promotion == move.promotion):
-                        return True
-            except Exception:
-                # Silently handle errors (book might not have position)
-                continue
-        
-        return False
-    
-    def close(self) -> None:
-        """Close all Polyglot book readers."""
-        for reader in self._polyglot_readers:
-            try:
-                reader.close()
-            except Exception:
-                pass
-        self._polyglot_readers.clear()
-        self._is_loaded = False
+        return self.is_polyglot_move(polyglot_key, move, is_king_move)
+
+    def book_move_flags(
+        self,
+        board: chess.Board,
+        moves: Sequence[chess.Move],
+        polyglot_keys: Optional[Sequence[int]] = None,
+        book_keys: Optional[Sequence[int]] = None,
+    ) -> List[bool]:
+        """Check every move of a line against the opening books in one call.
+
+        Args:
+            board: Position before the first move (not modified).
+            moves: Moves played from that position, in order.
+            polyglot_keys: Optional chess.polyglot.zobrist_hash per position
+                (index 0 = ``board``), e.g. DatabaseModel position hashes.
+            book_keys: Optional book hash per position (index 0 = ``board``),
+                e.g. DatabaseModel fuzzy position hashes.
+
+        Returns:
+            One flag per move, same as calling is_book_move for each ply.
+            Precomputed keys are used only when they cover every position.
+        """
+        count = len(moves)
+        if (
+            polyglot_keys is None or book_keys is None
+            or len(polyglot_keys) <= count or len(book_keys) <= count
+        ):
+            polyglot_keys, book_keys = self._line_keys(board, moves)
+        # Track king squares instead of replaying the line (castling encoding only).
+        kings = {chess.WHITE: board.king(chess.WHITE), chess.BLACK: board.king(chess.BLACK)}
+        turn = board.turn
+        flags: List[bool] = []
+        for ply, move in enumerate(moves):
+            is_king_move = bool(move) and kings[turn] == move.from_square
+            if is_king_move:
+                kings[turn] = move.to_square
+            turn = not turn
+            if not move:
+                flags.append(False)
+            elif self.opening_service.is_book_key(book_keys[ply + 1]):
+                flags.append(True)
+            else:
+                flags.append(self.is_polyglot_move(polyglot_keys[ply], move, is_king_move))
+        return flags
+
+    @staticmethod
+    def _line_keys(board: chess.Board, moves: Sequence[chess.Move]) -> Tuple[List[int], List[int]]:
+        """Replay a line once and return (Polyglot keys, book hashes) per position."""
+        line_board = board.copy(stack=False)
+        polyglot_keys = [chess.polyglot.zobrist_hash(line_board)]
+        book_keys = [book_hash(line_board)]
+        for move in moves:
+            line_board.push(move)
+            polyglot_keys.append(chess.polyglot.zobrist_hash(line_board))
+            book_keys.append(book_hash(line_board))
+        return polyglot_keys, book_keys
 
+    def close(self) -> None:
+        """Release the merged Polyglot table (rebuilt on next use)."""
+        with self._load_lock:
+            self._polyglot_moves = {}
+            self._is_loaded = False
@@ -443,6 +443,11 @@ class BulkAnalysisService(QObject):
             
             total_moves = len(moves_data)
             
+            # Book membership for every ply in one pass (hash probes, no per-move board copies)
+            book_move_flags = self.book_move_service.book_move_flags(
+                moves_data[0]["board_before"], [move_info["move"] for move_info in moves_data]
+            )
+            
             # Initialize engine service if needed
             if not self._engine_service or not self._engine_service.analysis_thread or not self._engine_service.analysis_thread.isRunning():
                 if not self._initialize_engine_service():
@@ -552,7 +557,7 @@ class BulkAnalysisService(QObject):
                 )
                 
                 # Check if book move
-                is_book_move = self.book_move_service.is_book_move(move_info["board_before"], move_info["move"])
+                is_book_move = book_move_flags[move_index]
                 
                 # Assess move quality
                 classification_thresholds = {
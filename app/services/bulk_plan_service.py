@@ -11,6 +11,7 @@ import chess.pgn
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from app.models.database_model import DatabaseModel
+from app.services.analysis_data_storage_service import AnalysisDataStorageService
 from app.services.bulk_clean_pgn_service import _process_game_for_cleaning
 from app.services.bulk_operation_stats import (
     BulkOperationStats,
@@ -21,7 +22,11 @@ from app.services.bulk_operation_stats import (
 )
 from app.services.logging_service import LoggingService
 from app.services.pgn_service import PgnService
-from app.utils.concurrency_utils import get_process_pool_max_workers
+from app.utils.concurrency_utils import (
+    get_process_pool_batch_size,
+    get_process_pool_max_workers,
+    iter_batches,
+)
 from app.utils.game_data_header_sync import (
     apply_game_data_updates,
     game_data_updates_for_header_tag,
@@ -246,6 +251,29 @@ def _process_game_for_plan(
         return None, {}, BulkProcessingOutcome.FAILED
 
 
+# Plan steps for this worker, set once by _init_plan_worker (not pickled per game).
+_worker_steps: Tuple[PlanStep, ...] = ()
+
+# (position in games_to_process, PGN text) -> (position, new PGN, field updates, outcome)
+PlanJob = Tuple[int, str]
+PlanJobResult = Tuple[int, Optional[str], Dict[str, Any], BulkProcessingOutcome]
+
+
+def _init_plan_worker(steps: Tuple[PlanStep, ...]) -> None:
+    """ProcessPoolExecutor initializer: keep the plan for every batch this worker runs."""
+    global _worker_steps
+    _worker_steps = steps
+
+
+def _process_plan_batch(jobs: Sequence[PlanJob]) -> List[PlanJobResult]:
+    """Apply the worker's plan to a batch of games (ProcessPool worker entry point)."""
+    results: List[PlanJobResult] = []
+    for position, game_pgn in jobs:
+        new_pgn, field_updates, outcome = _process_game_for_plan(game_pgn, _worker_steps)
+        results.append((position, new_pgn, field_updates, outcome))
+    return results
+
+
 class BulkPlanService:
     """Run an ordered list of header/clean operations in one pass over games."""
 
@@ -298,26 +326,42 @@ class BulkPlanService:
         executor = None
 
         try:
-            executor = ProcessPoolExecutor(max_workers=max_workers)
-            future_to_game = {
-                executor.submit(_process_game_for_plan, game.pgn, steps): game
-                for game in games_to_process
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_plan_worker,
+                initargs=(steps,),
+            )
+            jobs: List[PlanJob] = [
+                (position, game.pgn) for position, game in enumerate(games_to_process)
+            ]
+            batch_size = get_process_pool_batch_size(total_games, max_workers, self.config)
+            future_to_batch = {
+                executor.submit(_process_plan_batch, batch): batch
+                for batch in iter_batches(jobs, batch_size)
             }
 
-            for future in as_completed(future_to_game):
+            for future in as_completed(future_to_batch):
                 if cancellation_check and cancellation_check():
-                    for f in future_to_game:
+                    for f in future_to_batch:
                         if f != future:
                             f.cancel()
                     break
 
-                game = future_to_game[future]
-                completed += 1
                 try:
-                    new_pgn, field_updates, outcome = future.result()
+                    batch_results = future.result()
+                except Exception:
+                    batch_results = [
+                        (position, None, {}, BulkProcessingOutcome.FAILED)
+                        for position, _ in future_to_batch[future]
+                    ]
+                for position, new_pgn, field_updates, outcome in batch_results:
+                    game = games_to_process[position]
+                    completed += 1
                     if outcome == BulkProcessingOutcome.UPDATED:
                         if new_pgn:
+                            old_pgn = game.pgn
                             game.pgn = new_pgn
+                            AnalysisDataStorageService.sync_sidecar_after_pgn_edit(game, old_pgn)
                             if isinstance(field_updates, dict):
                                 apply_game_data_updates(game, field_updates)
                             updated_games.append(game)
@@ -331,15 +375,8 @@ class BulkPlanService:
                     else:
                         failed_game_ids.append(id(game))
                         games_failed += 1
-                except Exception:
-                    failed_game_ids.append(id(game))
-                    games_failed += 1
-
-                if progress_callback and (
-                    completed == 1
-                    or completed == total_games
-                    or completed % 8 == 0
-                ):
+
+                if progress_callback:
                     progress_callback(
                         completed,
                         total_games,
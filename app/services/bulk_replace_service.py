@@ -1,7 +1,9 @@
 """Bulk Smart Update service (Result / ECO) for database operations."""
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Sequence, Tuple
 from io import StringIO
 
 import chess
@@ -10,13 +12,80 @@ import chess.pgn
 from app.models.database_model import DatabaseModel
 from app.services.bulk_operation_stats import (
     BulkOperationStats,
+    BulkProcessingOutcome,
     BulkProgressCallback,
     emit_bulk_progress_phase_complete,
+    release_process_pool_executor,
 )
 from app.services.uci_communication_service import UCICommunicationService
 from app.services.opening_service import OpeningService
 from app.services.pgn_service import PgnService
-from app.services.logging_service import LoggingService
+from app.services.logging_service import LoggingService, init_worker_logging
+from app.utils.concurrency_utils import (
+    get_process_pool_batch_size,
+    get_process_pool_max_workers,
+    iter_batches,
+)
+
+# Below this many games, ECO update runs inline (pool startup would dominate).
+_ECO_INLINE_MAX_GAMES = 32
+
+# (position in games_to_process, PGN text, indexed per-ply fuzzy hashes or None)
+EcoJob = Tuple[int, str, Optional[List[int]]]
+# (position, new PGN, new ECO code, outcome)
+EcoJobResult = Tuple[int, Optional[str], Optional[str], BulkProcessingOutcome]
+
+# Opening book for this worker, opened once by _init_eco_worker (not pickled per game).
+_worker_opening_service: Optional[OpeningService] = None
+
+
+def _process_game_for_eco(
+    opening_service: OpeningService,
+    game_pgn: str,
+    position_hashes: Optional[List[int]] = None,
+) -> Tuple[Optional[str], Optional[str], BulkProcessingOutcome]:
+    """Classify one game and rewrite its ECO tag if it differs.
+
+    Returns:
+        (new PGN, ECO code, outcome). The PGN and code are None unless the game
+        was updated. Games without a classification keep their existing tag.
+    """
+    try:
+        eco_code = opening_service.get_final_eco_for_game(game_pgn, position_hashes)
+        if eco_code is None:
+            return None, None, BulkProcessingOutcome.SKIPPED
+
+        chess_game = chess.pgn.read_game(StringIO(game_pgn))
+        if not chess_game:
+            return None, None, BulkProcessingOutcome.FAILED
+
+        # Only rewrite the PGN when the tag actually changes
+        if chess_game.headers.get("ECO", "").strip() == eco_code:
+            return None, None, BulkProcessingOutcome.SKIPPED
+
+        chess_game.headers["ECO"] = eco_code
+        return PgnService.export_game_to_pgn(chess_game), eco_code, BulkProcessingOutcome.UPDATED
+    except Exception:
+        return None, None, BulkProcessingOutcome.FAILED
+
+
+def _init_eco_worker(log_queue: Any, config: Dict[str, Any]) -> None:
+    """ProcessPoolExecutor initializer: open the compiled ECO index once per worker."""
+    global _worker_opening_service
+    init_worker_logging(log_queue)
+    _worker_opening_service = OpeningService.get_instance(config)
+    _worker_opening_service.load()
+
+
+def _process_eco_batch(jobs: Sequence[EcoJob]) -> List[EcoJobResult]:
+    """Classify a batch of games with the worker's opening book (ProcessPool worker entry point)."""
+    results: List[EcoJobResult] = []
+    for position, game_pgn, position_hashes in jobs:
+        new_pgn, eco_code, outcome = _process_game_for_eco(
+            _worker_opening_service, game_pgn, position_hashes
+        )
+        results.append((position, new_pgn, eco_code, outcome))
+    return results
 
 
 class BulkReplaceService:
@@ -425,6 +494,10 @@ class BulkReplaceService:
     ) -> BulkOperationStats:
         """Update ECO tags from OpeningService.get_final_eco_for_game.
 
+        Large selections are classified in a process pool (each worker opens
+        the compiled ECO index once); small ones run inline with
+        ``opening_service``.
+
         Args:
             database: DatabaseModel instance to process.
             opening_service: OpeningService instance for ECO lookup.
@@ -467,67 +540,49 @@ class BulkReplaceService:
         updated_game_ids: List[int] = []
         failed_game_ids: List[int] = []
         
-        # Process each game
-        for idx, game in enumerate(games_to_process):
-            if cancel_flag and cancel_flag():
-                break
-            games_processed_count += 1
-
-            try:
-                # Get final ECO code for this game
-                eco_code = opening_service.get_final_eco_for_game(game.pgn)
-                
-                # If no ECO found, skip (don't overwrite existing tag)
-                if eco_code is None:
+        # Indexed per-ply hashes let classification skip the PGN replay
+        jobs: List[EcoJob] = [
+            (position, game.pgn, database.get_position_hashes_fuzzy(game))
+            for position, game in enumerate(games_to_process)
+        ]
+        max_workers = get_process_pool_max_workers(os.cpu_count(), self.config)
+        
+        def merge(batch_results: List[EcoJobResult]) -> None:
+            nonlocal games_processed_count, games_updated, games_failed, games_skipped
+            for position, new_pgn, eco_code, outcome in batch_results:
+                game = games_to_process[position]
+                games_processed_count += 1
+                if outcome == BulkProcessingOutcome.UPDATED and new_pgn:
+                    game.pgn = new_pgn
+                    game.eco = eco_code
+                    updated_games.append(game)
+                    updated_game_ids.append(id(game))
+                    games_updated += 1
+                elif outcome == BulkProcessingOutcome.SKIPPED:
                     games_skipped += 1
-                    continue
-                
-                # Parse PGN to check current ECO tag
-                pgn_io = StringIO(game.pgn)
-                chess_game = chess.pgn.read_game(pgn_io)
-                
-                if not chess_game:
+                else:
                     failed_game_ids.append(id(game))
                     games_failed += 1
-                    continue
-                
-                # Get current ECO tag from headers
-                current_eco = chess_game.headers.get("ECO", "").strip()
-                
-                # If current ECO equals identified ECO, skip (no update needed)
-                if current_eco == eco_code:
-                    games_skipped += 1
-                    continue
-                
-                # Update ECO tag (only if different)
-                chess_game.headers["ECO"] = eco_code
-                
-                # Regenerate PGN
-                new_pgn = PgnService.export_game_to_pgn(chess_game)
-                
-                # Update game data
-                game.pgn = new_pgn
-                game.eco = eco_code
-                
-                # Collect game for batch update
-                updated_games.append(game)
-                updated_game_ids.append(id(game))
-                games_updated += 1
-                
-            except Exception:
-                failed_game_ids.append(id(game))
-                games_failed += 1
-                continue
-            finally:
-                if progress_callback:
-                    progress_callback(
-                        games_processed_count,
-                        total_games,
-                        f"Processing game {games_processed_count}/{total_games}",
-                        games_updated,
-                        games_failed,
-                        games_skipped,
-                    )
+            if progress_callback:
+                progress_callback(
+                    games_processed_count,
+                    total_games,
+                    f"Processing game {games_processed_count}/{total_games}",
+                    games_updated,
+                    games_failed,
+                    games_skipped,
+                )
+        
+        if total_games <= _ECO_INLINE_MAX_GAMES or max_workers <= 1:
+            for position, game_pgn, position_hashes in jobs:
+                if cancel_flag and cancel_flag():
+                    break
+                new_pgn, eco_code, outcome = _process_game_for_eco(
+                    opening_service, game_pgn, position_hashes
+                )
+                merge([(position, new_pgn, eco_code, outcome)])
+        else:
+            self._run_eco_pool(jobs, merge, max_workers, cancel_flag)
         
         emit_bulk_progress_phase_complete(
             progress_callback,
@@ -550,3 +605,45 @@ class BulkReplaceService:
             reindex_positions=True,
         )
 
+    def _run_eco_pool(
+        self,
+        jobs: List[EcoJob],
+        merge: Callable[[List[EcoJobResult]], None],
+        max_workers: int,
+        cancel_flag: Optional[Callable[[], bool]],
+    ) -> None:
+        """Classify ECO jobs in a process pool, merging results as batches finish.
+
+        The parent has already loaded the opening book, so the compiled index
+        file exists and each worker only memory-maps it.
+        """
+        executor = None
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_eco_worker,
+                initargs=(LoggingService.get_queue(), self.config),
+            )
+            batch_size = get_process_pool_batch_size(len(jobs), max_workers, self.config)
+            future_to_batch = {
+                executor.submit(_process_eco_batch, batch): batch
+                for batch in iter_batches(jobs, batch_size)
+            }
+            for future in as_completed(future_to_batch):
+                if cancel_flag and cancel_flag():
+                    for f in future_to_batch:
+                        if f != future:
+                            f.cancel()
+                    break
+                try:
+                    batch_results = future.result()
+                except Exception:
+                    batch_results = [
+                        (position, None, None, BulkProcessingOutcome.FAILED)
+                        for position, _, _ in future_to_batch[future]
+                    ]
+                merge(batch_results)
+        finally:
+            if executor is not None:
+                release_process_pool_executor(executor)
+
@@ -1,14 +1,41 @@
 """Service for searching games in databases based on criteria."""
 
-from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from io import StringIO
 import chess.pgn
 import chess
 
 from app.models.database_model import GameData, DatabaseModel
-from app.models.search_criteria import SearchCriteria, SearchField, SearchOperator
+from app.models.search_criteria import LogicOperator, SearchCriteria, SearchField, SearchOperator
 from app.services.date_matcher import DateMatcher
+from app.services.logging_service import LoggingService
+from app.services.position_sequence_search import PositionSequence, find_position_sequences
+from app.services.search_query_planner import plan_search
 from app.utils.game_tags_utils import parse_game_tags
+from app.utils.position_keys import pawn_structure_key
+
+# Games tested between streamed batches (see DatabaseSearchService.iter_search_batches).
+SEARCH_SCAN_CHUNK = 2000
+
+# Position-like fields -> evaluation context key of their precomputed matches.
+POSITION_MATCH_KEYS = {
+    SearchField.POSITION: "position_matches",
+    SearchField.POSITION_FUZZY: "position_matches_fuzzy",
+    SearchField.PAWN_STRUCTURE: "position_matches_pawns",
+}
+# Evaluation context key of the precomputed Position sequence matches (sequence -> id(game) -> plies).
+POSITION_SEQUENCE_MATCHES_KEY = "position_sequence_matches"
+
+
+@dataclass
+class SearchBatch:
+    """Matches found in one scanned chunk of a streamed search."""
+
+    database_index: int  # Index into the searched databases list
+    matches: List[tuple]  # (GameData, database_name) or (GameData, database_name, ref_ply)
+    scanned: int  # Games tested so far, across all databases
+    total: int  # Games to test in this search
 
 
 class DatabaseSearchService:
@@ -18,7 +45,8 @@ class DatabaseSearchService:
     def search_databases(
         databases: List[DatabaseModel],
         criteria: List[SearchCriteria],
-        database_names: Optional[List[str]] = None
+        database_names: Optional[List[str]] = None,
+        candidates: Optional[List[Optional[List[GameData]]]] = None,
     ) -> List[tuple[GameData, str]]:
         """Search games across multiple databases.
         
@@ -27,46 +55,71 @@ class DatabaseSearchService:
             criteria: List of SearchCriteria to apply.
             database_names: Optional list of database names corresponding to databases list.
                           If None, will use "Database 1", "Database 2", etc.
+            candidates: Optional per-database game lists to test instead of all games
+                        (see iter_search_batches).
             
         Returns:
             List of tuples (GameData, database_name) for games that match all criteria.
         """
+        matching_games: List[tuple] = []
+        for batch in DatabaseSearchService.iter_search_batches(
+            databases, criteria, database_names, candidates=candidates
+        ):
+            matching_games.extend(batch.matches)
+        return matching_games  # type: ignore[return-value]
+    
+    @staticmethod
+    def uses_position_index(criteria: List[SearchCriteria]) -> bool:
+        """Whether evaluating the criteria reads the databases' position indexes."""
+        return any(c.field in POSITION_MATCH_KEYS or c.field == SearchField.POSITION_SEQUENCE for c in criteria)
+
+    @staticmethod
+    def iter_search_batches(
+        databases: List[DatabaseModel],
+        criteria: List[SearchCriteria],
+        database_names: Optional[List[str]] = None,
+        *,
+        candidates: Optional[List[Optional[List[GameData]]]] = None,
+        scan_chunk: int = SEARCH_SCAN_CHUNK,
+    ) -> Iterator[SearchBatch]:
+        """Search games across multiple databases, yielding matches as they are found.
+        
+        A batch is yielded after every ``scan_chunk`` games tested (possibly with no
+        matches) so callers can show progress and stop early by abandoning the iterator.
+        Criteria are evaluated through a query plan (see search_query_planner), which
+        skips games that cannot match and tests the cheapest criteria first.
+        
+        Args:
+            databases: List of DatabaseModel instances to search.
+            criteria: List of SearchCriteria to apply.
+            database_names: Optional list of database names corresponding to databases list.
+            candidates: Optional list parallel to ``databases``; a non-None entry is the only
+                        games tested for that database (e.g. the matches of a broader query,
+                        see is_refinement).
+            scan_chunk: Games tested between yielded batches.
+        """
         if not criteria:
-            return []
+            return
         
-        # Build criteria tree for evaluation
-        criteria_tree = DatabaseSearchService._build_criteria_tree(criteria)
-
-        # Precompute position matches per database (exact + fuzzy).
-        position_hashes: List[int] = []
-        position_hashes_fuzzy: List[int] = []
+        # Precompute position matches per database (exact, fuzzy, pawn structure, sequences).
+        position_keys: Dict[SearchField, List[int]] = {}
+        sequences: List[PositionSequence] = []
         for c in criteria:
-            if c.field in (SearchField.POSITION, SearchField.POSITION_FUZZY):
-                try:
-                    if isinstance(c.value, int):
-                        (position_hashes_fuzzy if c.field == SearchField.POSITION_FUZZY else position_hashes).append(int(c.value))
-                    elif isinstance(c.value, str) and c.value.strip():
-                        from chess.polyglot import zobrist_hash
-                        b = chess.Board(c.value.strip().splitlines()[0].strip())
-                        if c.field == SearchField.POSITION_FUZZY:
-                            cr0 = getattr(b, "castling_rights", 0)
-                            ep0 = getattr(b, "ep_square", None)
-                            try:
-                                b.castling_rights = 0
-                                b.ep_square = None
-                                position_hashes_fuzzy.append(int(zobrist_hash(b)))
-                            finally:
-                                b.castling_rights = cr0
-                                b.ep_square = ep0
-                        else:
-                            position_hashes.append(int(zobrist_hash(b)))
-                except Exception:
-                    pass
-        position_hashes = sorted(set(position_hashes))
-        position_hashes_fuzzy = sorted(set(position_hashes_fuzzy))
-        
-        # Collect matching games from all databases
-        matching_games: List[tuple] = []
+            if c.field in POSITION_MATCH_KEYS:
+                h = DatabaseSearchService.position_key(c.field, c.value)
+                if h and h not in position_keys.setdefault(c.field, []):
+                    position_keys[c.field].append(h)
+            elif c.field == SearchField.POSITION_SEQUENCE and isinstance(c.value, PositionSequence):
+                if c.value not in sequences:
+                    sequences.append(c.value)
+        
+        game_lists: List[List[GameData]] = []
+        for idx, database in enumerate(databases):
+            subset = candidates[idx] if candidates is not None and idx < len(candidates) else None
+            game_lists.append(list(subset) if subset is not None else database.get_all_games())
+        total = sum(len(games) for games in game_lists)
+        scanned = 0
+        chunk = max(1, int(scan_chunk))
         
         for idx, database in enumerate(databases):
             # Get database name
@@ -75,39 +128,121 @@ class DatabaseSearchService:
             else:
                 db_name = f"Database {idx + 1}"
 
-            position_matches: Dict[int, Dict[int, int]] = {}
-            position_matches_fuzzy: Dict[int, Dict[int, int]] = {}
-            if position_hashes:
-                for h in position_hashes:
-                    position_matches[h] = database.get_position_matches(int(h))
-            if position_hashes_fuzzy:
-                for h in position_hashes_fuzzy:
-                    position_matches_fuzzy[h] = database.get_position_matches_fuzzy(int(h))
+            lookups = {
+                SearchField.POSITION: database.get_position_matches,
+                SearchField.POSITION_FUZZY: database.get_position_matches_fuzzy,
+                SearchField.PAWN_STRUCTURE: database.get_position_matches_pawns,
+            }
+            ctx: Dict[str, Any] = {}
+            # Ordered exact, fuzzy, pawns: the first hit gives Search Results' ref_ply
+            ref_ply_sources: List[Dict[int, int]] = []
+            for field, key in POSITION_MATCH_KEYS.items():
+                position_matches = {h: lookups[field](h) for h in sorted(position_keys.get(field, []))}
+                ctx[key] = position_matches
+                ref_ply_sources.extend(position_matches.values())
+            sequence_matches: Dict[PositionSequence, Dict[int, List[int]]] = {}
+            for sequence in sequences:
+                try:
+                    sequence_matches[sequence] = find_position_sequences(database, sequence.steps())
+                except ValueError:
+                    sequence_matches[sequence] = {}
+                # A sequence's ref_ply is where its last position is reached
+                ref_ply_sources.append({gid: chain[-1] for gid, chain in sequence_matches[sequence].items()})
+            ctx[POSITION_SEQUENCE_MATCHES_KEY] = sequence_matches
+            plan = plan_search(criteria, database, database.get_all_games(), DatabaseSearchService._evaluate_criterion, ctx)
+            LoggingService.get_instance().debug(
+                f"Search plan for {db_name}: {plan.describe()} "
+                f"candidates={'all' if plan.candidates is None else len(plan.candidates)}"
+            )
+            plan_matches = plan.matches
+            plan_candidates = plan.candidates
             
-            games = database.get_all_games()
-            for game in games:
-                ctx = {"position_matches": position_matches, "position_matches_fuzzy": position_matches_fuzzy}
-                if DatabaseSearchService._evaluate_criteria_tree(game, criteria_tree, ctx):
-                    # Provide ref_ply for Search Results if we matched by position.
-                    ref_ply = 0
-                    if position_hashes:
-                        for h in position_hashes:
-                            ply = position_matches.get(h, {}).get(id(game), 0)
-                            if ply:
-                                ref_ply = ply
+            games = game_lists[idx]
+            for start in range(0, len(games), chunk):
+                matches: List[tuple] = []
+                chunk_games = games[start:start + chunk]
+                if plan_candidates is not None:
+                    # Games outside the candidate set cannot match; keep database order
+                    chunk_games = [game for game in chunk_games if id(game) in plan_candidates]
+                for game in chunk_games:
+                    if plan_matches(game):
+                        # Provide ref_ply for Search Results if we matched by position.
+                        ref_ply = 0
+                        for hits in ref_ply_sources:
+                            ref_ply = hits.get(id(game), 0)
+                            if ref_ply:
                                 break
-                    if not ref_ply and position_hashes_fuzzy:
-                        for h in position_hashes_fuzzy:
-                            ply = position_matches_fuzzy.get(h, {}).get(id(game), 0)
-                            if ply:
-                                ref_ply = ply
-                                break
-                    if ref_ply:
-                        matching_games.append((game, db_name, ref_ply))
-                    else:
-                        matching_games.append((game, db_name))
-        
-        return matching_games  # type: ignore[return-value]
+                        if ref_ply:
+                            matches.append((game, db_name, ref_ply))
+                        else:
+                            matches.append((game, db_name))
+                scanned += min(chunk, len(games) - start)
+                yield SearchBatch(database_index=idx, matches=matches, scanned=scanned, total=total)
+    
+    @staticmethod
+    def is_refinement(previous: List[SearchCriteria], current: List[SearchCriteria]) -> bool:
+        """Return True if every game matching ``current`` also matches ``previous``.
+        
+        Criteria combine left to right with AND/OR, both monotone, so the match set can
+        only shrink when ``current`` keeps ``previous`` as is except that some text or
+        numeric values are tightened (e.g. "contains Carl" -> "contains Carlsen", "Elo >= 2400"
+        -> "Elo >= 2500"), and optionally appends AND-ed criteria without groups.
+        Used to search only the previous results instead of whole databases.
+        """
+        if not previous or len(current) < len(previous):
+            return False
+        for old, new in zip(previous, current):
+            if (
+                old.field != new.field
+                or old.operator != new.operator
+                or old.logic_operator != new.logic_operator
+                or old.custom_tag_name != new.custom_tag_name
+                or old.is_group_start != new.is_group_start
+                or old.is_group_end != new.is_group_end
+                or old.group_level != new.group_level
+            ):
+                return False
+            if old.value != new.value and not DatabaseSearchService._is_narrower_value(old, new.value):
+                return False
+        for extra in current[len(previous):]:
+            if extra.logic_operator == LogicOperator.OR or extra.is_group_start or extra.is_group_end:
+                return False
+        return True
+    
+    @staticmethod
+    def _is_narrower_value(criterion: SearchCriteria, new_value: Any) -> bool:
+        """Whether replacing the criterion's value by ``new_value`` can only drop matches."""
+        if (
+            criterion.field in (SearchField.TAGS, SearchField.POSITION_SEQUENCE)
+            or criterion.field in POSITION_MATCH_KEYS
+        ):
+            return False
+        operator = criterion.operator
+        if operator in (SearchOperator.CONTAINS, SearchOperator.STARTS_WITH, SearchOperator.ENDS_WITH):
+            if not isinstance(criterion.value, str) or not isinstance(new_value, str):
+                return False
+            old_text = criterion.value.lower()
+            new_text = new_value.lower()
+            if operator == SearchOperator.CONTAINS:
+                return old_text in new_text
+            if operator == SearchOperator.STARTS_WITH:
+                return new_text.startswith(old_text)
+            return new_text.endswith(old_text)
+        if operator in (
+            SearchOperator.GREATER_THAN,
+            SearchOperator.GREATER_THAN_OR_EQUAL,
+            SearchOperator.LESS_THAN,
+            SearchOperator.LESS_THAN_OR_EQUAL,
+        ):
+            try:
+                old_num = float(criterion.value)
+                new_num = float(new_value)
+            except (ValueError, TypeError):
+                return False
+            if operator in (SearchOperator.GREATER_THAN, SearchOperator.GREATER_THAN_OR_EQUAL):
+                return new_num >= old_num
+            return new_num <= old_num
+        return False
     
     @staticmethod
     def _build_criteria_tree(criteria: List[SearchCriteria]) -> Dict[str, Any]:
@@ -361,6 +496,30 @@ class DatabaseSearchService:
                 result = result and results[i]
         return result
     
+    @staticmethod
+    def position_key(field: SearchField, value: Any) -> int:
+        """Position index key a criterion on ``field`` searches for (0 if ``value`` is not a position).
+
+        The value is a key or a FEN. Position uses the FEN's Zobrist hash, Position
+        (fuzzy) the hash without castling rights and en passant square, Pawn
+        structure its pawn_structure_key.
+        """
+        try:
+            if isinstance(value, int):
+                return int(value)
+            if not isinstance(value, str) or not value.strip():
+                return 0
+            from chess.polyglot import zobrist_hash
+            b = chess.Board(value.strip().splitlines()[0].strip())
+            if field == SearchField.PAWN_STRUCTURE:
+                return pawn_structure_key(b)
+            if field == SearchField.POSITION_FUZZY:
+                b.castling_rights = 0
+                b.ep_square = None
+            return int(zobrist_hash(b))
+        except Exception:
+            return 0
+
     @staticmethod
     def _evaluate_criterion(game: GameData, criterion: SearchCriteria, context: Optional[Dict[str, Any]] = None) -> bool:
         """Evaluate a single criterion against a game.
@@ -379,33 +538,12 @@ class DatabaseSearchService:
         operator = criterion.operator
         value = criterion.value
 
-        # Position matches: lookup in precomputed database index (exact or fuzzy).
-        if criterion.field in (SearchField.POSITION, SearchField.POSITION_FUZZY):
-            try:
-                if isinstance(value, int):
-                    h = int(value)
-                elif isinstance(value, str) and value.strip():
-                    from chess.polyglot import zobrist_hash
-                    b = chess.Board(value.strip().splitlines()[0].strip())
-                    if criterion.field == SearchField.POSITION_FUZZY:
-                        cr0 = getattr(b, "castling_rights", 0)
-                        ep0 = getattr(b, "ep_square", None)
-                        try:
-                            b.castling_rights = 0
-                            b.ep_square = None
-                            h = int(zobrist_hash(b))
-                        finally:
-                            b.castling_rights = cr0
-                            b.ep_square = ep0
-                    else:
-                        h = int(zobrist_hash(b))
-                else:
-                    h = 0
-            except Exception:
-                return False
+        # Position matches: lookup in precomputed database index (exact, fuzzy or pawn structure).
+        if criterion.field in POSITION_MATCH_KEYS:
+            h = DatabaseSearchService.position_key(criterion.field, value)
             if not h:
                 return False
-            pm_key = "position_matches_fuzzy" if criterion.field == SearchField.POSITION_FUZZY else "position_matches"
+            pm_key = POSITION_MATCH_KEYS[criterion.field]
             pm = (context or {}).get(pm_key, {}) if context else {}
             hits = pm.get(h, {}) if isinstance(pm, dict) else {}
             is_hit = bool(hits.get(id(game), 0))
@@ -413,6 +551,15 @@ class DatabaseSearchService:
                 return not is_hit
             return is_hit
 
+        # Position sequences: lookup in the chains precomputed for the sequence.
+        if criterion.field == SearchField.POSITION_SEQUENCE:
+            sm = (context or {}).get(POSITION_SEQUENCE_MATCHES_KEY, {}) if context else {}
+            chains = sm.get(value, {}) if isinstance(sm, dict) else {}
+            is_hit = id(game) in chains
+            if operator == SearchOperator.NOT_EQUALS:
+                return not is_hit
+            return is_hit
+
         # Tags: only allow membership operators (whole-tag match, case-insensitive).
         if criterion.field == SearchField.TAGS:
             raw = getattr(game, "game_tags_raw", "") or ""
@@ -0,0 +1,671 @@
+"""Compiled, memory-mapped ECO opening index.
+
+The ECO sources (``eco_base.json`` and ``eco_interpolated.json``) are compiled
+once into a compact binary file. Later launches (and worker processes)
+memory-map that file instead of parsing JSON and rebuilding the lookup maps.
+Positions are keyed by a 64-bit Zobrist hash of piece placement plus side to
+move (castling rights, en passant and clocks are ignored, like
+``OpeningService.book_key``). The hash uses the Polyglot random table, so it
+equals ``chess.polyglot.zobrist_hash`` for positions without castling rights
+or en passant squares.
+
+The compiled file is rebuilt automatically when the JSON sources change (their
+size or modification time differs from the signature stored in the file).
+
+File layout (little-endian): an 8-byte magic, ``u32`` format version, ``u32``
+section count, then ``(u64 offset, u64 length)`` per section. Sections are
+8-byte aligned:
+
+- signature: UTF-8 JSON describing the source files
+- string offsets (``u32``) and string data (UTF-8) for FENs, ECO codes, names, moves
+- entries: four ``u32`` string ids per row (fen, eco, name, moves); base rows
+  first, then interpolated rows, in source order
+- classified keys (``u64``) and entry ids (``u32``): curated base name per position
+- collision keys (``u64``), group starts (``u32``) and entry ids (``u32``):
+  base rows that share a position key, for exact-FEN matching
+- theory keys (``u64``): every base and interpolated position
+- classified reach (``u32`` pairs): distinct (home-pawn mask, minimum piece count)
+  over curated positions, used to tell when a game can no longer reach a named
+  position (pawns never return to their start squares and material never grows)
+- theory graph: node keys (``u64``, every theory position plus the starting
+  position), edge starts (``u32``), child keys (``u64``) and moves (``u16``,
+  ``from | to << 6 | promotion << 12``) for each legal move that lands on another
+  theory position. Castling and en passant are left out: they depend on rights
+  that differ between FENs sharing a key, so callers add them per board
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import chess
+import chess.polyglot
+
+
+ECO_INDEX_MAGIC = b"CARAECOI"
+ECO_INDEX_VERSION = 3
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<QQ")
+_SECTION_NAMES = (
+    "signature",
+    "string_offsets",
+    "string_data",
+    "entries",
+    "classified_keys",
+    "classified_entries",
+    "collision_keys",
+    "collision_starts",
+    "collision_entries",
+    "theory_keys",
+    "classified_reach",
+    "graph_nodes",
+    "graph_starts",
+    "graph_children",
+    "graph_moves",
+)
+_ENTRY_FIELDS = 4
+
+_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+_TURN_WHITE = _RANDOM[780]
+# Polyglot piece index: black pawn 0, white pawn 1, black knight 2, ...
+_PIECE_INDEX = {
+    symbol: (chess.PIECE_SYMBOLS.index(symbol.lower()) - 1) * 2 + int(symbol.isupper())
+    for symbol in "pnbrqkPNBRQK"
+}
+_EMPTY_RUNS = {str(n): n for n in range(1, 9)}
+
+
+def book_hash(board: chess.Board) -> int:
+    """64-bit book key of a board: piece placement plus side to move.
+
+    Args:
+        board: Position to hash.
+
+    Returns:
+        Zobrist hash (castling rights, en passant and clocks are ignored).
+    """
+    key = _TURN_WHITE if board.turn == chess.WHITE else 0
+    for color in chess.COLORS:
+        for piece_type in chess.PIECE_TYPES:
+            base = 64 * ((piece_type - 1) * 2 + int(color))
+            for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                key ^= _RANDOM[base + square]
+    return key
+
+
+def child_book_hash(board: chess.Board, key: int, move: chess.Move) -> int:
+    """Book key after a legal move, updated incrementally from the key before it.
+
+    Args:
+        board: Position before the move (not modified).
+        key: ``book_hash(board)``.
+        move: Legal move on ``board``.
+
+    Returns:
+        Same value as pushing the move and calling ``book_hash``.
+    """
+    color = board.turn
+    piece_type = board.piece_type_at(move.from_square)
+    side = int(color)
+    key ^= _TURN_WHITE ^ _RANDOM[64 * ((piece_type - 1) * 2 + side) + move.from_square]
+    if board.is_castling(move):
+        rank_start = move.from_square & ~7
+        kingside = board.is_kingside_castling(move)
+        rook_from = chess.square_file(move.to_square) if board.chess960 else (7 if kingside else 0)
+        rook_base = 64 * ((chess.ROOK - 1) * 2 + side)
+        return (
+            key
+            ^ _RANDOM[64 * ((chess.KING - 1) * 2 + side) + rank_start + (6 if kingside else 2)]
+            ^ _RANDOM[rook_base + rank_start + rook_from]
+            ^ _RANDOM[rook_base + rank_start + (5 if kingside else 3)]
+        )
+    if board.is_en_passant(move):
+        captured_square = move.to_square + (-8 if color == chess.WHITE else 8)
+        key ^= _RANDOM[64 * ((chess.PAWN - 1) * 2 + 1 - side) + captured_square]
+    else:
+        captured = board.piece_type_at(move.to_square)
+        if captured:
+            key ^= _RANDOM[64 * ((captured - 1) * 2 + 1 - side) + move.to_square]
+    placed = move.promotion or piece_type
+    return key ^ _RANDOM[64 * ((placed - 1) * 2 + side) + move.to_square]
+
+
+def _move_code(move: chess.Move) -> int:
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def _move_from_code(code: int) -> chess.Move:
+    return chess.Move(code & 0x3F, (code >> 6) & 0x3F, (code >> 12) or None)
+
+
+def home_pawn_mask(board: chess.Board) -> int:
+    """16-bit mask of pawns still on their start squares (white a2-h2 low, black a7-h7 high)."""
+    pawns = board.pawns
+    white = (pawns & board.occupied_co[chess.WHITE] & chess.BB_RANK_2) >> 8
+    black = (pawns & board.occupied_co[chess.BLACK] & chess.BB_RANK_7) >> 48
+    return white | (black << 8)
+
+
+def filter_reachable(
+    reach: Sequence[Tuple[int, int]], home_mask: int, piece_count: int
+) -> List[Tuple[int, int]]:
+    """Keep the (home-pawn mask, piece count) constraints still reachable from a position.
+
+    A target position is reachable only if its home pawns are a subset of the
+    current ones and it has no more pieces than the current position. Both only
+    shrink as a game goes on, so a constraint dropped once never comes back.
+    """
+    return [
+        (mask, count) for mask, count in reach
+        if count <= piece_count and not (mask & ~home_mask)
+    ]
+
+
+def _rank_hash(rank: int, row: str) -> Optional[int]:
+    """XOR of piece keys for one FEN rank string (None if malformed)."""
+    key = 0
+    file = 0
+    for char in row:
+        run = _EMPTY_RUNS.get(char)
+        if run is not None:
+            file += run
+            continue
+        piece_index = _PIECE_INDEX.get(char)
+        if piece_index is None or file > 7:
+            return None
+        key ^= _RANDOM[64 * piece_index + 8 * rank + file]
+        file += 1
+    return key if file == 8 else None
+
+
+def _placement_hash(placement: str) -> Optional[int]:
+    rows = placement.split("/")
+    if len(rows) != 8:
+        return None
+    key = 0
+    for i, row in enumerate(rows):
+        partial = _rank_hash(7 - i, row)
+        if partial is None:
+            return None
+        key ^= partial
+    return key
+
+
+# Placement string -> hash (None if malformed). Book and game positions repeat a
+# lot, so most probes are one dict hit instead of a per-character loop.
+_placement_hash_cache: Dict[str, Optional[int]] = {}
+_PLACEMENT_HASH_CACHE_MAX = 1 << 16
+
+
+def book_hash_from_fen(fen: str) -> Optional[int]:
+    """Book key of a FEN string without building a board.
+
+    Args:
+        fen: Full FEN, or at least placement and side to move.
+
+    Returns:
+        Same value as ``book_hash(chess.Board(fen))``, or None if the placement or
+        side to move cannot be parsed.
+    """
+    fields = str(fen or "").split(" ")
+    if len(fields) < 2:
+        return None
+    turn = fields[1]
+    if turn == "w":
+        key = _TURN_WHITE
+    elif turn == "b":
+        key = 0
+    else:
+        return None
+    placement = fields[0]
+    try:
+        placement_key = _placement_hash_cache[placement]
+    except KeyError:
+        placement_key = _placement_hash(placement)
+        if len(_placement_hash_cache) >= _PLACEMENT_HASH_CACHE_MAX:
+            _placement_hash_cache.clear()
+        _placement_hash_cache[placement] = placement_key
+    if placement_key is None:
+        return None
+    return key ^ placement_key
+
+
+@dataclass(frozen=True)
+class EcoIndexEntry:
+    """One ECO book row decoded from the compiled index."""
+
+    fen: str
+    eco: str
+    name: str
+    moves: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Entry as the ``{'eco', 'name', 'moves'}`` mapping used by OpeningService."""
+        return {"eco": self.eco, "name": self.name, "moves": self.moves}
+
+
+def source_signature(source_files: Sequence[Path]) -> str:
+    """Describe the ECO source files (name, size, mtime) for staleness checks."""
+    parts: List[Dict[str, Any]] = []
+    for path in source_files:
+        try:
+            stat = path.stat()
+            parts.append({"file": path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+        except OSError:
+            parts.append({"file": path.name, "size": None, "mtime_ns": None})
+    return json.dumps({"version": ECO_INDEX_VERSION, "sources": parts}, sort_keys=True)
+
+
+def _move_depth(moves: str) -> int:
+    # Local import: opening_service imports this module.
+    from app.services.opening_service import parse_move_sans
+    return len(parse_move_sans(moves))
+
+
+def _iter_book_entries(book: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for fen, entry in book.items():
+        if isinstance(entry, dict):
+            yield str(fen), entry
+
+
+def compile_eco_index(
+    eco_base: Dict[str, Any],
+    eco_interpolated: Dict[str, Any],
+    signature: str = "",
+) -> bytes:
+    """Compile ECO source dictionaries into the binary index format.
+
+    Args:
+        eco_base: Parsed ``eco_base.json`` (FEN → entry).
+        eco_interpolated: Parsed ``eco_interpolated.json`` (FEN → entry).
+        signature: Source signature stored in the file (see ``source_signature``).
+
+    Returns:
+        Compiled index bytes.
+    """
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def string_id(value: Any) -> int:
+        text = str(value or "")
+        sid = string_ids.get(text)
+        if sid is None:
+            sid = len(strings)
+            string_ids[text] = sid
+            strings.append(text)
+        return sid
+
+    entries: List[int] = []
+    base_count = 0
+    # key -> (entry id, depth); on a collision keep the longer canonical line
+    classified: Dict[int, Tuple[int, int]] = {}
+    base_groups: Dict[int, List[int]] = {}
+    theory_keys = set()
+    reach: Dict[int, int] = {}
+    # One board per position key (placement + side to move) for the theory graph
+    boards: Dict[int, Optional[chess.Board]] = {}
+
+    for is_base, book in ((True, eco_base or {}), (False, eco_interpolated or {})):
+        for fen, entry in _iter_book_entries(book):
+            entry_id = len(entries) // _ENTRY_FIELDS
+            entries.extend((
+                string_id(fen),
+                string_id(entry.get("eco")),
+                string_id(entry.get("name")),
+                string_id(entry.get("moves")),
+            ))
+            key = book_hash_from_fen(fen)
+            if key is None:
+                continue
+            theory_keys.add(key)
+            board = boards.get(key)
+            if board is None:
+                try:
+                    board = chess.Board(fen)
+                except ValueError:
+                    board = None
+                boards[key] = board
+            if not is_base:
+                continue
+            base_count += 1
+            base_groups.setdefault(key, []).append(entry_id)
+            depth = _move_depth(str(entry.get("moves") or ""))
+            if board is not None:
+                mask = home_pawn_mask(board)
+                count = chess.popcount(board.occupied)
+                reach[mask] = min(count, reach.get(mask, count))
+            prev = classified.get(key)
+            if prev is None or depth > prev[1]:
+                classified[key] = (entry_id, depth)
+
+    start = chess.Board()
+    boards.setdefault(book_hash(start), start)
+    graph_nodes = sorted(key for key, board in boards.items() if board is not None)
+    graph_starts = [0]
+    graph_children: List[int] = []
+    graph_moves: List[int] = []
+    for key in graph_nodes:
+        board = boards[key]
+        children = set()
+        for move in board.legal_moves:
+            if board.is_castling(move) or board.is_en_passant(move):
+                continue
+            child = child_book_hash(board, key, move)
+            if child in theory_keys:
+                children.add((child, _move_code(move)))
+        for child, code in sorted(children, key=lambda edge: edge[1]):
+            graph_children.append(child)
+            graph_moves.append(code)
+        graph_starts.append(len(graph_children))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    classified_keys = sorted(classified)
+    collision_keys = sorted(key for key, group in base_groups.items() if len(group) > 1)
+    collision_starts = [0]
+    collision_entries: List[int] = []
+    for key in collision_keys:
+        collision_entries.extend(base_groups[key])
+        collision_starts.append(len(collision_entries))
+
+    def pack(fmt: str, values: Sequence[int]) -> bytes:
+        return struct.pack(f"<{len(values)}{fmt}", *values)
+
+    sections = [
+        signature.encode("utf-8"),
+        pack("I", offsets),
+        b"".join(encoded),
+        pack("I", entries),
+        pack("Q", classified_keys),
+        pack("I", [classified[key][0] for key in classified_keys]),
+        pack("Q", collision_keys),
+        pack("I", collision_starts),
+        pack("I", collision_entries),
+        pack("Q", sorted(theory_keys)),
+        pack("I", [value for mask in sorted(reach) for value in (mask, reach[mask])]),
+        pack("Q", graph_nodes),
+        pack("I", graph_starts),
+        pack("Q", graph_children),
+        pack("H", graph_moves),
+    ]
+
+    header_size = _HEADER.size + _SECTION.size * len(sections)
+    layout: List[Tuple[int, int]] = []
+    body = bytearray()
+    position = _align(header_size)
+    for data in sections:
+        layout.append((position, len(data)))
+        body.extend(data)
+        padded = _align(len(data))
+        body.extend(b"\0" * (padded - len(data)))
+        position += padded
+
+    header = bytearray(_HEADER.pack(ECO_INDEX_MAGIC, ECO_INDEX_VERSION, len(sections)))
+    for offset, length in layout:
+        header.extend(_SECTION.pack(offset, length))
+    header.extend(b"\0" * (_align(header_size) - header_size))
+    return bytes(header) + bytes(body)
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class EcoIndex:
+    """Read-only view of a compiled ECO index (memory-mapped file or bytes).
+
+    The ``u64`` key sections are loaded into integer dicts/sets when the index is
+    opened (a few milliseconds), so lookups are integer hash probes. Book rows stay
+    in the mapped string table and are decoded only when returned. Safe to share
+    across threads.
+    """
+
+    def __init__(self, buffer: Any, backing: Any = None) -> None:
+        """Open a compiled index.
+
+        Args:
+            buffer: Object supporting the buffer protocol (bytes or mmap).
+            backing: Object kept alive with the view (e.g. the mmap or file).
+
+        Raises:
+            ValueError: If the buffer is not a compiled ECO index of this version.
+        """
+        self._backing = backing
+        # Validate before exporting any view, so a rejected mmap can still be closed
+        size = len(buffer)
+        if size < _HEADER.size:
+            raise ValueError("ECO index is truncated")
+        magic, version, section_count = _HEADER.unpack_from(buffer, 0)
+        if magic != ECO_INDEX_MAGIC or version != ECO_INDEX_VERSION:
+            raise ValueError("Not a compatible ECO index file")
+        if section_count != len(_SECTION_NAMES) or size < _HEADER.size + section_count * _SECTION.size:
+            raise ValueError("Unexpected ECO index layout")
+        layout = [
+            _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+            for i in range(section_count)
+        ]
+        if any(offset + length > size for offset, length in layout):
+            raise ValueError("ECO index is truncated")
+        view = memoryview(buffer)
+        sections: Dict[str, memoryview] = {
+            name: view[offset:offset + length]
+            for name, (offset, length) in zip(_SECTION_NAMES, layout)
+        }
+        self._view = view
+        self.signature = sections["signature"].tobytes().decode("utf-8")
+        self._string_offsets = sections["string_offsets"].cast("I")
+        self._string_data = sections["string_data"]
+        self._entries = sections["entries"].cast("I")
+        self._classified: Dict[int, int] = dict(zip(
+            sections["classified_keys"].cast("Q").tolist(),
+            sections["classified_entries"].cast("I").tolist(),
+        ))
+        collision_starts = sections["collision_starts"].cast("I").tolist()
+        self._collisions: Dict[int, Tuple[int, int]] = {
+            key: (collision_starts[i], collision_starts[i + 1])
+            for i, key in enumerate(sections["collision_keys"].cast("Q").tolist())
+        }
+        self._collision_entries = sections["collision_entries"].cast("I")
+        self._theory_keys = frozenset(sections["theory_keys"].cast("Q").tolist())
+        reach = sections["classified_reach"].cast("I").tolist()
+        self.classified_reach: List[Tuple[int, int]] = list(zip(reach[0::2], reach[1::2]))
+        graph_starts = sections["graph_starts"].cast("I").tolist()
+        self._graph: Dict[int, Tuple[int, int]] = {
+            key: (graph_starts[i], graph_starts[i + 1])
+            for i, key in enumerate(sections["graph_nodes"].cast("Q").tolist())
+        }
+        self._graph_children = sections["graph_children"].cast("Q")
+        self._graph_moves = sections["graph_moves"].cast("H")
+        # Decoded rows by entry id (filled on demand; bounded by the book size)
+        self._entry_cache: Dict[int, EcoIndexEntry] = {}
+
+    @classmethod
+    def open(cls, path: Path) -> "EcoIndex":
+        """Memory-map a compiled index file.
+
+        Raises:
+            OSError: If the file cannot be opened.
+            ValueError: If the file is not a compatible index.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, backing=mapped)
+        except Exception:
+            mapped.close()
+            raise
+
+    def _string(self, string_id: int) -> str:
+        start = self._string_offsets[string_id]
+        end = self._string_offsets[string_id + 1]
+        return self._string_data[start:end].tobytes().decode("utf-8")
+
+    def entry(self, entry_id: int) -> EcoIndexEntry:
+        """Decode one book row by entry id."""
+        entry = self._entry_cache.get(entry_id)
+        if entry is None:
+            base = entry_id * _ENTRY_FIELDS
+            fen_id, eco_id, name_id, moves_id = self._entries[base:base + _ENTRY_FIELDS]
+            entry = EcoIndexEntry(
+                fen=self._string(fen_id),
+                eco=self._string(eco_id),
+                name=self._string(name_id),
+                moves=self._string(moves_id),
+            )
+            self._entry_cache[entry_id] = entry
+        return entry
+
+    def entry_count(self) -> int:
+        """Number of book rows (base and interpolated, including repeated FENs)."""
+        return len(self._entries) // _ENTRY_FIELDS
+
+    def iter_entries(self) -> Iterator[EcoIndexEntry]:
+        """Decode every book row in source order (base first, then interpolated).
+
+        Rows decoded here are not kept in the lookup cache.
+        """
+        entries = self._entries
+        string = self._string
+        for base in range(0, len(entries), _ENTRY_FIELDS):
+            fen_id, eco_id, name_id, moves_id = entries[base:base + _ENTRY_FIELDS]
+            yield EcoIndexEntry(
+                fen=string(fen_id), eco=string(eco_id), name=string(name_id), moves=string(moves_id)
+            )
+
+    def classified_count(self) -> int:
+        return len(self._classified)
+
+    def theory_count(self) -> int:
+        return len(self._theory_keys)
+
+    def needs_exact_fen(self, key: int) -> bool:
+        """True if several curated rows share ``key`` (the full FEN picks between them)."""
+        return key in self._collisions
+
+    def classified_entry(self, key: int, fen: Optional[str] = None) -> Optional[EcoIndexEntry]:
+        """Curated (base) entry for a position key.
+
+        An exact FEN match among rows sharing the key wins; otherwise the row
+        with the longest canonical line.
+
+        Args:
+            key: Book key (see ``book_hash`` / ``book_hash_from_fen``).
+            fen: Full FEN of the position, used only when rows collide on ``key``.
+        """
+        winner = self._classified.get(key)
+        if winner is None:
+            return None
+        if fen is not None:
+            group = self._collisions.get(key)
+            if group is not None:
+                for pos in range(group[0], group[1]):
+                    entry = self.entry(self._collision_entries[pos])
+                    if entry.fen == fen:
+                        return entry
+        return self.entry(winner)
+
+    def is_classified_key(self, key: int) -> bool:
+        """True if the key has a curated (base) entry."""
+        return key in self._classified
+
+    def is_theory_key(self, key: int) -> bool:
+        """True if the key is a base or interpolated book position."""
+        return key in self._theory_keys
+
+    def theory_children(self, key: int) -> Optional[List[Tuple[chess.Move, int]]]:
+        """Moves from a theory position that land on another theory position.
+
+        Castling and en passant are not included (see module docstring).
+
+        Args:
+            key: Book key of the position.
+
+        Returns:
+            List of (move, child key), or None if the key is not a graph node
+            (neither a theory position nor the starting position).
+        """
+        span = self._graph.get(key)
+        if span is None:
+            return None
+        children = self._graph_children
+        moves = self._graph_moves
+        return [
+            (_move_from_code(moves[pos]), children[pos]) for pos in range(span[0], span[1])
+        ]
+
+    def close(self) -> None:
+        """Release the memory map (the index must not be used afterwards)."""
+        backing = self._backing
+        self._backing = None
+        self._entry_cache.clear()
+        for name in (
+            "_string_offsets", "_string_data", "_entries", "_collision_entries",
+            "_graph_children", "_graph_moves", "_view",
+        ):
+            getattr(self, name).release()
+        if backing is not None and hasattr(backing, "close"):
+            backing.close()
+
+
+_build_lock = threading.Lock()
+
+
+def load_eco_index(ecolists_path: Path, index_path: Optional[Path]) -> Tuple[EcoIndex, bool]:
+    """Open the compiled ECO index, rebuilding it when the sources changed.
+
+    Args:
+        ecolists_path: Directory with ``eco_base.json`` and ``eco_interpolated.json``.
+        index_path: Compiled index file, or None to compile in memory only.
+
+    Returns:
+        Tuple of (index, rebuilt). ``rebuilt`` is True when the JSON sources were parsed.
+    """
+    base_file = ecolists_path / "eco_base.json"
+    interpolated_file = ecolists_path / "eco_interpolated.json"
+    signature = source_signature([base_file, interpolated_file])
+
+    if index_path is not None and index_path.exists():
+        try:
+            index = EcoIndex.open(index_path)
+            if index.signature == signature:
+                return index, False
+            index.close()
+        except (OSError, ValueError):
+            pass
+
+    with _build_lock:
+        eco_base = _read_json(base_file)
+        eco_interpolated = _read_json(interpolated_file)
+        data = compile_eco_index(eco_base, eco_interpolated, signature)
+        if index_path is not None:
+            tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+            try:
+                index_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, index_path)
+                return EcoIndex.open(index_path), True
+            except (OSError, ValueError):
+                # Read-only location (or file in use): fall back to the in-memory copy
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
+        return EcoIndex(data), True
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data if isinstance(data, dict) else {}
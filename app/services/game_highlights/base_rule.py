@@ -1,12 +1,15 @@
 """Base rule interface for game highlight detection rules."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, Set
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Set
 from dataclasses import dataclass
 
 from app.models.moveslist_model import MoveData
 from app.services.game_highlights.rule_catalog import ALL_PHASES
 
+if TYPE_CHECKING:
+    from app.services.game_highlights.position_table import GamePositionTable
+
 
 @dataclass
 class RuleContext:
@@ -39,6 +42,8 @@ class RuleContext:
     shared_state: Dict[str, Any]
     # Full moves list for rules that need to look back (e.g., pawn storm)
     moves: List[MoveData]
+    # Parsed boards / attack maps / material per ply, shared by all rules for this game
+    positions: Optional["GamePositionTable"] = None
 
 
 @dataclass
@@ -15,6 +15,7 @@ from app.models.moveslist_model import MoveData
 from app.services.game_highlights.base_rule import GameHighlight, RuleContext
 from app.services.game_highlights.constants import PIECE_VALUES
 from app.services.game_highlights.helpers import parse_evaluation, parse_fen, parse_destination_square
+from app.services.game_highlights.position_table import GamePositionTable
 from app.utils.material_tracker import calculate_material_count
 
 # Capture values within this many centipawns count as an equal trade.
@@ -67,17 +68,63 @@ class HalfMoveContext:
         return "White" if self.is_white else "Black"
 
     def board_before(self) -> Optional[chess.Board]:
-        """Parsed position before this half-move (cached)."""
+        """Parsed position before this half-move (cached).
+
+        Comes from ``context.positions`` when present, so the board is shared with
+        other rules and must not be left modified.
+        """
         if self._board_before is None and self.fen_before:
-            self._board_before = parse_fen(self.fen_before)
+            self._board_before = self._lookup_board(self.fen_before)
         return self._board_before
 
     def board_after(self) -> Optional[chess.Board]:
-        """Parsed position after this half-move (cached)."""
+        """Parsed position after this half-move (cached, shared like ``board_before``)."""
         if self._board_after is None and self.fen_after:
-            self._board_after = parse_fen(self.fen_after)
+            self._board_after = self._lookup_board(self.fen_after)
         return self._board_after
 
+    def _lookup_board(self, fen: str) -> Optional[chess.Board]:
+        positions = self.context.positions
+        if positions is not None:
+            return positions.board(fen)
+        return parse_fen(fen)
+
+    def attacked_before(self, color: chess.Color) -> Optional[chess.SquareSet]:
+        """Squares attacked by ``color`` before this half-move."""
+        return self._attacked_squares(self.fen_before, self.board_before, color)
+
+    def attacked_after(self, color: chess.Color) -> Optional[chess.SquareSet]:
+        """Squares attacked by ``color`` after this half-move."""
+        return self._attacked_squares(self.fen_after, self.board_after, color)
+
+    def _attacked_squares(self, fen: str, board_getter, color: chess.Color) -> Optional[chess.SquareSet]:
+        positions = self.context.positions
+        if positions is not None and fen:
+            return positions.attacked_squares(fen, color)
+        board = board_getter()
+        if board is None:
+            return None
+        return chess.SquareSet(
+            sq for sq in chess.SQUARES if board.is_attacked_by(color, sq)
+        )
+
+    def material_before(self, is_white: bool) -> Optional[int]:
+        """Material count for one side before this half-move, in centipawns."""
+        return self._material(self.fen_before, self.board_before, is_white)
+
+    def material_after(self, is_white: bool) -> Optional[int]:
+        """Material count for one side after this half-move, in centipawns."""
+        return self._material(self.fen_after, self.board_after, is_white)
+
+    def _material(self, fen: str, board_getter, is_white: bool) -> Optional[int]:
+        positions = self.context.positions
+        if positions is not None and fen:
+            return positions.material(fen, is_white)
+        board = board_getter()
+        if board is None:
+            return None
+        return calculate_material_count(board, is_white)
+
     def eval_after_cp(self) -> Optional[float]:
         """White-relative evaluation after this half-move, in centipawns."""
         return parse_evaluation(self.eval_after) if self.eval_after else None
@@ -353,13 +400,11 @@ class HalfMoveContext:
 
     def own_material_drop_cp(self, later: "HalfMoveContext") -> Optional[int]:
         """Own material lost from before this ply to after ``later`` (positive = lost)."""
-        before = self.board_before()
-        after = later.board_after()
+        before = self.material_before(self.is_white)
+        after = later.material_after(self.is_white)
         if before is None or after is None:
             return None
-        return calculate_material_count(before, self.is_white) - calculate_material_count(
-            after, self.is_white
-        )
+        return before - after
 
     def capture_trade_net_cp(self) -> Optional[int]:
         """Net capture value: our capture minus reply capture (if any), in centipawns."""
@@ -459,7 +504,8 @@ def make_rule_context(
 
     Previous piece counts and material come from the prior row when present.
     Pass ``RuleContext`` field overrides (``opening_end``, thresholds, etc.)
-    as keyword arguments.
+    as keyword arguments. A ``GamePositionTable`` for ``moves`` is built unless
+    ``positions`` is given.
     """
     prev = moves[move_index - 1] if move_index > 0 else None
     nxt = moves[move_index + 1] if move_index + 1 < len(moves) else None
@@ -511,6 +557,8 @@ def make_rule_context(
         **prev_fields,
     )
     kwargs.update(overrides)
+    if "positions" not in overrides:
+        kwargs["positions"] = GamePositionTable(moves)
     return RuleContext(**kwargs)
 
 
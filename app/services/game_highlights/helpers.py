@@ -1,6 +1,6 @@
 """Helper functions for game highlight detection."""
 
-from typing import Optional, List, Tuple, Union
+from typing import Any, Optional, List, Tuple, Union
 import chess
 from app.services.game_highlights.constants import PIECE_VALUES
 
@@ -599,7 +599,8 @@ def check_tactical_pattern_on_follow_up_moves(board_after_capture: chess.Board,
                                               follow_up_moves: List,
                                               target_square: chess.Square,
                                               color: chess.Color,
-                                              max_moves_to_check: int = 2) -> Optional[str]:
+                                              max_moves_to_check: int = 2,
+                                              positions: Optional[Any] = None) -> Optional[str]:
     """Check if any of the follow-up moves create a profitable tactical pattern on the target square.
     
     This validates that the tactical pattern is actually executed, not just that it exists.
@@ -612,6 +613,7 @@ def check_tactical_pattern_on_follow_up_moves(board_after_capture: chess.Board,
         target_square: Square of the piece that was lured.
         color: Color of the player who executed the decoy.
         max_moves_to_check: Maximum number of follow-up moves to check (default 2).
+        positions: Optional GamePositionTable to read follow-up boards from.
         
     Returns:
         Tactical pattern type ("fork", "pin", "checkmate", "skewer", "check") if found, None otherwise.
@@ -639,12 +641,12 @@ def check_tactical_pattern_on_follow_up_moves(board_after_capture: chess.Board,
     # Check each follow-up move
     for i, follow_up_move in enumerate(follow_up_moves[:max_moves_to_check]):
         if color == chess.WHITE:
-            board_after_follow_up = parse_fen(follow_up_move.fen_white)
+            board_after_follow_up = _follow_up_board(follow_up_move.fen_white, positions)
             move_san = follow_up_move.white_move
             material_after = follow_up_move.white_material
             material_before = material_before_follow_up if i == 0 else (follow_up_moves[i-1].white_material if i > 0 else None)
         else:
-            board_after_follow_up = parse_fen(follow_up_move.fen_black)
+            board_after_follow_up = _follow_up_board(follow_up_move.fen_black, positions)
             move_san = follow_up_move.black_move
             material_after = follow_up_move.black_material
             material_before = material_before_follow_up if i == 0 else (follow_up_moves[i-1].black_material if i > 0 else None)
@@ -702,6 +704,12 @@ def check_tactical_pattern_on_follow_up_moves(board_after_capture: chess.Board,
     return None
 
 
+def _follow_up_board(fen: str, positions: Optional[Any]) -> Optional[chess.Board]:
+    if positions is not None:
+        return positions.board(fen)
+    return parse_fen(fen)
+
+
 def parse_destination_square(move_san: str) -> Optional[chess.Square]:
     """Parse the destination square from a move in SAN notation.
     
@@ -1,10 +1,13 @@
 """Main highlight detector service that orchestrates rule evaluation."""
 
+import time
 from typing import List, Dict, Any, Tuple
 from app.models.moveslist_model import MoveData
 from app.services.game_highlights.base_rule import GameHighlight, RuleContext
 from app.services.game_highlights.rule_registry import RuleRegistry
 from app.services.game_highlights.helpers import parse_evaluation
+from app.services.game_highlights.position_table import GamePositionTable
+from app.services.rule_profiler import SCOPE_HIGHLIGHTS, get_rule_profiler
 
 
 class HighlightDetector:
@@ -122,6 +125,14 @@ class HighlightDetector:
         # Get enabled rules
         rules = self.registry.get_enabled_rules()
         
+        # Parse every position once; rules and neighbor contexts share these boards
+        positions = GamePositionTable(moves)
+        
+        # Opt-in per-rule timing (None when profiling is off)
+        profiler = get_rule_profiler()
+        if profiler is not None:
+            profiler.count_unit(SCOPE_HIGHLIGHTS)
+        
         # Iterate through moves and evaluate each rule
         for i, move in enumerate(moves):
             move_num = move.move_number
@@ -163,24 +174,32 @@ class HighlightDetector:
                 inaccuracy_max_cpl=self.inaccuracy_max_cpl,
                 mistake_max_cpl=self.mistake_max_cpl,
                 shared_state=shared_state,
-                moves=moves
+                moves=moves,
+                positions=positions,
             )
             
             # Evaluate all enabled rules
-            for rule in rules:
-                try:
-                    rule_highlights = rule.evaluate(move, context)
-                    highlights.extend(
-                        self._apply_rule_overrides(
-                            rule,
-                            rule_highlights,
-                            opening_end,
-                            middlegame_end,
-                        )
+            if profiler is not None:
+                highlights.extend(
+                    self._evaluate_rules_profiled(
+                        rules, move, context, opening_end, middlegame_end, profiler
                     )
-                except Exception:
-                    # Silently skip rules that fail (to prevent one bad rule from breaking everything)
-                    pass
+                )
+            else:
+                for rule in rules:
+                    try:
+                        rule_highlights = rule.evaluate(move, context)
+                        highlights.extend(
+                            self._apply_rule_overrides(
+                                rule,
+                                rule_highlights,
+                                opening_end,
+                                middlegame_end,
+                            )
+                        )
+                    except Exception:
+                        # Silently skip rules that fail (to prevent one bad rule from breaking everything)
+                        pass
             
             # Update previous values for next iteration
             prev_white_bishops = move.white_bishops
@@ -211,6 +230,40 @@ class HighlightDetector:
         
         return highlights
 
+    def _evaluate_rules_profiled(
+        self,
+        rules: List[Any],
+        move: MoveData,
+        context: RuleContext,
+        opening_end: int,
+        middlegame_end: int,
+        profiler: Any,
+    ) -> List[GameHighlight]:
+        """Same as the plain rule loop, but records timing/exceptions per rule."""
+        highlights: List[GameHighlight] = []
+        for rule in rules:
+            error = None
+            emitted: List[GameHighlight] = []
+            start = time.perf_counter()
+            try:
+                emitted = self._apply_rule_overrides(
+                    rule,
+                    rule.evaluate(move, context),
+                    opening_end,
+                    middlegame_end,
+                )
+            except Exception as exc:
+                error = exc
+            profiler.record(
+                SCOPE_HIGHLIGHTS,
+                type(rule).__name__,
+                time.perf_counter() - start,
+                emitted=len(emitted),
+                error=error,
+            )
+            highlights.extend(emitted)
+        return highlights
+
     def _phase_for_move(
         self,
         move_number: int,
@@ -0,0 +1,90 @@
+"""Game-scoped position table shared by highlight rules.
+
+``HighlightDetector.detect_highlights`` builds one table per game so that every
+rule (and every ``HalfMoveContext`` rebuilt by helpers such as
+``context_for_move_index``) reads the same parsed boards instead of calling
+``parse_fen`` again for each rule and neighbor lookup.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+import chess
+
+from app.models.moveslist_model import MoveData
+from app.services.game_highlights.helpers import parse_fen
+from app.utils.material_tracker import calculate_material_count
+
+
+class GamePositionTable:
+    """Boards, attack maps and material counts for every ply of one game.
+
+    Boards are parsed once, up front, from the ``fen_white`` / ``fen_black``
+    fields of each row. Attack maps and material counts are derived on first
+    request and cached per position.
+
+    Boards are shared between rules: a rule may ``push()`` and ``pop()`` in
+    balanced pairs, but must ``copy()`` before any other modification.
+    """
+
+    def __init__(self, moves: List[MoveData]) -> None:
+        """Parse every position reached in ``moves``.
+
+        Args:
+            moves: Full moves list of the game (one MoveData per full-move row).
+        """
+        self._boards: Dict[str, Optional[chess.Board]] = {}
+        self._attacks: Dict[Tuple[str, chess.Color], chess.SquareSet] = {}
+        self._material: Dict[Tuple[str, bool], int] = {}
+        for move in moves:
+            for fen in (move.fen_white, move.fen_black):
+                if fen and fen not in self._boards:
+                    self._boards[fen] = parse_fen(fen)
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def board(self, fen: str) -> Optional[chess.Board]:
+        """Shared board for ``fen`` (parsed on demand if it was not in the game)."""
+        if not fen:
+            return None
+        try:
+            return self._boards[fen]
+        except KeyError:
+            board = parse_fen(fen)
+            self._boards[fen] = board
+            return board
+
+    def attacked_squares(self, fen: str, color: chess.Color) -> Optional[chess.SquareSet]:
+        """All squares attacked (or defended) by ``color`` in ``fen``.
+
+        Equivalent to testing ``board.is_attacked_by(color, square)`` for every
+        square, computed once per position and side.
+        """
+        key = (fen, color)
+        cached = self._attacks.get(key)
+        if cached is not None:
+            return cached
+        board = self.board(fen)
+        if board is None:
+            return None
+        mask = 0
+        for square in chess.scan_forward(board.occupied_co[color]):
+            mask |= int(board.attacks(square))
+        attacked = chess.SquareSet(mask)
+        self._attacks[key] = attacked
+        return attacked
+
+    def material(self, fen: str, is_white: bool) -> Optional[int]:
+        """Material count for one side in ``fen``, in centipawns."""
+        key = (fen, is_white)
+        cached = self._material.get(key)
+        if cached is not None:
+            return cached
+        board = self.board(fen)
+        if board is None:
+            return None
+        value = calculate_material_count(board, is_white)
+        self._material[key] = value
+        return value
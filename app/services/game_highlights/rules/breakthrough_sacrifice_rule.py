@@ -9,7 +9,6 @@ from app.services.game_highlights.half_move import (
     evaluate_for_each_side,
     make_highlight,
 )
-from app.utils.material_tracker import calculate_material_count
 
 _MIN_SACRIFICE_CP = 300
 _MIN_NET_MATERIAL_LOSS_CP = 150
@@ -65,24 +64,19 @@ class BreakthroughSacrificeRule(HighlightRule):
         self, half: HalfMoveContext, reply: HalfMoveContext
     ) -> Optional[int]:
         """Relative material lost from before this ply to after ``reply`` (positive = worse)."""
-        before = half.board_before()
-        after = reply.board_after()
-        if before is None or after is None:
+        own_before = half.material_before(half.is_white)
+        opp_before = half.material_before(not half.is_white)
+        own_after = reply.material_after(half.is_white)
+        opp_after = reply.material_after(not half.is_white)
+        if None in (own_before, opp_before, own_after, opp_after):
             return None
-
-        def relative(board) -> int:
-            return calculate_material_count(board, half.is_white) - calculate_material_count(
-                board, not half.is_white
-            )
-
-        return relative(before) - relative(after)
+        return (own_before - opp_before) - (own_after - opp_after)
 
     def _material_regained(self, half: HalfMoveContext, sacrificed: int) -> bool:
         """True if follow-ups regain the sacrificed material (tactical sequence, not sac)."""
-        before_board = half.board_before()
-        if before_board is None:
+        material_before = half.material_before(half.is_white)
+        if material_before is None:
             return False
-        material_before = calculate_material_count(before_board, half.is_white)
 
         for ply in half.iter_following(limit=_FOLLOW_UP_PLIES):
             if ply.is_white != half.is_white:
@@ -93,10 +87,9 @@ class BreakthroughSacrificeRule(HighlightRule):
                 if capture_value >= sacrificed * _REGAIN_CAPTURE_FRACTION:
                     return True
 
-            after = ply.board_after()
-            if after is None:
+            material_now = ply.material_after(half.is_white)
+            if material_now is None:
                 continue
-            material_now = calculate_material_count(after, half.is_white)
             if material_now >= material_before - _REGAIN_MATERIAL_SLACK_CP:
                 return True
 
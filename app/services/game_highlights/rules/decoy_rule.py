@@ -76,6 +76,7 @@ class DecoyRule(HighlightRule):
             their_dest,
             half.color,
             max_moves_to_check=2,
+            positions=half.context.positions,
         )
         if not tactical_type:
             return []
@@ -4,7 +4,6 @@ from typing import Any, Dict, List, Optional, Set
 
 from app.services.game_highlights.base_rule import HighlightRule, GameHighlight, RuleContext
 from app.services.game_highlights.half_move import HalfMoveContext, iter_half_moves
-from app.utils.material_tracker import calculate_material_count
 
 _MIN_MATERIAL_DISADVANTAGE_CP = 300
 _MAX_ABS_EVAL_CP = 100
@@ -37,12 +36,11 @@ class DefensiveFortressRule(HighlightRule):
     ) -> Optional[GameHighlight]:
         key = half.is_white
         eval_cp = half.eval_after_cp()
-        board = half.board_after()
-        if eval_cp is None or board is None:
+        our_mat = half.material_after(half.is_white)
+        opp_mat = half.material_after(not half.is_white)
+        if eval_cp is None or our_mat is None or opp_mat is None:
             return None
 
-        our_mat = calculate_material_count(board, half.is_white)
-        opp_mat = calculate_material_count(board, not half.is_white)
         material_diff = our_mat - opp_mat
 
         if material_diff > -_MIN_MATERIAL_DISADVANTAGE_CP:
@@ -48,9 +48,9 @@ class DefensiveResourceRule(HighlightRule):
         board_after = half.board_after()
         if board_before is None or board_after is None:
             return []
-        if not self._has_tactical_threat(board_before, half.color):
+        if not self._has_tactical_threat(half):
             return []
-        if not self._move_defends_threat(board_before, board_after, half.color):
+        if not self._move_defends_threat(half):
             return []
 
         if curr_cpl >= half.context.good_move_max_cpl:
@@ -97,16 +97,20 @@ class DefensiveResourceRule(HighlightRule):
         prior_gain = prior.eval_improvement_cp()
         return prior_gain is not None and prior_gain > _OPPONENT_GAIN_CP
 
-    def _has_tactical_threat(self, board: chess.Board, color: chess.Color) -> bool:
+    def _has_tactical_threat(self, half: HalfMoveContext) -> bool:
+        board = half.board_before()
+        color = half.color
         if board.is_check():
             return True
 
         opponent = not color
+        attacked = half.attacked_before(opponent)
+        defended = half.attacked_before(color)
         for piece_type in (chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT):
             for sq in board.pieces(piece_type, color):
-                if not board.is_attacked_by(opponent, sq):
+                if sq not in attacked:
                     continue
-                if board.is_attacked_by(color, sq):
+                if sq in defended:
                     continue
                 piece = board.piece_at(sq)
                 if piece is None:
@@ -119,26 +123,26 @@ class DefensiveResourceRule(HighlightRule):
             return True
         return False
 
-    def _move_defends_threat(
-        self,
-        board_before: chess.Board,
-        board_after: chess.Board,
-        color: chess.Color,
-    ) -> bool:
+    def _move_defends_threat(self, half: HalfMoveContext) -> bool:
+        board_before = half.board_before()
+        board_after = half.board_after()
+        color = half.color
         opponent = not color
 
         if board_before.is_check() and not board_after.is_check():
             return True
 
+        attacked_before = half.attacked_before(opponent)
+        defended_before = half.attacked_before(color)
+        attacked_after = half.attacked_after(opponent)
+        defended_after = half.attacked_after(color)
         for piece_type in (chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT):
             for sq in board_before.pieces(piece_type, color):
-                if not board_before.is_attacked_by(opponent, sq):
+                if sq not in attacked_before:
                     continue
-                if board_before.is_attacked_by(color, sq):
+                if sq in defended_before:
                     continue
-                if board_after.is_attacked_by(color, sq) or not board_after.is_attacked_by(
-                    opponent, sq
-                ):
+                if sq in defended_after or sq not in attacked_after:
                     piece = board_before.piece_at(sq)
                     if piece is None:
                         continue
@@ -8,7 +8,6 @@ from app.services.game_highlights.half_move import (
     evaluate_for_each_side,
     make_highlight,
 )
-from app.utils.material_tracker import calculate_material_count
 
 _MIN_EVAL_GAIN_CP = 50
 _MAX_MATERIAL_SWING_CP = 50
@@ -28,14 +27,11 @@ class PositionalImprovementRule(HighlightRule):
         if improvement is None or improvement <= _MIN_EVAL_GAIN_CP:
             return []
 
-        before = half.board_before()
-        after = half.board_after()
+        before = half.material_before(half.is_white)
+        after = half.material_after(half.is_white)
         if before is None or after is None:
             return []
-        material_swing = abs(
-            calculate_material_count(after, half.is_white)
-            - calculate_material_count(before, half.is_white)
-        )
+        material_swing = abs(after - before)
         if material_swing >= _MAX_MATERIAL_SWING_CP:
             return []
 
@@ -1,6 +1,6 @@
 """Rule for detecting simplification (quiet piece trades that clear the board)."""
 
-from typing import List
+from typing import List, Optional
 
 import chess
 
@@ -12,7 +12,6 @@ from app.services.game_highlights.half_move import (
     make_highlight,
     paired_move_notation,
 )
-from app.utils.material_tracker import calculate_material_count
 
 # Captures that count as simplifying piece trades (not pawn-only exchanges).
 _PIECE_CAPTURES = frozenset({"n", "b", "r", "q"})
@@ -52,7 +51,8 @@ class SimplificationRule(HighlightRule):
             return []
 
         # Relative material must stay roughly even (guards against Q-then-minor sequences).
-        if self._relative_material_swing_cp(before, after) > _MATERIAL_BALANCE_MAX_CP:
+        swing = self._relative_material_swing_cp(half, reply)
+        if swing is None or swing > _MATERIAL_BALANCE_MAX_CP:
             return []
 
         eval_before = half.eval_before_cp()
@@ -81,15 +81,17 @@ class SimplificationRule(HighlightRule):
             count += len(board.pieces(piece_type, chess.BLACK))
         return count
 
-    def _relative_material_swing_cp(self, before: chess.Board, after: chess.Board) -> int:
+    def _relative_material_swing_cp(
+        self, half: HalfMoveContext, reply: HalfMoveContext
+    ) -> Optional[int]:
         """Absolute change in White-minus-Black material across the trade."""
-
-        def relative(board: chess.Board) -> int:
-            return calculate_material_count(board, True) - calculate_material_count(
-                board, False
-            )
-
-        return abs(relative(after) - relative(before))
+        white_before = half.material_before(True)
+        black_before = half.material_before(False)
+        white_after = reply.material_after(True)
+        black_after = reply.material_after(False)
+        if None in (white_before, black_before, white_after, black_after):
+            return None
+        return abs((white_after - black_after) - (white_before - black_before))
 
     def _trade_label(self, first_capture: str, second_capture: str) -> str:
         if first_capture == second_capture == "q":
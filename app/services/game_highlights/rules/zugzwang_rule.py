@@ -8,7 +8,6 @@ from app.services.game_highlights.half_move import (
     iter_half_moves,
     make_highlight,
 )
-from app.utils.material_tracker import calculate_material_count
 
 _MIN_CPL = 150
 _EVAL_DROP_CP = 50
@@ -45,12 +44,11 @@ class ZugzwangRule(HighlightRule):
         if cpl <= _MIN_CPL or cpl_2 <= _MIN_CPL or cpl_3 <= _MIN_CPL:
             return None
 
-        board = half.board_after()
-        if board is None:
+        white_mat = half.material_after(True)
+        black_mat = half.material_after(False)
+        if white_mat is None or black_mat is None:
             return None
-        total = calculate_material_count(board, True) + calculate_material_count(
-            board, False
-        )
+        total = white_mat + black_mat
         if total >= _MAX_TOTAL_MATERIAL_CP:
             return None
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
@@ -33,8 +34,8 @@ from app.services.game_summary_service import (
     format_missed_tactic_line,
     ply_to_fullmove,
 )
+from app.services.board_diagram_cache import BoardDiagramCache, DiagramRequest
 from app.services.pdf_report_base import BasePDFReportService
-from app.views.widgets.mini_chessboard_widget import MiniChessBoardWidget
 
 _ASSESSMENT_SYMBOLS: Dict[str, str] = {
     "Brilliant": "!!",
@@ -103,10 +104,27 @@ class _Diagram:
     comment: str = ""  # PGN comment shown with text wrap
 
 
+@dataclass(frozen=True)
+class GameReportJob:
+    """One report for GameReportPDFService.export_batch."""
+
+    path: str | Path
+    summary: GameSummary
+    moves: Sequence[MoveData]
+    game: Optional[GameData] = None
+
+
 class GameReportPDFService(BasePDFReportService):
     """Build a multi-page PDF game report using Qt's QPdfWriter."""
 
-    def __init__(self, config: Dict[str, Any]) -> None:
+    def __init__(self, config: Dict[str, Any], diagrams: Optional[BoardDiagramCache] = None) -> None:
+        """Initialize the service.
+
+        Args:
+            config: Configuration dictionary.
+            diagrams: Board diagram cache to draw from (shared by export_batch); a new
+                one is created when None.
+        """
         report_cfg = (
             config.get("ui", {})
             .get("panels", {})
@@ -145,6 +163,9 @@ class GameReportPDFService(BasePDFReportService):
         self._board_size = int(self._cfg.get("board_size", 112))
         self._highlight_board_size = int(self._cfg.get("highlight_board_size", 72))
         self._board_render_scale = max(1, int(self._cfg.get("board_render_scale", 4)))
+        if diagrams is None:
+            diagrams = BoardDiagramCache(config, render_scale=self._board_render_scale)
+        self._diagrams = diagrams
         self._max_comment_diagrams = max(0, int(self._cfg.get("max_comment_diagrams", 3)))
         self._include_symbols = bool(self._cfg.get("include_symbols", True))
         self._eval_chart_height = float(self._cfg.get("eval_chart_height", 110))
@@ -196,6 +217,89 @@ class GameReportPDFService(BasePDFReportService):
         chart_image: Optional[QPixmap] = None,  # ignored; PDF draws its own light chart
     ) -> Path:
         """Write the PDF report to ``path`` and return the resolved path."""
+        plies = self._plies_with_pgn_comments(self._build_plies(moves), game)
+        diagrams = self._select_diagrams(summary, plies, game=game)
+        self._diagrams.prepare(self._diagram_requests(summary, moves, diagrams))
+        return self._write(
+            path, summary=summary, moves=moves, game=game, plies=plies, diagrams=diagrams
+        )
+
+    def export_batch(
+        self,
+        jobs: Sequence[GameReportJob],
+        *,
+        max_workers: Optional[int] = None,
+    ) -> List[Path]:
+        """Write one report per job, painting the PDFs on worker threads.
+
+        Board diagrams of all jobs are rendered up front into this service's cache,
+        so positions repeated across games are painted once. Each job is then
+        written by its own service instance (page numbering and other render state
+        are per document); only the diagram cache is shared.
+
+        Returns:
+            Resolved output paths, in job order.
+        """
+        prepared = []
+        requests: List[DiagramRequest] = []
+        for job in jobs:
+            plies = self._plies_with_pgn_comments(self._build_plies(job.moves), job.game)
+            diagrams = self._select_diagrams(job.summary, plies, game=job.game)
+            requests.extend(self._diagram_requests(job.summary, job.moves, diagrams))
+            prepared.append((job, plies, diagrams))
+        self._diagrams.prepare(requests)
+
+        def write(item: Tuple[GameReportJob, List[_Ply], List[_Diagram]]) -> Path:
+            job, plies, diagrams = item
+            service = GameReportPDFService(self.config, diagrams=self._diagrams)
+            return service._write(
+                job.path,
+                summary=job.summary,
+                moves=job.moves,
+                game=job.game,
+                plies=plies,
+                diagrams=diagrams,
+            )
+
+        workers = min(max_workers or self._diagrams.max_workers, len(prepared))
+        if workers <= 1:
+            return [write(item) for item in prepared]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(write, prepared))
+
+    def _diagram_requests(
+        self,
+        summary: GameSummary,
+        moves: Sequence[MoveData],
+        diagrams: Sequence[_Diagram],
+    ) -> List[DiagramRequest]:
+        """Boards the report will draw: annotated-game diagrams and highlight cards."""
+        requests = [
+            DiagramRequest(d.fen, self._board_size, d.fen_before, d.san) for d in diagrams
+        ]
+        moves_by_number = {
+            int(m.move_number): m for m in moves if getattr(m, "move_number", None) is not None
+        }
+        for highlight in summary.highlights or []:
+            fen_after, fen_before, san = self._fen_before_after_for_highlight(
+                highlight, moves_by_number
+            )
+            if fen_after:
+                requests.append(
+                    DiagramRequest(fen_after, self._highlight_board_size, fen_before, san)
+                )
+        return requests
+
+    def _write(
+        self,
+        path: str | Path,
+        *,
+        summary: GameSummary,
+        moves: Sequence[MoveData],
+        game: Optional[GameData],
+        plies: List[_Ply],
+        diagrams: List[_Diagram],
+    ) -> Path:
         out = Path(path)
         if out.suffix.lower() != ".pdf":
             out = out.with_suffix(".pdf")
@@ -207,8 +311,6 @@ class GameReportPDFService(BasePDFReportService):
 
         try:
             content = self._content_rect(writer)
-            plies = self._plies_with_pgn_comments(self._build_plies(moves), game)
-            diagrams = self._select_diagrams(summary, plies, game=game)
             white_name = (game.white.strip() if game and game.white else "") or "White"
             black_name = (game.black.strip() if game and game.black else "") or "Black"
 
@@ -1420,7 +1522,7 @@ class GameReportPDFService(BasePDFReportService):
             bh = float(board.height()) / scale
             painter.save()
             painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
-            painter.drawPixmap(
+            painter.drawImage(
                 QRectF(content.left() + pad, board_y, bw, bh),
                 board,
                 QRectF(0, 0, board.width(), board.height()),
@@ -2121,7 +2223,7 @@ class GameReportPDFService(BasePDFReportService):
 
         painter.save()
         painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
-        painter.drawPixmap(
+        painter.drawImage(
             QRectF(content.left(), y, board_w, board_h),
             board,
             QRectF(0, 0, board.width(), board.height()),
@@ -2181,28 +2283,10 @@ class GameReportPDFService(BasePDFReportService):
         san: str,
         *,
         size: Optional[int] = None,
-    ) -> QPixmap:
-        """Rasterize a mini board at supersampled size for sharp PDF embedding."""
-        scale = self._board_render_scale
+    ) -> QImage:
+        """Mini board rasterized at supersampled size for sharp PDF embedding (cached)."""
         board_size = int(size if size is not None else self._board_size)
-        widget = MiniChessBoardWidget(
-            self.config,
-            fen or chess.STARTING_FEN,
-            embedded=True,
-            size_override=int(board_size * scale),
-        )
-        if fen_before and san:
-            try:
-                board = chess.Board(fen_before)
-                move = board.parse_san(san)
-                widget.set_move(move, True)
-            except Exception:
-                pass
-        widget_size = widget.size()
-        image = QImage(widget_size, QImage.Format.Format_ARGB32_Premultiplied)
-        image.fill(Qt.GlobalColor.white)
-        widget.render(image)
-        return QPixmap.fromImage(image)
+        return self._diagrams.image(fen, fen_before, san, size=board_size)
 
 
 def default_pdf_filename(game: Optional[GameData] = None) -> str:
@@ -1,6 +1,6 @@
 """Game summary service for calculating game statistics from analysis data."""
 
-from typing import Callable, Dict, Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import math
 
@@ -23,6 +23,9 @@ from app.services.missed_tactic_ranking import (
     select_top_missed_tactics,
 )
 
+if TYPE_CHECKING:
+    from app.services.game_highlights.highlight_detector import HighlightDetector
+
 
 @dataclass
 class PlayerStatistics:
@@ -595,12 +598,18 @@ class GameSummaryService:
             **kwargs
         ))
     
-    def calculate_summary(self, moves: List[MoveData], total_moves: int, game_result: Optional[str] = None) -> GameSummary:
+    def calculate_summary(self, moves: List[MoveData], total_moves: int, game_result: Optional[str] = None,
+                          highlight_detector: Optional["HighlightDetector"] = None,
+                          highlights: Optional[List[GameHighlight]] = None) -> GameSummary:
         """Calculate complete game summary from moves data.
         
         Args:
             moves: List of MoveData instances from MovesListModel.
             total_moves: Total number of moves in the game.
+            highlight_detector: Prebuilt detector (see build_highlight_detector); built from
+                the current highlight settings when None.
+            highlights: Highlights already detected for this game (e.g. by HighlightBatchService);
+                the detector is not run when given.
             
         Returns:
             GameSummary instance with all calculated statistics.
@@ -748,37 +757,11 @@ class GameSummaryService:
         evaluation_data = self._extract_evaluation_data(moves)
         white_accuracy_curve, black_accuracy_curve = self._extract_accuracy_curves(moves)
         
-        # Detect game highlights
-        # Use new highlight detector
-        from app.services.game_highlights.rule_registry import RuleRegistry
-        from app.services.game_highlights.highlight_detector import HighlightDetector
-        from app.services.game_highlight_rules_service import GameHighlightRulesService
-        
-        highlights_config = self.config.get('ui', {}).get('panels', {}).get('detail', {}).get('summary', {}).get('highlights', {})
-        rules_service = GameHighlightRulesService.get_instance()
-        rule_config = rules_service.build_registry_config(
-            highlights_config.get('rules', {})
-        )
-        composer = rules_service.get_composer_settings(
-            default_max_per_phase=self.highlights_per_phase_limit
-        )
-        
-        rule_registry = RuleRegistry({'rules': rule_config})
-        highlight_detector = HighlightDetector(
-            {
-                'highlights_per_phase_limit': composer.max_per_phase,
-                'max_per_move': composer.max_per_move,
-                'phase_dedupe_enabled': composer.phase_dedupe_enabled,
-                'cross_phase_penalty_enabled': composer.cross_phase_penalty_enabled,
-                'cross_phase_penalty': composer.cross_phase_penalty,
-                'cross_phase_penalty_min_highlights': composer.cross_phase_penalty_min_highlights,
-            },
-            rule_registry,
-            good_move_max_cpl=self.good_move_max_cpl,
-            inaccuracy_max_cpl=self.inaccuracy_max_cpl,
-            mistake_max_cpl=self.mistake_max_cpl
-        )
-        highlights = highlight_detector.detect_highlights(moves, total_moves, opening_end, middlegame_end)
+        # Detect game highlights (process-pool callers pass a detector built once per worker)
+        if highlights is None:
+            if highlight_detector is None:
+                highlight_detector = self.build_highlight_detector(self.get_highlight_settings())
+            highlights = highlight_detector.detect_highlights(moves, total_moves, opening_end, middlegame_end)
         
         endgame_type_group = self.get_endgame_type_group(endgame_type) if endgame_type else None
         summary = GameSummary(
@@ -810,6 +793,69 @@ class GameSummaryService:
         
         return summary
     
+    def get_highlight_settings(self) -> Dict[str, Any]:
+        """Effective highlight rule and composer settings (picklable, JSON-serializable).
+        
+        Reads the user's rule overrides, so call this in the main process and hand the
+        result to worker processes rather than re-reading settings there.
+        
+        Returns:
+            Dictionary with 'rules' (RuleRegistry config), 'detector' (HighlightDetector
+            config) and 'thresholds' (assessment CPL thresholds).
+        """
+        from app.services.game_highlight_rules_service import GameHighlightRulesService
+        
+        highlights_config = self.config.get('ui', {}).get('panels', {}).get('detail', {}).get('summary', {}).get('highlights', {})
+        rules_service = GameHighlightRulesService.get_instance()
+        rule_config = rules_service.build_registry_config(
+            highlights_config.get('rules', {})
+        )
+        composer = rules_service.get_composer_settings(
+            default_max_per_phase=self.highlights_per_phase_limit
+        )
+        return {
+            'rules': rule_config,
+            'detector': {
+                'highlights_per_phase_limit': composer.max_per_phase,
+                'max_per_move': composer.max_per_move,
+                'phase_dedupe_enabled': composer.phase_dedupe_enabled,
+                'cross_phase_penalty_enabled': composer.cross_phase_penalty_enabled,
+                'cross_phase_penalty': composer.cross_phase_penalty,
+                'cross_phase_penalty_min_highlights': composer.cross_phase_penalty_min_highlights,
+            },
+            'thresholds': {
+                'good_move_max_cpl': self.good_move_max_cpl,
+                'inaccuracy_max_cpl': self.inaccuracy_max_cpl,
+                'mistake_max_cpl': self.mistake_max_cpl,
+            },
+        }
+    
+    @staticmethod
+    def build_highlight_detector(settings: Dict[str, Any]) -> "HighlightDetector":
+        """Create a HighlightDetector from settings returned by get_highlight_settings()."""
+        from app.services.game_highlights.rule_registry import RuleRegistry
+        from app.services.game_highlights.highlight_detector import HighlightDetector
+        
+        thresholds = settings.get('thresholds', {})
+        rule_registry = RuleRegistry({'rules': settings.get('rules', {})})
+        return HighlightDetector(
+            dict(settings.get('detector', {})),
+            rule_registry,
+            good_move_max_cpl=thresholds.get('good_move_max_cpl', 50),
+            inaccuracy_max_cpl=thresholds.get('inaccuracy_max_cpl', 100),
+            mistake_max_cpl=thresholds.get('mistake_max_cpl', 200)
+        )
+    
+    def detect_highlights(self, moves: List[MoveData], highlight_detector: "HighlightDetector") -> List[GameHighlight]:
+        """Detect a game's highlights without computing the rest of its summary.
+        
+        Uses the same phase boundaries as calculate_summary, so the result matches
+        GameSummary.highlights for the same detector.
+        """
+        total_moves = len(moves)
+        opening_end, middlegame_end = self._determine_phase_boundaries(moves, total_moves)
+        return highlight_detector.detect_highlights(moves, total_moves, opening_end, middlegame_end)
+    
     def _extract_player_moves(self, moves: List[MoveData], is_white: bool) -> List[PlayerMoveInfo]:
         """Extract color-agnostic player move info from MoveData list for one side."""
         if is_white:
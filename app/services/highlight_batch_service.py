@@ -0,0 +1,286 @@
+"""Batch game highlight detection over many analyzed games.
+
+Runs ``HighlightDetector`` for a list of games in a process pool and caches the
+results in memory, keyed by the game's CARAAnalysisData checksum and a hash of the
+effective highlight rule settings. Player-level features (reports, PDF exports,
+rule frequency scans) can then get highlights for hundreds of games without
+running the detector serially on the calling thread.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from app.models.database_model import GameData
+from app.services.analysis_data_storage_service import AnalysisDataStorageService
+from app.services.game_highlights.base_rule import GameHighlight
+from app.services.game_summary_service import GameSummaryService
+from app.services.logging_service import LoggingService, init_worker_logging
+from app.services.rule_profiler import (
+    RuleTimingStats,
+    SCOPE_HIGHLIGHTS,
+    get_rule_profile,
+    get_rule_profiler,
+    is_rule_profiling_enabled,
+    set_rule_profiling_enabled,
+)
+from app.utils.concurrency_utils import get_process_pool_batch_size, get_process_pool_max_workers, iter_batches
+
+
+# Cached games kept per process (highlight lists are small; analysis payloads are not stored).
+_CACHE_MAX_ENTRIES = 4096
+
+# Below this many uncached games the pool start-up costs more than it saves.
+_INLINE_MAX_GAMES = 4
+
+# Per-worker state set once by _init_highlight_worker.
+_worker_summary_service: Optional[GameSummaryService] = None
+_worker_detector: Optional[Any] = None
+
+# Picklable per-game job: (index, analysis payload (tag value or sidecar segment), checksum).
+HighlightJob = Tuple[int, Union[str, bytes], Optional[str]]
+
+# Worker batch result: ([(index, highlights or None)], profiler stats, profiled games).
+HighlightBatchResult = Tuple[List[Tuple[int, Optional[List[GameHighlight]]]], List[RuleTimingStats], int]
+
+
+def highlight_settings_hash(settings: Dict[str, Any]) -> str:
+    """Stable hash of highlight settings (see GameSummaryService.get_highlight_settings)."""
+    canonical = json.dumps(settings, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _init_highlight_worker(log_queue: Any, config: Dict[str, Any], settings: Dict[str, Any],
+                           profiling_enabled: bool) -> None:
+    """ProcessPoolExecutor initializer: build the rule registry and detector once per worker."""
+    global _worker_summary_service, _worker_detector
+    init_worker_logging(log_queue)
+    _worker_summary_service = GameSummaryService(config)
+    _worker_detector = GameSummaryService.build_highlight_detector(settings)
+    set_rule_profiling_enabled(profiling_enabled)
+
+
+def _detect_job(job: HighlightJob, summary_service: GameSummaryService,
+                detector: Any) -> Optional[List[GameHighlight]]:
+    """Decode one game's analysis payload and run the detector on it (None if unusable)."""
+    _, encoded, checksum = job
+    try:
+        moves = AnalysisDataStorageService.decode_analysis_payload(encoded, checksum)
+    except Exception:
+        return None
+    if not moves:
+        return None
+    return summary_service.detect_highlights(moves, detector)
+
+
+def _process_highlight_batch(jobs: Sequence[HighlightJob]) -> HighlightBatchResult:
+    """Detect highlights for a batch of games (ProcessPool worker entry point)."""
+    results: List[Tuple[int, Optional[List[GameHighlight]]]] = []
+    for job in jobs:
+        try:
+            highlights = _detect_job(job, _worker_summary_service, _worker_detector)
+        except Exception:
+            highlights = None
+        results.append((job[0], highlights))
+    # Hand this batch's rule timings back to the main process
+    profiler = get_rule_profiler()
+    if profiler is None:
+        return results, [], 0
+    stats = profiler.snapshot()
+    games = profiler.units(SCOPE_HIGHLIGHTS)
+    profiler.reset()
+    return results, stats, games
+
+
+class HighlightBatchService:
+    """Detects highlights for many games at once, with a checksum-keyed result cache."""
+
+    _instance: Optional["HighlightBatchService"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        """Initialize the batch service.
+
+        Args:
+            config: Configuration dictionary.
+        """
+        self.config = config
+        self._cache: "OrderedDict[Tuple[str, str], List[GameHighlight]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, config: Dict[str, Any]) -> "HighlightBatchService":
+        """Return the process-wide batch service (the cache is shared by all callers)."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(config)
+        return cls._instance
+
+    @staticmethod
+    def cache_key(encoded: Union[str, bytes], checksum: Optional[str], settings_hash: str) -> Tuple[str, str]:
+        """Cache key for one game: stored analysis checksum (or payload hash) plus settings hash."""
+        if not checksum:
+            data = encoded if isinstance(encoded, bytes) else encoded.encode("utf-8")
+            checksum = "payload:" + hashlib.sha256(data).hexdigest()
+        return (checksum, settings_hash)
+
+    def clear_cache(self) -> None:
+        """Drop all cached highlight results."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def cache_size(self) -> int:
+        with self._cache_lock:
+            return len(self._cache)
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[List[GameHighlight]]:
+        with self._cache_lock:
+            highlights = self._cache.get(key)
+            if highlights is not None:
+                self._cache.move_to_end(key)
+            return highlights
+
+    def _cache_put(self, key: Tuple[str, str], highlights: List[GameHighlight]) -> None:
+        with self._cache_lock:
+            self._cache[key] = highlights
+            self._cache.move_to_end(key)
+            while len(self._cache) > _CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def detect_for_games(
+        self,
+        games: Sequence[GameData],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancellation_check: Optional[Callable[[], bool]] = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> List[Optional[List[GameHighlight]]]:
+        """Detect highlights for each game, reusing cached results where possible.
+
+        Must be called from the main process (rule settings are read from user settings
+        here and shipped to the workers).
+
+        Args:
+            games: Games to process; only games with a CARAAnalysisData tag are analyzed.
+            progress_callback: Optional callback(completed, total) as games finish.
+            cancellation_check: Optional function() -> bool; remaining work is cancelled when True.
+            settings: Highlight settings snapshot (defaults to GameSummaryService.get_highlight_settings()).
+
+        Returns:
+            One entry per input game, in input order: the highlight list, or None if the game
+            has no usable stored analysis, detection failed, or it was not processed because
+            of cancellation.
+        """
+        total = len(games)
+        results: List[Optional[List[GameHighlight]]] = [None] * total
+        if not games:
+            return results
+
+        summary_service = GameSummaryService(self.config)
+        if settings is None:
+            settings = summary_service.get_highlight_settings()
+        settings_hash = highlight_settings_hash(settings)
+
+        # Header-only scan for payload + checksum; cached games never reach a worker
+        jobs: List[HighlightJob] = []
+        keys: Dict[int, Tuple[str, str]] = {}
+        completed = 0
+        for index, game in enumerate(games):
+            payload = AnalysisDataStorageService.read_analysis_payload(getattr(game, "pgn", "") or "")
+            if payload is None:
+                completed += 1
+                continue
+            encoded, checksum = payload
+            key = self.cache_key(encoded, checksum, settings_hash)
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[index] = list(cached)
+                completed += 1
+                continue
+            keys[index] = key
+            jobs.append((index, encoded, checksum))
+
+        if progress_callback:
+            progress_callback(completed, total)
+
+        if not jobs:
+            return results
+
+        def store(batch_results: List[Tuple[int, Optional[List[GameHighlight]]]]) -> None:
+            for index, highlights in batch_results:
+                if highlights is None:
+                    continue
+                self._cache_put(keys[index], highlights)
+                results[index] = list(highlights)
+
+        if len(jobs) <= _INLINE_MAX_GAMES:
+            detector = GameSummaryService.build_highlight_detector(settings)
+            for job in jobs:
+                if cancellation_check and cancellation_check():
+                    break
+                try:
+                    store([(job[0], _detect_job(job, summary_service, detector))])
+                except Exception:
+                    pass
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total)
+            return results
+
+        self._run_pool(jobs, settings, store, completed, total, progress_callback, cancellation_check)
+        return results
+
+    def _run_pool(
+        self,
+        jobs: List[HighlightJob],
+        settings: Dict[str, Any],
+        store: Callable[[List[Tuple[int, Optional[List[GameHighlight]]]]], None],
+        completed: int,
+        total: int,
+        progress_callback: Optional[Callable[[int, int], None]],
+        cancellation_check: Optional[Callable[[], bool]],
+    ) -> None:
+        """Detect highlights for uncached jobs in a process pool, storing results as batches finish."""
+        logging_service = LoggingService.get_instance()
+        max_workers = get_process_pool_max_workers(os.cpu_count(), self.config)
+        profiling_enabled = is_rule_profiling_enabled()
+        logging_service.debug(
+            f"Batch highlight detection: games={len(jobs)}, max_workers={max_workers}"
+        )
+
+        executor = None
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_highlight_worker,
+                initargs=(LoggingService.get_queue(), self.config, settings, profiling_enabled)
+            )
+            batch_size = get_process_pool_batch_size(len(jobs), max_workers, self.config)
+            future_to_size = {
+                executor.submit(_process_highlight_batch, batch): len(batch)
+                for batch in iter_batches(jobs, batch_size)
+            }
+            for future in as_completed(future_to_size):
+                if cancellation_check and cancellation_check():
+                    for f in future_to_size:
+                        f.cancel()
+                    break
+                try:
+                    batch_results, stats, profiled_games = future.result()
+                    store(batch_results)
+                    if stats or profiled_games:
+                        get_rule_profile().merge(stats, {SCOPE_HIGHLIGHTS: profiled_games})
+                except CancelledError:
+                    continue
+                except Exception as e:
+                    logging_service.error(f"Error detecting highlights for game batch: {e}", exc_info=e)
+                completed += future_to_size[future]
+                if progress_callback:
+                    progress_callback(completed, total)
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
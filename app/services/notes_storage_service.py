@@ -10,6 +10,7 @@ from app.models.database_model import GameData
 from app.services.pgn_service import PgnService
 from app.services.logging_service import LoggingService
 from app.utils.pgn_tag_compression import (
+    PayloadCodecUnavailableError,
     decode_and_decompress_to_str,
     compress_and_encode_from_str,
     compute_checksum,
@@ -19,7 +20,7 @@ from app.utils.pgn_tag_compression import (
 class NotesStorageService:
     """Service for storing and loading game notes in PGN tags.
 
-    Uses [CARANotes "..."] with gzip+base64 encoding (same as annotations/analysis).
+    Uses [CARANotes "..."] with compressed+base64 encoding (same as annotations/analysis).
     Optional [CARANotesInfo "..."] and [CARANotesChecksum "..."] for consistency.
     """
 
@@ -64,6 +65,11 @@ class NotesStorageService:
             game.notes = text
             game.has_notes = bool(text.strip())
             return text
+        except PayloadCodecUnavailableError as e:
+            # Written elsewhere with a codec not installed here; keep the tag.
+            LoggingService.get_instance().warning(f"Notes could not be read: {e}")
+            game.notes = ""
+            return ""
         except ValueError:
             NotesStorageService._remove_notes_tags(game)
             game.notes = ""
@@ -82,7 +88,7 @@ class NotesStorageService:
         try:
             data_bytes = text.encode("utf-8")
             checksum = compute_checksum(data_bytes)
-            encoded = compress_and_encode_from_str(text, compresslevel=9)
+            encoded = compress_and_encode_from_str(text)
             app_version = (config or {}).get("version", "1.0")
             info_str = f"App Version: {app_version}, Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
             pgn_io = StringIO(game.pgn)
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import heapq
 import re
 import json
 import sqlite3
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from app.utils.path_resolver import get_app_resource_path
 
@@ -381,6 +383,17 @@ def _search_match_rank(
     return best
 
 
+# Longest n-gram kept in the search index; longer queries intersect several.
+_SEARCH_GRAM_MAX = 3
+
+
+def _search_grams(text: str, size: int) -> Set[str]:
+    """All substrings of ``text`` with length ``size`` (the whole text if shorter)."""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
 def _opt_str(value: Any) -> Optional[str]:
     if value is None:
         return None
@@ -468,6 +481,21 @@ class EncyclopediaSearchPage:
     total: int
 
 
+@dataclass(frozen=True)
+class _SearchDoc:
+    """Searchable opening with its fields folded once at load."""
+
+    opening_id: str
+    family_id: Optional[str]
+    name: str
+    oid: str
+    eco: str
+    fid: str
+    aliases: Tuple[str, ...]
+    sort_name: str
+    result: EncyclopediaSearchResult
+
+
 @dataclass(frozen=True)
 class _SearchAbbrev:
     """Cached ``search_abbrev`` row for free-text query rewrite."""
@@ -542,6 +570,7 @@ class OpeningEncyclopediaService:
     """
 
     _instance: Optional["OpeningEncyclopediaService"] = None
+    _instance_lock = threading.Lock()
 
     def __init__(self, config: Dict[str, Any]) -> None:
         self._config = config
@@ -553,9 +582,14 @@ class OpeningEncyclopediaService:
         self._aliases_by_oid: Dict[str, Tuple[str, ...]] = {}
         # Loaded once from search_abbrev (never re-queried per search).
         self._search_abbrevs: Dict[str, _SearchAbbrev] = {}
+        # Ready openings with folded fields, plus n-gram (1.._SEARCH_GRAM_MAX)
+        # -> doc indices, built at load so search never scans the catalog.
+        self._search_docs: List[_SearchDoc] = []
+        self._search_postings: Dict[str, Tuple[int, ...]] = {}
         self._image_cache: Dict[Tuple[str, int], Optional[bytes]] = {}
         self._available = False
         self._load_attempted = False
+        self._load_lock = threading.Lock()
         self._opening_service: Optional[Any] = None
         self._rows_by_oid: Optional[Dict[str, List[Any]]] = None
         self._tabiya_fen_by_oid: Dict[str, Optional[str]] = {}
@@ -577,15 +611,28 @@ class OpeningEncyclopediaService:
     def get_instance(cls, config: Dict[str, Any]) -> "OpeningEncyclopediaService":
         """Return the process-wide shared encyclopedia service (lazy-loads DB)."""
         if cls._instance is None:
-            cls._instance = cls(config)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(config)
         return cls._instance
 
     def _ensure_loaded(self) -> None:
-        """Load the catalog once, on first access."""
+        """Load the catalog once, on first access.
+
+        Thread-safe: a caller arriving while a background warm-up is loading
+        waits for that load instead of seeing a half-built catalog.
+        """
         if self._load_attempted:
             return
-        self._load_attempted = True
-        self._load()
+        with self._load_lock:
+            if self._load_attempted:
+                return
+            self._load()
+            self._load_attempted = True
+
+    def load(self) -> None:
+        """Load the catalog now (idempotent; used for background warm-up)."""
+        self._ensure_loaded()
 
     @property
     def available(self) -> bool:
@@ -650,8 +697,9 @@ class OpeningEncyclopediaService:
 
         try:
             # Plain path open (not URI): drive letters and Parallels UNC shares
-            # (\\Mac\...) both work. query_only keeps the shipped DB read-only.
-            conn = sqlite3.connect(str(path.resolve()))
+            # (\\Mac\...) both work. query_only keeps the shipped DB read-only,
+            # so the connection may be shared with the thread that loaded it.
+            conn = sqlite3.connect(str(path.resolve()), check_same_thread=False)
             conn.execute("PRAGMA query_only=ON")
             conn.row_factory = sqlite3.Row
             self._conn = conn
@@ -755,6 +803,7 @@ class OpeningEncyclopediaService:
                 }
 
             self._load_eco_fen_index(conn)
+            self._build_search_index()
 
             self._available = True
             try:
@@ -773,6 +822,8 @@ class OpeningEncyclopediaService:
             self._conn = None
             self._available = False
             self._search_abbrevs = {}
+            self._search_docs = []
+            self._search_postings = {}
             try:
                 from app.services.logging_service import LoggingService
 
@@ -1211,6 +1262,9 @@ class OpeningEncyclopediaService:
         Only ``content_state=ready`` openings are searchable (stubs stay out of
         the hit list; explorer lookup still resolves them via inheritance).
 
+        Fields are folded and n-gram indexed once at load, so a query only
+        ranks the openings whose fields contain all of its n-grams.
+
         Returns a page of at most ``limit`` hits plus ``total`` untruncated count
         so the UI can show an overflow hint when results are truncated.
         """
@@ -1220,51 +1274,96 @@ class OpeningEncyclopediaService:
         q, family_scope = _rewrite_search_query(query.strip(), self._search_abbrevs)
         if not q:
             return EncyclopediaSearchPage(results=[], total=0)
-        scored: List[Tuple[int, str, EncyclopediaSearchResult]] = []
-        for raw in self._openings.values():
-            if not self._is_ready(raw):
-                continue
-            oid = str(raw["opening_id"])
-            row_family = raw.get("family_id")
+        scored: List[Tuple[int, str, int]] = []
+        for index in self._search_candidates(q):
+            doc = self._search_docs[index]
             if family_scope and not _opening_in_family_scope(
-                opening_id=oid,
-                family_id=str(row_family) if row_family else None,
+                opening_id=doc.opening_id,
+                family_id=doc.family_id,
                 scope_family_id=family_scope,
             ):
                 continue
-            name = _fold_search_text(raw.get("display_name") or "")
-            oid_fold = _fold_search_text(oid)
-            eco = _fold_search_text(raw.get("eco_codes") or "")
-            fid = _fold_search_text(raw.get("family_id") or "")
-            aliases = self._aliases_by_oid.get(oid, ())
             rank = _search_match_rank(
                 q,
-                display_name=name,
-                opening_id=oid_fold,
-                family_id=fid,
-                eco_codes=eco,
-                aliases=aliases,
+                display_name=doc.name,
+                opening_id=doc.oid,
+                family_id=doc.fid,
+                eco_codes=doc.eco,
+                aliases=doc.aliases,
             )
             if rank is None:
                 continue
+            # Doc index keeps catalog order for full ties (as the stable sort did).
+            scored.append((rank, doc.sort_name, index))
+        capped = max(1, int(limit))
+        top = heapq.nsmallest(capped, scored)
+        return EncyclopediaSearchPage(
+            results=[self._search_docs[index].result for _, _, index in top],
+            total=len(scored),
+        )
+
+    def _build_search_index(self) -> None:
+        """Fold searchable fields of ready openings once and index their n-grams.
+
+        Every field is indexed by its substrings of length 1.._SEARCH_GRAM_MAX,
+        so any query that is a substring of a field has all of its n-grams in
+        that doc's postings. Candidates are verified with the same
+        ``_search_match_rank`` as before, so ranking is unchanged.
+        """
+        docs: List[_SearchDoc] = []
+        postings: Dict[str, List[int]] = {}
+        for raw in self._openings.values():
+            if not self._is_ready(raw):
+                continue
+            oid = str(raw["opening_id"])
+            row_family = raw.get("family_id")
             display = str(raw.get("display_name") or "")
-            scored.append(
-                (
-                    rank,
-                    display.lower(),
-                    EncyclopediaSearchResult(
-                        opening_id=oid,
-                        display_name=display,
-                        tier=_opt_str(raw.get("tier")),
-                        eco_codes=_opt_str(raw.get("eco_codes")),
-                        family_id=_opt_str(raw.get("family_id")),
-                    ),
-                )
+            doc = _SearchDoc(
+                opening_id=oid,
+                family_id=str(row_family) if row_family else None,
+                name=_fold_search_text(display),
+                oid=_fold_search_text(oid),
+                eco=_fold_search_text(raw.get("eco_codes") or ""),
+                fid=_fold_search_text(raw.get("family_id") or ""),
+                aliases=self._aliases_by_oid.get(oid, ()),
+                sort_name=display.lower(),
+                result=EncyclopediaSearchResult(
+                    opening_id=oid,
+                    display_name=display,
+                    tier=_opt_str(raw.get("tier")),
+                    eco_codes=_opt_str(raw.get("eco_codes")),
+                    family_id=_opt_str(raw.get("family_id")),
+                ),
             )
-        scored.sort(key=lambda item: (item[0], item[1]))
-        results = [item[2] for item in scored]
-        capped = max(1, int(limit))
-        return EncyclopediaSearchPage(results=results[:capped], total=len(results))
+            index = len(docs)
+            docs.append(doc)
+            grams: Set[str] = set()
+            for field in (doc.name, doc.oid, doc.eco, doc.fid) + doc.aliases:
+                for size in range(1, _SEARCH_GRAM_MAX + 1):
+                    grams |= _search_grams(field, size)
+            for gram in grams:
+                postings.setdefault(gram, []).append(index)
+        self._search_docs = docs
+        self._search_postings = {gram: tuple(ids) for gram, ids in postings.items()}
+
+    def _search_candidates(self, query: str) -> List[int]:
+        """Doc indices whose fields contain every n-gram of ``query`` (a superset of matches)."""
+        size = min(len(query), _SEARCH_GRAM_MAX)
+        lists = []
+        for gram in _search_grams(query, size):
+            ids = self._search_postings.get(gram)
+            if not ids:
+                return []
+            lists.append(ids)
+        if not lists:
+            return []
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+        return sorted(candidates)
 
     def get_entry_by_id(self, opening_id: str) -> Optional[EncyclopediaEntry]:
         """Look up an entry by opening_id, walking to a ready ancestor if needed."""
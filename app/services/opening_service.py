@@ -5,17 +5,26 @@ update) uses :meth:`OpeningService.last_opening_for_pgn` — the last named
 book ply on the main line.
 """
 
-import json
 import threading
 import chess
 import chess.pgn
 from dataclasses import dataclass
 from io import StringIO
 from pathlib import Path
-from typing import Dict, Any, Optional, Sequence, Tuple, List, Set
+from typing import Dict, Any, Optional, Sequence, Tuple, List
 from typing import TYPE_CHECKING
 
-from app.utils.path_resolver import get_app_resource_path
+from app.services.eco_index import (
+    EcoIndex,
+    EcoIndexEntry,
+    book_hash,
+    book_hash_from_fen,
+    child_book_hash,
+    filter_reachable,
+    home_pawn_mask,
+    load_eco_index,
+)
+from app.utils.path_resolver import get_app_resource_path, resolve_data_file_path
 
 if TYPE_CHECKING:
     from app.config.config_loader import ConfigLoader
@@ -234,6 +243,57 @@ def compute_tabiya_fen(
     return _fen_from_lcp(shallow, _lcp_len([sans for _d, _r, sans in shallow]))
 
 
+class _MainlineOpeningVisitor(chess.pgn.BaseVisitor):
+    """Walks a PGN main line once with one board, keeping the last named book ply.
+
+    Side variations are skipped. Once no curated position can be reached any
+    more (see :func:`filter_reachable`), the remaining moves are not parsed.
+    """
+
+    def __init__(self, service: "OpeningService", index: EcoIndex) -> None:
+        self._service = service
+        self._index = index
+        self._reach = list(index.classified_reach)
+        self._reach_state: Optional[Tuple[int, int]] = None
+        self._done = False
+        self.hit: Optional[Tuple[OpeningDisplay, str]] = None
+
+    def begin_variation(self) -> Any:
+        return chess.pgn.SKIP
+
+    def begin_parse_san(self, board: chess.Board, san: str) -> Any:
+        return chess.pgn.SKIP if self._done else None
+
+    def visit_board(self, board: chess.Board) -> None:
+        # Called with the initial position and after every main-line move
+        if not self._done and board.move_stack:
+            self._visit_position(board)
+
+    def handle_error(self, error: Exception) -> None:
+        # Like GameBuilder: keep what was parsed; the rest of the line is skipped
+        pass
+
+    def result(self) -> Optional[Tuple[OpeningDisplay, str]]:
+        return self.hit
+
+    def _visit_position(self, board: chess.Board) -> None:
+        state = (home_pawn_mask(board), chess.popcount(board.occupied))
+        if state != self._reach_state:
+            self._reach_state = state
+            self._reach = filter_reachable(self._reach, state[0], state[1])
+            if not self._reach:
+                # Left book for good: no named position is reachable from here
+                self._done = True
+                return
+        key = book_hash(board)
+        if not self._index.is_classified_key(key):
+            return
+        fen = board.fen()
+        display = self._service._display_from_index_entry(self._index.classified_entry(key, fen))
+        if display is not None:
+            self.hit = (display, fen)
+
+
 class OpeningService:
     """Service for looking up opening information from FEN positions.
 
@@ -266,12 +326,8 @@ class OpeningService:
             config: Configuration dictionary containing resources.ecolists_path.
         """
         self.config = config
-        self._eco_base: Optional[Dict[str, Any]] = None
-        self._eco_interpolated: Optional[Dict[str, Any]] = None
-        # Curated (base) placement+STM index for classification names.
-        self._classified_by_book_key: Dict[str, Dict[str, Any]] = {}
-        # Placement+STM keys from base and interpolated (theory graph, not names).
-        self._theory_book_keys: Set[str] = set()
+        # Compiled placement+STM index: curated (base) names and theory-graph keys.
+        self._eco_index: Optional[EcoIndex] = None
         # Lazy reverse indexes for diagram lookup (ECO → FEN, ECO+name → FEN).
         self._fen_by_eco: Optional[Dict[str, str]] = None
         self._fen_by_eco_name: Optional[Dict[Tuple[str, str], str]] = None
@@ -289,10 +345,10 @@ class OpeningService:
         return cls._instance
 
     def load(self) -> None:
-        """Load ECO files and derived indexes into memory.
+        """Open the compiled ECO index (compiling it from the JSON sources if stale).
 
-        Thread-safe. After return, lookup maps are immutable and shared reads
-        do not need a lock.
+        Thread-safe. After return, the index is immutable and shared reads do
+        not need a lock.
         """
         if self._loaded:
             return
@@ -300,55 +356,30 @@ class OpeningService:
             if self._loaded:
                 return
 
-            ecolists_path_str = self.config.get('resources', {}).get(
-                'ecolists_path', 'app/resources/ecolists'
-            )
+            resources_config = self.config.get('resources', {})
+            ecolists_path_str = resources_config.get('ecolists_path', 'app/resources/ecolists')
             ecolists_path = Path(str(ecolists_path_str))
             if not ecolists_path.is_absolute():
                 ecolists_path = get_app_resource_path(str(ecolists_path))
 
-            eco_base_file = ecolists_path / "eco_base.json"
-            if eco_base_file.exists():
-                with open(eco_base_file, "r", encoding="utf-8") as f:
-                    self._eco_base = json.load(f)
-            else:
-                self._eco_base = {}
-
-            eco_interpolated_file = ecolists_path / "eco_interpolated.json"
-            if eco_interpolated_file.exists():
-                with open(eco_interpolated_file, "r", encoding="utf-8") as f:
-                    self._eco_interpolated = json.load(f)
-            else:
-                self._eco_interpolated = {}
+            index_path: Optional[Path] = None
+            index_filename = resources_config.get('eco_index_filename', 'eco_index.bin')
+            if index_filename:
+                try:
+                    index_path, _ = resolve_data_file_path(str(index_filename))
+                except OSError:
+                    index_path = None
 
-            self._classified_by_book_key = self._build_classified_index(self._eco_base or {})
-            self._theory_book_keys = self._build_theory_keys(
-                self._eco_base or {},
-                self._eco_interpolated or {},
-            )
-            self._book_rows = self._build_book_rows()
-            self._fen_by_eco, self._fen_by_eco_name = self._build_fen_reverse_indexes()
+            self._eco_index, rebuilt = load_eco_index(ecolists_path, index_path)
             self._loaded = True
 
             from app.services.logging_service import LoggingService
             logging_service = LoggingService.get_instance()
-            base_count = len(self._eco_base) if self._eco_base else 0
-            interpolated_count = len(self._eco_interpolated) if self._eco_interpolated else 0
-            classified_count = len(self._classified_by_book_key)
-            theory_count = len(self._theory_book_keys)
-            book_row_count = len(self._book_rows or [])
-            fen_eco_count = len(self._fen_by_eco or {})
-            fen_eco_name_count = len(self._fen_by_eco_name or {})
-            logging_service.debug(
-                f"Opening lookup index built: classified_keys={classified_count}, "
-                f"theory_keys={theory_count}, book_rows={book_row_count}, "
-                f"fen_by_eco={fen_eco_count}, fen_by_eco_name={fen_eco_name_count}"
-            )
             logging_service.info(
-                f"Opening book loaded: path={ecolists_path}, base_positions={base_count}, "
-                f"interpolated_positions={interpolated_count}, "
-                f"classified_keys={classified_count}, "
-                f"theory_keys={theory_count}"
+                f"Opening book loaded: path={ecolists_path}, index={index_path or 'memory'}, "
+                f"rebuilt={rebuilt}, book_rows={self._eco_index.entry_count()}, "
+                f"classified_keys={self._eco_index.classified_count()}, "
+                f"theory_keys={self._eco_index.theory_count()}"
             )
 
     @staticmethod
@@ -366,55 +397,19 @@ class OpeningService:
             return f"{fields[0]} {fields[1]}"
         return fen
 
-    def _build_classified_index(
-        self, eco_base: Dict[str, Any]
-    ) -> Dict[str, Dict[str, Any]]:
-        """Placement+STM index of curated (base) names only.
-
-        Interpolated rows are omitted: they copy a shallow root name onto later
-        plies and would mislabel transpositions (e.g. Van't Kruijs on a Modern).
-        On a key collision, keep the longer canonical line (more specific tabiya).
-        """
-        indexed: Dict[str, Tuple[Dict[str, Any], int]] = {}
-        for fen, entry in eco_base.items():
-            if not isinstance(entry, dict):
-                continue
-            key = self.book_key(fen)
-            depth = len(parse_move_sans(str(entry.get("moves") or "")))
-            prev = indexed.get(key)
-            if prev is None or depth > prev[1]:
-                indexed[key] = (entry, depth)
-        return {key: entry for key, (entry, _depth) in indexed.items()}
-
-    def _build_theory_keys(
-        self,
-        eco_base: Dict[str, Any],
-        eco_interpolated: Dict[str, Any],
-    ) -> Set[str]:
-        """Placement+STM keys that still count as opening-book positions."""
-        keys: Set[str] = set()
-        for book in (eco_base, eco_interpolated):
-            for fen, entry in book.items():
-                if isinstance(entry, dict):
-                    keys.add(self.book_key(str(fen)))
-        return keys
-
     def _build_book_rows(self) -> List[EcoBookRow]:
         """Unique ECO book positions (interpolated overrides base on the same FEN)."""
         by_fen: Dict[str, EcoBookRow] = {}
-        for book in (self._eco_base or {}, self._eco_interpolated or {}):
-            for fen, entry in book.items():
-                if not isinstance(entry, dict):
-                    continue
-                name = str(entry.get("name") or "").strip()
-                if not name:
-                    continue
-                by_fen[str(fen)] = EcoBookRow(
-                    fen=str(fen),
-                    name=name,
-                    eco=str(entry.get("eco") or "").strip(),
-                    moves=str(entry.get("moves") or "").strip(),
-                )
+        for entry in self._eco_index.iter_entries() if self._eco_index else ():
+            name = entry.name.strip()
+            if not name:
+                continue
+            by_fen[entry.fen] = EcoBookRow(
+                fen=entry.fen,
+                name=name,
+                eco=entry.eco.strip(),
+                moves=entry.moves.strip(),
+            )
         return list(by_fen.values())
 
     def _build_fen_reverse_indexes(
@@ -423,23 +418,20 @@ class OpeningService:
         """ECO / ECO+name → FEN maps (shortest move-list wins per key)."""
         by_eco: Dict[str, Tuple[int, str]] = {}
         by_eco_name: Dict[Tuple[str, str], Tuple[int, str]] = {}
-        for book in (self._eco_base or {}, self._eco_interpolated or {}):
-            for fen, entry in book.items():
-                if not isinstance(entry, dict):
-                    continue
-                eco = str(entry.get("eco") or "").strip()
-                if not eco:
-                    continue
-                name = str(entry.get("name") or "").strip()
-                move_len = len(str(entry.get("moves") or ""))
-                prev = by_eco.get(eco)
-                if prev is None or move_len < prev[0]:
-                    by_eco[eco] = (move_len, fen)
-                if name:
-                    key = (eco, name)
-                    prev_n = by_eco_name.get(key)
-                    if prev_n is None or move_len < prev_n[0]:
-                        by_eco_name[key] = (move_len, fen)
+        for entry in self._eco_index.iter_entries() if self._eco_index else ():
+            eco = entry.eco.strip()
+            if not eco:
+                continue
+            name = entry.name.strip()
+            move_len = len(entry.moves)
+            prev = by_eco.get(eco)
+            if prev is None or move_len < prev[0]:
+                by_eco[eco] = (move_len, entry.fen)
+            if name:
+                key = (eco, name)
+                prev_n = by_eco_name.get(key)
+                if prev_n is None or move_len < prev_n[0]:
+                    by_eco_name[key] = (move_len, entry.fen)
         return (
             {eco: fen for eco, (_n, fen) in by_eco.items()},
             {key: fen for key, (_n, fen) in by_eco_name.items()},
@@ -452,12 +444,24 @@ class OpeningService:
             return None
         return OpeningDisplay(eco=str(eco), name=str(name))
 
+    @staticmethod
+    def _display_from_index_entry(entry: Optional[EcoIndexEntry]) -> Optional[OpeningDisplay]:
+        if entry is None or not entry.eco or not entry.name:
+            return None
+        return OpeningDisplay(eco=entry.eco, name=entry.name)
+
+    def _classified_entry(self, fen: str) -> Optional[EcoIndexEntry]:
+        """Curated index row for a FEN: exact FEN first, then placement + side to move."""
+        if not self._loaded:
+            self.load()
+        key = book_hash_from_fen(fen)
+        if key is None or self._eco_index is None:
+            return None
+        return self._eco_index.classified_entry(key, fen)
+
     def lookup_opening_display(self, fen: str) -> Optional[OpeningDisplay]:
         """Look up a curated OpeningDisplay for a FEN (exact then book-key)."""
-        entry = self.lookup_opening(fen)
-        if not entry:
-            return None
-        return self._display_from_entry(entry)
+        return self._display_from_index_entry(self._classified_entry(fen))
     
     def lookup_opening(self, fen: str) -> Optional[Dict[str, Any]]:
         """Look up a curated opening name for a FEN position.
@@ -470,20 +474,24 @@ class OpeningService:
             fen: FEN position string.
             
         Returns:
-            Dictionary with 'eco', 'name', 'moves', etc., or None if not found.
+            Dictionary with 'eco', 'name' and 'moves', or None if not found.
+        """
+        entry = self._classified_entry(fen)
+        return entry.as_dict() if entry else None
+
+    def lookup_board_display(self, board: chess.Board) -> Optional[OpeningDisplay]:
+        """Look up a curated OpeningDisplay for a board without rendering its FEN.
+
+        Same result as ``lookup_opening_display(board.fen())``; the full FEN is
+        only rendered when several curated rows share the position.
         """
         if not self._loaded:
             self.load()
-
-        entry: Optional[Dict[str, Any]] = None
-        if self._eco_base and fen in self._eco_base:
-            found = self._eco_base[fen]
-            if isinstance(found, dict):
-                entry = found
-        if entry is None:
-            found = self._classified_by_book_key.get(self.book_key(fen))
-            entry = found if isinstance(found, dict) else None
-        return entry
+        if self._eco_index is None:
+            return None
+        key = book_hash(board)
+        fen = board.fen() if self._eco_index.needs_exact_fen(key) else None
+        return self._display_from_index_entry(self._eco_index.classified_entry(key, fen))
 
     def get_opening_info(self, fen: str) -> Tuple[Optional[str], Optional[str]]:
         """Get ECO code and opening name for a FEN position.
@@ -532,43 +540,101 @@ class OpeningService:
         return hit[0] if hit else None
 
     def last_named_opening_for_pgn(
-        self, pgn: str
+        self, pgn: str, position_hashes: Optional[Sequence[int]] = None
     ) -> Optional[Tuple[OpeningDisplay, str]]:
-        """Last curated opening on the PGN main line, with that ply's FEN."""
-        return self.last_named_opening_from_fens(
-            self._mainline_fens_after_each_move(pgn)
-        )
+        """Last curated opening on the PGN main line, with that ply's FEN.
 
-    def last_opening_for_pgn(self, pgn: str) -> Optional[OpeningDisplay]:
-        """Last curated opening on the PGN main line."""
-        hit = self.last_named_opening_for_pgn(pgn)
+        Args:
+            pgn: Game PGN.
+            position_hashes: Optional per-ply book keys of the main line (index 0 =
+                start; e.g. ``DatabaseModel.get_position_hashes_fuzzy``). When given,
+                the line is only replayed up to the hit to render its FEN.
+        """
+        if position_hashes:
+            hit = self._last_named_ply_from_hashes(pgn, position_hashes)
+            if hit is not None:
+                display, ply, fen = hit
+                if fen is None:
+                    fens, _, _ = self.replay_mainline_to_ply(pgn, ply)
+                    if len(fens) != ply + 1:
+                        return self._last_named_from_mainline(pgn)
+                    fen = fens[-1]
+                return (display, fen)
+            return None
+        return self._last_named_from_mainline(pgn)
+
+    def last_opening_for_pgn(
+        self, pgn: str, position_hashes: Optional[Sequence[int]] = None
+    ) -> Optional[OpeningDisplay]:
+        """Last curated opening on the PGN main line (see :meth:`last_named_opening_for_pgn`)."""
+        if position_hashes:
+            hit = self._last_named_ply_from_hashes(pgn, position_hashes)
+            return hit[0] if hit else None
+        hit = self._last_named_from_mainline(pgn)
         return hit[0] if hit else None
 
-    def _mainline_fens_after_each_move(self, pgn: str) -> List[str]:
-        """FENs after each mainline ply. Empty if the PGN cannot be parsed."""
+    def _last_named_from_mainline(self, pgn: str) -> Optional[Tuple[OpeningDisplay, str]]:
+        """Single forward pass over the main line; stops once the game left book for good."""
+        if not self._loaded:
+            self.load()
+        if self._eco_index is None:
+            return None
         try:
-            pgn_io = StringIO(pgn)
-            chess_game = chess.pgn.read_game(pgn_io)
-            if chess_game is None:
-                return []
-            fens: List[str] = []
-            node = chess_game
-            while node.variations:
-                node = node.variation(0)
-                fens.append(node.board().fen())
-            return fens
+            return chess.pgn.read_game(
+                StringIO(pgn or ""),
+                Visitor=lambda: _MainlineOpeningVisitor(self, self._eco_index),
+            )
         except Exception:
-            return []
+            return None
+
+    def _last_named_ply_from_hashes(
+        self, pgn: str, position_hashes: Sequence[int]
+    ) -> Optional[Tuple[OpeningDisplay, int, Optional[str]]]:
+        """Scan precomputed per-ply keys from the end: ``(display, ply, fen or None)``.
+
+        The FEN is only rendered (by replaying up to that ply) when several curated
+        rows share the hit's key and the exact FEN decides between them.
+        """
+        if not self._loaded:
+            self.load()
+        index = self._eco_index
+        if index is None:
+            return None
+        for ply in range(len(position_hashes) - 1, 0, -1):
+            key = int(position_hashes[ply])
+            if not index.is_classified_key(key):
+                continue
+            fen: Optional[str] = None
+            if index.needs_exact_fen(key):
+                fens, _, _ = self.replay_mainline_to_ply(pgn, ply)
+                if len(fens) == ply + 1:
+                    fen = fens[-1]
+            display = self._display_from_index_entry(index.classified_entry(key, fen))
+            if display is not None:
+                return (display, ply, fen)
+        return None
 
     def _ensure_fen_reverse_indexes(self) -> None:
         if not self._loaded:
             self.load()
+        if self._fen_by_eco is not None:
+            return
+        with self._load_lock:
+            if self._fen_by_eco is None:
+                by_eco, by_eco_name = self._build_fen_reverse_indexes()
+                self._fen_by_eco_name = by_eco_name
+                # Assigned last: unlocked readers check this one
+                self._fen_by_eco = by_eco
 
     def iter_book_rows(self) -> List[EcoBookRow]:
         """All unique ECO book positions (interpolated overrides base on the same FEN)."""
         if not self._loaded:
             self.load()
-        return self._book_rows or []
+        if self._book_rows is None:
+            with self._load_lock:
+                if self._book_rows is None:
+                    self._book_rows = self._build_book_rows()
+        return self._book_rows
 
     def find_representative_fen(
         self, eco: Optional[str], name: Optional[str] = None
@@ -595,12 +661,23 @@ class OpeningService:
         """True if the position appears in the ECO theory graph (base or interpolated)."""
         if not self._loaded:
             self.load()
-        if self._eco_base and fen in self._eco_base:
-            return True
-        if self._eco_interpolated and fen in self._eco_interpolated:
-            return True
-        return self.book_key(fen) in self._theory_book_keys
-    
+        key = book_hash_from_fen(fen)
+        if key is None or self._eco_index is None:
+            return False
+        return self._eco_index.is_theory_key(key)
+
+    def is_book_board(self, board: chess.Board) -> bool:
+        """Same as :meth:`is_book_position` for a board (no FEN rendering)."""
+        if not self._loaded:
+            self.load()
+        return self.is_book_key(book_hash(board))
+
+    def is_book_key(self, key: int) -> bool:
+        """Same as :meth:`is_book_position` for a precomputed book hash (see eco_index.book_hash)."""
+        if not self._loaded:
+            self.load()
+        return self._eco_index is not None and self._eco_index.is_theory_key(key)
+
     def is_loaded(self) -> bool:
         """Check if ECO files are loaded.
         
@@ -848,6 +925,10 @@ class OpeningService:
     ) -> List[OpeningContinuation]:
         """Legal moves from ``fen`` that land on another theory-graph position.
 
+        Theory positions read their moves from the precompiled graph in the ECO
+        index (no move generation, hashing or lookup per legal move); other
+        positions fall back to trying every legal move.
+
         Destination names are curated lookups. Interpolated-only landings keep
         ``fallback_display`` (typically the current named opening) instead of
         adopting a shallow interpolated root name.
@@ -861,15 +942,32 @@ class OpeningService:
         except Exception:
             return []
 
+        index = self._eco_index
+        key = book_hash(board)
+        edges = index.theory_children(key) if index is not None else None
+        if edges is None:
+            # Not a theory node: try every legal move
+            candidates = [(move, child_book_hash(board, key, move)) for move in board.legal_moves]
+        else:
+            # Graph edges cover moves that depend on placement only; castling and
+            # en passant depend on this FEN's rights, so add them here
+            candidates = list(edges)
+            for move in board.generate_castling_moves():
+                candidates.append((move, child_book_hash(board, key, move)))
+            for move in board.generate_legal_ep():
+                candidates.append((move, child_book_hash(board, key, move)))
+
         results: List[OpeningContinuation] = []
-        for move in board.legal_moves:
+        for move, child_key in candidates:
+            if index is None or not index.is_theory_key(child_key):
+                continue
             san = board.san(move)
             board.push(move)
             fen_after = board.fen()
-            display = self.lookup_opening_display(fen_after)
-            if display is None and self.is_book_position(fen_after):
-                display = fallback_display
             board.pop()
+            display = self._display_from_index_entry(index.classified_entry(child_key, fen_after))
+            if display is None:
+                display = fallback_display
             if display is None:
                 continue
             results.append(
@@ -894,11 +992,13 @@ class OpeningService:
         results.sort(key=sort_key)
         return results[: max(int(limit), 0)]
     
-    def get_final_eco_for_game(self, pgn: str) -> Optional[str]:
+    def get_final_eco_for_game(
+        self, pgn: str, position_hashes: Optional[Sequence[int]] = None
+    ) -> Optional[str]:
         """ECO of the last named book opening on the main line.
 
         Thin wrapper over :meth:`last_opening_for_pgn`. Used by bulk ECO
         update, bulk analysis, and the game header.
         """
-        opening = self.last_opening_for_pgn(pgn)
+        opening = self.last_opening_for_pgn(pgn, position_hashes)
         return opening.eco if opening else None
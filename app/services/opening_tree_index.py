@@ -0,0 +1,201 @@
+"""Move-prefix trie over a player's analyzed games for opening-tree views (no Qt)."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (eco, opening_name) for a FEN, as returned by OpeningService.get_opening_info.
+OpeningInfoLookup = Callable[[str], Tuple[Optional[str], Optional[str]]]
+
+# One ply of a game's main line: (SAN, FEN after the move or "").
+TreePly = Tuple[str, str]
+
+
+class OpeningTreeNode:
+    """One SAN prefix: aggregate counts plus the indices of the games that reached it."""
+
+    __slots__ = (
+        "games",
+        "white_games",
+        "black_games",
+        "game_accuracy_sum",
+        "opening_accuracy_sum",
+        "game_indices",
+        "children",
+        "fen",
+        "opening_info",
+    )
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.white_games = 0
+        self.black_games = 0
+        self.game_accuracy_sum = 0.0
+        self.opening_accuracy_sum = 0.0
+        self.game_indices: List[int] = []
+        self.children: Dict[str, OpeningTreeNode] = {}
+        # First non-empty FEN seen after this move; ECO info is looked up from it on first export.
+        self.fen = ""
+        self.opening_info: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+
+def flatten_move_list(moves: Iterable[Any], max_plies: int) -> List[TreePly]:
+    """Flatten MoveData rows into (SAN, FEN after) plies, skipping empty half-moves.
+
+    Args:
+        moves: MoveData-like rows with white_move/black_move and fen_white/fen_black.
+        max_plies: Maximum number of plies to return.
+    """
+    plies: List[TreePly] = []
+    if max_plies <= 0:
+        return plies
+    for move in moves:
+        if move.white_move:
+            plies.append((move.white_move, getattr(move, "fen_white", "") or ""))
+            if len(plies) >= max_plies:
+                break
+        if move.black_move:
+            plies.append((move.black_move, getattr(move, "fen_black", "") or ""))
+            if len(plies) >= max_plies:
+                break
+    return plies
+
+
+class OpeningTreeIndex:
+    """Opening tree for one player's games, built once and queried per view.
+
+    Every game is inserted along its first ``max_depth`` plies. Each node keeps
+    the per-colour counts and accuracy sums of the games through it, so the
+    player-stats opening tree can be exported at any depth up to ``max_depth``
+    and the games behind any node are read from its posting list instead of
+    replaying every game's move list.
+    """
+
+    def __init__(self, max_depth: int) -> None:
+        """Initialize an empty index.
+
+        Args:
+            max_depth: Deepest ply stored; exports and lookups beyond it need a rebuild.
+        """
+        self.max_depth = max_depth
+        self.root = OpeningTreeNode()
+
+    def add_game(
+        self,
+        game_index: int,
+        plies: Sequence[TreePly],
+        is_white: bool,
+        game_accuracy: float = 0.0,
+        opening_accuracy: float = 0.0,
+    ) -> None:
+        """Insert one game.
+
+        Args:
+            game_index: Caller's index of the game (returned by games_for_path).
+            plies: (SAN, FEN after) per ply from the start position.
+            is_white: True if the player had White in this game.
+            game_accuracy: Player's overall accuracy in the game.
+            opening_accuracy: Player's opening-phase accuracy in the game.
+        """
+        game_accuracy = float(game_accuracy)
+        opening_accuracy = float(opening_accuracy)
+        node = self.root
+        self._count(node, game_index, is_white, game_accuracy, opening_accuracy)
+        for san, fen in plies[:self.max_depth]:
+            child = node.children.get(san)
+            if child is None:
+                child = OpeningTreeNode()
+                node.children[san] = child
+            if fen and not child.fen:
+                child.fen = fen
+            self._count(child, game_index, is_white, game_accuracy, opening_accuracy)
+            node = child
+
+    @staticmethod
+    def _count(
+        node: OpeningTreeNode,
+        game_index: int,
+        is_white: bool,
+        game_accuracy: float,
+        opening_accuracy: float,
+    ) -> None:
+        node.games += 1
+        if is_white:
+            node.white_games += 1
+        else:
+            node.black_games += 1
+        node.game_accuracy_sum += game_accuracy
+        node.opening_accuracy_sum += opening_accuracy
+        node.game_indices.append(game_index)
+
+    def node_for_path(self, san_path: Sequence[str]) -> Optional[OpeningTreeNode]:
+        """Return the node reached by a SAN path from the start, or None."""
+        if len(san_path) > self.max_depth:
+            return None
+        node = self.root
+        for san in san_path:
+            node = node.children.get(san)
+            if node is None:
+                return None
+        return node
+
+    def games_for_path(self, san_path: Sequence[str]) -> List[int]:
+        """Return indices (in insertion order) of games whose main line starts with san_path."""
+        node = self.node_for_path(san_path)
+        return list(node.game_indices) if node is not None else []
+
+    def to_tree(
+        self,
+        max_depth: int,
+        min_games: int = 1,
+        opening_info: Optional[OpeningInfoLookup] = None,
+    ) -> Dict[str, Any]:
+        """Export the nested dict used by the player-stats opening tree view.
+
+        Args:
+            max_depth: Deepest ply to export (capped at the index depth).
+            min_games: Children reached by fewer games are dropped with their subtrees.
+            opening_info: Optional FEN -> (eco, name) lookup; results are cached per node.
+        """
+        root = self.root
+        tree: Dict[str, Any] = {
+            "games": root.games,
+            "white_games": root.white_games,
+            "black_games": root.black_games,
+            "children": self._export_children(root, min(max_depth, self.max_depth), min_games, opening_info),
+        }
+        return tree
+
+    def _export_children(
+        self,
+        node: OpeningTreeNode,
+        depth_left: int,
+        min_games: int,
+        opening_info: Optional[OpeningInfoLookup],
+    ) -> Dict[str, Any]:
+        children: Dict[str, Any] = {}
+        if depth_left <= 0:
+            return children
+        for san, child in node.children.items():
+            if child.games < min_games:
+                continue
+            entry: Dict[str, Any] = {
+                "games": child.games,
+                "white_games": child.white_games,
+                "black_games": child.black_games,
+                "game_accuracy_sum": child.game_accuracy_sum,
+                "game_accuracy_count": child.games,
+                "opening_accuracy_sum": child.opening_accuracy_sum,
+                "opening_accuracy_count": child.games,
+                "children": self._export_children(child, depth_left - 1, min_games, opening_info),
+            }
+            if opening_info is not None and child.fen:
+                if child.opening_info is None:
+                    child.opening_info = opening_info(child.fen)
+                eco, name = child.opening_info
+                if eco:
+                    entry["eco"] = eco
+                if name:
+                    entry["opening_name"] = name
+            children[san] = entry
+        return children
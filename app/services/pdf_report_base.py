@@ -16,7 +16,6 @@ from PyQt6.QtGui import (
     QPainter,
     QPdfWriter,
     QPen,
-    QPixmap,
 )
 
 from app.utils.pdf_report_config import resolve_pdf_report_config
@@ -85,7 +84,7 @@ class BasePDFReportService:
         ] or [f"Generated with CARA ({version})"]
 
         self._logo_file: Optional[Path] = None
-        self._logo_pixmap: Optional[QPixmap] = None
+        self._logo_image: Optional[QImage] = None
         self._logo_resolved = False
         page = str(self._cfg.get("page_size", "letter")).lower()
         self._page_size_id = (
@@ -135,9 +134,10 @@ class BasePDFReportService:
                 break
         return self._logo_file
 
-    def _logo_raster_pixmap(self) -> Optional[QPixmap]:
-        if self._logo_pixmap is not None:
-            return self._logo_pixmap
+    def _logo_raster_image(self) -> Optional[QImage]:
+        # QImage rather than QPixmap, so painting a report does not need the GUI thread.
+        if self._logo_image is not None:
+            return self._logo_image
         path = self._resolve_logo_file()
         if path is None:
             return None
@@ -155,27 +155,27 @@ class BasePDFReportService:
             p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
             renderer.render(p)
             p.end()
-            self._logo_pixmap = QPixmap.fromImage(image)
-            return self._logo_pixmap
-        pix = QPixmap(str(path))
-        if pix.isNull():
+            self._logo_image = image
+            return self._logo_image
+        image = QImage(str(path))
+        if image.isNull():
             return None
-        self._logo_pixmap = pix.scaled(
+        self._logo_image = image.scaled(
             px,
             px,
             Qt.AspectRatioMode.KeepAspectRatio,
             Qt.TransformationMode.SmoothTransformation,
         )
-        return self._logo_pixmap
+        return self._logo_image
 
     def _draw_logo(self, painter: QPainter, rect: QRectF) -> bool:
-        pix = self._logo_raster_pixmap()
-        if pix is None or pix.isNull():
+        image = self._logo_raster_image()
+        if image is None or image.isNull():
             return False
         painter.save()
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
-        painter.drawPixmap(rect, pix, QRectF(0, 0, pix.width(), pix.height()))
+        painter.drawImage(rect, image, QRectF(0, 0, image.width(), image.height()))
         painter.restore()
         return True
 
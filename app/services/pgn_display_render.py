@@ -0,0 +1,223 @@
+"""Rendered PGN view content, a small cache of recent renders and comment-edit patches (no Qt)."""
+
+from __future__ import annotations
+
+import html as html_lib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.pgn_formatter_service import PgnFormatterService, PgnRangeMap, comment_href
+
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+@dataclass(frozen=True)
+class PgnDisplayOptions:
+    """Everything besides the PGN text that changes the rendered view."""
+
+    show_metadata: bool = True
+    show_comments: bool = True
+    show_variations: bool = True
+    show_annotations: bool = True
+    show_results: bool = True
+    show_non_standard_tags: bool = False
+    indent_variations: bool = True
+    # Sorted (key, value) pairs of the user's PGN notation settings
+    notation: Tuple[Tuple[str, Any], ...] = ()
+
+    @staticmethod
+    def notation_key(settings: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+        """Hashable form of a PGN notation settings dict."""
+        return tuple(sorted((settings or {}).items()))
+
+
+@dataclass
+class PgnDisplayRender:
+    """HTML and move table for one PGN text under one set of display options.
+
+    ``range_map`` depends on how Qt lays out ``html``; the view fills it in after
+    the first ``setHtml`` so later renders of the same HTML skip the document walk.
+    """
+
+    html: str
+    move_info: List[Tuple[str, int, bool]]
+    range_map: Optional[PgnRangeMap] = None
+
+
+def render_pgn_for_display(pgn_text: str, config: Dict[str, Any], options: PgnDisplayOptions) -> PgnDisplayRender:
+    """Render PGN text for the PGN view.
+
+    The move table is read from the unfiltered text (hidden headers may include
+    SetUp/FEN); the HTML is formatted once from the filtered text.
+
+    Args:
+        pgn_text: Plain PGN text of the game.
+        config: Configuration dictionary containing formatting settings.
+        options: Visibility flags and notation settings.
+    """
+    if not pgn_text:
+        return PgnDisplayRender(html="", move_info=[])
+    return PgnDisplayRender(
+        html=_display_html(pgn_text, config, options),
+        move_info=PgnFormatterService.extract_move_info(pgn_text),
+    )
+
+
+def _display_html(pgn_text: str, config: Dict[str, Any], options: PgnDisplayOptions) -> str:
+    display_text = PgnFormatterService.filter_pgn_for_display(
+        pgn_text,
+        show_metadata=options.show_metadata,
+        show_comments=options.show_comments,
+        show_variations=options.show_variations,
+        show_annotations=options.show_annotations,
+        show_results=options.show_results,
+        show_non_standard_tags=options.show_non_standard_tags,
+    )
+    if not display_text:
+        return ""
+    return PgnFormatterService.format_pgn_html(
+        display_text,
+        config,
+        pgn_notation_settings=dict(options.notation),
+        indent_variations=options.indent_variations,
+    )
+
+
+class PgnDisplayRenderCache:
+    """Least-recently-used renders keyed by (PGN text, display options).
+
+    Keying on the text itself means an edited game is a new entry while toggling
+    a visibility flag back, or returning to a recently viewed game, is a lookup.
+    """
+
+    def __init__(self, config: Dict[str, Any], max_entries: int = 16) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            config: Configuration dictionary passed to the formatter.
+            max_entries: Renders kept before the least recently used is dropped.
+        """
+        self._config = config
+        self._max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[Tuple[str, PgnDisplayOptions], PgnDisplayRender]" = OrderedDict()
+
+    def get(self, pgn_text: str, options: PgnDisplayOptions) -> PgnDisplayRender:
+        """Return the cached render, rendering and storing it on a miss."""
+        key = (pgn_text, options)
+        render = self._entries.get(key)
+        if render is not None:
+            self._entries.move_to_end(key)
+            return render
+        render = render_pgn_for_display(pgn_text, self._config, options)
+        self._entries[key] = render
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return render
+
+    def put(self, pgn_text: str, options: PgnDisplayOptions, render: PgnDisplayRender) -> None:
+        """Store a render produced elsewhere (e.g. by patching a cached one)."""
+        key = (pgn_text, options)
+        self._entries[key] = render
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass(frozen=True)
+class PgnCommentEdit:
+    """The single comment that differs between two versions of a game."""
+
+    index: int  # Position among the movetext's brace comments
+    comment_count: int  # Brace comments in the movetext (same in both versions)
+    old_comment: str
+    new_comment: str
+
+
+@dataclass(frozen=True)
+class PgnCommentFragment:
+    """One comment as the formatter renders it inside a game."""
+
+    html: str  # Anchor element; its href is COMMENT_FRAGMENT_HREF
+    text: str  # Plain text the anchor shows in the document
+
+
+COMMENT_FRAGMENT_HREF = comment_href(1)
+
+
+def _split_comments(pgn_text: str) -> Tuple[List[str], List[str]]:
+    """Split a game into whitespace-normalized text between brace comments and the comments.
+
+    Header lines are kept in the first segment (their quoted values may contain braces).
+    Whitespace is normalized because the export re-wraps lines while the rendered view
+    collapses whitespace anyway.
+    """
+    lines = pgn_text.split("\n")
+    header_count = 0
+    while header_count < len(lines) and (
+        lines[header_count].lstrip().startswith("[") or not lines[header_count].strip()
+    ):
+        header_count += 1
+    headers = " ".join(" ".join(lines[:header_count]).split())
+    movetext = "\n".join(lines[header_count:])
+    segments: List[str] = []
+    comments: List[str] = []
+    position = 0
+    while True:
+        open_brace = movetext.find("{", position)
+        if open_brace == -1:
+            break
+        close_brace = movetext.find("}", open_brace + 1)
+        if close_brace == -1:
+            break
+        segments.append(" ".join(movetext[position:open_brace].split()))
+        comments.append(" ".join(movetext[open_brace + 1:close_brace].split()))
+        position = close_brace + 1
+    segments.append(" ".join(movetext[position:].split()))
+    segments[0] = f"{headers}|{segments[0]}"
+    return segments, comments
+
+
+def find_comment_edit(old_text: str, new_text: str) -> Optional[PgnCommentEdit]:
+    """Return the comment edit if the two games differ only in the text of one existing comment."""
+    if not old_text or not new_text:
+        return None
+    old_segments, old_comments = _split_comments(old_text)
+    new_segments, new_comments = _split_comments(new_text)
+    if old_segments != new_segments or len(old_comments) != len(new_comments):
+        return None
+    changed = [i for i, (old, new) in enumerate(zip(old_comments, new_comments)) if old != new]
+    if len(changed) != 1:
+        return None
+    index = changed[0]
+    return PgnCommentEdit(
+        index=index,
+        comment_count=len(old_comments),
+        old_comment=old_comments[index],
+        new_comment=new_comments[index],
+    )
+
+
+def render_comment_fragment(
+    comment: str, config: Dict[str, Any], options: PgnDisplayOptions
+) -> Optional[PgnCommentFragment]:
+    """Render one comment through the display filter and formatter, as in a full render.
+
+    Returns None if the filters drop the comment or no comment anchor is produced.
+    """
+    html = _display_html(f"1. e4 {{{comment}}} *", config, options)
+    start = html.find(f'<a href="{COMMENT_FRAGMENT_HREF}"')
+    if start == -1:
+        return None
+    end = html.find("</a>", start)
+    if end == -1:
+        return None
+    element = html[start:end + len("</a>")]
+    return PgnCommentFragment(html=element, text=html_lib.unescape(_TAG_RE.sub("", element)))
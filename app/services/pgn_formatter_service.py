@@ -8,7 +8,7 @@ sideline comments use ``cara-pcmt:``.
 
 import re
 import io
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Dict, Any, Tuple, List, Optional, Sequence
 
 import chess.pgn
@@ -86,6 +86,27 @@ class PgnRangeMap:
                 return item
         return None
 
+    def with_range_resized(self, start: int, end: int, new_end: int) -> "PgnRangeMap":
+        """Return the map after the document range ``[start, end)`` became ``[start, new_end)``.
+
+        The range starting at ``start`` is resized and every range after ``end`` is shifted.
+        """
+        delta = new_end - end
+
+        def moved(item):
+            if item.start >= end:
+                return replace(item, start=item.start + delta, end=item.end + delta)
+            if item.start == start:
+                return replace(item, end=item.end + delta)
+            return item
+
+        return PgnRangeMap(
+            moves=tuple(moved(item) for item in self.moves),
+            comments=tuple(moved(item) for item in self.comments),
+            path_moves=tuple(moved(item) for item in self.path_moves),
+            path_comments=tuple(moved(item) for item in self.path_comments),
+        )
+
 
 def ply_href(ply: int) -> str:
     """Return the HTML href for a 1-based main-line ply."""
@@ -1404,9 +1425,47 @@ class PgnFormatterService:
         """
         if not pgn_text:
             return ("", [])
+        formatted = PgnFormatterService.format_pgn_html(
+            pgn_text,
+            config,
+            pgn_notation_settings=pgn_notation_settings,
+            indent_variations=indent_variations,
+        )
+        return (formatted, PgnFormatterService.extract_move_info(pgn_text))
+    
+    @staticmethod
+    def extract_move_info(pgn_text: str) -> List[Tuple[str, int, bool]]:
+        """Return (move_san, move_number, is_white) for each main-line ply of the PGN text.
+        
+        Args:
+            pgn_text: Plain PGN text string (unfiltered, so SetUp/FEN headers are honoured).
+        """
+        return [
+            (move_san, move_number, is_white)
+            for _ply_index, move_san, move_number, is_white
+            in PgnFormatterService._extract_move_positions_from_pgn(pgn_text)
+        ]
+    
+    @staticmethod
+    def format_pgn_html(
+        pgn_text: str,
+        config: Dict[str, Any],
+        pgn_notation_settings: Optional[Dict[str, Any]] = None,
+        indent_variations: bool = False,
+    ) -> str:
+        """Format plain PGN text to styled HTML without extracting move info.
         
-        # Parse PGN to identify moves
-        parsed_moves = PgnFormatterService._extract_move_positions_from_pgn(pgn_text)
+        Args:
+            pgn_text: Plain PGN text string (typically already filtered for display).
+            config: Configuration dictionary containing formatting settings.
+            pgn_notation_settings: Optional user settings for PGN notation (see format_pgn_to_html).
+            indent_variations: If True, display each variation on a new line indented by depth.
+            
+        Returns:
+            HTML formatted string with styling applied.
+        """
+        if not pgn_text:
+            return ""
         
         # Get formatting config
         ui_config = config.get('ui', {})
@@ -2298,21 +2357,7 @@ class PgnFormatterService:
             # between '(' and the first sideline move.
             return text
         
-        formatted = add_break_after_last_tag(formatted)
-        
-        # Extract move information for each ply
-        # This is used by the view to find moves in the rendered document
-        move_info_list = []  # Store move information for each ply
-        
-        if not parsed_moves:
-            return (formatted, [])
-        
-        # Build move_info list from parsed moves
-        for ply_index, move_san, move_number, is_white in parsed_moves:
-            move_info_list.append((move_san, move_number, is_white))
-        
-        # Return formatted HTML and move info
-        return (formatted, move_info_list)
+        return add_break_after_last_tag(formatted)
     
     @staticmethod
     def _format_variations_with_moves(
@@ -2793,13 +2838,13 @@ class PgnFormatterService:
             if chess_game is None:
                 return []
             
-            # Traverse game tree to extract moves
+            # Traverse the main line on one board (node.board() replays from the root every call)
             node = chess_game
+            board_before = chess_game.board()
             ply_index = 0
             
             while node.variations:
                 next_node = node.variation(0)
-                board_before = node.board()
                 move_san = board_before.san(next_node.move)
                 
                 is_white = board_before.turn == chess.WHITE
@@ -2808,6 +2853,7 @@ class PgnFormatterService:
                 ply_index += 1
                 moves.append((ply_index, move_san, move_number, is_white))
                 
+                board_before.push(next_node.move)
                 node = next_node
         except Exception as e:
             # On any error, return empty list
@@ -1017,10 +1017,13 @@ class PgnService:
             # This is done in the worker process during load for performance.
             position_hashes: List[int] = []
             position_hashes_fuzzy: List[int] = []
+            position_pawn_keys: List[int] = []
             try:
                 from chess.polyglot import zobrist_hash
+                from app.utils.position_keys import pawn_structure_key
                 board = game.board()
                 position_hashes.append(int(zobrist_hash(board)))
+                position_pawn_keys.append(pawn_structure_key(board))
                 # Fuzzy: ignore castling rights and en-passant square.
                 cr0 = getattr(board, "castling_rights", 0)
                 ep0 = getattr(board, "ep_square", None)
@@ -1036,6 +1039,7 @@ class PgnService:
                     node = node.variation(0)
                     board.push(node.move)
                     position_hashes.append(int(zobrist_hash(board)))
+                    position_pawn_keys.append(pawn_structure_key(board))
                     cr0 = getattr(board, "castling_rights", 0)
                     ep0 = getattr(board, "ep_square", None)
                     try:
@@ -1048,6 +1052,7 @@ class PgnService:
             except Exception:
                 position_hashes = []
                 position_hashes_fuzzy = []
+                position_pawn_keys = []
             
             return {
                 "white": white,
@@ -1070,6 +1075,7 @@ class PgnService:
                 "tags": tag_names,  # Tag names extracted during parsing
                 "position_hashes": position_hashes,  # Per-ply zobrist hashes (ply 0..N)
                 "position_hashes_fuzzy": position_hashes_fuzzy,  # Per-ply hashes ignoring castling/ep
+                "position_pawn_keys": position_pawn_keys,  # Per-ply pawn structure + side to move keys
             }
             
         except Exception:
@@ -8,12 +8,12 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from PyQt6.QtCore import QRectF, Qt
-from PyQt6.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter, QPen, QPixmap
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter, QPen
 
+from app.services.board_diagram_cache import BoardDiagramCache, DiagramRequest
 from app.services.opening_service import OpeningService
 from app.services.pdf_report_base import BasePDFReportService
 from app.utils.player_stats_text_formatter import PlayerStatsTextFormatter
-from app.views.widgets.mini_chessboard_widget import MiniChessBoardWidget
 
 try:
     import chess
@@ -70,6 +70,7 @@ class PlayerStatsPDFService(BasePDFReportService):
             )
         )
         self._board_render_scale = max(1, int(self._cfg.get("board_render_scale", 4)))
+        self._diagrams = BoardDiagramCache(config, render_scale=self._board_render_scale)
         self._opening_service: Optional[OpeningService] = None
 
         # Assessment colors: prefer summary pdf_report (shared with game report look)
@@ -153,6 +154,14 @@ class PlayerStatsPDFService(BasePDFReportService):
 
         try:
             content = self._content_rect(writer)
+            self._diagrams.prepare(
+                self._diagram_requests(
+                    content,
+                    stats=stats,
+                    section_visibility=section_visibility,
+                    significant_moves=significant_moves,
+                )
+            )
             self._page_number = 1
             self._draw_page_chrome(painter, content)
             y = self._draw_header(
@@ -183,6 +192,45 @@ class PlayerStatsPDFService(BasePDFReportService):
 
         return out
 
+    def _diagram_requests(
+        self,
+        content: QRectF,
+        *,
+        stats: Any,
+        section_visibility: Optional[Dict[str, bool]],
+        significant_moves: Optional[Dict[str, List[Dict[str, Any]]]],
+    ) -> List[DiagramRequest]:
+        """Boards the visible opening and significant-move sections will draw."""
+        if chess is None:
+            return []
+        requests: List[DiagramRequest] = []
+        if self._is_visible("openings", section_visibility):
+            bs = int(round(self._opening_board_display(content)))
+            for _title, rows in self._opening_groups(stats):
+                for eco, name, _cpl, _count in rows:
+                    fen = self._opening_fen(eco, name)
+                    if fen:
+                        requests.append(DiagramRequest(fen, bs))
+        if self._is_visible("significant_moves", section_visibility) and isinstance(
+            significant_moves, dict
+        ):
+            bs = int(round(self._significant_move_board_display(content)))
+            for key in ("brilliant", "misses", "blunders"):
+                for move in significant_moves.get(key) or []:
+                    if not isinstance(move, dict):
+                        continue
+                    fen = str(move.get("fen") or "").strip()
+                    if fen:
+                        requests.append(
+                            DiagramRequest(
+                                fen,
+                                bs,
+                                str(move.get("fen_before") or "").strip(),
+                                str(move.get("san") or "").strip(),
+                            )
+                        )
+        return requests
+
     def _is_visible(
         self, section_id: str, section_visibility: Optional[Dict[str, bool]]
     ) -> bool:
@@ -2717,10 +2765,9 @@ class PlayerStatsPDFService(BasePDFReportService):
             )
         return y
 
-    def _draw_openings(
-        self, painter: QPainter, writer, content: QRectF, y: float, stats: Any
-    ) -> float:
-        """Openings as miniature-board cards (game-report highlight style)."""
+    def _opening_groups(
+        self, stats: Any
+    ) -> List[Tuple[str, List[Tuple[str, Optional[str], Optional[float], int]]]]:
         groups: List[Tuple[str, List[Tuple[str, Optional[str], Optional[float], int]]]] = []
         if stats.top_openings:
             groups.append(
@@ -2758,10 +2805,20 @@ class PlayerStatsPDFService(BasePDFReportService):
                     ],
                 )
             )
+        return groups
+
+    def _opening_board_display(self, content: QRectF) -> float:
+        return max(48.0, min(self._opening_board_size, content.width() * 0.22))
+
+    def _draw_openings(
+        self, painter: QPainter, writer, content: QRectF, y: float, stats: Any
+    ) -> float:
+        """Openings as miniature-board cards (game-report highlight style)."""
+        groups = self._opening_groups(stats)
         if not groups:
             return y
 
-        board = max(48.0, min(self._opening_board_size, content.width() * 0.22))
+        board = self._opening_board_display(content)
         # Estimate first group keep-with
         first_n = len(groups[0][1])
         cols = min(3, max(1, first_n))
@@ -2801,7 +2858,13 @@ class PlayerStatsPDFService(BasePDFReportService):
             self._opening_service.load()
         return self._opening_service
 
-    def _render_opening_board(self, fen: str, size: int) -> Optional[QPixmap]:
+    def _opening_fen(self, eco: str, name: Optional[str]) -> Optional[str]:
+        """Board shown on an opening card (A00 is the starting position with a "?")."""
+        if str(eco or "").strip().upper() == "A00":
+            return chess.STARTING_FEN if chess is not None else None
+        return self._opening_svc().find_representative_fen(eco, name)
+
+    def _render_opening_board(self, fen: str, size: int) -> Optional[QImage]:
         return self._render_move_board(fen, "", "", size=size)
 
     def _render_move_board(
@@ -2811,30 +2874,12 @@ class PlayerStatsPDFService(BasePDFReportService):
         san: str,
         *,
         size: int,
-    ) -> Optional[QPixmap]:
-        """Rasterize a mini board; optionally highlight the last move from fen_before+san."""
+    ) -> Optional[QImage]:
+        """Rasterize a mini board (cached); optionally highlight the last move from fen_before+san."""
         if chess is None:
             return None
-        scale = self._board_render_scale
         try:
-            widget = MiniChessBoardWidget(
-                self.config,
-                fen or chess.STARTING_FEN,
-                embedded=True,
-                size_override=int(size * scale),
-            )
-            if fen_before and san:
-                try:
-                    board = chess.Board(fen_before)
-                    move = board.parse_san(san)
-                    widget.set_move(move, True)
-                except Exception:
-                    pass
-            widget_size = widget.size()
-            image = QImage(widget_size, QImage.Format.Format_ARGB32_Premultiplied)
-            image.fill(Qt.GlobalColor.white)
-            widget.render(image)
-            return QPixmap.fromImage(image)
+            return self._diagrams.image(fen, fen_before, san, size=size)
         except Exception:
             return None
 
@@ -2882,18 +2927,15 @@ class PlayerStatsPDFService(BasePDFReportService):
 
             if eco_key == "A00":
                 # Irregular / unspecified — starting board with a clear "?" marker.
-                pix = (
-                    self._render_opening_board(chess.STARTING_FEN, bs)
-                    if chess is not None
-                    else None
-                )
+                fen = self._opening_fen(eco, name)
+                pix = self._render_opening_board(fen, bs) if fen else None
                 painter.save()
                 painter.setClipRect(board_rect)
                 if pix is not None and not pix.isNull():
                     painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
                     # Stretch to the exact target so wash/"?" share the same edges
                     # (avoids left/bottom gaps from supersample size mismatch).
-                    painter.drawPixmap(
+                    painter.drawImage(
                         board_rect,
                         pix,
                         QRectF(0, 0, pix.width(), pix.height()),
@@ -2912,13 +2954,13 @@ class PlayerStatsPDFService(BasePDFReportService):
                 painter.drawText(board_rect, int(Qt.AlignmentFlag.AlignCenter), "?")
                 painter.restore()
             else:
-                fen = self._opening_svc().find_representative_fen(eco, name)
+                fen = self._opening_fen(eco, name)
                 pix = self._render_opening_board(fen, bs) if fen else None
                 if pix is not None and not pix.isNull():
                     painter.save()
                     painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
                     painter.setClipRect(board_rect)
-                    painter.drawPixmap(
+                    painter.drawImage(
                         board_rect,
                         pix,
                         QRectF(0, 0, pix.width(), pix.height()),
@@ -2999,10 +3041,7 @@ class PlayerStatsPDFService(BasePDFReportService):
                 painter, writer, content, y, "Significant Moves", kv
             )
 
-        board = max(
-            48.0,
-            min(self._significant_move_board_size, content.width() * 0.28),
-        )
+        board = self._significant_move_board_display(content)
         card_h = board + 12.0
         y = self._section_heading(
             painter,
@@ -3049,6 +3088,12 @@ class PlayerStatsPDFService(BasePDFReportService):
             y += 4.0
         return y
 
+    def _significant_move_board_display(self, content: QRectF) -> float:
+        return max(
+            48.0,
+            min(self._significant_move_board_size, content.width() * 0.28),
+        )
+
     def _draw_significant_move_card(
         self,
         painter: QPainter,
@@ -3087,7 +3132,7 @@ class PlayerStatsPDFService(BasePDFReportService):
         if pix is not None and not pix.isNull():
             painter.save()
             painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
-            painter.drawPixmap(
+            painter.drawImage(
                 QRectF(board_x, board_y, bs, bs),
                 pix,
                 QRectF(0, 0, pix.width(), pix.height()),
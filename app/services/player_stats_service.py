@@ -4,64 +4,98 @@ import calendar
 import os
 from datetime import date
 from statistics import median
-from typing import List, Dict, Any, Optional, Tuple, Callable, Sequence
+from typing import List, Dict, Any, Optional, Tuple, Callable, Sequence, Union
 from dataclasses import dataclass
 from collections import Counter, defaultdict
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import math
 
 from app.models.database_model import GameData, DatabaseModel
+from app.services.analysis_data_storage_service import AnalysisDataStorageService
 from app.services.date_matcher import DateMatcher
 from app.models.moveslist_model import MoveData
 from app.services.game_summary_service import GameSummary, PlayerStatistics, PhaseStatistics, GameSummaryService
+from app.services.game_highlights.base_rule import GameHighlight
+from app.services.highlight_batch_service import HighlightBatchService
 from app.controllers.game_controller import GameController
 from app.services.logging_service import LoggingService, init_worker_logging
-from app.utils.concurrency_utils import get_process_pool_max_workers
+from app.utils.concurrency_utils import get_process_pool_batch_size, get_process_pool_max_workers, iter_batches
 from app.services.player_stats_time_series_user import player_stats_block_with_time_series_overrides
 
 
-def _process_game_for_stats(game_pgn: str, game_result: str, game_white: str, game_black: str,
-                            game_eco: str, player_name: str, config: Dict[str, Any],
-                            game_index: int = 0) -> Optional[Dict[str, Any]]:
+# Per-worker state set once by _init_stats_worker (avoids pickling config with every game).
+_worker_config: Optional[Dict[str, Any]] = None
+_worker_summary_service: Optional[GameSummaryService] = None
+_worker_highlight_detector: Optional[Any] = None
+
+# Picklable per-game job: (index, analysis payload (tag value or sidecar segment), checksum, result, white, black, eco,
+# highlights already detected by HighlightBatchService or None).
+StatsJob = Tuple[int, Union[str, bytes], Optional[str], str, str, str, str, Optional[List[GameHighlight]]]
+
+
+def _init_stats_worker(log_queue: Any, config: Dict[str, Any], highlight_settings: Dict[str, Any]) -> None:
+    """ProcessPoolExecutor initializer: set up logging, keep config and build the highlight detector once."""
+    global _worker_config, _worker_summary_service, _worker_highlight_detector
+    init_worker_logging(log_queue)
+    _worker_config = config
+    _worker_summary_service = None
+    _worker_highlight_detector = GameSummaryService.build_highlight_detector(highlight_settings)
+
+
+def _get_worker_summary_service() -> GameSummaryService:
+    """Return the worker's GameSummaryService, created on first use."""
+    global _worker_summary_service
+    if _worker_summary_service is None:
+        _worker_summary_service = GameSummaryService(_worker_config or {})
+    return _worker_summary_service
+
+
+def build_stats_job(game: GameData, game_index: int,
+                    highlights: Optional[List[GameHighlight]] = None) -> Optional[StatsJob]:
+    """Build the slim worker payload for one game, or None if it has no stored analysis.
+
+    Only the stored analysis payload and a few headers are shipped; the movetext stays
+    in the calling process. ``highlights`` are precomputed highlights for the game; the
+    worker runs its own detector when they are None.
+    """
+    payload = AnalysisDataStorageService.read_analysis_payload(game.pgn)
+    if payload is None:
+        return None
+    encoded, checksum = payload
+    return (
+        game_index,
+        encoded,
+        checksum,
+        game.result,
+        game.white,
+        game.black,
+        game.eco if game.eco else "",
+        highlights,
+    )
+
+
+def _process_stats_batch(jobs: Sequence[StatsJob], player_name: str) -> List[Optional[Dict[str, Any]]]:
+    """Process a batch of games for statistics aggregation (ProcessPool worker entry point)."""
+    return [_process_game_for_stats(job, player_name) for job in jobs]
+
+
+def _process_game_for_stats(job: StatsJob, player_name: str) -> Optional[Dict[str, Any]]:
     """Process a single game for statistics aggregation (must be top-level for pickling).
 
-    game_index is used to preserve order of results when using as_completed().
+    The job index is used to preserve order of results when using as_completed().
     """
+    game_index, encoded, checksum, game_result, game_white, game_black, game_eco, highlights = job
     try:
-        # Extract moves from PGN
-        from app.services.analysis_data_storage_service import AnalysisDataStorageService
-        from app.models.database_model import GameData
-        import io
-        import chess.pgn
+        config = _worker_config or {}
         
-        # Create minimal GameData for analysis data loading
-        game_data = GameData(
-            game_number=0,
-            white=game_white,
-            black=game_black,
-            result=game_result,
-            date="",
-            moves=0,
-            eco=game_eco,
-            pgn=game_pgn,
-            event="",
-            site="",
-            white_elo="",
-            black_elo="",
-            time_control="",
-            analyzed=True,
-            annotated=False,
-            file_position=0
-        )
-        
-        # Try to load analysis data from PGN tag
+        # Decode analysis data from the shipped CARAAnalysisData payload
         moves = None
         try:
-            stored_moves = AnalysisDataStorageService.load_analysis_data(game_data)
+            stored_moves = AnalysisDataStorageService.decode_analysis_payload(encoded, checksum)
             if stored_moves:
                 moves = stored_moves
         except (ValueError, Exception):
-            # Continue to parse PGN normally
+            # Corrupted payload: skip this game
             pass
         
         # If no stored moves, we can't process this game in parallel
@@ -70,8 +104,12 @@ def _process_game_for_stats(game_pgn: str, game_result: str, game_white: str, ga
             return None
         
         # Calculate game summary
-        summary_service = GameSummaryService(config)
-        game_summary = summary_service.calculate_summary(moves, len(moves), game_result)
+        summary_service = _get_worker_summary_service()
+        game_summary = summary_service.calculate_summary(
+            moves, len(moves), game_result,
+            highlight_detector=_worker_highlight_detector,
+            highlights=highlights,
+        )
         if not game_summary:
             return None
         
@@ -1156,6 +1194,7 @@ class PlayerStatsService:
         progress_callback: Optional[Callable[[int, str], None]] = None,
         cancellation_check: Optional[Callable[[], bool]] = None,
         time_series_user_settings: Optional[Dict[str, Any]] = None,
+        highlight_settings: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Optional[AggregatedPlayerStats], List[GameSummary]]:
         """Aggregate statistics for a player across multiple games.
         
@@ -1166,6 +1205,8 @@ class PlayerStatsService:
             progress_callback: Optional callback function(completed: int, status: str) for progress updates.
             cancellation_check: Optional function() -> bool to check if operation should be cancelled.
             time_series_user_settings: Optional user overrides for time-series binning (main-thread snapshot).
+            highlight_settings: Highlight settings snapshot (main thread; see
+                GameSummaryService.get_highlight_settings). Read here when None.
 
         Returns:
             Tuple of (AggregatedPlayerStats instance, List[GameSummary]) or (None, []) if no analyzed games found.
@@ -1186,6 +1227,27 @@ class PlayerStatsService:
         # Worker count from config (reserved_cores + max_workers_cap)
         max_workers = get_process_pool_max_workers(os.cpu_count(), self.config)
         
+        if highlight_settings is None:
+            highlight_settings = GameSummaryService(self.config).get_highlight_settings()
+        
+        # Highlights come from the batch service (cached by analysis checksum, so repeat
+        # reports skip detection); the summary workers only fill in games it could not process.
+        def highlight_progress(completed: int, total: int) -> None:
+            if progress_callback and total:
+                progress_callback(
+                    20 + int((completed / total) * 30),
+                    f"Detecting highlights {completed}/{total}..."
+                )
+        
+        per_game_highlights = HighlightBatchService.get_instance(self.config).detect_for_games(
+            analyzed_games,
+            progress_callback=highlight_progress,
+            cancellation_check=cancellation_check,
+            settings=highlight_settings,
+        )
+        if cancellation_check and cancellation_check():
+            return (None, [])
+        
         # Process games in parallel
         game_results: List[Dict[str, Any]] = []
         completed_count = 0
@@ -1195,41 +1257,39 @@ class PlayerStatsService:
             log_queue = LoggingService.get_queue()
             executor = ProcessPoolExecutor(
                 max_workers=max_workers,
-                initializer=init_worker_logging,
-                initargs=(log_queue,)
+                initializer=_init_stats_worker,
+                initargs=(log_queue, self.config, highlight_settings)
             )
-            # Submit all games for processing (pass index so results can be restored to input order)
-            future_to_game = {
-                executor.submit(
-                    _process_game_for_stats,
-                    game.pgn,
-                    game.result,
-                    game.white,
-                    game.black,
-                    game.eco if game.eco else "",
-                    player_name,
-                    self.config,
-                    idx,
-                ): game
-                for idx, game in enumerate(analyzed_games)
+            # Games without a stored analysis tag cannot be processed in parallel; they only count
+            # toward progress. The rest are sent in batches (index restores input order).
+            jobs: List[StatsJob] = []
+            for idx, game in enumerate(analyzed_games):
+                job = build_stats_job(game, idx, per_game_highlights[idx])
+                if job is not None:
+                    jobs.append(job)
+            completed_count = total_games - len(jobs)
+            batch_size = get_process_pool_batch_size(len(jobs), max_workers, self.config)
+            future_to_size = {
+                executor.submit(_process_stats_batch, batch, player_name): len(batch)
+                for batch in iter_batches(jobs, batch_size)
             }
             
             # Process results as they complete
-            for future in as_completed(future_to_game):
+            for future in as_completed(future_to_size):
                 # Check for cancellation
                 if cancellation_check and cancellation_check():
                     # Cancel remaining futures
-                    for f in future_to_game:
+                    for f in future_to_size:
                         f.cancel()
                     break
                 
                 try:
-                    result = future.result()
-                    if result:
-                        game_results.append(result)
+                    for result in future.result():
+                        if result:
+                            game_results.append(result)
                     
                     # Update progress
-                    completed_count += 1
+                    completed_count += future_to_size[future]
                     if progress_callback:
                         progress_percent = 50 + int((completed_count / total_games) * 40)
                         progress_callback(
@@ -1243,7 +1303,7 @@ class PlayerStatsService:
                         continue
                     # Log other errors but continue processing other games
                     logging_service = LoggingService.get_instance()
-                    logging_service.error(f"Error processing game: {e}", exc_info=e)
+                    logging_service.error(f"Error processing game batch: {e}", exc_info=e)
         finally:
             # Ensure executor is properly shut down
             # This waits for all processes to finish, even if cancelled
@@ -0,0 +1,152 @@
+"""Indexed position-sequence search: positions in order, within ply limits (no Qt).
+
+Answered from the per-ply position indexes of DatabaseModel by intersecting the
+games each position occurs in and then checking ply constraints on their
+occurrence lists; games are never replayed.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.models.database_model import DatabaseModel
+from app.models.search_criteria import SearchField
+
+# Position index kind -> field whose criteria use that index's keys.
+_KIND_FIELDS = {
+    "exact": SearchField.POSITION,
+    "fuzzy": SearchField.POSITION_FUZZY,
+    "pawns": SearchField.PAWN_STRUCTURE,
+}
+
+
+@dataclass(frozen=True)
+class PositionStep:
+    """One position of a sequence and where it may occur.
+
+    Side to move is part of every key, so "X with White to move" is the FEN of X
+    with "w" as its active color.
+    """
+
+    key: int  # Zobrist hash, fuzzy hash or pawn structure key (see kind)
+    kind: str = "exact"  # "exact", "fuzzy" or "pawns"
+    min_ply: int = 1  # Earliest ply (ply 0 is the start position, never a match)
+    max_ply: Optional[int] = None  # Latest ply, inclusive
+    within: Optional[int] = None  # At most this many plies after the previous step
+
+    @classmethod
+    def from_fen(cls, fen: str, kind: str = "exact", **constraints: Optional[int]) -> "PositionStep":
+        """Step for a FEN, keyed like a Position / Position (fuzzy) / Pawn structure criterion.
+
+        Raises:
+            ValueError: If ``kind`` is unknown or the FEN is invalid.
+        """
+        from app.services.database_search_service import DatabaseSearchService
+
+        field = _KIND_FIELDS.get(kind)
+        if field is None:
+            raise ValueError(f"Unknown position index kind: {kind}")
+        key = DatabaseSearchService.position_key(field, fen)
+        if not key:
+            raise ValueError(f"Invalid FEN: {fen!r}")
+        return cls(key=key, kind=kind, **constraints)
+
+
+@dataclass(frozen=True)
+class PositionSequence:
+    """Value of a Position sequence search criterion: exact positions in order.
+
+    Hashable, so the search context can hold one match table per sequence.
+    """
+
+    fens: Tuple[str, ...]
+    within: Optional[int] = None  # At most this many plies between consecutive positions
+    max_ply: Optional[int] = None  # Ply by which the last position must be reached
+
+    def steps(self) -> List[PositionStep]:
+        """The sequence as PositionSteps.
+
+        Raises:
+            ValueError: If a FEN is invalid.
+        """
+        last = len(self.fens) - 1
+        return [
+            PositionStep.from_fen(
+                fen,
+                within=self.within if index else None,
+                max_ply=self.max_ply if index == last else None,
+            )
+            for index, fen in enumerate(self.fens)
+        ]
+
+    def __str__(self) -> str:
+        text = " ; ".join(self.fens)
+        limits = []
+        if self.within is not None:
+            limits.append(f"within {self.within} plies")
+        if self.max_ply is not None:
+            limits.append(f"by ply {self.max_ply}")
+        return f"{text} ({', '.join(limits)})" if limits else text
+
+
+def find_position_sequences(database: DatabaseModel, steps: Sequence[PositionStep]) -> Dict[int, List[int]]:
+    """Find games where the steps' positions occur in order within their ply limits.
+
+    Returns:
+        id(game) -> ply of each step, for every matching game. Among the chains a
+        game allows, the one ending earliest is reported (each step at the latest
+        ply that still reaches it).
+    """
+    if not steps:
+        return {}
+    occurrences = [database.get_position_occurrences(step.key, step.kind) for step in steps]
+    # Intersect posting lists, smallest first
+    by_size = sorted(occurrences, key=len)
+    gids = set(by_size[0])
+    for postings in by_size[1:]:
+        gids.intersection_update(postings)
+        if not gids:
+            return {}
+    result: Dict[int, List[int]] = {}
+    for gid in gids:
+        chain = _match_chain([postings[gid] for postings in occurrences], steps)
+        if chain is not None:
+            result[gid] = chain
+    return result
+
+
+def _match_chain(plies_per_step: List[List[int]], steps: Sequence[PositionStep]) -> Optional[List[int]]:
+    """Plies of one matching chain through one game's occurrences, or None."""
+    reachable: List[int] = []
+    predecessors: List[Dict[int, int]] = []
+    for index, (plies, step) in enumerate(zip(plies_per_step, steps)):
+        upper = step.max_ply
+        candidates = [p for p in plies if p >= max(1, step.min_ply) and (upper is None or p <= upper)]
+        if index == 0:
+            reachable = candidates
+            predecessors.append({})
+        else:
+            previous = reachable
+            reachable = []
+            links: Dict[int, int] = {}
+            for ply in candidates:
+                # Latest earlier occurrence of the previous step: the smallest gap
+                position = bisect_left(previous, ply)
+                if position == 0:
+                    continue
+                before = previous[position - 1]
+                if step.within is not None and ply - before > step.within:
+                    continue
+                reachable.append(ply)
+                links[ply] = before
+            predecessors.append(links)
+        if not reachable:
+            return None
+    chain = [reachable[0]]
+    for links in reversed(predecessors[1:]):
+        chain.append(links[chain[-1]])
+    chain.reverse()
+    return chain
+
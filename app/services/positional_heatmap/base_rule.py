@@ -1,9 +1,12 @@
 """Base rule interface for positional evaluation rules."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional
 import chess
 
+if TYPE_CHECKING:
+    from app.services.positional_heatmap.position_features import PositionFeatures
+
 
 class PositionalRule(ABC):
     """Abstract base class for all positional evaluation rules.
@@ -25,13 +28,16 @@ class PositionalRule(ABC):
         self.description = config.get('description', '')
     
     @abstractmethod
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional["PositionFeatures"] = None) -> Dict[chess.Square, float]:
         """Evaluate position and return scores for each square.
         
         Args:
             board: Current chess position (python-chess Board).
             perspective: Color to evaluate from (chess.WHITE or chess.BLACK).
                         Positive scores favor this color, negative scores favor opponent.
+            features: Shared attack maps / pawn structure for this board (built
+                      on demand when None, e.g. when a rule is called directly).
         
         Returns:
             Dictionary mapping square -> score (typically -100 to +100).
@@ -0,0 +1,156 @@
+"""Per-position feature layer shared by positional heat-map rules."""
+
+from typing import Dict, List, Optional
+import chess
+
+
+class PositionFeatures:
+    """Attack maps, pawn structure and mobility for one position.
+
+    Built once per board by PositionalAnalyzer and passed to every rule, so
+    attackers, pawn files and legal moves are computed once per position and
+    color instead of once per rule (or once per piece). Every feature is
+    computed lazily on first request and cached.
+
+    The board must not be modified while the features are in use.
+    """
+
+    def __init__(self, board: chess.Board) -> None:
+        """Initialize the feature layer.
+
+        Args:
+            board: Position to describe.
+        """
+        self.board = board
+        self._attacks: Dict[chess.Color, chess.SquareSet] = {}
+        self._pawn_file_counts: Dict[chess.Color, List[int]] = {}
+        self._isolated_pawns: Dict[chess.Color, chess.SquareSet] = {}
+        self._passed_pawns: Dict[chess.Color, chess.SquareSet] = {}
+        self._legal_move_counts: Dict[chess.Color, Dict[chess.Square, int]] = {}
+
+    def attacks(self, color: chess.Color) -> chess.SquareSet:
+        """Get all squares attacked (or defended) by pieces of a color.
+
+        Args:
+            color: Attacking color.
+
+        Returns:
+            SquareSet equivalent to testing board.is_attacked_by(color, square) for every square.
+        """
+        attacked = self._attacks.get(color)
+        if attacked is None:
+            mask = 0
+            for square in chess.scan_forward(self.board.occupied_co[color]):
+                mask |= int(self.board.attacks(square))
+            attacked = chess.SquareSet(mask)
+            self._attacks[color] = attacked
+        return attacked
+
+    def is_attacked_by(self, color: chess.Color, square: chess.Square) -> bool:
+        """Check if a square is attacked by a color (cached board.is_attacked_by)."""
+        return square in self.attacks(color)
+
+    def pawn_file_counts(self, color: chess.Color) -> List[int]:
+        """Get the number of pawns of a color on each file (index 0 = a-file)."""
+        counts = self._pawn_file_counts.get(color)
+        if counts is None:
+            counts = [0] * 8
+            for square in self.board.pieces(chess.PAWN, color):
+                counts[chess.square_file(square)] += 1
+            self._pawn_file_counts[color] = counts
+        return counts
+
+    def has_pawn_on_file(self, color: chess.Color, file: int) -> bool:
+        """Check if a color has at least one pawn on a file."""
+        return self.pawn_file_counts(color)[file] > 0
+
+    def isolated_pawns(self, color: chess.Color) -> chess.SquareSet:
+        """Get pawns with no friendly pawns on adjacent files."""
+        isolated = self._isolated_pawns.get(color)
+        if isolated is None:
+            counts = self.pawn_file_counts(color)
+            isolated = chess.SquareSet()
+            for square in self.board.pieces(chess.PAWN, color):
+                file = chess.square_file(square)
+                if (file > 0 and counts[file - 1]) or (file < 7 and counts[file + 1]):
+                    continue
+                isolated.add(square)
+            self._isolated_pawns[color] = isolated
+        return isolated
+
+    def passed_pawns(self, color: chess.Color) -> chess.SquareSet:
+        """Get passed pawns of a color.
+
+        A passed pawn has no enemy pawns in front of it on the same file or
+        adjacent files. Pawns on their starting rank are never passed.
+        """
+        passed = self._passed_pawns.get(color)
+        if passed is None:
+            enemy_pawns = int(self.board.pieces(chess.PAWN, not color))
+            passed = chess.SquareSet()
+            for square in self.board.pieces(chess.PAWN, color):
+                file = chess.square_file(square)
+                rank = chess.square_rank(square)
+                if (color == chess.WHITE and rank <= 1) or (color == chess.BLACK and rank >= 6):
+                    continue
+                if not enemy_pawns & self._front_span_mask(file, rank, color):
+                    passed.add(square)
+            self._passed_pawns[color] = passed
+        return passed
+
+    def king_zone_files(self, color: chess.Color) -> List[int]:
+        """Get the king's file followed by its adjacent files (empty if there is no king)."""
+        king_square = self.board.king(color)
+        if king_square is None:
+            return []
+        king_file = chess.square_file(king_square)
+        files = [king_file]
+        if king_file > 0:
+            files.append(king_file - 1)
+        if king_file < 7:
+            files.append(king_file + 1)
+        return files
+
+    def legal_move_count(self, color: chess.Color, square: chess.Square) -> int:
+        """Get the number of legal moves for the piece of a color on a square.
+
+        Moves for the side not to move are generated as if it were that side's turn.
+        """
+        return self.legal_move_counts(color).get(square, 0)
+
+    def legal_move_counts(self, color: chess.Color) -> Dict[chess.Square, int]:
+        """Get legal move counts per origin square for a color."""
+        counts = self._legal_move_counts.get(color)
+        if counts is None:
+            counts = {}
+            if color == self.board.turn:
+                moves = self.board.legal_moves
+            else:
+                temp_board = self.board.copy(stack=False)
+                temp_board.turn = color
+                moves = temp_board.generate_legal_moves()
+            for move in moves:
+                counts[move.from_square] = counts.get(move.from_square, 0) + 1
+            self._legal_move_counts[color] = counts
+        return counts
+
+    @staticmethod
+    def _front_span_mask(file: int, rank: int, color: chess.Color) -> int:
+        """Bitmask of squares ahead of (file, rank) on the same and adjacent files."""
+        files_mask = chess.BB_FILES[file]
+        if file > 0:
+            files_mask |= chess.BB_FILES[file - 1]
+        if file < 7:
+            files_mask |= chess.BB_FILES[file + 1]
+        if color == chess.WHITE:
+            ahead = chess.BB_ALL & ~((1 << (8 * (rank + 1))) - 1)
+        else:
+            ahead = (1 << (8 * rank)) - 1
+        return files_mask & ahead
+
+
+def features_for(board: chess.Board, features: Optional[PositionFeatures]) -> PositionFeatures:
+    """Return the shared features for a board, building them when a rule is called directly."""
+    if features is not None and features.board is board:
+        return features
+    return PositionFeatures(board)
@@ -1,16 +1,23 @@
 """Main positional analyzer service."""
 
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Optional
 import chess
 
+from app.services.positional_heatmap.position_features import PositionFeatures
 from app.services.positional_heatmap.rule_registry import RuleRegistry
 from app.services.positional_heatmap.score_aggregator import ScoreAggregator
+from app.services.rule_profiler import SCOPE_HEATMAP, get_rule_profiler
 
 
 class PositionalAnalyzer:
     """Main service for analyzing chess positions and generating heat-map scores.
     
     Coordinates rule evaluation, score aggregation, and caching for performance.
+    The cache is LRU and thread-safe so a background precompute job can fill it
+    while the UI thread reads from it.
     """
     
     def __init__(self, config: Dict, rule_registry: RuleRegistry) -> None:
@@ -23,18 +30,21 @@ class PositionalAnalyzer:
         self.config = config
         self.registry = rule_registry
         self.aggregator = ScoreAggregator(config.get('aggregation', {}))
-        self._cache: Dict[str, Dict[chess.Square, float]] = {}
+        self._cache: "OrderedDict[str, Dict[chess.Square, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.cache_enabled = config.get('cache_enabled', True)
         self.max_cache_size = config.get('max_cache_size', 1000)
     
     def analyze_position(self, board: chess.Board, 
-                        perspective: Optional[chess.Color] = None) -> Dict[chess.Square, float]:
+                        perspective: Optional[chess.Color] = None,
+                        features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Analyze position and return heat-map scores.
         
         Args:
             board: Current chess position (python-chess Board).
             perspective: Color to evaluate from (None = side to move).
                         Positive scores favor this color, negative scores favor opponent.
+            features: Shared features for this board (built here when None).
         
         Returns:
             Dictionary mapping square -> aggregated score.
@@ -46,40 +56,120 @@ class PositionalAnalyzer:
         # Check cache
         fen = board.fen()
         cache_key = f"{fen}_{perspective}"
-        if self.cache_enabled and cache_key in self._cache:
-            return self._cache[cache_key]
+        if self.cache_enabled:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
         
         # Get enabled rules
         rules = self.registry.get_enabled_rules()
         
-        # Evaluate each rule (with error isolation)
-        rule_results = []
-        for rule in rules:
-            try:
-                scores = rule.evaluate(board, perspective)
-                rule_results.append(scores)
-            except Exception as e:
-                # Log error but continue with other rules
-                # Error isolation: one bad rule doesn't break everything
-                # In production, you might want to log this to error_collector
-                continue
+        # Attack maps, pawn structure and mobility are computed once and shared by all rules
+        if features is None or features.board is not board:
+            features = PositionFeatures(board)
+        
+        # Evaluate each rule (with error isolation). The aggregator pairs results with rules
+        # by position, so a rule that raises or returns None still gets an (empty) entry.
+        profiler = get_rule_profiler()
+        if profiler is not None:
+            rule_results = self._evaluate_rules_profiled(rules, board, perspective, features, profiler)
+        else:
+            rule_results = []
+            for rule in rules:
+                try:
+                    scores = rule.evaluate(board, perspective, features)
+                except Exception as e:
+                    # Log error but continue with other rules
+                    # Error isolation: one bad rule doesn't break everything
+                    # In production, you might want to log this to error_collector
+                    scores = None
+                rule_results.append(scores or {})
         
         # Aggregate scores
         aggregated = self.aggregator.aggregate(rule_results, rules)
         
         # Cache result (with size limit)
         if self.cache_enabled:
-            if len(self._cache) >= self.max_cache_size:
-                # Remove oldest entry (simple FIFO)
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
-            self._cache[cache_key] = aggregated
+            self._cache_put(cache_key, aggregated)
         
         return aggregated
     
+    def analyze_board(self, board: chess.Board) -> Dict[chess.Square, float]:
+        """Analyze a position from both sides and combine the scores per piece.
+        
+        White pieces are scored from White's perspective and Black pieces from
+        Black's perspective. Both perspectives share one feature layer.
+        
+        Args:
+            board: Chess position to analyze.
+        
+        Returns:
+            Dictionary mapping occupied square -> score for the piece on it.
+        """
+        features = PositionFeatures(board)
+        white_scores = self.analyze_position(board, chess.WHITE, features)
+        black_scores = self.analyze_position(board, chess.BLACK, features)
+        
+        combined_scores: Dict[chess.Square, float] = {}
+        for square, score in white_scores.items():
+            piece = board.piece_at(square)
+            if piece and piece.color == chess.WHITE:
+                combined_scores[square] = score
+        for square, score in black_scores.items():
+            piece = board.piece_at(square)
+            if piece and piece.color == chess.BLACK:
+                combined_scores[square] = score
+        return combined_scores
+    
+    def is_cached(self, board: chess.Board) -> bool:
+        """Check if both perspectives of a position are in the cache."""
+        fen = board.fen()
+        with self._cache_lock:
+            return f"{fen}_{chess.WHITE}" in self._cache and f"{fen}_{chess.BLACK}" in self._cache
+    
+    def _cache_get(self, cache_key: str) -> Optional[Dict[chess.Square, float]]:
+        with self._cache_lock:
+            scores = self._cache.get(cache_key)
+            if scores is not None:
+                self._cache.move_to_end(cache_key)
+            return scores
+    
+    def _cache_put(self, cache_key: str, scores: Dict[chess.Square, float]) -> None:
+        with self._cache_lock:
+            self._cache[cache_key] = scores
+            self._cache.move_to_end(cache_key)
+            # Evict least recently used entries beyond the configured size
+            while len(self._cache) > max(1, self.max_cache_size):
+                self._cache.popitem(last=False)
+    
+    def _evaluate_rules_profiled(self, rules, board: chess.Board,
+                                 perspective: chess.Color, features: PositionFeatures,
+                                 profiler) -> list:
+        """Evaluate rules like analyze_position, recording per-rule timing and errors."""
+        profiler.count_unit(SCOPE_HEATMAP)
+        rule_results = []
+        for rule in rules:
+            error = None
+            scores = None
+            start = time.perf_counter()
+            try:
+                scores = rule.evaluate(board, perspective, features)
+            except Exception as e:
+                error = e
+            profiler.record(
+                SCOPE_HEATMAP,
+                rule.get_name(),
+                time.perf_counter() - start,
+                emitted=len(scores) if scores else 0,
+                error=error,
+            )
+            rule_results.append(scores or {})
+        return rule_results
+    
     def clear_cache(self) -> None:
         """Clear analysis cache."""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
     
     def get_cache_size(self) -> int:
         """Get current cache size.
@@ -126,10 +216,11 @@ class PositionalAnalyzer:
         rules = self.registry.get_enabled_rules()
         
         # Evaluate each rule separately
+        features = PositionFeatures(board)
         rule_results = []
         for rule in rules:
             try:
-                scores = rule.evaluate(board, perspective)
+                scores = rule.evaluate(board, perspective, features)
                 rule_results.append((rule, scores))
             except Exception as e:
                 # Skip rules that error
@@ -1,9 +1,10 @@
 """Rule for evaluating backward pawns."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures
 
 
 class BackwardPawnRule(PositionalRule):
@@ -23,12 +24,14 @@ class BackwardPawnRule(PositionalRule):
         self.backward_pawn_penalty = config.get('score', -15.0)
         self.defended_pawn_penalty = config.get('defended_score', -8.0)
     
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate backward pawns in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
@@ -1,9 +1,10 @@
 """Rule for evaluating doubled pawns."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures, features_for
 
 
 class DoubledPawnRule(PositionalRule):
@@ -22,18 +23,21 @@ class DoubledPawnRule(PositionalRule):
         super().__init__(config)
         self.doubled_pawn_penalty = config.get('score', -8.0)
     
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate doubled pawns in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
             Negative scores for doubled pawns.
         """
         scores: Dict[chess.Square, float] = {}
+        features = features_for(board, features)
         
         # Get all pawns for the perspective color
         pawns = board.pieces(chess.PAWN, perspective)
@@ -61,12 +65,7 @@ class DoubledPawnRule(PositionalRule):
                     base_penalty = -8.0
                 
                 # Check if file is open (no opposing pawns on the file)
-                opponent_pawns = board.pieces(chess.PAWN, opponent)
-                is_open_file = True
-                for opp_pawn_square in opponent_pawns:
-                    if chess.square_file(opp_pawn_square) == file:
-                        is_open_file = False
-                        break
+                is_open_file = not features.has_pawn_on_file(opponent, file)
                 
                 # If file is open, reduce penalty by 50%
                 if is_open_file:
@@ -1,9 +1,10 @@
 """Rule for evaluating isolated pawns."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures, features_for
 
 
 class IsolatedPawnRule(PositionalRule):
@@ -22,27 +23,25 @@ class IsolatedPawnRule(PositionalRule):
         super().__init__(config)
         self.isolated_pawn_penalty = config.get('score', -10.0)
     
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate isolated pawns in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
             Negative scores for isolated pawns.
         """
         scores: Dict[chess.Square, float] = {}
+        features = features_for(board, features)
         
-        # Get all pawns for the perspective color
-        pawns = board.pieces(chess.PAWN, perspective)
-        
-        for pawn_square in pawns:
-            file = chess.square_file(pawn_square)
-            
-            if self._is_isolated_pawn(board, file, perspective):
-                scores[pawn_square] = self.isolated_pawn_penalty
+        # Isolated pawns of the perspective color (from the shared pawn-file counts)
+        for pawn_square in features.isolated_pawns(perspective):
+            scores[pawn_square] = self.isolated_pawn_penalty
         
         return scores
     
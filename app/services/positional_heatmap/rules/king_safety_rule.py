@@ -1,9 +1,10 @@
 """Rule for evaluating king safety."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures, features_for
 
 
 class KingSafetyRule(PositionalRule):
@@ -26,18 +27,21 @@ class KingSafetyRule(PositionalRule):
         self.pawn_shield_bonus = config.get('pawn_shield_bonus', 5.0)
         self.exposed_king_penalty = config.get('exposed_king_penalty', -15.0)
     
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate king safety in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
             Negative scores for unsafe king positions, positive for safe positions.
         """
         scores: Dict[chess.Square, float] = {}
+        features = features_for(board, features)
         
         # Get king square
         king_square = board.king(perspective)
@@ -51,7 +55,7 @@ class KingSafetyRule(PositionalRule):
         # A king in check should get a significant negative score
         # Check if the king of the perspective color is attacked by the opponent
         opponent = not perspective
-        is_in_check = board.is_attacked_by(opponent, king_square)
+        is_in_check = features.is_attacked_by(opponent, king_square)
         if is_in_check:
             # King is in check - this is a critical safety issue
             # Override all other considerations with a strong negative score
@@ -61,7 +65,7 @@ class KingSafetyRule(PositionalRule):
             king_score = 0.0
             
             # Check for open files near the king
-            open_files = self._get_open_files_near_king(board, king_file, perspective)
+            open_files = self._get_open_files_near_king(board, king_file, perspective, features)
             if open_files:
                 # Penalty for each open file near king
                 king_score += len(open_files) * self.open_file_penalty
@@ -69,7 +73,7 @@ class KingSafetyRule(PositionalRule):
             # Check for semi-open files near the king (opponent has no pawns on the file)
             # Semi-open files are dangerous because the opponent can attack down that file
             # A semi-open file near the king is almost as dangerous as an open file
-            semi_open_files = self._get_semi_open_files_near_king(board, king_file, perspective)
+            semi_open_files = self._get_semi_open_files_near_king(board, king_file, perspective, features)
             if semi_open_files:
                 # Penalty for each semi-open file near king
                 # If the king is on a semi-open file, it's very dangerous (use full penalty)
@@ -104,7 +108,8 @@ class KingSafetyRule(PositionalRule):
         return scores
     
     def _get_open_files_near_king(self, board: chess.Board, king_file: int, 
-                                  color: chess.Color) -> list:
+                                  color: chess.Color,
+                                  features: Optional[PositionFeatures] = None) -> list:
         """Get open files near the king.
         
         An open file has no pawns of either color.
@@ -113,31 +118,27 @@ class KingSafetyRule(PositionalRule):
             board: Current position.
             king_file: King's file (0-7).
             color: King's color.
+            features: Shared position features (built on demand when None).
         
         Returns:
             List of open file numbers near the king.
         """
+        features = features_for(board, features)
         open_files = []
         
         # Check files: king's file and adjacent files
-        files_to_check = [king_file]
-        if king_file > 0:
-            files_to_check.append(king_file - 1)
-        if king_file < 7:
-            files_to_check.append(king_file + 1)
-        
-        all_pawns = board.pieces(chess.PAWN, chess.WHITE) | board.pieces(chess.PAWN, chess.BLACK)
-        
-        for file in files_to_check:
+        for file in features.king_zone_files(color):
             # Check if file has any pawns
-            has_pawns = any(chess.square_file(sq) == file for sq in all_pawns)
+            has_pawns = (features.has_pawn_on_file(chess.WHITE, file)
+                         or features.has_pawn_on_file(chess.BLACK, file))
             if not has_pawns:
                 open_files.append(file)
         
         return open_files
     
     def _get_semi_open_files_near_king(self, board: chess.Board, king_file: int, 
-                                        color: chess.Color) -> list:
+                                        color: chess.Color,
+                                        features: Optional[PositionFeatures] = None) -> list:
         """Get semi-open files near the king.
         
         A semi-open file has no pawns of the opponent's color, but has pawns of the friendly color.
@@ -147,28 +148,21 @@ class KingSafetyRule(PositionalRule):
             board: Current position.
             king_file: King's file (0-7).
             color: King's color.
+            features: Shared position features (built on demand when None).
         
         Returns:
             List of semi-open file numbers near the king.
         """
+        features = features_for(board, features)
         semi_open_files = []
         opponent = not color
         
         # Check files: king's file and adjacent files
-        files_to_check = [king_file]
-        if king_file > 0:
-            files_to_check.append(king_file - 1)
-        if king_file < 7:
-            files_to_check.append(king_file + 1)
-        
-        friendly_pawns = board.pieces(chess.PAWN, color)
-        opponent_pawns = board.pieces(chess.PAWN, opponent)
-        
-        for file in files_to_check:
+        for file in features.king_zone_files(color):
             # Check if file has friendly pawns
-            has_friendly_pawns = any(chess.square_file(sq) == file for sq in friendly_pawns)
+            has_friendly_pawns = features.has_pawn_on_file(color, file)
             # Check if file has opponent pawns
-            has_opponent_pawns = any(chess.square_file(sq) == file for sq in opponent_pawns)
+            has_opponent_pawns = features.has_pawn_on_file(opponent, file)
             
             # Semi-open file: friendly has pawns, opponent doesn't
             if has_friendly_pawns and not has_opponent_pawns:
@@ -1,9 +1,10 @@
 """Rule for evaluating outpost squares."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures
 
 
 class OutpostSquareRule(PositionalRule):
@@ -33,12 +34,14 @@ class OutpostSquareRule(PositionalRule):
         self.central_bonus = config.get('central_bonus', 3.0)
         self.protected_bonus = config.get('protected_bonus', 2.0)
 
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate outpost squares in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
@@ -1,9 +1,10 @@
 """Rule for evaluating passed pawns."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures, features_for
 
 
 class PassedPawnRule(PositionalRule):
@@ -22,12 +23,14 @@ class PassedPawnRule(PositionalRule):
         super().__init__(config)
         self.passed_pawn_score = config.get('score', 20.0)
     
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate passed pawns in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
@@ -35,6 +38,8 @@ class PassedPawnRule(PositionalRule):
         """
         scores: Dict[chess.Square, float] = {}
         opponent = not perspective
+        features = features_for(board, features)
+        passed_pawns = features.passed_pawns(perspective)
         
         # Get all pawns for the perspective color
         pawns = board.pieces(chess.PAWN, perspective)
@@ -75,8 +80,8 @@ class PassedPawnRule(PositionalRule):
                 pawn_score = 10.0
             
             # Check if pawn is attacked/defended (needed for passed pawn evaluation)
-            is_attacked = board.is_attacked_by(opponent, pawn_square)
-            is_defended = board.is_attacked_by(pawn_color, pawn_square)
+            is_attacked = features.is_attacked_by(opponent, pawn_square)
+            is_defended = features.is_attacked_by(pawn_color, pawn_square)
             
             # Re-check starting rank before checking if passed (safety check)
             # This ensures we never evaluate starting rank pawns as passed
@@ -87,7 +92,7 @@ class PassedPawnRule(PositionalRule):
                 continue
             
             # Check if pawn is passed (only if not blocked and not on starting rank)
-            is_passed = self._is_passed_pawn(board, file, rank, pawn_color)
+            is_passed = pawn_square in passed_pawns
             
             if is_passed:
                 # Passed pawn - calculate bonus scaled by rank advancement
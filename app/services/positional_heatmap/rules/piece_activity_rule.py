@@ -1,9 +1,10 @@
 """Rule for evaluating piece activity."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures, features_for
 
 
 class PieceActivityRule(PositionalRule):
@@ -26,18 +27,21 @@ class PieceActivityRule(PositionalRule):
         self.central_square_bonus = config.get('central_square_bonus', 3.0)
         self.doubled_rooks_bonus = config.get('doubled_rooks_bonus', 20.0)
     
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate piece activity in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
             Positive scores for active pieces.
         """
         scores: Dict[chess.Square, float] = {}
+        features = features_for(board, features)
         
         # Central squares (d4, d5, e4, e5)
         central_squares = [chess.E4, chess.E5, chess.D4, chess.D5]
@@ -50,21 +54,8 @@ class PieceActivityRule(PositionalRule):
                 activity_score = 0.0
                 
                 # Count legal moves (mobility) for this piece's color
-                # board.legal_moves only returns moves for the current side to move,
-                # so we need to check moves for the perspective color specifically
-                if perspective == board.turn:
-                    # Current side to move - can use board.legal_moves directly
-                    legal_moves = [move for move in board.legal_moves 
-                                 if move.from_square == piece_square]
-                    num_moves = len(legal_moves)
-                else:
-                    # Not current side to move - need to generate moves for this piece's color
-                    # Create a temporary board copy and set turn to perspective color
-                    temp_board = board.copy()
-                    temp_board.turn = perspective
-                    legal_moves = [move for move in temp_board.generate_legal_moves() 
-                                 if move.from_square == piece_square]
-                    num_moves = len(legal_moves)
+                # (generated once per color by the shared features, also for the side not to move)
+                num_moves = features.legal_move_count(perspective, piece_square)
                 
                 # Get attacks and central attacks (used multiple times)
                 attacks = board.attacks(piece_square)
@@ -102,7 +93,7 @@ class PieceActivityRule(PositionalRule):
                     if piece_type == chess.ROOK:
                         piece_file = chess.square_file(piece_square)
                         # Check if this rook is on an open file with another rook
-                        if self._is_doubled_rooks_on_open_file(board, piece_file, perspective):
+                        if self._is_doubled_rooks_on_open_file(board, piece_file, perspective, features):
                             activity_score += self.doubled_rooks_bonus
                 else:
                     # Penalty for blocked pieces (no legal moves)
@@ -227,7 +218,8 @@ class PieceActivityRule(PositionalRule):
         
         return False
     
-    def _is_doubled_rooks_on_open_file(self, board: chess.Board, file: int, color: chess.Color) -> bool:
+    def _is_doubled_rooks_on_open_file(self, board: chess.Board, file: int, color: chess.Color,
+                                       features: Optional[PositionFeatures] = None) -> bool:
         """Check if there are doubled rooks on an open file.
         
         Doubled rooks on an open file is a significant tactical advantage.
@@ -237,6 +229,7 @@ class PieceActivityRule(PositionalRule):
             board: Current position.
             file: File to check (0-7).
             color: Color of the rooks.
+            features: Shared position features (built on demand when None).
             
         Returns:
             True if there are doubled rooks on an open file, False otherwise.
@@ -251,11 +244,9 @@ class PieceActivityRule(PositionalRule):
             return False  # Need at least 2 rooks
         
         # Check if the file is open (no pawns of either color)
-        white_pawns = board.pieces(chess.PAWN, chess.WHITE)
-        black_pawns = board.pieces(chess.PAWN, chess.BLACK)
-        
-        has_white_pawns = any(chess.square_file(sq) == file for sq in white_pawns)
-        has_black_pawns = any(chess.square_file(sq) == file for sq in black_pawns)
+        features = features_for(board, features)
+        has_white_pawns = features.has_pawn_on_file(chess.WHITE, file)
+        has_black_pawns = features.has_pawn_on_file(chess.BLACK, file)
         
         # File is open if no pawns of either color
         is_open_file = not has_white_pawns and not has_black_pawns
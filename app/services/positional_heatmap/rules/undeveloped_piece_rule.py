@@ -1,9 +1,10 @@
 """Rule for evaluating undeveloped pieces."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures, features_for
 
 
 class UndevelopedPieceRule(PositionalRule):
@@ -23,18 +24,21 @@ class UndevelopedPieceRule(PositionalRule):
         super().__init__(config)
         self.undeveloped_penalty = config.get('penalty', -8.0)
     
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate undeveloped pieces in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
             Negative scores for undeveloped pieces.
         """
         scores: Dict[chess.Square, float] = {}
+        features = features_for(board, features)
         
         # Starting squares for each piece type and color
         starting_squares = self._get_starting_squares(perspective)
@@ -49,18 +53,7 @@ class UndevelopedPieceRule(PositionalRule):
                     continue
                 
                 # Check if piece has legal moves (if not, it's blocked/undeveloped)
-                if perspective == board.turn:
-                    # Current side to move - can use board.legal_moves directly
-                    legal_moves = [move for move in board.legal_moves 
-                                 if move.from_square == piece_square]
-                    num_moves = len(legal_moves)
-                else:
-                    # Not current side to move - need to generate moves for this piece's color
-                    temp_board = board.copy()
-                    temp_board.turn = perspective
-                    legal_moves = [move for move in temp_board.generate_legal_moves() 
-                                 if move.from_square == piece_square]
-                    num_moves = len(legal_moves)
+                num_moves = features.legal_move_count(perspective, piece_square)
                 
                 # If piece has no legal moves, it's undeveloped (blocked)
                 if num_moves == 0:
@@ -1,9 +1,10 @@
 """Rule for evaluating weak squares."""
 
-from typing import Dict
+from typing import Dict, Optional
 import chess
 
 from app.services.positional_heatmap.base_rule import PositionalRule
+from app.services.positional_heatmap.position_features import PositionFeatures, features_for
 
 
 class WeakSquareRule(PositionalRule):
@@ -25,12 +26,14 @@ class WeakSquareRule(PositionalRule):
         self.weak_square_penalty = config.get('score', -8.0)
         self.undefended_penalty = config.get('undefended_penalty', -2.0)
     
-    def evaluate(self, board: chess.Board, perspective: chess.Color) -> Dict[chess.Square, float]:
+    def evaluate(self, board: chess.Board, perspective: chess.Color,
+                 features: Optional[PositionFeatures] = None) -> Dict[chess.Square, float]:
         """Evaluate weak squares in the position.
         
         Args:
             board: Current chess position.
             perspective: Color to evaluate from.
+            features: Shared position features (built on demand when None).
         
         Returns:
             Dictionary mapping square -> score.
@@ -38,16 +41,13 @@ class WeakSquareRule(PositionalRule):
         """
         scores: Dict[chess.Square, float] = {}
         opponent = not perspective
+        features = features_for(board, features)
+        opponent_attacks = features.attacks(opponent)
+        own_attacks = features.attacks(perspective)
         
-        # Only evaluate squares that have pieces
-        for square in chess.SQUARES:
+        # Only evaluate squares that have pieces of the perspective color
+        for square in chess.scan_forward(board.occupied_co[perspective]):
             piece = board.piece_at(square)
-            if piece is None:
-                continue  # Skip empty squares
-            
-            # Only evaluate pieces of the perspective color
-            if piece.color != perspective:
-                continue
             
             file = chess.square_file(square)
             rank = chess.square_rank(square)
@@ -57,9 +57,9 @@ class WeakSquareRule(PositionalRule):
             
             # Only penalize if square is actually weak (attacked and undefended)
             # Don't penalize just because it can't be defended by pawns - that's too harsh
-            if board.is_attacked_by(opponent, square):
+            if square in opponent_attacks:
                 # Check if square is defended by friendly pieces
-                if not board.is_attacked_by(perspective, square):
+                if square not in own_attacks:
                     # Square is attacked but not defended - this is a weakness
                     # Scale penalty by piece value: Pawn -6.0, Knight/Bishop -8.0, Rook -10.0, Queen -12.0, King -15.0
                     piece_type = piece.piece_type
@@ -0,0 +1,213 @@
+"""Opt-in per-rule profiling for game highlight and positional heatmap rules.
+
+Profiling is off by default. When enabled (Debug menu or ``set_rule_profiling_enabled``),
+``HighlightDetector`` and ``PositionalAnalyzer`` time every rule call and record
+call counts, cumulative / p95 time, exceptions and highlights (or scored squares)
+emitted. Stats accumulate across games until reset, so a batch scan over a real
+database shows which rules dominate.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Rule scopes recorded by the profiler.
+SCOPE_HIGHLIGHTS = "highlights"
+SCOPE_HEATMAP = "heatmap"
+
+# Per-rule sample reservoir used for percentile estimates.
+_SAMPLE_RESERVOIR_SIZE = 4096
+
+
+@dataclass
+class RuleTimingStats:
+    """Accumulated timing for one rule (picklable, mergeable across processes)."""
+
+    scope: str
+    rule_name: str
+    calls: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    exceptions: int = 0
+    emitted: int = 0
+    last_error: str = ""
+    samples: List[float] = field(default_factory=list, repr=False)
+
+    def add(self, elapsed_s: float, emitted: int, error: Optional[BaseException], rng: random.Random) -> None:
+        self.calls += 1
+        self.total_s += elapsed_s
+        if elapsed_s > self.max_s:
+            self.max_s = elapsed_s
+        self.emitted += emitted
+        if error is not None:
+            self.exceptions += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+        if len(self.samples) < _SAMPLE_RESERVOIR_SIZE:
+            self.samples.append(elapsed_s)
+        else:
+            slot = rng.randrange(self.calls)
+            if slot < _SAMPLE_RESERVOIR_SIZE:
+                self.samples[slot] = elapsed_s
+
+    def merge(self, other: "RuleTimingStats", rng: random.Random) -> None:
+        self.calls += other.calls
+        self.total_s += other.total_s
+        self.max_s = max(self.max_s, other.max_s)
+        self.exceptions += other.exceptions
+        self.emitted += other.emitted
+        if other.last_error:
+            self.last_error = other.last_error
+        combined = self.samples + other.samples
+        if len(combined) > _SAMPLE_RESERVOIR_SIZE:
+            combined = rng.sample(combined, _SAMPLE_RESERVOIR_SIZE)
+        self.samples = combined
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.calls if self.calls else 0.0
+
+    @property
+    def p95_s(self) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class RuleProfiler:
+    """Thread-safe accumulator of ``RuleTimingStats`` keyed by (scope, rule name)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], RuleTimingStats] = {}
+        self._rng = random.Random(0)
+        self._units: Dict[str, int] = {}
+
+    def record(
+        self,
+        scope: str,
+        rule_name: str,
+        elapsed_s: float,
+        emitted: int = 0,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record one rule call."""
+        key = (scope, rule_name)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = RuleTimingStats(scope=scope, rule_name=rule_name)
+                self._stats[key] = stats
+            stats.add(elapsed_s, emitted, error, self._rng)
+
+    def count_unit(self, scope: str) -> None:
+        """Count one profiled unit of work (a game for highlights, a position for heatmaps)."""
+        with self._lock:
+            self._units[scope] = self._units.get(scope, 0) + 1
+
+    def snapshot(self) -> List[RuleTimingStats]:
+        """Copy of all stats, slowest cumulative time first."""
+        with self._lock:
+            copies = [
+                RuleTimingStats(
+                    scope=s.scope,
+                    rule_name=s.rule_name,
+                    calls=s.calls,
+                    total_s=s.total_s,
+                    max_s=s.max_s,
+                    exceptions=s.exceptions,
+                    emitted=s.emitted,
+                    last_error=s.last_error,
+                    samples=list(s.samples),
+                )
+                for s in self._stats.values()
+            ]
+        copies.sort(key=lambda s: s.total_s, reverse=True)
+        return copies
+
+    def units(self, scope: str) -> int:
+        with self._lock:
+            return self._units.get(scope, 0)
+
+    def merge(self, stats: List[RuleTimingStats], units: Optional[Dict[str, int]] = None) -> None:
+        """Fold stats collected elsewhere (e.g. a worker process) into this profiler."""
+        with self._lock:
+            for other in stats:
+                key = (other.scope, other.rule_name)
+                mine = self._stats.get(key)
+                if mine is None:
+                    self._stats[key] = RuleTimingStats(scope=other.scope, rule_name=other.rule_name)
+                    mine = self._stats[key]
+                mine.merge(other, self._rng)
+            for scope, count in (units or {}).items():
+                self._units[scope] = self._units.get(scope, 0) + count
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._units.clear()
+
+    def format_report(self) -> str:
+        """Plain-text table per scope, sorted by cumulative time."""
+        all_stats = self.snapshot()
+        lines: List[str] = ["=== RULE PROFILE ==="]
+        for scope, unit_label in ((SCOPE_HIGHLIGHTS, "games"), (SCOPE_HEATMAP, "positions")):
+            scoped = [s for s in all_stats if s.scope == scope]
+            if not scoped:
+                continue
+            total = sum(s.total_s for s in scoped)
+            lines.append("")
+            lines.append(
+                f"[{scope}] {self.units(scope)} {unit_label}, "
+                f"{sum(s.calls for s in scoped)} rule calls, {total * 1000:.1f} ms total"
+            )
+            lines.append(
+                f"{'rule':<34} {'calls':>9} {'total ms':>10} {'share':>6} "
+                f"{'mean us':>9} {'p95 us':>9} {'max ms':>8} {'errors':>7} {'emitted':>8}"
+            )
+            for s in scoped:
+                share = (s.total_s / total * 100.0) if total else 0.0
+                lines.append(
+                    f"{s.rule_name[:34]:<34} {s.calls:>9} {s.total_s * 1000:>10.1f} {share:>5.1f}% "
+                    f"{s.mean_s * 1e6:>9.1f} {s.p95_s * 1e6:>9.1f} {s.max_s * 1000:>8.2f} "
+                    f"{s.exceptions:>7} {s.emitted:>8}"
+                )
+            failing = [s for s in scoped if s.last_error]
+            if failing:
+                lines.append("")
+                lines.append("Last exception per failing rule:")
+                for s in failing:
+                    lines.append(f"- {s.rule_name}: {s.last_error}")
+        if len(lines) == 1:
+            lines.append("")
+            lines.append("No rule calls recorded.")
+        return "\n".join(lines)
+
+
+# Single process-wide profiler; stats survive toggling so a report can be taken afterwards.
+_profiler = RuleProfiler()
+_enabled = False
+
+
+def set_rule_profiling_enabled(enabled: bool) -> None:
+    """Turn per-rule profiling on or off (collected stats are kept)."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_rule_profiling_enabled() -> bool:
+    return _enabled
+
+
+def get_rule_profiler() -> Optional[RuleProfiler]:
+    """Profiler to record into, or None when profiling is off (the fast path)."""
+    return _profiler if _enabled else None
+
+
+def get_rule_profile() -> RuleProfiler:
+    """Process-wide profiler for reports and reset, regardless of the enabled flag."""
+    return _profiler
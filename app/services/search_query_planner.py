@@ -0,0 +1,439 @@
+"""Query planning for database search criteria (no Qt).
+
+The criteria list is compiled into an AND/OR tree with exactly the semantics of
+DatabaseSearchService._evaluate_criteria_recursive (left-to-right combination,
+groups evaluated flat). Because every criterion is a pure predicate, children of
+an AND/OR node can then be reordered and short-circuited freely.
+
+Criteria on plain game fields are answered per distinct field value instead of
+per game: a database has far fewer distinct players, dates, ECO codes or Elo
+values than games. Selective ones become candidate sets (like position matches)
+so only the surviving games are evaluated at all.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.models.database_model import GameData
+from app.models.search_criteria import SearchCriteria, SearchField, SearchOperator
+
+# (game, criterion, context) -> bool; DatabaseSearchService._evaluate_criterion.
+CriterionEvaluator = Callable[[GameData, SearchCriteria, Optional[Dict[str, Any]]], bool]
+
+# Game attribute each field's criteria depend on (and only on).
+VALUE_FIELD_ATTRIBUTES: Dict[SearchField, str] = {
+    SearchField.WHITE: "white",
+    SearchField.BLACK: "black",
+    SearchField.WHITE_ELO: "white_elo",
+    SearchField.BLACK_ELO: "black_elo",
+    SearchField.RESULT: "result",
+    SearchField.DATE: "date",
+    SearchField.EVENT: "event",
+    SearchField.SITE: "site",
+    SearchField.ECO: "eco",
+    SearchField.TIMECONTROL: "time_control",
+    SearchField.TC_TYPE: "time_control",
+    SearchField.ANALYZED: "analyzed",
+    SearchField.ANNOTATED: "annotated",
+    SearchField.TAGS: "game_tags_raw",
+}
+
+_POSITION_FIELDS = (
+    SearchField.POSITION,
+    SearchField.POSITION_FUZZY,
+    SearchField.PAWN_STRUCTURE,
+    SearchField.POSITION_SEQUENCE,
+)
+
+# Leaves matching at most this share of games are turned into candidate sets.
+CANDIDATE_SET_MAX_SELECTIVITY = 0.25
+
+# Relative per-game cost of evaluating a criterion directly.
+_FIELD_COST = {
+    SearchField.DATE: 3.0,
+    SearchField.TIMECONTROL: 3.0,
+    SearchField.TC_TYPE: 3.0,
+    SearchField.TAGS: 3.0,
+    SearchField.CUSTOM_TAG: 200.0,  # Parses the game's PGN
+}
+_LOOKUP_COST = 0.2  # Per-game cost of a dict or set lookup
+
+# Guessed share of games matching a criterion when nothing better is known.
+_OPERATOR_SELECTIVITY = {
+    SearchOperator.EQUALS: 0.1,
+    SearchOperator.EQUALS_NUM: 0.1,
+    SearchOperator.DATE_EQUALS: 0.1,
+    SearchOperator.IS_EMPTY: 0.1,
+    SearchOperator.CONTAINS: 0.3,
+    SearchOperator.STARTS_WITH: 0.3,
+    SearchOperator.ENDS_WITH: 0.3,
+    SearchOperator.DATE_CONTAINS: 0.3,
+    SearchOperator.NOT_EQUALS: 0.9,
+    SearchOperator.NOT_EQUALS_NUM: 0.9,
+    SearchOperator.DATE_NOT_EQUALS: 0.9,
+    SearchOperator.IS_NOT_EMPTY: 0.9,
+    SearchOperator.DOES_NOT_CONTAIN: 0.9,
+}
+
+
+class FieldValueIndex:
+    """Game ids grouped by the value of one attribute, with one game per value."""
+
+    __slots__ = ("revision", "groups", "representatives")
+
+    def __init__(self, revision: int, games: List[GameData], attribute: str) -> None:
+        self.revision = revision
+        self.groups: Dict[Any, List[int]] = {}
+        self.representatives: Dict[Any, GameData] = {}
+        groups = self.groups
+        for game in games:
+            value = getattr(game, attribute, None)
+            ids = groups.get(value)
+            if ids is None:
+                groups[value] = [id(game)]
+                self.representatives[value] = game
+            else:
+                ids.append(id(game))
+
+
+class FieldValueIndexCache:
+    """Per-database FieldValueIndex objects, rebuilt when the database's data revision changes."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # database -> attribute -> index
+        self._indexes: "weakref.WeakKeyDictionary[Any, Dict[str, FieldValueIndex]]" = weakref.WeakKeyDictionary()
+
+    def get(self, database: Any, games: List[GameData], attribute: str) -> Optional[FieldValueIndex]:
+        """Return the index of ``attribute`` over ``games`` (all games of ``database``).
+
+        Returns None if the attribute holds unhashable values.
+        """
+        revision = database.data_revision()
+        with self._lock:
+            index = self._indexes.get(database, {}).get(attribute)
+        if index is not None and index.revision == revision:
+            return index
+        try:
+            index = FieldValueIndex(revision, games, attribute)
+        except TypeError:
+            return None
+        with self._lock:
+            self._indexes.setdefault(database, {})[attribute] = index
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+_INDEX_CACHE = FieldValueIndexCache()
+
+
+class PlanNode:
+    """One node of a compiled criteria tree."""
+
+    __slots__ = ("kind", "children", "criterion", "evaluate", "candidates", "cost", "selectivity", "label")
+
+    def __init__(self, kind: str, children: Optional[List["PlanNode"]] = None, criterion: Optional[SearchCriteria] = None) -> None:
+        self.kind = kind  # "true", "leaf", "and", "or"
+        self.children: List[PlanNode] = children or []
+        self.criterion = criterion
+        self.evaluate: Optional[Callable[[GameData], bool]] = None
+        # Exact set of matching game ids (leaves backed by an index), or a superset for inner nodes
+        self.candidates: Optional[Set[int]] = None
+        self.cost = 0.0
+        self.selectivity = 1.0
+        self.label = ""
+
+
+def compile_criteria(criteria: List[SearchCriteria]) -> PlanNode:
+    """Compile a criteria list into an AND/OR tree.
+
+    Mirrors DatabaseSearchService._evaluate_criteria_recursive step by step, so the
+    tree matches exactly the games the sequential evaluation matches.
+    """
+    return _compile_range(criteria, 0, len(criteria), "and")
+
+
+def _compile_range(criteria: List[SearchCriteria], start_idx: int, end_idx: int, default_logic: str) -> PlanNode:
+    if start_idx >= end_idx:
+        return PlanNode("true")
+    results: List[PlanNode] = []
+    logic_operators: List[str] = []
+    i = start_idx
+    while i < end_idx:
+        criterion = criteria[i]
+        if criterion.is_group_start:
+            group_start = i
+            group_level = criterion.group_level
+            i += 1
+            nested_level = 0
+            group_end = -1
+            while i < end_idx:
+                if criteria[i].is_group_start:
+                    nested_level += 1
+                elif criteria[i].is_group_end and criteria[i].group_level == group_level:
+                    if nested_level == 0:
+                        group_end = i
+                        break
+                    nested_level -= 1
+                i += 1
+            if group_end == -1:
+                results.append(PlanNode("leaf", criterion=criterion))
+                if criterion.logic_operator:
+                    logic_operators.append(criterion.logic_operator.value)
+                i += 1
+                continue
+            group_logic = default_logic
+            if group_start + 1 <= group_end:
+                first_actual = criteria[group_start + 1] if group_start + 1 < group_end else criteria[group_start]
+                if criteria[group_start].logic_operator:
+                    group_logic = criteria[group_start].logic_operator.value
+                elif first_actual.logic_operator:
+                    group_logic = first_actual.logic_operator.value
+            members = [PlanNode("leaf", criterion=criteria[j]) for j in range(group_start, group_end + 1)]
+            member_logic = [
+                criteria[j + 1].logic_operator.value if criteria[j + 1].logic_operator else group_logic
+                for j in range(group_start, group_end)
+            ]
+            results.append(_fold(members, member_logic, group_logic))
+            next_idx = group_end + 1
+            while next_idx < end_idx and criteria[next_idx].is_group_end:
+                next_idx += 1
+            if next_idx < end_idx and criteria[next_idx].logic_operator:
+                logic_operators.append(criteria[next_idx].logic_operator.value)
+            else:
+                logic_operators.append(default_logic)
+            i = group_end + 1
+            continue
+        if criterion.is_group_end:
+            i += 1
+            continue
+        results.append(PlanNode("leaf", criterion=criterion))
+        if i + 1 < end_idx:
+            next_criterion = criteria[i + 1]
+            logic_operators.append(next_criterion.logic_operator.value if next_criterion.logic_operator else default_logic)
+        i += 1
+    if not results:
+        return PlanNode("true")
+    return _fold(results, logic_operators, default_logic)
+
+
+def _fold(results: List[PlanNode], logic_operators: List[str], default_logic: str) -> PlanNode:
+    """Left-to-right combination as a tree, flattening runs of the same operator."""
+    node = results[0]
+    for k in range(1, len(results)):
+        kind = "or" if (logic_operators[k - 1] if k - 1 < len(logic_operators) else default_logic) == "or" else "and"
+        if node.kind == kind:
+            node.children.append(results[k])
+        else:
+            node = PlanNode(kind, [node, results[k]])
+    return node
+
+
+class SearchPlan:
+    """Executable plan of one criteria tree for one database."""
+
+    def __init__(self, root: PlanNode, game_count: int) -> None:
+        self.root = root
+        self.game_count = game_count
+        self.matches: Callable[[GameData], bool] = root.evaluate or (lambda game: True)
+
+    @property
+    def candidates(self) -> Optional[Set[int]]:
+        """Ids of the only games that can match, or None if every game must be tested."""
+        return self.root.candidates
+
+    def describe(self) -> str:
+        """One-line rendering of the evaluation order, for debug logs."""
+        return self.root.label
+
+
+def plan_search(
+    criteria: List[SearchCriteria],
+    database: Any,
+    games: List[GameData],
+    evaluate: CriterionEvaluator,
+    context: Optional[Dict[str, Any]] = None,
+) -> SearchPlan:
+    """Plan a search of ``games`` (all games of ``database``).
+
+    Args:
+        criteria: Search criteria in the order entered.
+        database: DatabaseModel the games belong to (keys the value-index cache).
+        games: The database's games.
+        evaluate: Evaluates one criterion for one game.
+        context: Evaluation context (precomputed position matches).
+    """
+    root = compile_criteria(criteria)
+    _plan_node(root, database, games, evaluate, context or {})
+    return SearchPlan(root, len(games))
+
+
+def _plan_node(
+    node: PlanNode,
+    database: Any,
+    games: List[GameData],
+    evaluate: CriterionEvaluator,
+    context: Dict[str, Any],
+) -> None:
+    if node.kind == "true":
+        node.evaluate = lambda game: True
+        node.label = "true"
+        return
+    if node.kind == "leaf":
+        _plan_leaf(node, database, games, evaluate, context)
+        return
+    for child in node.children:
+        _plan_node(child, database, games, evaluate, context)
+    if node.kind == "and":
+        # Cheapest rejection first: rank by cost per share of games rejected
+        node.children.sort(key=lambda c: c.cost / (1.0 - c.selectivity) if c.selectivity < 1.0 else float("inf"))
+        sets = [c.candidates for c in node.children if c.candidates is not None]
+        if sets:
+            sets.sort(key=len)
+            node.candidates = set(sets[0]).intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+        node.evaluate = _all_of([c.evaluate for c in node.children])
+        node.cost, node.selectivity = _chain_cost(node.children, lambda p: p)
+    else:
+        # Cheapest acceptance first
+        node.children.sort(key=lambda c: c.cost / c.selectivity if c.selectivity > 0.0 else float("inf"))
+        if all(c.candidates is not None for c in node.children):
+            node.candidates = set().union(*[c.candidates for c in node.children])
+        node.evaluate = _any_of([c.evaluate for c in node.children])
+        node.cost, _ = _chain_cost(node.children, lambda p: 1.0 - p)
+        miss = 1.0
+        for child in node.children:
+            miss *= 1.0 - child.selectivity
+        node.selectivity = 1.0 - miss
+    if node.candidates is not None and games:
+        node.selectivity = min(node.selectivity, len(node.candidates) / len(games))
+    node.label = "(" + f" {node.kind.upper()} ".join(c.label for c in node.children) + ")"
+
+
+def _chain_cost(children: List[PlanNode], continue_share: Callable[[float], float]) -> Tuple[float, float]:
+    """Expected per-game cost of evaluating children in order with short-circuiting."""
+    cost = 0.0
+    reach = 1.0
+    for child in children:
+        cost += reach * child.cost
+        reach *= continue_share(child.selectivity)
+    return cost, reach
+
+
+def _plan_leaf(
+    node: PlanNode,
+    database: Any,
+    games: List[GameData],
+    evaluate: CriterionEvaluator,
+    context: Dict[str, Any],
+) -> None:
+    criterion = node.criterion
+    assert criterion is not None
+    field = criterion.field
+    node.label = f"{field.value} {criterion.operator.value}"
+    total = len(games)
+
+    if field in _POSITION_FIELDS and criterion.operator != SearchOperator.NOT_EQUALS:
+        # The matching ids are known up front: games where the position occurs after ply 0
+        hit_ids = _position_hit_ids(criterion, context)
+        if hit_ids is not None:
+            _set_leaf(node, hit_ids, total)
+            return
+
+    attribute = VALUE_FIELD_ATTRIBUTES.get(field)
+    index = _INDEX_CACHE.get(database, games, attribute) if attribute and total else None
+    if index is not None:
+        truth: Dict[Any, bool] = {}
+        matched = 0
+        for value, representative in index.representatives.items():
+            hit = bool(evaluate(representative, criterion, context))
+            truth[value] = hit
+            if hit:
+                matched += len(index.groups[value])
+        selectivity = matched / total
+        if selectivity <= CANDIDATE_SET_MAX_SELECTIVITY:
+            hit_ids: Set[int] = set()
+            for value, hit in truth.items():
+                if hit:
+                    hit_ids.update(index.groups[value])
+            _set_leaf(node, hit_ids, total)
+            return
+        get_truth = truth.get
+
+        def by_value(game: GameData) -> bool:
+            hit = get_truth(getattr(game, attribute, None))
+            if hit is None:  # Value changed since the index was built
+                return bool(evaluate(game, criterion, context))
+            return hit
+
+        node.evaluate = by_value
+        node.cost = _LOOKUP_COST
+        node.selectivity = selectivity
+        node.label += " [by value]"
+        return
+
+    node.evaluate = lambda game: bool(evaluate(game, criterion, context))
+    node.cost = _FIELD_COST.get(field, 1.0)
+    node.selectivity = _OPERATOR_SELECTIVITY.get(criterion.operator, 0.5)
+
+
+def _set_leaf(node: PlanNode, hit_ids: Set[int], total: int) -> None:
+    node.candidates = hit_ids
+    contains = hit_ids.__contains__
+    node.evaluate = lambda game: contains(id(game))
+    node.cost = _LOOKUP_COST
+    node.selectivity = len(hit_ids) / total if total else 0.0
+    node.label += f" [{len(hit_ids)} ids]"
+
+
+def _position_hit_ids(criterion: SearchCriteria, context: Dict[str, Any]) -> Optional[Set[int]]:
+    """Game ids the precomputed position matches count as hits (a match after ply 0)."""
+    from app.services.database_search_service import (
+        POSITION_MATCH_KEYS,
+        POSITION_SEQUENCE_MATCHES_KEY,
+        DatabaseSearchService,
+    )
+
+    if criterion.field == SearchField.POSITION_SEQUENCE:
+        sequence_matches = context.get(POSITION_SEQUENCE_MATCHES_KEY)
+        if not isinstance(sequence_matches, dict):
+            return None
+        return set(sequence_matches.get(criterion.value, {}))
+    matches_by_hash = context.get(POSITION_MATCH_KEYS[criterion.field])
+    if not isinstance(matches_by_hash, dict):
+        return None
+    position_hash = DatabaseSearchService.position_key(criterion.field, criterion.value)
+    hits = matches_by_hash.get(position_hash, {}) if position_hash else {}
+    return {gid for gid, ply in hits.items() if ply}
+
+
+def _all_of(checks: List[Callable[[GameData], bool]]) -> Callable[[GameData], bool]:
+    if len(checks) == 1:
+        return checks[0]
+
+    def run(game: GameData) -> bool:
+        for check in checks:
+            if not check(game):
+                return False
+        return True
+
+    return run
+
+
+def _any_of(checks: List[Callable[[GameData], bool]]) -> Callable[[GameData], bool]:
+    if len(checks) == 1:
+        return checks[0]
+
+    def run(game: GameData) -> bool:
+        for check in checks:
+            if check(game):
+                return True
+        return False
+
+    return run
+
@@ -0,0 +1,86 @@
+"""Background warm-up of heavy services after the main window is shown."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from app.services.logging_service import LoggingService
+from app.utils.startup_profile import StartupProfile, get_startup_profile
+
+
+class ServiceWarmup:
+    """Run service loaders on one background thread, lowest priority number first.
+
+    Loaders must be the services' own idempotent, thread-safe ``load`` methods:
+    code that needs a service before its turn simply calls ``load`` itself, and
+    a caller arriving mid-load waits on that service's lock only. Warm-up is
+    therefore an optimisation; nothing depends on it having run.
+    """
+
+    def __init__(self, profile: Optional[StartupProfile] = None) -> None:
+        """Initialize an empty warm-up queue.
+
+        Args:
+            profile: Startup profile receiving one phase per loader (defaults to the process profile).
+        """
+        self._profile = profile or get_startup_profile()
+        self._tasks: List[Tuple[int, int, str, Callable[[], None]]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._finished = threading.Event()
+        self._cancelled = False
+        self._on_finished: Optional[Callable[[], None]] = None
+
+    def add(self, name: str, loader: Callable[[], None], priority: int = 100) -> None:
+        """Queue a loader; equal priorities run in the order added.
+
+        Args:
+            name: Service name for logs and the startup profile.
+            loader: Idempotent, thread-safe load callable.
+            priority: Lower runs first.
+        """
+        if self._thread is not None:
+            raise RuntimeError("ServiceWarmup already started")
+        self._tasks.append((priority, len(self._tasks), name, loader))
+
+    def start(self, on_finished: Optional[Callable[[], None]] = None) -> None:
+        """Start the warm-up thread (once).
+
+        Args:
+            on_finished: Called on the warm-up thread after the last loader.
+        """
+        if self._thread is not None:
+            return
+        self._on_finished = on_finished
+        self._thread = threading.Thread(target=self._run, name="ServiceWarmup", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Skip loaders that have not started yet (e.g. on application shutdown)."""
+        self._cancelled = True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every loader has run or been skipped; returns False on timeout."""
+        return self._finished.wait(timeout)
+
+    def _run(self) -> None:
+        logging_service = LoggingService.get_instance()
+        try:
+            for _priority, _order, name, loader in sorted(self._tasks):
+                if self._cancelled:
+                    break
+                start = time.perf_counter()
+                try:
+                    loader()
+                except Exception as e:
+                    # Callers load on demand and surface their own errors
+                    logging_service.warning(f"Background warm-up of {name} failed: {e}")
+                    continue
+                elapsed = time.perf_counter() - start
+                self._profile.record_phase(f"warm-up: {name}", start, elapsed)
+                logging_service.debug(f"Background warm-up: {name} ready in {elapsed * 1000:.0f} ms")
+        finally:
+            self._finished.set()
+            if self._on_finished is not None:
+                self._on_finished()
@@ -1,8 +1,10 @@
 """Utilities for concurrent execution (e.g. ProcessPoolExecutor)."""
 
-from typing import Optional
+from typing import Iterator, Optional, Sequence, TypeVar
 
 
+T = TypeVar('T')
+
 # Default cap for max_workers (applied on all platforms).
 DEFAULT_MAX_WORKERS_CAP = 60
 # Default cores to reserve for OS/UI when computing worker count.
@@ -34,3 +36,40 @@ def get_process_pool_max_workers(cpu_count: Optional[int], config: Optional[dict
         cap = DEFAULT_MAX_WORKERS_CAP
     effective = min(desired, cap)
     return max(1, effective)
+
+
+# Default upper bound for games shipped to a worker in one task.
+DEFAULT_GAMES_PER_TASK = 64
+# Aim for at least this many tasks per worker so progress and cancellation stay responsive.
+MIN_TASKS_PER_WORKER = 4
+
+
+def get_process_pool_batch_size(total_items: int, max_workers: int, config: Optional[dict] = None) -> int:
+    """Return how many items to send to a pool worker per task.
+
+    Batching amortizes pickling/IPC overhead, which dominates for short games.
+    The batch is capped by parallel_processing.process_pool.games_per_task and
+    shrunk for small inputs so every worker still receives several tasks.
+
+    Args:
+        total_items: Number of items to process.
+        max_workers: Effective pool size (see get_process_pool_max_workers).
+        config: Application config dict. If None or key missing, defaults are used.
+
+    Returns:
+        Batch size, at least 1.
+    """
+    pool_config = (config or {}).get('parallel_processing', {}).get('process_pool', {})
+    cap = pool_config.get('games_per_task')
+    if cap is None:
+        cap = DEFAULT_GAMES_PER_TASK
+    target_tasks = max(1, max_workers) * MIN_TASKS_PER_WORKER
+    per_task = -(-max(0, total_items) // target_tasks)
+    return max(1, min(int(cap), per_task))
+
+
+def iter_batches(items: Sequence[T], batch_size: int) -> Iterator[Sequence[T]]:
+    """Yield consecutive slices of *items* with at most *batch_size* elements."""
+    step = max(1, batch_size)
+    for start in range(0, len(items), step):
+        yield items[start:start + step]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from typing import Dict, Iterable
 
 # Tag pair syntax is [TagName "value"]; the name must be a single token (no spaces,
 # brackets, or quotes). Allow letters, digits, underscore — same family as standard tags
@@ -21,3 +22,36 @@ def is_valid_pgn_header_tag_name(name: str) -> bool:
 def pgn_header_tag_name_input_pattern() -> str:
     """Regular expression string for QLineEdit validators (allows empty intermediate state)."""
     return _PGN_HEADER_TAG_NAME_INPUT.pattern
+
+
+# One tag pair per line: [Name "value"] with PGN escapes (\" and \\) inside the value.
+_PGN_HEADER_TAG_LINE = re.compile(r'^\[([A-Za-z0-9_]+)\s+"((?:[^"\\]|\\.)*)"\]\s*$')
+_PGN_HEADER_ESCAPE = re.compile(r"\\(.)")
+
+
+def read_header_tag_values(pgn_text: str, tag_names: Iterable[str]) -> Dict[str, str]:
+    """Return values for *tag_names* from the header section of *pgn_text*.
+
+    Scans only the leading tag-pair lines (stops at the first movetext line), so
+    callers can pull a few headers without building a full ``chess.pgn.Game``.
+    Tags that are absent are omitted from the result.
+    """
+    wanted = set(tag_names)
+    found: Dict[str, str] = {}
+    if not pgn_text or not wanted:
+        return found
+    for line in pgn_text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if not stripped.startswith("["):
+            break
+        match = _PGN_HEADER_TAG_LINE.match(stripped)
+        if match is None:
+            continue
+        name = match.group(1)
+        if name in wanted and name not in found:
+            found[name] = _PGN_HEADER_ESCAPE.sub(r"\1", match.group(2))
+            if len(found) == len(wanted):
+                break
+    return found
@@ -1,17 +1,197 @@
 """Shared compression and encoding helpers for PGN custom tags (CARAAnnotations, CARAAnalysisData, CARANotes).
 
-Used by storage services to avoid duplicating gzip+base64+checksum logic.
+Used by storage services to avoid duplicating compression+base64+checksum logic.
+
+Payloads are written as ``<marker><base64 data>``, where the marker names the
+codec and payload format version (``z2:`` zlib, ``x2:`` lzma, ``s2:`` zstd).
+Version 1 payloads are unmarked base64 gzip; they are still read, and written
+when the codec is set to ``gzip`` for compatibility with older versions. Base64
+stays the text encoding: it is what PGN tag values can carry, and base85 saves
+only ~6% while being far slower in Python.
 """
 
 import gzip
+import lzma
 import zlib
 import base64
 import hashlib
-from typing import Tuple
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Optional zstd backend
+try:
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - depends on the environment
+    _zstd = None
+
+PAYLOAD_FORMAT_VERSION = 2
+
+CODEC_GZIP = "gzip"  # Unmarked version 1 format
+CODEC_ZLIB = "zlib"
+CODEC_LZMA = "lzma"
+CODEC_ZSTD = "zstd"
+
+_CODEC_MARKERS: Dict[str, str] = {
+    CODEC_ZLIB: f"z{PAYLOAD_FORMAT_VERSION}:",
+    CODEC_LZMA: f"x{PAYLOAD_FORMAT_VERSION}:",
+    CODEC_ZSTD: f"s{PAYLOAD_FORMAT_VERSION}:",
+}
+_MARKER_CODECS: Dict[str, str] = {marker: codec for codec, marker in _CODEC_MARKERS.items()}
+_MARKER_LENGTH = 3
+
+# Level used when none is configured: zlib 6 is ~4x faster than gzip 9 for ~2% larger output.
+_DEFAULT_LEVELS: Dict[str, int] = {CODEC_GZIP: 9, CODEC_ZLIB: 6, CODEC_LZMA: 6, CODEC_ZSTD: 3}
+_LEVEL_RANGES: Dict[str, Tuple[int, int]] = {CODEC_GZIP: (1, 9), CODEC_ZLIB: (1, 9), CODEC_LZMA: (0, 9), CODEC_ZSTD: (1, 22)}
+
+
+class PayloadCodecUnavailableError(ValueError):
+    """A payload's codec cannot be used here (zstd without zstandard).
+
+    The payload itself may be intact, so callers must not treat it as
+    corruption and strip the tag.
+    """
+
+
+_settings_lock = threading.Lock()
+_default_codec = CODEC_ZLIB
+_default_level: Optional[int] = None
+
+
+def available_codecs() -> List[str]:
+    """Codecs usable for writing in this environment."""
+    codecs = [CODEC_GZIP, CODEC_ZLIB, CODEC_LZMA]
+    if _zstd is not None:
+        codecs.append(CODEC_ZSTD)
+    return codecs
+
+
+def configure_payload_codec(config: Optional[Dict[str, Any]]) -> Tuple[str, int]:
+    """Set the codec and level new payloads are written with (``pgn.tag_payload`` settings).
+
+    An unavailable codec (zstd without the zstandard package) or unknown name
+    falls back to zlib.
+
+    Returns:
+        The (codec, level) now in effect.
+    """
+    global _default_codec, _default_level
+    settings = ((config or {}).get("pgn") or {}).get("tag_payload") or {}
+    codec = str(settings.get("codec") or CODEC_ZLIB).lower()
+    if codec not in available_codecs():
+        codec = CODEC_ZLIB
+    level = settings.get("level")
+    with _settings_lock:
+        _default_codec = codec
+        _default_level = _clamp_level(codec, level) if level is not None else None
+    return payload_codec()
+
+
+def payload_codec() -> Tuple[str, int]:
+    """The (codec, level) new payloads are written with."""
+    with _settings_lock:
+        codec, level = _default_codec, _default_level
+    return codec, level if level is not None else _DEFAULT_LEVELS[codec]
+
+
+def _clamp_level(codec: str, level: Any) -> int:
+    low, high = _LEVEL_RANGES[codec]
+    try:
+        return max(low, min(high, int(level)))
+    except (TypeError, ValueError):
+        return _DEFAULT_LEVELS[codec]
+
+
+def payload_format(encoded: str) -> str:
+    """Codec a stored payload was written with (``gzip`` for unmarked version 1 payloads)."""
+    return _MARKER_CODECS.get(encoded[:_MARKER_LENGTH], CODEC_GZIP)
+
+
+def encode_payload(data: bytes, codec: Optional[str] = None, level: Optional[int] = None) -> str:
+    """Compress and base64-encode a payload with a format marker.
+
+    Args:
+        data: Raw bytes to store.
+        codec: Codec name (default: the configured codec, see configure_payload_codec).
+        level: Compression level (default: the configured or codec default level).
+
+    Returns:
+        Marked payload text (unmarked base64 gzip for the ``gzip`` codec).
+
+    Raises:
+        ValueError: If the codec is unknown or not available.
+    """
+    if codec is None:
+        codec, default_level = payload_codec()
+        if level is None:
+            level = default_level
+    elif codec not in _DEFAULT_LEVELS:
+        raise ValueError(f"Unknown payload codec: {codec}")
+    level = _clamp_level(codec, _DEFAULT_LEVELS[codec] if level is None else level)
+    if codec == CODEC_GZIP:
+        return compress_and_encode(data, compresslevel=level)
+    if codec == CODEC_ZLIB:
+        compressed = zlib.compress(data, level)
+    elif codec == CODEC_LZMA:
+        compressed = lzma.compress(data, preset=level)
+    else:
+        if _zstd is None:
+            raise PayloadCodecUnavailableError("zstd payload codec is not available (zstandard is not installed)")
+        compressed = _zstd.ZstdCompressor(level=level).compress(data)
+    return _CODEC_MARKERS[codec] + base64.b64encode(compressed).decode("ascii")
+
+
+def decode_payload(encoded: str) -> bytes:
+    """Decode a payload of any format version (see encode_payload).
+
+    Raises:
+        PayloadCodecUnavailableError: If the payload's codec is not installed.
+        ValueError: If decoding or decompression fails.
+    """
+    codec = payload_format(encoded)
+    if codec == CODEC_GZIP:
+        return decode_and_decompress(encoded)
+    if codec == CODEC_ZSTD and _zstd is None:
+        raise PayloadCodecUnavailableError("zstd payload codec is not available (zstandard is not installed)")
+    try:
+        compressed = base64.b64decode(encoded[_MARKER_LENGTH:].encode("ascii"))
+    except Exception as e:
+        raise ValueError(f"Base64 decode failed: {e}") from e
+    try:
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(compressed)
+        if codec == CODEC_LZMA:
+            return lzma.decompress(compressed)
+        return _zstd.ZstdDecompressor().decompress(compressed)
+    except (lzma.LZMAError, zlib.error) as e:
+        raise ValueError(f"Decompression failed: {e}") from e
+    except ValueError:
+        raise
+    except Exception as e:  # zstandard.ZstdError
+        raise ValueError(f"Decompression failed: {e}") from e
+
+
+def encode_payloads(items: Iterable[bytes], codec: Optional[str] = None, level: Optional[int] = None) -> List[str]:
+    """encode_payload for many payloads with one settings lookup (thread-safe, no Qt)."""
+    if codec is None:
+        codec, default_level = payload_codec()
+        if level is None:
+            level = default_level
+    return [encode_payload(data, codec, level) for data in items]
+
+
+def decode_payloads(encoded_items: Iterable[str]) -> List[Optional[bytes]]:
+    """decode_payload for many payloads; undecodable ones come back as None."""
+    results: List[Optional[bytes]] = []
+    for encoded in encoded_items:
+        try:
+            results.append(decode_payload(encoded))
+        except ValueError:
+            results.append(None)
+    return results
 
 
 def decode_and_decompress(encoded: str) -> bytes:
-    """Decode base64 and decompress gzip payload.
+    """Decode base64 and decompress a version 1 (gzip) payload.
 
     Args:
         encoded: Base64-encoded gzip payload (ascii string).
@@ -33,7 +213,7 @@ def decode_and_decompress(encoded: str) -> bytes:
 
 
 def compress_and_encode(data: bytes, compresslevel: int = 9) -> str:
-    """Compress with gzip and encode as base64.
+    """Compress with gzip and encode as base64 (version 1 format; see encode_payload).
 
     Args:
         data: Raw bytes to compress (e.g. UTF-8 text).
@@ -62,27 +242,28 @@ def decode_and_decompress_to_str(encoded: str, encoding: str = "utf-8") -> str:
     """Decode, decompress, and decode bytes to string.
 
     Args:
-        encoded: Base64-encoded gzip payload.
+        encoded: Payload of any format version.
         encoding: Text encoding (default utf-8).
 
     Returns:
         Decompressed text string.
 
     Raises:
+        PayloadCodecUnavailableError: If the payload's codec is not installed.
         ValueError: If decoding or decompression fails.
     """
-    return decode_and_decompress(encoded).decode(encoding)
+    return decode_payload(encoded).decode(encoding)
 
 
-def compress_and_encode_from_str(text: str, encoding: str = "utf-8", compresslevel: int = 9) -> str:
-    """Encode string to bytes, compress, and base64-encode.
+def compress_and_encode_from_str(text: str, encoding: str = "utf-8", compresslevel: Optional[int] = None) -> str:
+    """Encode string to bytes, compress with the configured codec, and base64-encode.
 
     Args:
         text: Text to store.
         encoding: Text encoding (default utf-8).
-        compresslevel: gzip compression level 1–9.
+        compresslevel: Compression level (default: configured level).
 
     Returns:
-        Base64-encoded gzip payload.
+        Marked payload text (see encode_payload).
     """
-    return compress_and_encode(text.encode(encoding), compresslevel=compresslevel)
+    return encode_payload(text.encode(encoding), level=compresslevel)
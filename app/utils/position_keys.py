@@ -0,0 +1,29 @@
+"""Position keys besides Zobrist hashes, used by the position search index."""
+
+import chess
+
+_WHITE_TO_MOVE_BIT = 1 << 128
+_MARKER_BIT = 1 << 129  # Keeps every key non-zero (0 means "no key" in the index)
+
+
+def pawn_structure_key(board: chess.Board) -> int:
+    """Exact key of a board's pawn placement plus side to move.
+
+    Positions with the same pawns on the same squares and the same side to move
+    share a key whatever the other pieces are. The key packs both pawn bitboards,
+    so unlike a hash it cannot collide.
+    """
+    white_pawns = board.pawns & board.occupied_co[chess.WHITE]
+    black_pawns = board.pawns & board.occupied_co[chess.BLACK]
+    key = white_pawns | (black_pawns << 64) | _MARKER_BIT
+    if board.turn == chess.WHITE:
+        key |= _WHITE_TO_MOVE_BIT
+    return key
+
+
+def pawn_structure_key_from_fen(fen: str) -> int:
+    """pawn_structure_key of a FEN (first line only); 0 if the FEN is invalid."""
+    try:
+        return pawn_structure_key(chess.Board(str(fen or "").strip().splitlines()[0].strip()))
+    except Exception:
+        return 0
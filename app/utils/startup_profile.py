@@ -0,0 +1,166 @@
+"""Opt-in startup timing: per-module import times and named startup phases.
+
+Enabled with ``--startup-profile`` on the command line or ``CARA_STARTUP_PROFILE=1``.
+When disabled every hook is a no-op, so call sites need no guards.
+"""
+
+from __future__ import annotations
+
+import importlib.machinery
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+STARTUP_PROFILE_FLAG = "--startup-profile"
+STARTUP_PROFILE_ENV = "CARA_STARTUP_PROFILE"
+
+# Loaders whose exec_module runs per module instance (builtin/frozen importers are shared classes).
+_TIMED_LOADER_TYPES = (
+    importlib.machinery.SourceFileLoader,
+    importlib.machinery.SourcelessFileLoader,
+    importlib.machinery.ExtensionFileLoader,
+)
+
+
+class _ImportTimer:
+    """sys.meta_path finder that times module execution without changing how modules resolve."""
+
+    def __init__(self, profile: "StartupProfile") -> None:
+        self._profile = profile
+        self._local = threading.local()
+
+    def find_spec(
+        self, fullname: str, path: Any, target: Any = None
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        local = self._local
+        if getattr(local, "resolving", False):
+            return None
+        local.resolving = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            local.resolving = False
+        if spec is not None and isinstance(spec.loader, _TIMED_LOADER_TYPES):
+            self._wrap(spec.loader, fullname)
+        return spec
+
+    def _wrap(self, loader: Any, fullname: str) -> None:
+        exec_module = loader.exec_module
+        profile = self._profile
+        local = self._local
+
+        def timed_exec_module(module: ModuleType) -> None:
+            stack: List[float] = local.__dict__.setdefault("child_time", [])
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                profile.record_import(fullname, elapsed, elapsed - children)
+
+        loader.exec_module = timed_exec_module
+
+
+class StartupProfile:
+    """Collects startup timings; a disabled profile ignores every call."""
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        # module -> (inclusive seconds, self seconds)
+        self._imports: Dict[str, Tuple[float, float]] = {}
+        # (phase name, start offset, seconds, thread name), in completion order
+        self._phases: List[Tuple[str, float, float, str]] = []
+        self._import_timer: Optional[_ImportTimer] = None
+
+    @classmethod
+    def from_environment(cls, argv: Optional[List[str]] = None) -> "StartupProfile":
+        """Build a profile enabled by the command-line flag (removed from argv) or env var."""
+        argv = sys.argv if argv is None else argv
+        enabled = STARTUP_PROFILE_FLAG in argv
+        if enabled:
+            argv[:] = [arg for arg in argv if arg != STARTUP_PROFILE_FLAG]
+        env = (os.environ.get(STARTUP_PROFILE_ENV) or "").strip().lower()
+        return cls(enabled or env in {"1", "true", "yes"})
+
+    def install_import_hook(self) -> None:
+        """Start timing module imports (modules already imported are not counted)."""
+        if not self.enabled or self._import_timer is not None:
+            return
+        self._import_timer = _ImportTimer(self)
+        sys.meta_path.insert(0, self._import_timer)
+
+    def remove_import_hook(self) -> None:
+        """Stop timing imports."""
+        if self._import_timer is not None:
+            try:
+                sys.meta_path.remove(self._import_timer)
+            except ValueError:
+                pass
+            self._import_timer = None
+
+    def record_import(self, module: str, inclusive: float, own: float) -> None:
+        with self._lock:
+            self._imports[module] = (inclusive, own)
+
+    def record_phase(self, name: str, start: float, seconds: float) -> None:
+        """Record a phase that started at ``start`` (time.perf_counter) and took ``seconds``."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._phases.append((name, start - self._origin, seconds, threading.current_thread().name))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a named startup phase."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, start, time.perf_counter() - start)
+
+    def report(self, top_imports: int = 25) -> str:
+        """Human-readable summary: phases in completion order, then the slowest imports."""
+        with self._lock:
+            phases = list(self._phases)
+            imports = sorted(self._imports.items(), key=lambda item: item[1][0], reverse=True)
+        lines = [f"Startup profile (total {time.perf_counter() - self._origin:.3f}s)"]
+        lines.append("Phases (start offset, duration, thread):")
+        for name, offset, seconds, thread_name in phases:
+            lines.append(f"  {offset:8.3f}s  {seconds * 1000:9.1f} ms  {name} [{thread_name}]")
+        lines.append(f"Imports (top {top_imports} by cumulative time; self time in parentheses):")
+        for module, (inclusive, own) in imports[:top_imports]:
+            lines.append(f"  {inclusive * 1000:9.1f} ms ({own * 1000:7.1f} ms)  {module}")
+        return "\n".join(lines)
+
+
+_profile = StartupProfile(False)
+
+
+def get_startup_profile() -> StartupProfile:
+    """Return the process-wide startup profile (disabled unless set_startup_profile enabled one)."""
+    return _profile
+
+
+def set_startup_profile(profile: StartupProfile) -> None:
+    """Install the process-wide startup profile (done once by the entry point)."""
+    global _profile
+    _profile = profile
@@ -6,10 +6,19 @@ from PyQt6.QtCore import Qt, QPoint
 from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING, Callable, Sequence
 
 from app.services.pgn_formatter_service import (
-    PgnFormatterService,
     PgnRangeMap,
     build_pgn_range_map_from_fragments,
     clean_pgn_text,
+    comment_href,
+    path_comment_href,
+)
+from app.services.pgn_display_render import (
+    COMMENT_FRAGMENT_HREF,
+    PgnDisplayOptions,
+    PgnDisplayRender,
+    PgnDisplayRenderCache,
+    find_comment_edit,
+    render_comment_fragment,
 )
 from app.models.game_model import GameModel
 from app.utils.font_utils import resolve_font_family, scale_font_size
@@ -297,6 +306,8 @@ class DetailPgnView(QWidget):
         self._current_formatted_html: str = ""  # Store formatted HTML (debug / re-display)
         self._move_info: List[Tuple[str, int, bool]] = []  # List of (move_san, move_number, is_white) tuples for each ply
         self._range_map: PgnRangeMap = PgnRangeMap()  # Move/comment ranges from rendered anchors
+        self._render_cache = PgnDisplayRenderCache(config)  # Recent renders per (text, display options)
+        self._current_render_options: Optional[PgnDisplayOptions] = None  # Options of the displayed render
         self._active_move_ply: int = 0  # Current active move ply (0 = starting position)
         self._active_path: Path = ()
         self._show_metadata: bool = True  # Whether to show metadata tags in PGN view
@@ -434,48 +445,28 @@ class DetailPgnView(QWidget):
         # Store plain text
         self._current_pgn_text = text
         
-        # Extract move info from ORIGINAL (unfiltered) PGN text
-        # This ensures move extraction works correctly even when filtering is applied
-        # Filtering can break PGN structure, making move extraction fail
-        original_move_info = []
-        if text:
-            try:
-                _, original_move_info = PgnFormatterService.format_pgn_to_html(
-                    text, 
-                    self.config, 
-                    0  # Don't highlight in HTML formatting
-                )
-            except Exception:
-                # If extraction fails, use empty list
-                original_move_info = []
+        # Move info comes from the unfiltered text, HTML from the filtered text; both are
+        # cached per (text, visibility flags, notation settings) so toggles and revisits are lookups.
+        options = self._display_options()
+        try:
+            render = self._render_cache.get(text, options)
+        except Exception:
+            render = PgnDisplayRender(html="", move_info=[])
+        self._current_render_options = options
         
-        # Filter PGN text based on visibility flags (for display only)
-        # Use service to filter PGN text
-        pgn_text_to_format = PgnFormatterService.filter_pgn_for_display(
-            text,
-            show_metadata=self._show_metadata,
-            show_comments=self._show_comments,
-            show_variations=self._show_variations,
-            show_annotations=self._show_annotations,
-            show_results=self._show_results,
-            show_non_standard_tags=self._show_non_standard_tags
-        )
-        
-        # Format and display filtered PGN
-        if pgn_text_to_format:
-            formatted_html, _ = PgnFormatterService.format_pgn_to_html(
-                pgn_text_to_format, 
-                self.config, 
-                0,  # Don't highlight in HTML formatting
-                pgn_notation_settings=self._pgn_notation_settings,  # Pass user settings
-                indent_variations=self._indent_variations,
-            )
-            self.pgn_text.setHtml(formatted_html)
-            # Store formatted HTML and move info; range map is built once from clean HTML
-            # (ExtraSelections highlight does not mutate document formats).
-            self._current_formatted_html = formatted_html
-            self._move_info = original_move_info
-            self._range_map = _range_map_from_document(self.pgn_text.document())
+        if render.html:
+            if render.html != self._current_formatted_html:
+                self.pgn_text.setHtml(render.html)
+                # Range map is built once per HTML from the clean document
+                # (ExtraSelections highlight does not mutate document formats).
+                if render.range_map is None:
+                    render.range_map = _range_map_from_document(self.pgn_text.document())
+            elif render.range_map is None:
+                # Same HTML already displayed (e.g. an edit to a hidden header)
+                render.range_map = self._range_map
+            self._current_formatted_html = render.html
+            self._move_info = render.move_info
+            self._range_map = render.range_map
             self.pgn_text.setExtraSelections([])
 
             # Re-apply highlighting for current active move after HTML is laid out
@@ -488,6 +479,19 @@ class DetailPgnView(QWidget):
             self._move_info = []
             self._range_map = PgnRangeMap()
     
+    def _display_options(self) -> PgnDisplayOptions:
+        """Current visibility flags and notation settings as a render cache key."""
+        return PgnDisplayOptions(
+            show_metadata=self._show_metadata,
+            show_comments=self._show_comments,
+            show_variations=self._show_variations,
+            show_annotations=self._show_annotations,
+            show_results=self._show_results,
+            show_non_standard_tags=self._show_non_standard_tags,
+            indent_variations=self._indent_variations,
+            notation=PgnDisplayOptions.notation_key(self._pgn_notation_settings),
+        )
+    
     def set_show_metadata(self, show: bool) -> None:
         """Set whether to show metadata tags in PGN view.
         
@@ -749,12 +753,77 @@ class DetailPgnView(QWidget):
             # Note: set_pgn_text already calls _highlight_active_move via QTimer,
             # but we add an additional call with longer delay to ensure it works
             # after permanent PGN modifications that might change the structure
-            self.set_pgn_text(self._game_model.active_game.pgn)
+            new_text = self._game_model.active_game.pgn
+            # A single edited comment is patched in place (no re-format, no full re-layout)
+            if self._apply_comment_edit(new_text):
+                self._highlight_active_move()
+                return
+            self.set_pgn_text(new_text)
             # Re-apply highlighting for the current active move after a longer delay
             # This ensures the HTML is fully rendered and move extraction completed
             from PyQt6.QtCore import QTimer
             QTimer.singleShot(100, lambda: self._highlight_active_move())
     
+    def _apply_comment_edit(self, new_text: str) -> bool:
+        """Patch the displayed document if ``new_text`` only changes one existing comment.
+
+        The comment's anchor range is replaced with the formatter's fragment for the new
+        text, the range map is shifted, and the result is cached like a full render.
+        Returns False (nothing changed) whenever the edit is not such a case.
+        """
+        options = self._display_options()
+        old_text = self._current_pgn_text
+        if not self._current_formatted_html or options != self._current_render_options:
+            return False
+        edit = find_comment_edit(old_text, new_text)
+        if edit is None:
+            return False
+        range_map = self._range_map
+        patched_html = self._current_formatted_html
+        if options.show_comments:
+            anchors = sorted(
+                [(item.start, item.end, comment_href(item.ply)) for item in range_map.comments]
+                + [(item.start, item.end, path_comment_href(item.path)) for item in range_map.path_comments]
+            )
+            # Every comment must be displayed as an anchor, in text order
+            if len(anchors) != edit.comment_count:
+                return False
+            start, end, href = anchors[edit.index]
+            old_fragment = render_comment_fragment(edit.old_comment, self.config, options)
+            new_fragment = render_comment_fragment(edit.new_comment, self.config, options)
+            if old_fragment is None or new_fragment is None:
+                return False
+            element_start = patched_html.find(f'<a href="{href}"')
+            if element_start == -1 or patched_html.find(f'<a href="{href}"', element_start + 1) != -1:
+                return False
+            element_end = patched_html.find("</a>", element_start)
+            if element_end == -1:
+                return False
+            new_element = new_fragment.html.replace(f'href="{COMMENT_FRAGMENT_HREF}"', f'href="{href}"', 1)
+            cursor = QTextCursor(self.pgn_text.document())
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+            if cursor.selectedText() != old_fragment.text:
+                return False
+            cursor.insertHtml(new_element)
+            new_end = start + len(new_fragment.text)
+            cursor.setPosition(start)
+            cursor.setPosition(new_end, QTextCursor.MoveMode.KeepAnchor)
+            if cursor.selectedText() != new_fragment.text:
+                # Document no longer matches any render; force a full one
+                self._current_formatted_html = ""
+                return False
+            patched_html = (
+                patched_html[:element_start] + new_element + patched_html[element_end + len("</a>"):]
+            )
+            range_map = range_map.with_range_resized(start, end, new_end)
+        render = PgnDisplayRender(html=patched_html, move_info=self._move_info, range_map=range_map)
+        self._render_cache.put(new_text, options, render)
+        self._current_pgn_text = new_text
+        self._current_formatted_html = patched_html
+        self._range_map = range_map
+        return True
+    
     def get_debug_info(self) -> tuple[str, dict]:
         """Get debug information about current HTML and visibility settings.
         
@@ -26,6 +26,7 @@ from app.models.search_criteria import SearchCriteria, SearchField, SearchOperat
 from app.models.database_model import DatabaseModel
 
 from app.services.game_tags_service import GameTagsService
+from app.services.position_sequence_search import PositionSequence
 from app.utils.font_utils import resolve_font_family, scale_font_size
 from app.utils.themed_icon import themed_icon_from_svg, SVG_MENU_TRASH
 
@@ -390,6 +391,8 @@ class CriteriaRowWidget(QWidget):
             "Event", "Site", "ECO", "TimeControl", "TC Type", "Analyzed", "Annotated", "Game tags", "Custom PGN header tag",
             "Position",
             "Position (fuzzy)",
+            "Pawn structure",
+            "Position sequence",
         ])
         self.field_combo.setFixedWidth(140)
         self.field_combo.currentTextChanged.connect(self._on_field_changed)
@@ -416,6 +419,13 @@ class CriteriaRowWidget(QWidget):
         self.position_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         layout.addWidget(self.position_input)
 
+        # Ply limit of a position sequence (hidden by default; value_input holds "within N plies")
+        self.max_ply_input = QLineEdit()
+        self.max_ply_input.setPlaceholderText("By ply (optional)")
+        self.max_ply_input.setFixedWidth(120)
+        self.max_ply_input.setVisible(False)
+        layout.addWidget(self.max_ply_input)
+
         # Game tags picker (hidden by default; used when field == "Game tags")
         self._selected_tags: List[str] = []
         self.tags_picker_btn = QPushButton("Select game tags…")
@@ -454,6 +464,8 @@ class CriteriaRowWidget(QWidget):
                 self._tags_popup.close()
         except Exception:
             pass
+
+        self.max_ply_input.setVisible(field_text == "Position sequence")
         
         if field_text in ["Analyzed", "Annotated"]:
             self.operator_combo.addItems(["is", "is not"])
@@ -514,14 +526,27 @@ class CriteriaRowWidget(QWidget):
             self.tags_picker_btn.setVisible(False)
             self.custom_tag_input.setVisible(False)
             self.position_input.setVisible(True)
+            self.position_input.setPlaceholderText("FEN… or (Current Position)")
             # Default: use current position token (user can override by typing a FEN).
             self.position_input.setText("(Current Position)")
-        elif field_text == "Position (fuzzy)":
+        elif field_text in ("Position (fuzzy)", "Pawn structure"):
             self.operator_combo.addItems(["equals", "not equals"])
             self.value_input.setVisible(False)
             self.tags_picker_btn.setVisible(False)
             self.custom_tag_input.setVisible(False)
             self.position_input.setVisible(True)
+            self.position_input.setPlaceholderText("FEN… or (Current Position)")
+            self.position_input.setText("(Current Position)")
+        elif field_text == "Position sequence":
+            self.operator_combo.addItems(["equals", "not equals"])
+            self.value_input.setVisible(True)
+            self.value_input.setEnabled(True)
+            self.value_input.clear()
+            self.value_input.setPlaceholderText("Within N plies (optional)")
+            self.tags_picker_btn.setVisible(False)
+            self.custom_tag_input.setVisible(False)
+            self.position_input.setVisible(True)
+            self.position_input.setPlaceholderText("FEN; FEN; … (positions in order)")
             self.position_input.setText("(Current Position)")
         else:
             # Text fields
@@ -617,7 +642,7 @@ class CriteriaRowWidget(QWidget):
         focus_border_color = [self.input_focus_border_color.red(), self.input_focus_border_color.green(), self.input_focus_border_color.blue()]
         
         StyleManager.style_line_edits(
-            [self.value_input, self.custom_tag_input, self.position_input],
+            [self.value_input, self.custom_tag_input, self.position_input, self.max_ply_input],
             self.config,
             font_family=self.input_font_family,  # Match original dialog font
             font_size=self.input_font_size,  # Match original dialog font size
@@ -687,6 +712,8 @@ class CriteriaRowWidget(QWidget):
             "Custom PGN header tag": SearchField.CUSTOM_TAG,
             "Position": SearchField.POSITION,
             "Position (fuzzy)": SearchField.POSITION_FUZZY,
+            "Pawn structure": SearchField.PAWN_STRUCTURE,
+            "Position sequence": SearchField.POSITION_SEQUENCE,
         }
         field = field_map.get(field_text)
         if field is None:
@@ -734,43 +761,36 @@ class CriteriaRowWidget(QWidget):
             value = True  # Value doesn't matter for boolean
         elif operator in [SearchOperator.IS_EMPTY, SearchOperator.IS_NOT_EMPTY]:
             value = None
-        elif field in (SearchField.POSITION, SearchField.POSITION_FUZZY):
+        elif field in (SearchField.POSITION, SearchField.POSITION_FUZZY, SearchField.PAWN_STRUCTURE):
             # Store resolved FEN (str) in value; hash is computed during search execution.
-            try:
-                import chess
-                raw = str(fen_text or "").strip()
-                raw_cf = raw.casefold()
-
-                # Resolve "(Current Position)" (and variants) via live provider.
-                wants_current = (not raw) or ("current position" in raw_cf) or ("current_position" in raw_cf)
-                if wants_current:
-                    cleaned = ""
-                    if callable(self._current_fen_provider):
-                        try:
-                            cleaned = str(self._current_fen_provider() or "").strip()
-                        except Exception:
-                            cleaned = ""
-                    if not cleaned:
-                        # No live current position available -> invalid criterion
-                        self._last_validation_error = "Position search failed: current position FEN could not be resolved."
-                        return None
-                    # Be defensive: FEN must be a single line.
-                    cleaned = cleaned.splitlines()[0].strip()
-                else:
-                    # Allow a UI suffix without breaking parsing.
-                    cleaned = raw.replace("(Current position)", "").replace("(Current Position)", "").strip()
-                    cleaned = cleaned.splitlines()[0].strip()
-                # Validate FEN eagerly so the dialog can show helpful errors.
-                chess.Board(cleaned)
-                value = cleaned
-            except Exception as e:
-                try:
-                    cleaned_dbg = str(locals().get("cleaned", "") or "").strip()
-                except Exception:
-                    cleaned_dbg = ""
-                snippet = cleaned_dbg[:120] + ("…" if len(cleaned_dbg) > 120 else "")
-                self._last_validation_error = f"Position search failed: invalid FEN ('{snippet}'). {type(e).__name__}: {e}"
+            value = self._resolve_position_fen(fen_text)
+            if value is None:
+                return None
+        elif field == SearchField.POSITION_SEQUENCE:
+            fens = []
+            for part in str(fen_text or "").split(";"):
+                if not part.strip():
+                    continue
+                cleaned = self._resolve_position_fen(part)
+                if cleaned is None:
+                    return None
+                fens.append(cleaned)
+            if not fens:
+                self._last_validation_error = "Position sequence search failed: enter at least one FEN."
                 return None
+            limits = []
+            for text in (value_text, self.max_ply_input.text().strip()):
+                try:
+                    limit = int(text) if text else None
+                except ValueError:
+                    limit = 0
+                if limit is not None and limit < 1:
+                    self._last_validation_error = (
+                        f"Position sequence search failed: ply limit '{text}' is not a positive whole number."
+                    )
+                    return None
+                limits.append(limit)
+            value = PositionSequence(tuple(fens), within=limits[0], max_ply=limits[1])
         elif field == SearchField.TAGS:
             value = list(self._selected_tags)
             if not value:
@@ -795,6 +815,48 @@ class CriteriaRowWidget(QWidget):
             custom_tag_name=custom_tag if field == SearchField.CUSTOM_TAG else None
         )
 
+    def _resolve_position_fen(self, fen_text: str) -> Optional[str]:
+        """FEN typed in the position input, with "(Current Position)" resolved.
+
+        Returns:
+            The validated FEN, or None (with _last_validation_error set) if it is invalid.
+        """
+        try:
+            import chess
+            raw = str(fen_text or "").strip()
+            raw_cf = raw.casefold()
+
+            # Resolve "(Current Position)" (and variants) via live provider.
+            wants_current = (not raw) or ("current position" in raw_cf) or ("current_position" in raw_cf)
+            if wants_current:
+                cleaned = ""
+                if callable(self._current_fen_provider):
+                    try:
+                        cleaned = str(self._current_fen_provider() or "").strip()
+                    except Exception:
+                        cleaned = ""
+                if not cleaned:
+                    # No live current position available -> invalid criterion
+                    self._last_validation_error = "Position search failed: current position FEN could not be resolved."
+                    return None
+                # Be defensive: FEN must be a single line.
+                cleaned = cleaned.splitlines()[0].strip()
+            else:
+                # Allow a UI suffix without breaking parsing.
+                cleaned = raw.replace("(Current position)", "").replace("(Current Position)", "").strip()
+                cleaned = cleaned.splitlines()[0].strip()
+            # Validate FEN eagerly so the dialog can show helpful errors.
+            chess.Board(cleaned)
+            return cleaned
+        except Exception as e:
+            try:
+                cleaned_dbg = str(locals().get("cleaned", "") or "").strip()
+            except Exception:
+                cleaned_dbg = ""
+            snippet = cleaned_dbg[:120] + ("…" if len(cleaned_dbg) > 120 else "")
+            self._last_validation_error = f"Position search failed: invalid FEN ('{snippet}'). {type(e).__name__}: {e}"
+            return None
+
     def get_last_validation_error(self) -> str:
         return str(getattr(self, "_last_validation_error", "") or "")
 
@@ -835,6 +897,8 @@ class CriteriaRowWidget(QWidget):
             SearchField.CUSTOM_TAG: "Custom PGN header tag",
             SearchField.POSITION: "Position",
             SearchField.POSITION_FUZZY: "Position (fuzzy)",
+            SearchField.PAWN_STRUCTURE: "Pawn structure",
+            SearchField.POSITION_SEQUENCE: "Position sequence",
         }
         field_text = field_map.get(criterion.field)
         if field_text:
@@ -876,12 +940,17 @@ class CriteriaRowWidget(QWidget):
                 if criterion.field == SearchField.TAGS and isinstance(criterion.value, list):
                     self._selected_tags = [str(x) for x in criterion.value if str(x).strip()]
                     self._sync_tags_picker_label()
-                elif criterion.field == SearchField.POSITION:
+                elif criterion.field in (SearchField.POSITION, SearchField.POSITION_FUZZY, SearchField.PAWN_STRUCTURE):
                     # Handle legacy saved queries where value was a zobrist int.
                     if isinstance(criterion.value, int):
                         self.position_input.setText("(Current Position)")
                     else:
                         self.position_input.setText(str(criterion.value))
+                elif isinstance(criterion.value, PositionSequence):
+                    self.position_input.setText("; ".join(criterion.value.fens))
+                    within, max_ply = criterion.value.within, criterion.value.max_ply
+                    self.value_input.setText(str(within) if within is not None else "")
+                    self.max_ply_input.setText(str(max_ply) if max_ply is not None else "")
                 else:
                     self.value_input.setText(str(criterion.value))
         
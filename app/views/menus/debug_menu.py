@@ -43,6 +43,20 @@ def setup_debug_menu(mw, menu_bar: QMenuBar) -> None:
     )
     debug_menu.addAction(debug_scan_highlight_rules_action)
 
+    mw.debug_rule_profiling_action = QAction("Profile Highlight/Heatmap Rules", mw)
+    mw.debug_rule_profiling_action.setCheckable(True)
+    mw.debug_rule_profiling_action.setChecked(False)
+    mw.debug_rule_profiling_action.triggered.connect(mw._debug_toggle_rule_profiling)
+    debug_menu.addAction(mw.debug_rule_profiling_action)
+
+    debug_copy_rule_profile_action = QAction("Copy Rule Profile Report", mw)
+    debug_copy_rule_profile_action.triggered.connect(mw._debug_copy_rule_profile_report)
+    debug_menu.addAction(debug_copy_rule_profile_action)
+
+    debug_reset_rule_profile_action = QAction("Reset Rule Profile", mw)
+    debug_reset_rule_profile_action.triggered.connect(mw._debug_reset_rule_profile)
+    debug_menu.addAction(debug_reset_rule_profile_action)
+
     debug_menu.addSeparator()
 
     mw.debug_uci_lifecycle_action = QAction("Debug UCI Lifecycle", mw)
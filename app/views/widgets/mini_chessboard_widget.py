@@ -1,5 +1,6 @@
 """Mini chessboard widget for displaying positions in popups."""
 
+from dataclasses import dataclass
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QPolygonF, QMouseEvent
 from PyQt6.QtSvg import QSvgRenderer
@@ -12,6 +13,229 @@ from app.utils.path_resolver import get_app_resource_path
 # Shared across all mini boards: piece-set directory -> SVG renderers.
 _SVG_RENDERER_CACHE: Dict[str, Dict[Tuple[str, str], QSvgRenderer]] = {}
 
+PIECE_TYPES = ('p', 'r', 'n', 'b', 'q', 'k')
+PIECE_COLORS = ('w', 'b')
+
+
+@dataclass(frozen=True)
+class MiniBoardStyle:
+    """Resolved mini-board look (main-board colors/pieces, ui.styles.mini_board border/size).
+
+    Hashable, so it can key caches of rendered boards.
+    """
+
+    light_square_color: Tuple[int, int, int]
+    dark_square_color: Tuple[int, int, int]
+    svg_path: str
+    piece_padding_ratio: float
+    border_size: int
+    border_color: Tuple[int, int, int]
+    arrow_color: Tuple[int, int, int]
+    size: int  # Default base board size in pixels
+
+    @classmethod
+    def from_config(
+        cls, config: Dict[str, Any], mini_board_config: Optional[Dict[str, Any]] = None
+    ) -> "MiniBoardStyle":
+        ui_config = config.get('ui', {})
+        board_config = ui_config.get('panels', {}).get('main', {}).get('board', {})
+
+        # Square colors and pieces (main board)
+        squares_config = board_config.get('squares', {})
+        pieces_config = board_config.get('pieces', {})
+
+        # Shared miniature-board style (ui.styles.mini_board); callers may override.
+        if mini_board_config is None:
+            mini_board_config = ui_config.get('styles', {}).get('mini_board', {})
+        if not isinstance(mini_board_config, dict):
+            mini_board_config = {}
+
+        # Border: shared mini-board style, then main-board fallbacks.
+        border_config = board_config.get('border', {})
+        border_size = border_config.get('size', 2)
+        border_color = border_config.get('color', [60, 60, 65])
+        mini_border = mini_board_config.get('border', {})
+        if isinstance(mini_border, dict):
+            if 'size' in mini_border:
+                border_size = int(mini_border['size'])
+            if 'color' in mini_border:
+                border_color = mini_border['color']
+
+        # Best next move arrow color (same as main board)
+        arrow_config = board_config.get('bestnextmove_arrow', {})
+        return cls(
+            light_square_color=tuple(squares_config.get('light_color', [240, 217, 181])),
+            dark_square_color=tuple(squares_config.get('dark_color', [181, 136, 99])),
+            svg_path=pieces_config.get('svg_path', 'app/resources/chesspieces/default'),
+            piece_padding_ratio=max(0.0, min(0.5, float(pieces_config.get('padding_ratio', 0.1)))),
+            border_size=border_size,
+            border_color=tuple(border_color),
+            arrow_color=tuple(arrow_config.get('color', [0, 0, 255])),
+            size=int(mini_board_config.get('size', 160)),
+        )
+
+
+def board_square_size(base_size: int, scale_factor: float = 1.0) -> int:
+    """Integer square size for a board of ``base_size`` pixels (board divisible by 8 avoids seams)."""
+    scaled = max(8, int(round(base_size * float(scale_factor))))
+    return max(1, scaled // 8)
+
+
+def piece_svg_renderers(svg_path: str) -> Dict[Tuple[str, str], QSvgRenderer]:
+    """Shared (GUI-thread) SVG renderers of a piece set, keyed by (color, piece type)."""
+    pieces_dir = get_app_resource_path(svg_path)
+
+    if not pieces_dir.exists():
+        logging_service = LoggingService.get_instance()
+        logging_service.warning(f"Chess pieces directory not found: {pieces_dir}")
+        return {}
+
+    cache_key = str(pieces_dir.resolve())
+    cached = _SVG_RENDERER_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    renderers: Dict[Tuple[str, str], QSvgRenderer] = {}
+
+    for color in PIECE_COLORS:
+        for piece_type in PIECE_TYPES:
+            filename = f"{color}{piece_type}.svg"
+            file_path = pieces_dir / filename
+
+            if file_path.exists():
+                renderer = QSvgRenderer(str(file_path))
+                if renderer.isValid():
+                    renderers[(color, piece_type)] = renderer
+                else:
+                    logging_service = LoggingService.get_instance()
+                    logging_service.warning(f"Invalid SVG file: {file_path}")
+
+    _SVG_RENDERER_CACHE[cache_key] = renderers
+    return renderers
+
+
+def paint_board_squares(
+    painter: QPainter,
+    board_start_x: float,
+    board_start_y: float,
+    square_size: int,
+    light_square_color: Tuple[int, int, int],
+    dark_square_color: Tuple[int, int, int],
+) -> None:
+    """Fill the 64 squares (row 0 at the top, a8 light)."""
+    light_color = QColor(light_square_color[0], light_square_color[1], light_square_color[2])
+    dark_color = QColor(dark_square_color[0], dark_square_color[1], dark_square_color[2])
+
+    for row in range(8):
+        for col in range(8):
+            is_light = (row + col) % 2 == 0
+            square_color = light_color if is_light else dark_color
+
+            square_x = board_start_x + col * square_size
+            square_y = board_start_y + row * square_size
+
+            square_rect = QRect(int(square_x), int(square_y), int(square_size), int(square_size))
+            painter.fillRect(square_rect, QBrush(square_color))
+
+
+def paint_move_arrow(
+    painter: QPainter,
+    move: chess.Move,
+    color: Tuple[int, int, int],
+    board_start_x: float,
+    board_start_y: float,
+    square_size: int,
+    is_flipped: bool = False,
+) -> None:
+    """Draw an arrow for a chess move.
+
+    Args:
+        painter: QPainter instance for drawing.
+        move: Chess move to draw arrow for.
+        color: RGB color [r, g, b] for the arrow.
+        board_start_x: X coordinate of the board's top-left corner.
+        board_start_y: Y coordinate of the board's top-left corner.
+        square_size: Square size in pixels.
+        is_flipped: Whether the board is drawn from Black's side.
+    """
+    if move is None:
+        return
+
+    # Get move squares
+    from_square = move.from_square
+    to_square = move.to_square
+
+    # Convert square indices to file and rank
+    from_file = chess.square_file(from_square)
+    from_rank = chess.square_rank(from_square)
+    to_file = chess.square_file(to_square)
+    to_rank = chess.square_rank(to_square)
+
+    # Adjust for flipped board
+    if is_flipped:
+        from_file = 7 - from_file
+        from_rank = 7 - from_rank
+        to_file = 7 - to_file
+        to_rank = 7 - to_rank
+
+    # CRITICAL: In python-chess, ranks are 0-based from bottom (0=rank1, 7=rank8)
+    # But in our drawing system, row 0 is at the top (rank 8), row 7 is at the bottom (rank 1)
+    # So we need to convert: visual_row = 7 - rank
+    from_visual_rank = 7 - from_rank
+    to_visual_rank = 7 - to_rank
+
+    # Calculate square centers
+    from_x = board_start_x + from_file * square_size + square_size / 2
+    from_y = board_start_y + from_visual_rank * square_size + square_size / 2
+    to_x = board_start_x + to_file * square_size + square_size / 2
+    to_y = board_start_y + to_visual_rank * square_size + square_size / 2
+
+    # Set up pen for arrow — width scales with square size so supersampled
+    # PDF renders (and scaled UI boards) keep a readable stroke weight.
+    arrow_color = QColor(color[0], color[1], color[2])
+    line_width = max(2.5, float(square_size) * 0.16)
+    pen = QPen(arrow_color)
+    pen.setWidthF(line_width)
+    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+    pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+    painter.setPen(pen)
+    painter.setBrush(QBrush(arrow_color))
+
+    # Draw arrow line from source to destination
+    # Shorten the line to leave space for arrowhead
+    arrowhead_size = square_size * 0.22
+    dx = to_x - from_x
+    dy = to_y - from_y
+    length = (dx * dx + dy * dy) ** 0.5
+    if length > 0:
+        # Normalize direction
+        unit_x = dx / length
+        unit_y = dy / length
+
+        # Shorten line to make room for arrowhead
+        shortened_to_x = to_x - unit_x * arrowhead_size
+        shortened_to_y = to_y - unit_y * arrowhead_size
+
+        # Draw line
+        painter.drawLine(
+            QPointF(from_x, from_y),
+            QPointF(shortened_to_x, shortened_to_y),
+        )
+
+        # Draw arrowhead (triangle pointing to destination)
+        arrowhead_points = QPolygonF([
+            QPointF(to_x, to_y),
+            QPointF(
+                shortened_to_x - unit_y * arrowhead_size * 0.55,
+                shortened_to_y + unit_x * arrowhead_size * 0.55
+            ),
+            QPointF(
+                shortened_to_x + unit_y * arrowhead_size * 0.55,
+                shortened_to_y - unit_x * arrowhead_size * 0.55
+            )
+        ])
+        painter.drawPolygon(arrowhead_points)
+
 
 class MiniChessBoardWidget(QWidget):
     """Mini chessboard widget displaying pieces (popup or embedded), following main-board style."""
@@ -70,52 +294,21 @@ class MiniChessBoardWidget(QWidget):
     
     def _load_config(self) -> None:
         """Load configuration for the mini chessboard."""
-        ui_config = self.config.get('ui', {})
-        panel_config = ui_config.get('panels', {}).get('main', {})
-        board_config = panel_config.get('board', {})
-        
-        # Square colors (main board)
-        squares_config = board_config.get('squares', {})
-        self.light_square_color = squares_config.get('light_color', [240, 217, 181])
-        self.dark_square_color = squares_config.get('dark_color', [181, 136, 99])
-        
-        # Pieces (main board)
-        pieces_config = board_config.get('pieces', {})
-        self.svg_path = pieces_config.get('svg_path', 'app/resources/chesspieces/default')
-        self.piece_padding_ratio = max(0.0, min(0.5, float(pieces_config.get('padding_ratio', 0.1))))
-        
-        # Shared miniature-board style (ui.styles.mini_board); callers may override.
-        if self._mini_board_config_override is not None:
-            mini_board_config = self._mini_board_config_override
-        else:
-            mini_board_config = ui_config.get('styles', {}).get('mini_board', {})
-        if not isinstance(mini_board_config, dict):
-            mini_board_config = {}
-
-        # Border: shared mini-board style, then main-board fallbacks.
-        border_config = board_config.get('border', {})
-        self.border_size = border_config.get('size', 2)
-        self.border_color = border_config.get('color', [60, 60, 65])
-        mini_border = mini_board_config.get('border', {})
-        if isinstance(mini_border, dict):
-            if 'size' in mini_border:
-                self.border_size = int(mini_border['size'])
-            if 'color' in mini_border:
-                self.border_color = mini_border['color']
+        style = MiniBoardStyle.from_config(self.config, self._mini_board_config_override)
+        self.style = style
+        self.light_square_color = style.light_square_color
+        self.dark_square_color = style.dark_square_color
+        self.svg_path = style.svg_path
+        self.piece_padding_ratio = style.piece_padding_ratio
+        self.border_size = style.border_size
+        self.border_color = style.border_color
+        self.arrow_color = style.arrow_color
         
         # Size: keep an integer square size (board divisible by 8) to avoid aliasing seams.
-        if self._size_override is not None:
-            base_size = int(self._size_override)
-        else:
-            base_size = int(mini_board_config.get('size', 160))
-        scaled = max(8, int(round(base_size * float(self._scale_factor))))
-        self.square_size = max(1, scaled // 8)
+        base_size = int(self._size_override) if self._size_override is not None else style.size
+        self.square_size = board_square_size(base_size, self._scale_factor)
         self.board_size = self.square_size * 8
         
-        # Get best next move arrow color (same as main board)
-        bestnextmove_arrow_config = board_config.get('bestnextmove_arrow', {})
-        self.arrow_color = bestnextmove_arrow_config.get('color', [0, 0, 255])
-        
         # Calculate widget size (board + border)
         widget_size = self.board_size + self.border_size * 2
         self.setFixedSize(int(widget_size), int(widget_size))
@@ -144,39 +337,7 @@ class MiniChessBoardWidget(QWidget):
     
     def _load_pieces(self) -> None:
         """Load chess piece SVG files from the configured path (shared cache)."""
-        pieces_dir = get_app_resource_path(self.svg_path)
-
-        if not pieces_dir.exists():
-            logging_service = LoggingService.get_instance()
-            logging_service.warning(f"Chess pieces directory not found: {pieces_dir}")
-            self.piece_renderers = {}
-            return
-
-        cache_key = str(pieces_dir.resolve())
-        cached = _SVG_RENDERER_CACHE.get(cache_key)
-        if cached is not None:
-            self.piece_renderers = cached
-            return
-
-        piece_types = ['p', 'r', 'n', 'b', 'q', 'k']
-        colors = ['w', 'b']
-        renderers: Dict[Tuple[str, str], QSvgRenderer] = {}
-
-        for color in colors:
-            for piece_type in piece_types:
-                filename = f"{color}{piece_type}.svg"
-                file_path = pieces_dir / filename
-
-                if file_path.exists():
-                    renderer = QSvgRenderer(str(file_path))
-                    if renderer.isValid():
-                        renderers[(color, piece_type)] = renderer
-                    else:
-                        logging_service = LoggingService.get_instance()
-                        logging_service.warning(f"Invalid SVG file: {file_path}")
-
-        _SVG_RENDERER_CACHE[cache_key] = renderers
-        self.piece_renderers = renderers
+        self.piece_renderers = piece_svg_renderers(self.svg_path)
     
     def _load_position_from_fen(self, fen: str) -> None:
         """Load board position from FEN string.
@@ -269,19 +430,10 @@ class MiniChessBoardWidget(QWidget):
             painter.fillRect(border_rect, QBrush(border_color))
         
         # Draw squares
-        light_color = QColor(self.light_square_color[0], self.light_square_color[1], self.light_square_color[2])
-        dark_color = QColor(self.dark_square_color[0], self.dark_square_color[1], self.dark_square_color[2])
-        
-        for row in range(self.square_count):
-            for col in range(self.square_count):
-                is_light = (row + col) % 2 == 0
-                square_color = light_color if is_light else dark_color
-                
-                square_x = board_start_x + col * self.square_size
-                square_y = board_start_y + row * self.square_size
-                
-                square_rect = QRect(int(square_x), int(square_y), int(self.square_size), int(self.square_size))
-                painter.fillRect(square_rect, QBrush(square_color))
+        paint_board_squares(
+            painter, board_start_x, board_start_y, self.square_size,
+            self.light_square_color, self.dark_square_color,
+        )
         
         # Draw pieces
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
@@ -328,92 +480,10 @@ class MiniChessBoardWidget(QWidget):
                 renderer.render(painter, piece_rect)
     
     def _draw_arrow(self, painter: QPainter, move: chess.Move, color: List[int], board_start_x: float, board_start_y: float) -> None:
-        """Draw an arrow for a chess move.
-        
-        Args:
-            painter: QPainter instance for drawing.
-            move: Chess move to draw arrow for.
-            color: RGB color list [r, g, b] for the arrow.
-            board_start_x: X coordinate of the board's top-left corner.
-            board_start_y: Y coordinate of the board's top-left corner.
-        """
-        if move is None:
-            return
-        
-        # Get move squares
-        from_square = move.from_square
-        to_square = move.to_square
-        
-        # Convert square indices to file and rank
-        from_file = chess.square_file(from_square)
-        from_rank = chess.square_rank(from_square)
-        to_file = chess.square_file(to_square)
-        to_rank = chess.square_rank(to_square)
-        
-        # Adjust for flipped board
-        if self._is_flipped:
-            from_file = 7 - from_file
-            from_rank = 7 - from_rank
-            to_file = 7 - to_file
-            to_rank = 7 - to_rank
-        
-        # CRITICAL: In python-chess, ranks are 0-based from bottom (0=rank1, 7=rank8)
-        # But in our drawing system, row 0 is at the top (rank 8), row 7 is at the bottom (rank 1)
-        # So we need to convert: visual_row = 7 - rank
-        from_visual_rank = 7 - from_rank
-        to_visual_rank = 7 - to_rank
-        
-        # Calculate square centers
-        from_x = board_start_x + from_file * self.square_size + self.square_size / 2
-        from_y = board_start_y + from_visual_rank * self.square_size + self.square_size / 2
-        to_x = board_start_x + to_file * self.square_size + self.square_size / 2
-        to_y = board_start_y + to_visual_rank * self.square_size + self.square_size / 2
-        
-        # Set up pen for arrow — width scales with square size so supersampled
-        # PDF renders (and scaled UI boards) keep a readable stroke weight.
-        arrow_color = QColor(color[0], color[1], color[2])
-        line_width = max(2.5, float(self.square_size) * 0.16)
-        pen = QPen(arrow_color)
-        pen.setWidthF(line_width)
-        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-        pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-        painter.setPen(pen)
-        painter.setBrush(QBrush(arrow_color))
-        
-        # Draw arrow line from source to destination
-        # Shorten the line to leave space for arrowhead
-        arrowhead_size = self.square_size * 0.22
-        dx = to_x - from_x
-        dy = to_y - from_y
-        length = (dx * dx + dy * dy) ** 0.5
-        if length > 0:
-            # Normalize direction
-            unit_x = dx / length
-            unit_y = dy / length
-            
-            # Shorten line to make room for arrowhead
-            shortened_to_x = to_x - unit_x * arrowhead_size
-            shortened_to_y = to_y - unit_y * arrowhead_size
-            
-            # Draw line
-            painter.drawLine(
-                QPointF(from_x, from_y),
-                QPointF(shortened_to_x, shortened_to_y),
-            )
-            
-            # Draw arrowhead (triangle pointing to destination)
-            arrowhead_points = QPolygonF([
-                QPointF(to_x, to_y),
-                QPointF(
-                    shortened_to_x - unit_y * arrowhead_size * 0.55,
-                    shortened_to_y + unit_x * arrowhead_size * 0.55
-                ),
-                QPointF(
-                    shortened_to_x + unit_y * arrowhead_size * 0.55,
-                    shortened_to_y - unit_x * arrowhead_size * 0.55
-                )
-            ])
-            painter.drawPolygon(arrowhead_points)
+        """Draw an arrow for a chess move (see paint_move_arrow)."""
+        paint_move_arrow(
+            painter, move, color, board_start_x, board_start_y, self.square_size, self._is_flipped
+        )
     
     def set_move(self, move: Optional[chess.Move], show_arrow: bool) -> None:
         """Set the move to display with an arrow.
@@ -0,0 +1,19 @@
+"""Headless performance benchmarks for CARA.
+
+Usage (from the repository root)::
+
+    python -m benchmarks --sizes 10k --output results.json
+    python -m benchmarks --sizes 10k,100k --compare results.json --threshold 0.10
+    python -m benchmarks --only search,sort --sizes 100k
+
+Suites: parse (PgnService.parse_pgn_text), database_load (DatabaseModel batch
+add), search and position_search (DatabaseSearchService), sort
+(DatabaseModel.sort), player_stats (player game lookup and aggregation),
+navigation (GameController ply stepping) and cold_start (process start to the
+main window's first paint, measured in a subprocess). Qt runs offscreen.
+
+Corpora are synthetic and deterministic (see benchmarks.corpus) and cached in
+benchmarks/.corpus; the 1m corpus is several GB and is only built when asked
+for. The cold_start probe launches the app for real, so it reads and migrates
+user_settings.json like any launch.
+"""
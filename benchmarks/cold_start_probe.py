@@ -0,0 +1,64 @@
+"""Launch CARA headless and report the time from process spawn to the first main-window paint.
+
+Run by the cold_start benchmark as
+``python -m benchmarks.cold_start_probe <spawn_time> <data_dir>``, where spawn_time is
+the parent's time.time() just before starting this process and data_dir is a
+scratch directory holding copies of the user data files. Prints one line
+``first_paint_s=<seconds>`` and exits without running the close handlers. Startup
+itself behaves like a real launch (settings load and migrations included), but every
+data file the app writes (settings, logs, caches) goes to data_dir instead of the
+checkout.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.scratch_data import redirect_data_files
+
+
+def main() -> None:
+    spawn_time = float(sys.argv[1])
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    redirect_data_files(Path(sys.argv[2]))
+
+    import cara
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+    import app.main_window as main_window_module
+
+    class _FirstPaint(QObject):
+        def __init__(self, window) -> None:
+            super().__init__()
+            self._window = window
+            self._seen = False
+
+        def eventFilter(self, obj, event) -> bool:
+            if not self._seen and event.type() == QEvent.Type.Paint:
+                widget_window = obj.window() if hasattr(obj, "window") else None
+                if widget_window is self._window:
+                    self._seen = True
+                    # Report once the paint event has been delivered
+                    QTimer.singleShot(0, self._report)
+            return False
+
+        def _report(self) -> None:
+            print(f"first_paint_s={time.time() - spawn_time:.6f}", flush=True)
+            os._exit(0)
+
+    original_show = main_window_module.MainWindow.show
+
+    def show_and_watch(window) -> None:
+        watcher = _FirstPaint(window)
+        window._benchmark_first_paint = watcher
+        QApplication.instance().installEventFilter(watcher)
+        original_show(window)
+
+    main_window_module.MainWindow.show = show_and_watch
+    sys.argv = [sys.argv[0]]
+    cara.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Deterministic synthetic PGN corpora for the benchmark suite.
+
+A corpus of N games is built from a fixed pool of random legal games (the
+move text) combined with varied headers (players, ratings, dates, events,
+time controls). Games of the benchmark player carry a synthetic
+CARAAnalysisData payload so player-stats aggregation has work to do. The
+same seed always yields the same games (with the gzip tag codec, payload bytes
+differ by its timestamp), and generated corpora are cached on disk because the
+1M-game corpus takes minutes to write.
+"""
+
+from __future__ import annotations
+
+import io
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import chess
+import chess.pgn
+
+CORPUS_VERSION = 2
+DEFAULT_SEED = 20240601
+POOL_SIZE = 2000
+PLAYER_COUNT = 400
+# Player whose games carry analysis payloads (player-stats benchmark).
+BENCHMARK_PLAYER = "Bench Player 000"
+# Share of the benchmark player's games that are analyzed.
+ANALYZED_SHARE = 0.8
+
+SIZE_ALIASES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Biased first moves so position search and ECO queries hit realistic buckets.
+_OPENINGS = (
+    ("e4", "c5", "Nf3", "d6"),
+    ("e4", "e5", "Nf3", "Nc6"),
+    ("d4", "d5", "c4", "e6"),
+    ("d4", "Nf6", "c4", "g6"),
+    ("e4", "e6", "d4", "d5"),
+    ("c4", "e5"),
+    ("Nf3", "d5", "g3"),
+    (),
+)
+_TIME_CONTROLS = ("60+0", "180+2", "300+0", "600+5", "900+10", "5400+30")
+_RESULTS = ("1-0", "0-1", "1/2-1/2")
+
+
+def parse_size(text: str) -> int:
+    """Parse "10k" / "100k" / "1m" or a plain integer game count."""
+    key = text.strip().lower()
+    if key in SIZE_ALIASES:
+        return SIZE_ALIASES[key]
+    value = int(key.replace("_", ""))
+    if value <= 0:
+        raise ValueError(f"Corpus size must be positive: {text!r}")
+    return value
+
+
+def size_label(size: int) -> str:
+    """Inverse of parse_size for the standard sizes ("10k"), else the number."""
+    for label, value in SIZE_ALIASES.items():
+        if value == size:
+            return label
+    return str(size)
+
+
+@dataclass(frozen=True)
+class PoolGame:
+    """One reusable main line: SAN moves and their movetext."""
+
+    sans: List[str]
+    movetext: str
+
+
+def _random_game(rng: random.Random) -> List[str]:
+    board = chess.Board()
+    sans: List[str] = []
+    opening = _OPENINGS[rng.randrange(len(_OPENINGS))]
+    for san in opening:
+        sans.append(san)
+        board.push_san(san)
+    target_plies = rng.randint(30, 120)
+    while len(sans) < target_plies and not board.is_game_over(claim_draw=False):
+        moves = list(board.legal_moves)
+        # Prefer captures now and then so games look less like random walks
+        weighted = [m for m in moves if board.is_capture(m)] if rng.random() < 0.3 else []
+        move = rng.choice(weighted or moves)
+        sans.append(board.san(move))
+        board.push(move)
+    return sans
+
+
+def _movetext(sans: List[str]) -> str:
+    parts: List[str] = []
+    for i, san in enumerate(sans):
+        if i % 2 == 0:
+            parts.append(f"{i // 2 + 1}. {san}")
+        else:
+            parts.append(san)
+    return " ".join(parts)
+
+
+def _analysis_headers(sans: List[str], rng: random.Random) -> Dict[str, str]:
+    """Synthetic CARA analysis tags for a main line (random-walk evals, plausible CPL)."""
+    from app.models.database_model import GameData
+    from app.models.moveslist_model import MoveData
+    from app.services.analysis_data_storage_service import AnalysisDataStorageService
+
+    board = chess.Board()
+    rows: List[MoveData] = []
+    evaluation = 0.2
+    assessments = ("Best Move", "Good Move", "Inaccuracy", "Mistake", "Blunder")
+    weights = (50, 30, 12, 6, 2)
+    for i in range(0, len(sans), 2):
+        row = MoveData(move_number=i // 2 + 1)
+        for offset, side in ((0, "white"), (1, "black")):
+            if i + offset >= len(sans):
+                break
+            san = sans[i + offset]
+            board.push_san(san)
+            assess = rng.choices(assessments, weights)[0]
+            cpl = {"Best Move": 0, "Good Move": rng.randint(5, 40), "Inaccuracy": rng.randint(50, 99),
+                   "Mistake": rng.randint(100, 249), "Blunder": rng.randint(250, 600)}[assess]
+            evaluation += (-cpl if side == "white" else cpl) / 100.0 + rng.uniform(-0.1, 0.1)
+            setattr(row, f"{side}_move", san)
+            setattr(row, f"eval_{side}", f"{evaluation:+.2f}")
+            setattr(row, f"cpl_{side}", str(cpl))
+            setattr(row, f"assess_{side}", assess)
+            setattr(row, f"best_{side}", san if assess == "Best Move" else "")
+            setattr(row, f"{side}_depth", 18)
+            setattr(row, f"fen_{side}", board.fen())
+        rows.append(row)
+
+    game = GameData(game_number=0, pgn=f'[Event "?"]\n\n{_movetext(sans)} *\n')
+    if not AnalysisDataStorageService.store_analysis_data(game, rows, {"version": "benchmark"}):
+        return {}
+    headers = chess.pgn.read_headers(io.StringIO(game.pgn))
+    if headers is None:
+        return {}
+    return {
+        AnalysisDataStorageService.TAG_NAME: headers.get(AnalysisDataStorageService.TAG_NAME, ""),
+        # Fixed info text: the real one carries a creation timestamp
+        AnalysisDataStorageService.TAG_INFO: "App Version: benchmark, Created: synthetic",
+        AnalysisDataStorageService.TAG_CHECKSUM: headers.get(AnalysisDataStorageService.TAG_CHECKSUM, ""),
+    }
+
+
+def build_pool(seed: int = DEFAULT_SEED, pool_size: int = POOL_SIZE) -> List[PoolGame]:
+    """Build the shared pool of main lines."""
+    rng = random.Random(seed)
+    pool: List[PoolGame] = []
+    for _ in range(pool_size):
+        sans = _random_game(rng)
+        pool.append(PoolGame(sans=sans, movetext=_movetext(sans)))
+    return pool
+
+
+def iter_corpus_games(size: int, pool: List[PoolGame], seed: int = DEFAULT_SEED) -> Iterator[str]:
+    """Yield ``size`` PGN game texts (deterministic for a given seed and pool)."""
+    rng = random.Random(seed ^ size)
+    players = [f"Bench Player {i:03d}" for i in range(PLAYER_COUNT)]
+    # Analysis payloads are slow to encode; build them only for pool games the benchmark player uses
+    analysis_by_pool_index: Dict[int, Dict[str, str]] = {}
+    for n in range(size):
+        pool_index = rng.randrange(len(pool))
+        game = pool[pool_index]
+        white, black = rng.sample(players, 2)
+        # Give the benchmark player a fixed share of games so stats work scales with size
+        if rng.random() < 0.02:
+            if rng.random() < 0.5:
+                white = BENCHMARK_PLAYER
+            else:
+                black = BENCHMARK_PLAYER
+            if white == black:
+                black = players[-1]
+        year = rng.randint(1995, 2024)
+        result = rng.choice(_RESULTS)
+        headers = [
+            f'[Event "Benchmark Open {n % 97}"]',
+            f'[Site "Bench City {n % 13}"]',
+            f'[Date "{year}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}"]',
+            f'[Round "{n % 11 + 1}"]',
+            f'[White "{white}"]',
+            f'[Black "{black}"]',
+            f'[Result "{result}"]',
+            f'[WhiteElo "{rng.randint(1200, 2800)}"]',
+            f'[BlackElo "{rng.randint(1200, 2800)}"]',
+            f'[TimeControl "{rng.choice(_TIME_CONTROLS)}"]',
+        ]
+        if BENCHMARK_PLAYER in (white, black) and rng.random() < ANALYZED_SHARE:
+            analysis = analysis_by_pool_index.get(pool_index)
+            if analysis is None:
+                analysis = _analysis_headers(game.sans, random.Random(seed + pool_index))
+                analysis_by_pool_index[pool_index] = analysis
+            headers.extend(f'[{key} "{value}"]' for key, value in analysis.items())
+        yield "\n".join(headers) + f"\n\n{game.movetext} {result}\n"
+
+
+def corpus_path(size: int, cache_dir: Path, seed: int = DEFAULT_SEED) -> Path:
+    return cache_dir / f"corpus_v{CORPUS_VERSION}_{seed}_{size_label(size)}.pgn"
+
+
+def ensure_corpus(
+    size: int,
+    cache_dir: Path,
+    seed: int = DEFAULT_SEED,
+    pool: Optional[List[PoolGame]] = None,
+) -> Path:
+    """Return the cached corpus file for ``size`` games, generating it if missing."""
+    path = corpus_path(size, cache_dir, seed)
+    if path.is_file():
+        return path
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    pool = pool if pool is not None else build_pool(seed)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        for text in iter_corpus_games(size, pool, seed):
+            f.write(text)
+            f.write("\n")
+    tmp_path.replace(path)
+    return path
+
+
+def long_game_pgn(plies: int = 200, seed: int = DEFAULT_SEED) -> str:
+    """One long game (with variations) for ply-navigation benchmarks."""
+    rng = random.Random(seed)
+    game = chess.pgn.Game()
+    game.headers["White"] = "Bench Navigation"
+    game.headers["Black"] = "Bench Navigation"
+    node = game
+    while node.ply() < plies:
+        moves = list(node.board().legal_moves)
+        if not moves:
+            break
+        main = rng.choice(moves)
+        if len(moves) > 1 and rng.random() < 0.15:
+            side_line = node.add_variation(rng.choice([m for m in moves if m != main]))
+            replies = list(side_line.board().legal_moves)
+            if replies:
+                side_line.add_variation(rng.choice(replies))
+            node = node.add_main_variation(main)
+        else:
+            node = node.add_variation(main)
+    return str(game)
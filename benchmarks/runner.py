@@ -0,0 +1,226 @@
+"""Benchmark runner: timing helpers, JSON results and baseline comparison."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parent / ".corpus"
+
+
+@dataclass
+class BenchmarkResult:
+    """Wall-clock samples (seconds) of one benchmark on one corpus size."""
+
+    name: str
+    corpus: str
+    samples: List[float]
+    items: int = 0
+    unit: str = ""
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Identifier used to match results across runs, e.g. "sort.white@100k"."""
+        return f"{self.name}@{self.corpus}"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "name": self.name,
+            "corpus": self.corpus,
+            "samples_s": [round(s, 6) for s in self.samples],
+            "median_s": round(self.median, 6),
+            "min_s": round(min(self.samples), 6),
+            "max_s": round(max(self.samples), 6),
+        }
+        if self.items and self.unit:
+            data["items"] = self.items
+            data["unit"] = self.unit
+            if self.median > 0:
+                data[f"{self.unit}_per_s"] = round(self.items / self.median, 1)
+        data.update(self.extra)
+        return data
+
+
+def time_call(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> List[float]:
+    """Run ``func`` ``repeat`` times and return the wall-clock seconds of each run.
+
+    Args:
+        func: Operation to time.
+        repeat: Number of timed runs (at least one).
+        setup: Untimed callable run before every timed run.
+    """
+    samples: List[float] = []
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def environment_info(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Machine and build details stored with every result file."""
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "app_version": (config or {}).get("version", ""),
+    }
+
+
+def results_document(results: List[BenchmarkResult], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {
+        "version": RESULTS_VERSION,
+        "environment": environment_info(config),
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Tuple[str, float, float, float, bool]]:
+    """Match two result documents by benchmark key and compare median times.
+
+    Args:
+        baseline: Earlier results document.
+        current: New results document.
+        threshold: Relative slowdown (0.10 = 10%) counted as a regression.
+
+    Returns:
+        (key, baseline median, current median, current/baseline ratio, regressed)
+        for every benchmark present in both documents, in the current run's order.
+    """
+    base_by_key = {f"{r['name']}@{r['corpus']}": r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        key = f"{result['name']}@{result['corpus']}"
+        base = base_by_key.get(key)
+        if base is None:
+            continue
+        base_median = float(base["median_s"])
+        median = float(result["median_s"])
+        ratio = median / base_median if base_median > 0 else float("inf")
+        rows.append((key, base_median, median, ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def format_comparison(rows: List[Tuple[str, float, float, float, bool]]) -> str:
+    lines = [f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'ratio':>7}"]
+    for key, base_median, median, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        lines.append(f"{key:<40} {base_median * 1000:>8.1f}ms {median * 1000:>8.1f}ms {ratio:>7.2f}{flag}")
+    return "\n".join(lines)
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    line = f"{result.key:<40} median {result.median * 1000:10.1f} ms"
+    if result.items and result.unit and result.median > 0:
+        line += f"  ({result.items / result.median:,.0f} {result.unit}/s)"
+    print(line, flush=True)
+
+
+def run(args: argparse.Namespace) -> List[BenchmarkResult]:
+    from benchmarks.corpus import build_pool, ensure_corpus, parse_size
+    from benchmarks.suites import (
+        CORPUS_SUITES,
+        CorpusContext,
+        bench_cold_start,
+        bench_navigation,
+        ensure_qt_application,
+    )
+
+    ensure_qt_application()
+    from app.config.config_loader import ConfigLoader
+
+    config = ConfigLoader().load()
+    args.config = config
+    selected = set(args.only.split(",")) if args.only else None
+    results: List[BenchmarkResult] = []
+
+    def wanted(name: str) -> bool:
+        return selected is None or name in selected
+
+    corpus_dir = Path(args.corpus_dir)
+    pool = None
+    for size in [parse_size(s) for s in args.sizes.split(",") if s.strip()]:
+        suites = [name for name in CORPUS_SUITES if wanted(name)]
+        if not suites:
+            break
+        if pool is None:
+            pool = build_pool()
+        print(f"Preparing corpus of {size} games in {corpus_dir} ...", flush=True)
+        context = CorpusContext(size, ensure_corpus(size, corpus_dir, pool=pool), config)
+        for name in suites:
+            for result in CORPUS_SUITES[name](context, args.repeat):
+                _print_result(result)
+                results.append(result)
+
+    if wanted("navigation"):
+        for result in bench_navigation(config, args.repeat):
+            _print_result(result)
+            results.append(result)
+    if wanted("cold_start"):
+        for result in bench_cold_start(args.repeat):
+            _print_result(result)
+            results.append(result)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Headless CARA benchmarks over synthetic PGN corpora.",
+    )
+    parser.add_argument("--sizes", default="10k", help="Comma-separated corpus sizes: 10k, 100k, 1m or a game count (default: 10k)")
+    parser.add_argument("--only", default="", help="Comma-separated suites: parse, database_load, search, position_search, sort, player_stats, navigation, cold_start")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (whole-corpus suites run once at 100k+)")
+    parser.add_argument("--output", default="", help="Write results JSON to this file")
+    parser.add_argument("--compare", default="", help="Baseline results JSON; exit 1 if any benchmark regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative slowdown counted as a regression (default: 0.10)")
+    parser.add_argument("--corpus-dir", default=str(DEFAULT_CORPUS_DIR), help="Cache directory for generated corpora")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from benchmarks.scratch_data import redirect_data_files, scratch_data_dir
+
+    args = build_parser().parse_args(argv)
+    # In-process suites use the real services too; keep their settings and logs out of the checkout
+    with scratch_data_dir() as data_dir:
+        redirect_data_files(data_dir)
+        results = run(args)
+    document = results_document(results, args.config)
+    if args.output:
+        Path(args.output).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        rows = compare_results(baseline, document, args.threshold)
+        print(format_comparison(rows))
+        if any(row[4] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
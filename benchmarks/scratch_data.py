@@ -0,0 +1,48 @@
+"""Scratch user-data directory for benchmark runs.
+
+The app resolves every file it writes (settings, logs, caches) through
+``resolve_data_file_path``, which in a writable checkout is the repo root. Benchmarks
+point it at a temporary directory seeded with copies of the tracked data files, so a
+run leaves the checkout as it found it. Stdlib only: the cold-start probe imports this
+before the app.
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Tracked user data files the app reads (and may migrate) at startup.
+TRACKED_DATA_FILES = ("user_settings.json", "engine_parameters.json")
+
+
+@contextmanager
+def scratch_data_dir(prefix: str = "cara_bench_") -> Iterator[Path]:
+    """Yield a temporary directory holding copies of the tracked data files; removed on exit."""
+    data_dir = Path(tempfile.mkdtemp(prefix=prefix))
+    try:
+        for name in TRACKED_DATA_FILES:
+            source = REPO_ROOT / name
+            if source.exists():
+                shutil.copy2(source, data_dir / name)
+        yield data_dir
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def redirect_data_files(data_dir: Path) -> None:
+    """Resolve user data files inside data_dir (portable mode); resources still come from the checkout.
+
+    Call before the app modules are imported, since they bind resolve_data_file_path by name.
+    """
+    from app.utils import path_resolver
+
+    def resolve_in_data_dir(filename: str) -> Tuple[Path, bool]:
+        return data_dir / filename, True
+
+    path_resolver.resolve_data_file_path = resolve_in_data_dir
@@ -0,0 +1,289 @@
+"""Benchmark suites: each measures one user-visible operation on a loaded corpus.
+
+Suites run in-process against the real services and models (Qt offscreen).
+Suites that need earlier work (a parsed corpus, a loaded DatabaseModel) share
+it through CorpusContext, which builds it on first use and does not count it
+towards their timings.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import BENCHMARK_PLAYER, long_game_pgn, size_label
+from benchmarks.runner import BenchmarkResult, time_call
+from benchmarks.scratch_data import scratch_data_dir
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# FEN after 1.e4 c5 2.Nf3 (one of the corpus' biased openings).
+SICILIAN_FEN = "rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2"
+
+
+def ensure_qt_application() -> Any:
+    """Return the QApplication, creating an offscreen one if needed."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+class CorpusContext:
+    """Corpus text plus lazily built parse result and DatabaseModel for one size."""
+
+    def __init__(self, size: int, corpus_path: Path, config: Dict[str, Any]) -> None:
+        self.size = size
+        self.label = size_label(size)
+        self.corpus_path = corpus_path
+        self.config = config
+        self._text: Optional[str] = None
+        self._parse_result: Any = None
+        self._model: Any = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.corpus_path.read_text(encoding="utf-8")
+        return self._text
+
+    def parse(self) -> Any:
+        """Parse the corpus the way the database controller does."""
+        from app.services.pgn_service import PgnService
+
+        result = PgnService.parse_pgn_text(self.text, config=self.config)
+        if not result.success:
+            raise RuntimeError(f"Corpus {self.label} failed to parse: {result.error_message}")
+        self._parse_result = result
+        return result
+
+    @property
+    def parse_result(self) -> Any:
+        if self._parse_result is None:
+            self.parse()
+        return self._parse_result
+
+    def load_model(self) -> Any:
+        """Build a fresh DatabaseModel from the parse result (as opening a file does)."""
+        from app.models.database_model import DatabaseModel, GameData
+
+        games = []
+        tags_list = []
+        hashes_list = []
+        fuzzy_list = []
+        pawn_keys_list = []
+        for index, game_dict in enumerate(self.parse_result.games):
+            games.append(GameData(
+                game_number=0,
+                white=game_dict.get("white", ""),
+                black=game_dict.get("black", ""),
+                result=game_dict.get("result", ""),
+                date=game_dict.get("date", ""),
+                moves=game_dict.get("moves", 0),
+                eco=game_dict.get("eco", ""),
+                pgn=game_dict.get("pgn", ""),
+                event=game_dict.get("event", ""),
+                site=game_dict.get("site", ""),
+                white_elo=game_dict.get("white_elo", ""),
+                black_elo=game_dict.get("black_elo", ""),
+                time_control=game_dict.get("time_control", ""),
+                game_tags_raw=game_dict.get("game_tags_raw", ""),
+                game_tags=game_dict.get("game_tags", ""),
+                analyzed=game_dict.get("analyzed", False),
+                annotated=game_dict.get("annotated", False),
+                has_notes=game_dict.get("has_notes", False),
+                file_position=index + 1,
+            ))
+            tags_list.append(game_dict.get("tags", []))
+            hashes_list.append(game_dict.get("position_hashes"))
+            fuzzy_list.append(game_dict.get("position_hashes_fuzzy"))
+            pawn_keys_list.append(game_dict.get("position_pawn_keys"))
+        model = DatabaseModel(str(self.corpus_path), config=self.config)
+        model.add_games_batch(
+            games,
+            mark_unsaved=False,
+            tags_list=tags_list,
+            position_hashes_list=hashes_list,
+            position_hashes_fuzzy_list=fuzzy_list,
+            position_pawn_keys_list=pawn_keys_list,
+        )
+        self._model = model
+        return model
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            self.load_model()
+        return self._model
+
+
+def _repeat_for(context: CorpusContext, repeat: int) -> int:
+    # Whole-corpus work at 100k+ takes minutes per run; one sample is enough there.
+    return 1 if context.size >= 100_000 else repeat
+
+
+def bench_parse(context: CorpusContext, repeat: int) -> List[BenchmarkResult]:
+    samples = time_call(context.parse, _repeat_for(context, repeat))
+    return [BenchmarkResult("parse_pgn_text", context.label, samples, items=context.size, unit="games")]
+
+
+def bench_database_load(context: CorpusContext, repeat: int) -> List[BenchmarkResult]:
+    context.parse_result
+    samples = time_call(context.load_model, _repeat_for(context, repeat))
+    return [BenchmarkResult("database_load", context.label, samples, items=context.size, unit="games")]
+
+
+def _run_search(context: CorpusContext, criteria: List[Any]) -> int:
+    from app.services.database_search_service import DatabaseSearchService
+
+    return len(DatabaseSearchService.search_databases([context.model], criteria))
+
+
+def bench_search(context: CorpusContext, repeat: int) -> List[BenchmarkResult]:
+    from app.models.search_criteria import LogicOperator, SearchCriteria, SearchField, SearchOperator
+
+    queries = {
+        "player_equals": [SearchCriteria(SearchField.WHITE, SearchOperator.EQUALS, BENCHMARK_PLAYER)],
+        "event_contains": [SearchCriteria(SearchField.EVENT, SearchOperator.CONTAINS, "Open 42")],
+        "elo_and_date": [
+            SearchCriteria(SearchField.WHITE_ELO, SearchOperator.GREATER_THAN_OR_EQUAL, "2400"),
+            SearchCriteria(SearchField.DATE, SearchOperator.DATE_AFTER, "2015.01.01", LogicOperator.AND),
+        ],
+        "player_or_tc_type": [
+            SearchCriteria(SearchField.BLACK, SearchOperator.EQUALS, BENCHMARK_PLAYER),
+            SearchCriteria(SearchField.TC_TYPE, SearchOperator.EQUALS, "Classical", LogicOperator.OR),
+        ],
+    }
+    context.model
+    results = []
+    for name, criteria in queries.items():
+        samples = time_call(lambda: _run_search(context, criteria), repeat)
+        results.append(BenchmarkResult(f"search.{name}", context.label, samples, items=context.size, unit="games"))
+    return results
+
+
+def bench_position_search(context: CorpusContext, repeat: int) -> List[BenchmarkResult]:
+    from app.models.search_criteria import SearchCriteria, SearchField, SearchOperator
+
+    queries = {
+        "exact": [SearchCriteria(SearchField.POSITION, SearchOperator.EQUALS, SICILIAN_FEN)],
+        "fuzzy": [SearchCriteria(SearchField.POSITION_FUZZY, SearchOperator.EQUALS, SICILIAN_FEN)],
+    }
+    # Build the lazy position index up front so the first exact sample times the search only
+    context.model.ensure_position_index()
+    results = []
+    for name, criteria in queries.items():
+        samples = time_call(lambda: _run_search(context, criteria), repeat)
+        results.append(BenchmarkResult(f"position_search.{name}", context.label, samples, items=context.size, unit="games"))
+    return results
+
+
+def bench_sort(context: CorpusContext, repeat: int) -> List[BenchmarkResult]:
+    from PyQt6.QtCore import Qt
+    from app.models.database_model import DatabaseModel
+
+    model = context.model
+    columns = {
+        "white": DatabaseModel.COL_WHITE,
+        "date": DatabaseModel.COL_DATE,
+        "white_elo": DatabaseModel.COL_WHITE_ELO,
+        "eco": DatabaseModel.COL_ECO,
+    }
+
+    def reset_order() -> None:
+        model.sort(DatabaseModel.COL_NUM, Qt.SortOrder.AscendingOrder)
+
+    results = []
+    for name, column in columns.items():
+        samples = time_call(
+            lambda: model.sort(column, Qt.SortOrder.AscendingOrder), repeat, setup=reset_order
+        )
+        results.append(BenchmarkResult(f"sort.{name}", context.label, samples, items=context.size, unit="games"))
+    reset_order()
+    return results
+
+
+def bench_player_stats(context: CorpusContext, repeat: int) -> List[BenchmarkResult]:
+    from app.services.player_stats_service import PlayerStatsService
+
+    model = context.model
+    service = PlayerStatsService(context.config, None)
+    game_count = [0]
+
+    def run() -> None:
+        games, _total = service.get_player_games(BENCHMARK_PLAYER, [model])
+        game_count[0] = len(games)
+        service.aggregate_player_statistics(BENCHMARK_PLAYER, games)
+
+    samples = time_call(run, repeat)
+    return [BenchmarkResult("player_stats", context.label, samples, items=game_count[0], unit="games")]
+
+
+def bench_navigation(config: Dict[str, Any], repeat: int) -> List[BenchmarkResult]:
+    """Step along the main line of a 200-ply game with variations, then back to the start."""
+    from app.controllers.board_controller import BoardController
+    from app.controllers.game_controller import GameController
+    from app.models.database_model import GameData
+
+    controller = GameController(config, BoardController(config))
+    # With variations enabled, stepping stops at every branch for the PGN view's overlay
+    controller.set_navigate_variations_enabled(False)
+    controller.set_active_game(GameData(game_number=0, pgn=long_game_pgn()))
+    plies = [0]
+
+    def run() -> None:
+        steps = 0
+        while controller.navigate_to_next_move():
+            steps += 1
+        controller.navigate_to_start()
+        plies[0] = steps
+
+    samples = time_call(run, repeat, setup=controller.navigate_to_start)
+    return [BenchmarkResult("navigation", "-", samples, items=plies[0], unit="plies")]
+
+
+def bench_cold_start(repeat: int, timeout: float = 120.0) -> List[BenchmarkResult]:
+    """Spawn the app headless and time process start to the main window's first paint.
+
+    Each launch gets a scratch data directory with copies of the tracked data files, so
+    settings migrations and log files never touch the checkout.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    samples = []
+    for _ in range(repeat):
+        with scratch_data_dir("cara_cold_start_") as data_dir:
+            spawn_time = time.time()
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.cold_start_probe", repr(spawn_time), str(data_dir)],
+                cwd=str(REPO_ROOT),
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        value = None
+        for line in completed.stdout.splitlines():
+            if line.startswith("first_paint_s="):
+                value = float(line.split("=", 1)[1])
+        if value is None:
+            raise RuntimeError(f"Cold-start probe reported no paint (exit {completed.returncode}): {completed.stderr[-500:]}")
+        samples.append(value)
+    return [BenchmarkResult("cold_start_first_paint", "-", samples)]
+
+
+# Suites that run once per corpus size, in dependency-friendly order.
+CORPUS_SUITES: Dict[str, Callable[[CorpusContext, int], List[BenchmarkResult]]] = {
+    "parse": bench_parse,
+    "database_load": bench_database_load,
+    "search": bench_search,
+    "position_search": bench_position_search,
+    "sort": bench_sort,
+    "player_stats": bench_player_stats,
+}
+
+# Suites independent of corpus size.
+STANDALONE_SUITES = ("navigation", "cold_start")
@@ -54,6 +54,14 @@ _configure_linux_frozen_runtime()
 # Suppress Qt font warnings before importing Qt modules
 os.environ.setdefault("QT_LOGGING_RULES", "qt.qpa.fonts.warning=false")
 
+# Opt-in startup profile (--startup-profile / CARA_STARTUP_PROFILE=1); installed before
+# the heavy imports below so their timings are recorded.
+from app.utils.startup_profile import StartupProfile, set_startup_profile
+
+_startup_profile = StartupProfile.from_environment()
+set_startup_profile(_startup_profile)
+_startup_profile.install_import_hook()
+
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import QtMsgType, qInstallMessageHandler, QLoggingCategory
@@ -63,7 +71,6 @@ from app.config.config_loader import (
     read_default_style_config_ref,
     resolve_style_config_path,
 )
-from app.main_window import MainWindow
 from app.services.error_handler import ErrorHandler
 from app.utils.path_resolver import get_app_resource_path
 from app.services.theme_service import load_saved_theme_style_ref
@@ -160,7 +167,8 @@ def main() -> None:
                 )
                 print(f"Configuration Error: {err}", file=sys.stderr)
                 style_override = None
-        config = loader.load_with_style_override(style_override) if style_override else loader.load()
+        with _startup_profile.phase("load config"):
+            config = loader.load_with_style_override(style_override) if style_override else loader.load()
         
         # Initialize logging service
         from app.services.logging_service import LoggingService
@@ -177,14 +185,33 @@ def main() -> None:
         # Load user settings and run migrations before UI uses them
         from app.services.user_settings_service import UserSettingsService
         from app.services.migration_service import MigrationService
-        UserSettingsService.get_instance()
-        MigrationService.run()
+        with _startup_profile.phase("user settings and migrations"):
+            UserSettingsService.get_instance()
+            MigrationService.run()
+        
+        # MainWindow pulls in every view and controller; imported here so the
+        # startup profile can attribute that cost.
+        with _startup_profile.phase("import MainWindow"):
+            from app.main_window import MainWindow
         
         # Initialize MainWindow with injected configuration.
         # Reuse the same style ref we already loaded at startup to sync the Theme menu.
         active_style_ref = style_override or str(config.get("default_style_config", "") or "")
-        window = MainWindow(config, active_style_ref=active_style_ref)
-        window.show()
+        with _startup_profile.phase("construct MainWindow"):
+            window = MainWindow(config, active_style_ref=active_style_ref)
+        with _startup_profile.phase("show MainWindow"):
+            window.show()
+        
+        # Heavy services (ECO book, Polyglot books, encyclopedia) load in the
+        # background once the window is up; first use waits only for its own service.
+        def _report_startup_profile() -> None:
+            if _startup_profile.enabled:
+                _startup_profile.remove_import_hook()
+                report = _startup_profile.report()
+                logging_service.info(report)
+                print(report, file=sys.stderr)
+        
+        window.start_service_warmup(on_finished=_report_startup_profile)
         
         exit_code = app.exec()
         
@@ -0,0 +1,92 @@
+"""Pre-merged config snapshot: reused until config.json or the style file changes."""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from app.config import config_loader
+from app.config.config_loader import ConfigLoader
+from app.utils.path_resolver import get_app_resource_path
+
+
+_LIGHT = "app/config/style_light.config.json"
+
+
+class TestConfigSnapshot(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        source_dir = get_app_resource_path("app/config")
+        # Style refs ("app/config/style_*.config.json") resolve next to config.json first
+        self.config_dir = root / "app" / "config"
+        self.config_dir.mkdir(parents=True)
+        for name in ("style_default.config.json", "style_light.config.json"):
+            shutil.copy2(source_dir / name, self.config_dir / name)
+        self.config_path = root / "config.json"
+        shutil.copy2(source_dir / "config.json", self.config_path)
+        self.data_dir = root / "data"
+        patcher = mock.patch.object(
+            config_loader, "resolve_data_file_path", lambda name: (self.data_dir / name, False)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def _load(self, style_ref=None):
+        loader = ConfigLoader(self.config_path, use_snapshot=True)
+        config = loader.load_with_style_override(style_ref) if style_ref else loader.load()
+        return config, loader.loaded_from_snapshot
+
+    def _rewrite_style(self, name, mutate):
+        path = self.config_dir / name
+        data = json.loads(config_loader._strip_json_comments(path.read_text(encoding="utf-8")))
+        mutate(data)
+        path.write_text(json.dumps(data), encoding="utf-8")
+        later = time.time() + 10
+        os.utime(path, (later, later))
+
+    def test_second_load_matches_full_load(self):
+        first, hit = self._load()
+        self.assertFalse(hit)
+        second, hit = self._load()
+        self.assertTrue(hit)
+        self.assertEqual(second, first)
+        self.assertEqual(second, ConfigLoader(self.config_path, use_snapshot=False).load())
+
+    def test_style_selections_are_cached_separately(self):
+        default, _ = self._load()
+        light, hit = self._load(_LIGHT)
+        self.assertFalse(hit)
+        self.assertNotEqual(light, default)
+        self.assertEqual(self._load(_LIGHT), (light, True))
+        self.assertEqual(self._load(), (default, True))
+
+    def test_changed_style_file_invalidates_but_touch_does_not(self):
+        self._load()
+        path = self.config_dir / "style_default.config.json"
+        later = time.time() + 20
+        os.utime(path, (later, later))
+        self.assertTrue(self._load()[1])
+
+        self._rewrite_style("style_default.config.json", lambda d: d.setdefault("ui", {}).update(snapshot_probe=7))
+        config, hit = self._load()
+        self.assertFalse(hit)
+        self.assertEqual(config["ui"]["snapshot_probe"], 7)
+
+    def test_debug_random_colors_are_never_cached(self):
+        text = self.config_path.read_text(encoding="utf-8")
+        self.config_path.write_text(
+            text.replace('"enable_debug_rand_colors": false', '"enable_debug_rand_colors": true'),
+            encoding="utf-8",
+        )
+        self._load()
+        self.assertFalse(self._load()[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for stopping the positional heat-map precompute thread."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from app.config.config_loader import ConfigLoader
+from app.controllers.positional_heatmap_controller import HeatmapPrecomputeThread, PositionalHeatmapController
+
+PGN = (
+    '[Event "t"]\n[White "A"]\n[Black "B"]\n[Result "*"]\n\n'
+    "1. e4 e5 2. Nf3 Nc6 *\n"
+)
+
+_APP = None
+
+
+def _ensure_app() -> QApplication:
+    global _APP
+    _APP = QApplication.instance() or QApplication([])
+    return _APP
+
+
+class _BlockingAnalyzer:
+    """Analyzer stand-in whose first analysis blocks until released."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def is_cached(self, board) -> bool:
+        return False
+
+    def analyze_board(self, board):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return {}
+
+
+class PrecomputeStopTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _ensure_app()
+        self.controller = PositionalHeatmapController(ConfigLoader().load(), None)
+        self.analyzer = _BlockingAnalyzer()
+        self.thread = HeatmapPrecomputeThread(self.analyzer, PGN)
+        self.thread.start()
+        self.assertTrue(self.analyzer.started.wait(5))
+        self.controller._precompute_thread = self.thread
+
+    def tearDown(self) -> None:
+        self.analyzer.release.set()
+        self.thread.wait(5000)
+
+    def test_stop_returns_without_waiting_for_the_thread(self) -> None:
+        start = time.perf_counter()
+        self.controller._stop_precompute()
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIsNone(self.controller._precompute_thread)
+        self.assertEqual(self.controller._retired_threads, [self.thread])
+
+        loop = QEventLoop()
+        self.thread.finished.connect(loop.quit)
+        QTimer.singleShot(5000, loop.quit)
+        self.analyzer.release.set()
+        loop.exec()
+        QApplication.processEvents()
+
+        self.assertTrue(self.thread.isFinished())
+        self.assertEqual(self.controller._retired_threads, [])
+        # The job stopped after the position it was analyzing
+        self.assertEqual(self.analyzer.calls, 1)
+
+    def test_cleanup_waits_for_retired_threads(self) -> None:
+        self.controller._stop_precompute()
+        self.analyzer.release.set()
+        self.controller.cleanup()
+        self.assertTrue(self.thread.isFinished())
+
+
+if __name__ == "__main__":
+    unittest.main()
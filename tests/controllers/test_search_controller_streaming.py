@@ -0,0 +1,113 @@
+"""Tests for SearchController's background search with streamed results."""
+
+from __future__ import annotations
+
+import os
+import unittest
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from app.controllers.search_controller import SearchController
+from app.models.database_model import DatabaseModel, GameData
+from app.models.search_criteria import LogicOperator, SearchCriteria, SearchField, SearchOperator, SearchQuery
+from app.services import database_search_service
+from app.services.database_search_service import DatabaseSearchService
+
+_APP = None
+
+
+def _ensure_app() -> QApplication:
+    global _APP
+    _APP = QApplication.instance() or QApplication([])
+    return _APP
+
+
+def _database(whites):
+    model = DatabaseModel()
+    games = [GameData(game_number=0, white=w, result="1-0" if i % 2 else "0-1", file_position=i + 1)
+             for i, w in enumerate(whites)]
+    model.add_games_batch(games, mark_unsaved=False, tags_list=[[] for _ in games])
+    return model
+
+
+class SearchControllerStreamingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _ensure_app()
+        self.database = _database(["Carlsen", "Caruana", "Kasparov", "Carlsen", "Anand"] * 5)
+        panel_model = SimpleNamespace(find_database_by_model=lambda model: None)
+        self.controller = SearchController({}, SimpleNamespace(get_panel_model=lambda: panel_model))
+
+    def _run(self, criteria):
+        model, _message = self.controller.start_search(SearchQuery("active", criteria), self.database)
+        loop = QEventLoop()
+        timer = QTimer()
+        timer.timeout.connect(lambda: None if self.controller.is_search_running() else loop.quit())
+        timer.start(5)
+        QTimer.singleShot(5000, loop.quit)
+        loop.exec()
+        timer.stop()
+        self.assertFalse(self.controller.is_search_running())
+        return model
+
+    def test_results_stream_into_model(self) -> None:
+        model = self._run([SearchCriteria(SearchField.WHITE, SearchOperator.CONTAINS, "car")])
+        self.assertEqual(model.rowCount(), 15)
+        self.assertEqual({model.get_game(r).source_database for r in range(model.rowCount())}, {"Active Database"})
+
+    def test_narrower_query_tests_previous_matches_only(self) -> None:
+        self._run([SearchCriteria(SearchField.WHITE, SearchOperator.CONTAINS, "car")])
+        tested = []
+        original = DatabaseSearchService.iter_search_batches
+
+        def spy(databases, criteria, names=None, *, candidates=None, **kwargs):
+            tested.append(candidates)
+            return original(databases, criteria, names, candidates=candidates, **kwargs)
+
+        database_search_service.DatabaseSearchService.iter_search_batches = staticmethod(spy)
+        try:
+            narrower = [
+                SearchCriteria(SearchField.WHITE, SearchOperator.CONTAINS, "carl"),
+                SearchCriteria(SearchField.RESULT, SearchOperator.EQUALS, "1-0", LogicOperator.AND),
+            ]
+            model = self._run(narrower)
+            self.assertEqual(len(tested[0][0]), 15)
+            expected = DatabaseSearchService.search_databases([self.database], narrower)
+            self.assertEqual(model.rowCount(), len(expected))
+
+            # Data changed since: search the whole database again
+            self.database.update_game(self.database.get_game(0), reindex_positions=False)
+            self._run([SearchCriteria(SearchField.WHITE, SearchOperator.CONTAINS, "carls")])
+            self.assertIsNone(tested[-1])
+        finally:
+            database_search_service.DatabaseSearchService.iter_search_batches = staticmethod(original)
+
+    def test_position_index_is_built_before_the_worker_starts(self) -> None:
+        pgn = '[White "A"]\n[Black "B"]\n[Result "*"]\n\n1. e4 c5 2. Nf3 *'
+        database = DatabaseModel()
+        games = [GameData(game_number=0, white="A", pgn=pgn, file_position=i + 1) for i in range(3)]
+        database.add_games_batch(games, mark_unsaved=False, tags_list=[[] for _ in games])
+        self.assertTrue(database._position_index_pending)
+        original = DatabaseSearchService.iter_search_batches
+        pending_in_worker = []
+
+        def spy(databases, criteria, names=None, **kwargs):
+            pending_in_worker.append(len(databases[0]._position_index_pending))
+            return original(databases, criteria, names, **kwargs)
+
+        database_search_service.DatabaseSearchService.iter_search_batches = staticmethod(spy)
+        try:
+            fen = "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq c6 0 2"
+            self.database = database
+            model = self._run([SearchCriteria(SearchField.POSITION, SearchOperator.EQUALS, fen)])
+        finally:
+            database_search_service.DatabaseSearchService.iter_search_batches = staticmethod(original)
+        self.assertEqual(pending_in_worker, [0])
+        self.assertEqual(model.rowCount(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
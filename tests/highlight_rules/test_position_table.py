@@ -0,0 +1,61 @@
+"""Unit tests for the game-scoped GamePositionTable."""
+
+import unittest
+
+import chess
+
+from app.services.game_highlights.half_move import (
+    context_for_move_index,
+    half_move_for,
+    make_rule_context,
+)
+from app.services.game_highlights.position_table import GamePositionTable
+from app.utils.material_tracker import calculate_material_count
+from tests.highlight_rules.helpers import moves_from_pgn
+
+
+class TestGamePositionTable(unittest.TestCase):
+    """Boards are parsed once per game and shared by every half-move context."""
+
+    def setUp(self):
+        self.moves = moves_from_pgn("1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Bxc6 dxc6")
+
+    def test_one_board_per_position(self):
+        table = GamePositionTable(self.moves)
+        self.assertEqual(len(table), 8)
+        fen = self.moves[1].fen_white
+        self.assertIs(table.board(fen), table.board(fen))
+
+    def test_neighbor_contexts_share_boards(self):
+        context = make_rule_context(self.moves, 1)
+        black = half_move_for(self.moves[1], context, is_white=False)
+        white_next = black.reply()
+        self.assertIs(black.board_after(), white_next.board_before())
+
+        rebuilt = context_for_move_index(context, 2)
+        self.assertIs(rebuilt.positions, context.positions)
+
+    def test_attack_map_matches_is_attacked_by(self):
+        table = GamePositionTable(self.moves)
+        fen = self.moves[3].fen_black
+        board = chess.Board(fen)
+        for color in (chess.WHITE, chess.BLACK):
+            expected = {sq for sq in chess.SQUARES if board.is_attacked_by(color, sq)}
+            self.assertEqual(set(table.attacked_squares(fen, color)), expected)
+
+    def test_material_matches_material_tracker(self):
+        table = GamePositionTable(self.moves)
+        fen = self.moves[3].fen_white
+        board = chess.Board(fen)
+        self.assertEqual(table.material(fen, True), calculate_material_count(board, True))
+        self.assertEqual(table.material(fen, False), calculate_material_count(board, False))
+
+    def test_invalid_fen_yields_none(self):
+        table = GamePositionTable([])
+        self.assertIsNone(table.board("not a fen"))
+        self.assertIsNone(table.attacked_squares("not a fen", chess.WHITE))
+        self.assertIsNone(table.material("", True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for the deferred (paged) position-search index in DatabaseModel."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from app.models.database_model import DatabaseModel, GameData
+
+
+def _load(model: DatabaseModel, hashes):
+    games = [GameData(game_number=0, white=f"P{i}", file_position=i + 1) for i in range(len(hashes))]
+    model.add_games_batch(
+        games,
+        mark_unsaved=False,
+        tags_list=[[] for _ in games],
+        position_hashes_list=hashes,
+        position_hashes_fuzzy_list=[[h + 1000 for h in game_hashes] for game_hashes in hashes],
+    )
+    return games
+
+
+def _by_row(games, matches):
+    return {row: matches[id(game)] for row, game in enumerate(games) if id(game) in matches}
+
+
+class DeferredPositionIndexTests(unittest.TestCase):
+    HASHES = [[11, 12, 13], [11, 22, 13], [11, 32, 33], [11, 42, 13]]
+
+    def setUp(self) -> None:
+        self.model = DatabaseModel()
+        self.model.POSITION_INDEX_CHUNK = 3  # Several chunks for four games
+        self.games = _load(self.model, self.HASHES)
+
+    def test_batch_add_defers_indexing_until_lookup(self) -> None:
+        self.assertEqual(len(self.model._position_index_pending), 4)
+        matches = self.model.get_position_matches(13)
+        self.assertEqual(matches, {id(self.games[0]): 2, id(self.games[1]): 2, id(self.games[3]): 2})
+        self.assertEqual(self.model._position_index_pending, {})
+        self.assertEqual(self.model.get_position_matches_fuzzy(1022), {id(self.games[1]): 1})
+
+    def test_matches_agree_with_immediate_indexing(self) -> None:
+        eager = DatabaseModel()
+        eager_games = _load(eager, self.HASHES)
+        eager._ensure_position_index()
+        for h in (11, 12, 13, 22, 33, 99):
+            self.assertEqual(
+                _by_row(self.games, self.model.get_position_matches(h)),
+                _by_row(eager_games, eager.get_position_matches(h)),
+            )
+
+    def test_removed_pending_game_is_never_indexed(self) -> None:
+        self.model.remove_games([self.games[1]])
+        self.assertNotIn(id(self.games[1]), self.model.get_position_matches(11))
+        self.assertEqual(len(self.model.get_position_matches(11)), 3)
+
+    def test_fuzzy_hashes_of_pending_game(self) -> None:
+        self.assertEqual(self.model.get_position_hashes_fuzzy(self.games[2]), [1011, 1032, 1033])
+        self.assertNotIn(id(self.games[2]), self.model._position_index_pending)
+
+    def test_clear_drops_pending_games(self) -> None:
+        self.model.clear()
+        self.assertEqual(self.model._position_index_pending, {})
+        self.assertEqual(self.model.get_position_matches(11), {})
+
+    def test_lookup_does_not_pump_ui_events(self) -> None:
+        with mock.patch("app.services.bulk_operation_stats.pump_bulk_ui_events") as pump:
+            self.model.get_position_matches(11)
+        pump.assert_not_called()
+        self.assertEqual(self.model._position_index_pending, {})
+
+    def test_explicit_build_survives_edits_and_nested_calls_while_pumping(self) -> None:
+        self.model.POSITION_INDEX_CHUNK = 1
+
+        def edit_during_pump() -> None:
+            self.model.remove_games([self.games[2]])
+            self.model.ensure_position_index()
+
+        with mock.patch(
+            "app.services.bulk_operation_stats.pump_bulk_ui_events", side_effect=edit_during_pump
+        ) as pump:
+            self.model.ensure_position_index()
+        # The nested call finished the build without pumping again
+        pump.assert_called_once()
+        self.assertEqual(self.model._position_index_pending, {})
+        self.assertEqual(len(self.model.get_position_matches(11)), 3)
+        self.assertNotIn(id(self.games[2]), self.model.get_position_matches(11))
+
+
+if __name__ == "__main__":
+    unittest.main()
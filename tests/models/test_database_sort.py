@@ -0,0 +1,74 @@
+"""Tests for DatabaseModel sorting with cached sort keys and row lookups."""
+
+from __future__ import annotations
+
+import unittest
+
+from PyQt6.QtCore import Qt
+
+from app.models.database_model import DatabaseModel, GameData
+
+
+def _game(number: int, **fields) -> GameData:
+    return GameData(game_number=number, **fields)
+
+
+def _numbers(model: DatabaseModel):
+    return [model.get_game(row).game_number for row in range(model.rowCount())]
+
+
+class DatabaseModelSortTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.model = DatabaseModel()
+        self.games = [
+            _game(1, white="Carol", date="2020.05.01", white_elo="2100", time_control="600+5"),
+            _game(2, white="alice", date="2019.??.??", white_elo="", time_control="60+0"),
+            _game(3, white="Bob", date="2020.05.01", white_elo="abc", time_control="5400+30"),
+            _game(4, white="Dave", date="", white_elo="2450", time_control="180+2"),
+        ]
+        self.model.add_games_batch(self.games, mark_unsaved=False, tags_list=[[] for _ in self.games])
+
+    def test_elo_sorts_numerically_with_invalid_as_zero(self) -> None:
+        self.model.sort(DatabaseModel.COL_WHITE_ELO, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(_numbers(self.model), [2, 3, 1, 4])
+        self.model.sort(DatabaseModel.COL_WHITE_ELO, Qt.SortOrder.DescendingOrder)
+        # Descending keeps the original order of equal keys (stable like list.sort(reverse=True))
+        self.assertEqual(_numbers(self.model), [4, 1, 2, 3])
+
+    def test_date_sort_matches_key_function_order(self) -> None:
+        expected = sorted(self.games, key=lambda g: self.model._parse_date_for_sort(g.date))
+        self.model.sort(DatabaseModel.COL_DATE, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(_numbers(self.model), [g.game_number for g in expected])
+
+    def test_text_columns_keep_string_order(self) -> None:
+        self.model.sort(DatabaseModel.COL_WHITE, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(_numbers(self.model), [3, 1, 4, 2])
+
+    def test_key_recomputed_after_direct_field_change(self) -> None:
+        self.model.sort(DatabaseModel.COL_WHITE_ELO, Qt.SortOrder.AscendingOrder)
+        self.games[3].white_elo = "1000"  # Edited outside the model, e.g. by header sync
+        self.model.sort(DatabaseModel.COL_WHITE_ELO, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(_numbers(self.model), [2, 3, 4, 1])
+
+    def test_tc_type_keys_follow_config(self) -> None:
+        self.model.sort(DatabaseModel.COL_TC_TYPE, Qt.SortOrder.AscendingOrder)
+        first = _numbers(self.model)
+        self.model.sort(DatabaseModel.COL_NUM, Qt.SortOrder.AscendingOrder)
+        self.model.sort(DatabaseModel.COL_TC_TYPE, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(_numbers(self.model), first)
+
+    def test_find_game_after_sort_and_remove(self) -> None:
+        self.model.sort(DatabaseModel.COL_WHITE, Qt.SortOrder.AscendingOrder)
+        for row in range(self.model.rowCount()):
+            self.assertEqual(self.model.find_game(self.model.get_game(row)), row)
+        self.model.remove_games([self.games[2]])
+        self.assertIsNone(self.model.find_game(self.games[2]))
+        for row in range(self.model.rowCount()):
+            self.assertEqual(self.model.find_game(self.model.get_game(row)), row)
+        extra = _game(5, white="Eve")
+        self.model.add_game(extra, tags=[])
+        self.assertEqual(self.model.find_game(extra), self.model.rowCount() - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import os
 import sys
 import unittest
@@ -13,6 +14,7 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from app.services.eco_index import book_hash_from_fen
 from app.services.opening_encyclopedia_service import OpeningEncyclopediaService
 from app.services.opening_service import (
     OpeningService,
@@ -69,9 +71,32 @@ def encyclopedia_service() -> OpeningEncyclopediaService:
     return OpeningEncyclopediaService(CONFIG)
 
 
+_ECO_BASE: Optional[Dict[str, Any]] = None
+
+
+def load_eco_base() -> Dict[str, Any]:
+    """Raw ``eco_base.json`` (the service itself only reads the compiled index)."""
+    global _ECO_BASE
+    if _ECO_BASE is None:
+        path = Path(CONFIG["resources"]["ecolists_path"]) / "eco_base.json"
+        with open(path, "r", encoding="utf-8") as f:
+            _ECO_BASE = json.load(f)
+    return _ECO_BASE
+
+
+def classified_winner(svc: OpeningService, key: str) -> Optional[Dict[str, Any]]:
+    """Curated entry the index keeps for a placement+STM book key (no exact-FEN match)."""
+    svc.load()
+    hashed = book_hash_from_fen(key)
+    if hashed is None or svc._eco_index is None:
+        return None
+    entry = svc._eco_index.classified_entry(hashed)
+    return entry.as_dict() if entry else None
+
+
 def iter_base_rows(svc: OpeningService) -> List[BaseRow]:
     rows: List[BaseRow] = []
-    for fen, entry in (svc._eco_base or {}).items():
+    for fen, entry in load_eco_base().items():
         if not isinstance(entry, dict):
             continue
         name = str(entry.get("name") or "").strip()
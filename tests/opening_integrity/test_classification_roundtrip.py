@@ -9,9 +9,11 @@ from app.services.opening_service import OpeningService, parse_move_sans
 from tests.opening_integrity.helpers import (
     SKIP_IN_CI,
     SKIP_REASON,
+    classified_winner,
     collision_groups,
     display_tuple,
     iter_base_rows,
+    load_eco_base,
     load_tests_if_not_ci as load_tests,
     opening_service,
     replay_fen,
@@ -75,7 +77,7 @@ class TestClassificationRoundtrip(unittest.TestCase):
         """Placement+STM index keeps the longer canonical line (ties keep first)."""
         failures = []
         for key, group in self.collisions.items():
-            winner = self.svc._classified_by_book_key.get(key)
+            winner = classified_winner(self.svc, key)
             if not isinstance(winner, dict):
                 failures.append((key, "missing winner"))
                 continue
@@ -98,13 +100,13 @@ class TestClassificationRoundtrip(unittest.TestCase):
         checked = 0
         failures = []
         for key, group in self.collisions.items():
-            winner = self.svc._classified_by_book_key.get(key)
+            winner = classified_winner(self.svc, key)
             if not isinstance(winner, dict):
                 continue
             placement = key.split(" ", 1)[0]
             stm = key.split(" ", 1)[1] if " " in key else "w"
             probe = f"{placement} {stm} - - 1 3"
-            if probe in (self.svc._eco_base or {}):
+            if probe in load_eco_base():
                 continue
             if OpeningService.book_key(probe) != key:
                 continue
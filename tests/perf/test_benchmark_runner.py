@@ -0,0 +1,68 @@
+"""Benchmark runner: corpus sizes, result documents and baseline comparison."""
+
+import unittest
+
+from benchmarks.corpus import build_pool, iter_corpus_games, parse_size, size_label
+from benchmarks.runner import BenchmarkResult, compare_results, results_document, time_call
+from benchmarks.scratch_data import REPO_ROOT, TRACKED_DATA_FILES, scratch_data_dir
+
+
+def _without_payloads(text):
+    # gzip analysis payloads (legacy tag codec) carry the encoding time
+    return [line for line in text.splitlines() if not line.startswith("[CARAAnalysis")]
+
+
+def _doc(**medians):
+    return {"results": [
+        {"name": key.split("@")[0], "corpus": key.split("@")[1], "median_s": value}
+        for key, value in medians.items()
+    ]}
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    def test_parse_size(self):
+        self.assertEqual(parse_size("10k"), 10_000)
+        self.assertEqual(parse_size(" 1M "), 1_000_000)
+        self.assertEqual(parse_size("2_500"), 2500)
+        self.assertEqual(size_label(100_000), "100k")
+        self.assertEqual(size_label(2500), "2500")
+        with self.assertRaises(ValueError):
+            parse_size("0")
+
+    def test_result_document(self):
+        result = BenchmarkResult("parse_pgn_text", "10k", [2.0, 1.0, 4.0], items=10_000, unit="games")
+        data = results_document([result], {"version": "9.9"})
+        self.assertEqual(data["environment"]["app_version"], "9.9")
+        entry = data["results"][0]
+        self.assertEqual((entry["median_s"], entry["min_s"], entry["max_s"]), (2.0, 1.0, 4.0))
+        self.assertEqual(entry["games_per_s"], 5000.0)
+
+    def test_time_call_runs_setup_untimed_before_each_run(self):
+        calls = []
+        samples = time_call(lambda: calls.append("run"), 2, setup=lambda: calls.append("setup"))
+        self.assertEqual(len(samples), 2)
+        self.assertEqual(calls, ["setup", "run", "setup", "run"])
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = _doc(**{"sort.white@10k": 1.0, "search.x@10k": 1.0, "gone@10k": 1.0})
+        current = _doc(**{"sort.white@10k": 1.05, "search.x@10k": 1.2, "new@10k": 1.0})
+        rows = compare_results(baseline, current, threshold=0.10)
+        self.assertEqual([(row[0], row[4]) for row in rows], [("sort.white@10k", False), ("search.x@10k", True)])
+
+    def test_corpus_is_deterministic(self):
+        first = list(iter_corpus_games(30, build_pool(seed=7, pool_size=20), seed=7))
+        second = list(iter_corpus_games(30, build_pool(seed=7, pool_size=20), seed=7))
+        self.assertEqual(len(first), 30)
+        self.assertEqual([_without_payloads(g) for g in first], [_without_payloads(g) for g in second])
+
+    def test_scratch_data_dir_copies_tracked_files_and_cleans_up(self):
+        with scratch_data_dir() as data_dir:
+            self.assertNotEqual(data_dir.parent, REPO_ROOT)
+            for name in TRACKED_DATA_FILES:
+                self.assertEqual((data_dir / name).read_bytes(), (REPO_ROOT / name).read_bytes())
+            (data_dir / "cara_test.log").write_text("x")
+        self.assertFalse(data_dir.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""PGN view: a single comment edit patches the document in place."""
+
+from __future__ import annotations
+
+import io
+import os
+import unittest
+from unittest import mock
+
+# Must be set before QApplication is created (CI / headless have no xcb display).
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import chess.pgn
+from PyQt6.QtWidgets import QApplication
+
+from app.config.config_loader import ConfigLoader
+from app.services.pgn_service import PgnService
+from app.views.detail_pgn_view import DetailPgnView
+
+PGN = (
+    '[Event "Patch"]\n[White "A"]\n[Black "B"]\n\n'
+    "1. e4 {king pawn} e5 2. Nf3 Nc6 (2... d6 {philidor} 3. d4) 3. Bb5 a6 4. Ba4 {pin} Nf6 *\n"
+)
+
+
+def _with_comment(pgn: str, ply: int, comment: str) -> str:
+    game = chess.pgn.read_game(io.StringIO(pgn))
+    list(game.mainline())[ply - 1].comment = comment
+    return PgnService.export_game_to_pgn(game)
+
+
+class TestCommentPatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication([])
+        cls.config = ConfigLoader().load()
+
+    def _view(self, text: str) -> DetailPgnView:
+        view = DetailPgnView(self.config)
+        view.set_pgn_text(text)
+        return view
+
+    def _assert_same_as_full_render(self, view: DetailPgnView, text: str) -> None:
+        reference = self._view(text)
+        self.assertEqual(view.pgn_text.toPlainText(), reference.pgn_text.toPlainText())
+        self.assertEqual(view._range_map, reference._range_map)
+        self.assertEqual(view._current_formatted_html, reference._current_formatted_html)
+
+    def test_comment_edit_is_patched_without_formatting(self) -> None:
+        base = PgnService.export_game_to_pgn(chess.pgn.read_game(io.StringIO(PGN)))
+        view = self._view(base)
+        edited = _with_comment(base, 1, "king pawn, the most popular first move")
+        with mock.patch.object(view.pgn_text, "setHtml") as set_html, mock.patch(
+            "app.services.pgn_display_render.render_pgn_for_display"
+        ) as render:
+            self.assertTrue(view._apply_comment_edit(edited))
+        set_html.assert_not_called()
+        render.assert_not_called()
+        self.assertEqual(view._current_pgn_text, edited)
+        self._assert_same_as_full_render(view, edited)
+
+    def test_hidden_comments_keep_the_document(self) -> None:
+        view = DetailPgnView(self.config)
+        view.set_show_comments(False)
+        view.set_pgn_text(PGN)
+        html = view._current_formatted_html
+        self.assertTrue(view._apply_comment_edit(PGN.replace("{pin}", "{pinned knight}")))
+        self.assertEqual(view._current_formatted_html, html)
+
+    def test_structural_edits_fall_back(self) -> None:
+        view = self._view(PGN)
+        self.assertFalse(view._apply_comment_edit(PGN.replace(" a6 ", " {new} a6 ")))
+        self.assertFalse(view._apply_comment_edit(PGN.replace("4. Ba4", "4. Bc4")))
+        view.set_show_annotations(False)  # takes effect on the next full render
+        self.assertFalse(view._apply_comment_edit(PGN.replace("{pin}", "{x}")))
+
+
+if __name__ == "__main__":
+    unittest.main()
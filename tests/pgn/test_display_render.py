@@ -0,0 +1,96 @@
+"""PGN view rendering: single format pass, move table from unfiltered text, render cache."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from app.config.config_loader import ConfigLoader
+from app.services.pgn_display_render import (
+    COMMENT_FRAGMENT_HREF,
+    PgnDisplayOptions,
+    PgnDisplayRenderCache,
+    find_comment_edit,
+    render_comment_fragment,
+    render_pgn_for_display,
+)
+from app.services.pgn_formatter_service import PgnFormatterService, PgnRangeMap, PgnTextRange
+
+PGN = '[Event "Test"]\n[White "A"]\n[Black "B"]\n\n1. e4 {open} e5 (1... c5 2. Nf3) 2. Nf3 $1 Nc6 1-0\n'
+FEN_PGN = '[SetUp "1"]\n[FEN "4k3/8/8/8/8/8/8/4K2R w K - 0 30"]\n\n30. Rh8+ Kd7 31. Rh7+ *\n'
+
+
+class TestPgnDisplayRender(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.config = ConfigLoader().load()
+
+    def test_matches_two_pass_formatting(self) -> None:
+        options = PgnDisplayOptions(show_comments=False, indent_variations=False)
+        render = render_pgn_for_display(PGN, self.config, options)
+        filtered = PgnFormatterService.filter_pgn_for_display(PGN, show_comments=False)
+        html, _ = PgnFormatterService.format_pgn_to_html(filtered, self.config, 0, pgn_notation_settings={})
+        self.assertEqual(render.html, html)
+        self.assertEqual(render.move_info, PgnFormatterService.format_pgn_to_html(PGN, self.config)[1])
+
+    def test_move_info_uses_unfiltered_headers(self) -> None:
+        render = render_pgn_for_display(FEN_PGN, self.config, PgnDisplayOptions(show_metadata=False))
+        self.assertEqual([san for san, _, _ in render.move_info], ["Rh8+", "Kd7", "Rh7+"])
+        self.assertNotIn("FEN", render.html)
+
+    def test_cache_hits_and_evicts_least_recently_used(self) -> None:
+        cache = PgnDisplayRenderCache(self.config, max_entries=2)
+        shown, hidden = PgnDisplayOptions(), PgnDisplayOptions(show_variations=False)
+        with mock.patch(
+            "app.services.pgn_display_render.render_pgn_for_display",
+            wraps=render_pgn_for_display,
+        ) as render:
+            first = cache.get(PGN, shown)
+            cache.get(PGN, hidden)
+            self.assertIs(cache.get(PGN, shown), first)
+            self.assertEqual(render.call_count, 2)
+            cache.get(FEN_PGN, shown)  # evicts (PGN, hidden)
+            cache.get(PGN, hidden)
+            self.assertEqual(render.call_count, 4)
+        self.assertEqual(len(cache), 2)
+
+    def test_notation_settings_are_part_of_the_key(self) -> None:
+        a = PgnDisplayOptions(notation=PgnDisplayOptions.notation_key({"show_nag_text": True, "use_symbols_for_nags": False}))
+        b = PgnDisplayOptions(notation=PgnDisplayOptions.notation_key({"use_symbols_for_nags": False, "show_nag_text": True}))
+        c = PgnDisplayOptions(notation=PgnDisplayOptions.notation_key({"show_nag_text": False}))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+
+    def test_find_comment_edit_ignores_rewrapping(self) -> None:
+        new = PGN.replace("{open}", "{open\nand longer}").replace(" 2. Nf3", "\n2. Nf3", 1)
+        edit = find_comment_edit(PGN, new)
+        self.assertEqual((edit.index, edit.comment_count), (0, 1))
+        self.assertEqual((edit.old_comment, edit.new_comment), ("open", "open and longer"))
+
+    def test_find_comment_edit_rejects_other_changes(self) -> None:
+        self.assertIsNone(find_comment_edit(PGN, PGN))
+        self.assertIsNone(find_comment_edit(PGN, PGN.replace("{open}", "")))
+        self.assertIsNone(find_comment_edit(PGN, PGN.replace("{open} e5", "{x} e6")))
+        self.assertIsNone(find_comment_edit(PGN, PGN.replace('"A"', '"C"').replace("{open}", "{x}")))
+
+    def test_comment_fragment_matches_full_render(self) -> None:
+        options = PgnDisplayOptions()
+        fragment = render_comment_fragment("mid <x> $1 [%evp 1,2]", self.config, options)
+        full = render_pgn_for_display("1. e4 {mid <x> $1 [%evp 1,2]} e5 *", self.config, options).html
+        self.assertIn(fragment.html, full)
+        self.assertIn(f'href="{COMMENT_FRAGMENT_HREF}"', fragment.html)
+        self.assertEqual(fragment.text, "{mid <x> !}")
+
+    def test_range_map_resize_shifts_later_ranges(self) -> None:
+        rm = PgnRangeMap(
+            moves=(PgnTextRange(1, 0, 2), PgnTextRange(2, 10, 12)),
+            comments=(PgnTextRange(1, 3, 9),),
+        )
+        resized = rm.with_range_resized(3, 9, 5)
+        self.assertEqual(resized.moves, (PgnTextRange(1, 0, 2), PgnTextRange(2, 6, 8)))
+        self.assertEqual(resized.comments, (PgnTextRange(1, 3, 5),))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Tests for the shared per-position feature layer and the analyzer cache."""
+
+import unittest
+
+import chess
+
+from app.config.config_loader import ConfigLoader
+from app.controllers.positional_heatmap_controller import HeatmapPrecomputeThread
+from app.services.positional_heatmap.position_features import PositionFeatures
+from app.services.positional_heatmap.positional_analyzer import PositionalAnalyzer
+from app.services.positional_heatmap.rule_registry import RuleRegistry
+
+
+FENS = [
+    chess.STARTING_FEN,
+    "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+]
+
+PGN = (
+    '[Event "t"]\n[White "A"]\n[Black "B"]\n[Result "*"]\n\n'
+    "1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 *\n"
+)
+
+
+class TestPositionFeatures(unittest.TestCase):
+    """Features match the per-square python-chess queries they replace."""
+
+    def test_attacks_match_is_attacked_by(self):
+        for fen in FENS:
+            board = chess.Board(fen)
+            features = PositionFeatures(board)
+            for color in chess.COLORS:
+                for square in chess.SQUARES:
+                    self.assertEqual(
+                        features.is_attacked_by(color, square),
+                        board.is_attacked_by(color, square),
+                        f"{fen} {chess.square_name(square)}",
+                    )
+
+    def test_legal_move_counts_match_per_piece_generation(self):
+        for fen in FENS:
+            board = chess.Board(fen)
+            features = PositionFeatures(board)
+            for color in chess.COLORS:
+                temp_board = board.copy()
+                temp_board.turn = color
+                for square in chess.SquareSet(temp_board.occupied_co[color]):
+                    expected = sum(1 for move in temp_board.legal_moves if move.from_square == square)
+                    self.assertEqual(features.legal_move_count(color, square), expected)
+
+    def test_pawn_structure(self):
+        board = chess.Board("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1")
+        features = PositionFeatures(board)
+        self.assertEqual(features.pawn_file_counts(chess.WHITE)[4], 1)
+        self.assertTrue(features.has_pawn_on_file(chess.BLACK, 5))
+        self.assertEqual(set(features.isolated_pawns(chess.WHITE)), {chess.B5, chess.E2, chess.G2})
+        self.assertEqual(set(features.isolated_pawns(chess.BLACK)), {chess.F4})
+        # f4 is stopped by the e2/g2 pawns on adjacent files
+        self.assertEqual(set(features.passed_pawns(chess.BLACK)), set())
+        # Pawns on their starting rank are never counted as passed
+        self.assertNotIn(chess.E2, features.passed_pawns(chess.WHITE))
+        self.assertEqual(features.king_zone_files(chess.WHITE), [0, 1])
+
+        passed = PositionFeatures(chess.Board("k7/8/2p5/3P4/8/6p1/8/K7 w - - 0 1"))
+        self.assertEqual(set(passed.passed_pawns(chess.WHITE)), set())
+        self.assertEqual(set(passed.passed_pawns(chess.BLACK)), {chess.G3})
+
+
+class TestPositionalAnalyzerCache(unittest.TestCase):
+    """Combined board scores, LRU eviction and background precompute."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.heatmap_config = ConfigLoader().load()["ui"]["positional_heatmap"]
+
+    def _analyzer(self, **overrides) -> PositionalAnalyzer:
+        config = dict(self.heatmap_config, **overrides)
+        return PositionalAnalyzer(config, RuleRegistry(config))
+
+    def test_analyze_board_combines_perspectives(self):
+        analyzer = self._analyzer()
+        board = chess.Board(FENS[1])
+        combined = analyzer.analyze_board(board)
+        white = analyzer.analyze_position(board, chess.WHITE)
+        black = analyzer.analyze_position(board, chess.BLACK)
+        expected = dict(white)
+        for square, score in black.items():
+            expected[square] = expected.get(square, 0.0) + score
+        self.assertEqual(set(combined), set(expected))
+        for square, score in expected.items():
+            self.assertAlmostEqual(combined[square], score)
+        self.assertTrue(analyzer.is_cached(board))
+
+    def test_cache_evicts_least_recently_used(self):
+        analyzer = self._analyzer(max_cache_size=4)
+        boards = [chess.Board(fen) for fen in FENS[:3]]
+        analyzer.analyze_board(boards[0])
+        analyzer.analyze_board(boards[1])
+        # Touch the first position so the second becomes the oldest
+        analyzer.analyze_board(boards[0])
+        analyzer.analyze_board(boards[2])
+        self.assertEqual(analyzer.get_cache_size(), 4)
+        self.assertTrue(analyzer.is_cached(boards[0]))
+        self.assertFalse(analyzer.is_cached(boards[1]))
+        self.assertTrue(analyzer.is_cached(boards[2]))
+
+    def test_precompute_fills_cache_for_every_ply(self):
+        analyzer = self._analyzer()
+        thread = HeatmapPrecomputeThread(analyzer, PGN, start_ply=3)
+        thread.run()
+        boards = thread._mainline_boards()
+        self.assertEqual(len(boards), 9)
+        self.assertTrue(all(analyzer.is_cached(board) for board in boards))
+
+    def test_precompute_respects_cancel(self):
+        analyzer = self._analyzer()
+        thread = HeatmapPrecomputeThread(analyzer, PGN)
+        thread.cancel()
+        thread.run()
+        self.assertEqual(analyzer.get_cache_size(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
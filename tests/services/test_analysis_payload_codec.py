@@ -0,0 +1,148 @@
+"""Tests for versioned tag payloads and the binary CARAAnalysisData encoding."""
+
+import unittest
+
+from app.models.database_model import GameData
+from app.services.analysis_data_storage_service import AnalysisDataStorageService
+from app.services.analysis_payload_codec import decode_moves, encode_moves, is_binary_moves
+from app.services.notes_storage_service import NotesStorageService
+from app.utils import pgn_tag_compression
+from app.utils.pgn_tag_compression import (
+    PayloadCodecUnavailableError,
+    compress_and_encode,
+    compute_checksum,
+    configure_payload_codec,
+    decode_and_decompress_to_str,
+    decode_payload,
+    decode_payloads,
+    encode_payload,
+    payload_codec,
+    payload_format,
+)
+from app.utils.pgn_header_utils import read_header_tag_values
+from tests.highlight_rules.helpers import moves_from_pgn
+
+SAN = "1. e4 e5 2. Nf3 Nc6 3. Bc4 Nd4 4. Nxe5 Qg5 5. Nxf7 Qxg2 6. Rf1 Qxe4+ 7. Be2 Nf3#"
+PGN = f'[Event "t"]\n[White "A"]\n[Black "B"]\n[Result "0-1"]\n\n{SAN} 0-1\n'
+
+
+def _moves():
+    moves = moves_from_pgn(SAN, analysis={4: {"black": {"cpl": "300", "assess": "Blunder", "eval": "+3.0"}}})
+    moves[0].comment = "Ünïcode"
+    moves[1].black_is_top3 = True
+    moves[2].white_seldepth = 31
+    return moves
+
+
+class PayloadCodecTests(unittest.TestCase):
+    def tearDown(self):
+        configure_payload_codec(None)
+
+    def test_codecs_round_trip_with_marker(self):
+        data = b"payload " * 200
+        for codec in pgn_tag_compression.available_codecs():
+            with self.subTest(codec=codec):
+                encoded = encode_payload(data, codec)
+                self.assertEqual(payload_format(encoded), codec)
+                self.assertEqual(decode_payload(encoded), data)
+        self.assertTrue(encode_payload(data).startswith("z2:"))
+
+    def test_legacy_gzip_payload_still_readable(self):
+        legacy = compress_and_encode("é".encode("utf-8"), compresslevel=9)
+        self.assertEqual(payload_format(legacy), "gzip")
+        self.assertEqual(decode_and_decompress_to_str(legacy), "é")
+
+    def test_configuration(self):
+        self.assertEqual(configure_payload_codec({"pgn": {"tag_payload": {"codec": "lzma", "level": 42}}}), ("lzma", 9))
+        self.assertTrue(encode_payload(b"x").startswith("x2:"))
+        if "zstd" not in pgn_tag_compression.available_codecs():
+            self.assertEqual(configure_payload_codec({"pgn": {"tag_payload": {"codec": "zstd"}}})[0], "zlib")
+            with self.assertRaises(ValueError):
+                decode_payload("s2:AAAA")
+        configure_payload_codec(None)
+        self.assertEqual(payload_codec(), ("zlib", 6))
+
+    def test_corrupted_payloads(self):
+        with self.assertRaises(ValueError):
+            decode_payload("z2:bm90IHpsaWI=")
+        self.assertEqual(decode_payloads([encode_payload(b"ok"), "z2:@@"]), [b"ok", None])
+
+    def test_unavailable_codec_keeps_tags(self):
+        original = pgn_tag_compression._zstd
+        pgn_tag_compression._zstd = None
+        try:
+            with self.assertRaises(PayloadCodecUnavailableError):
+                decode_payload("s2:KLUv/QBYAQAAb2s=")
+            pgn = PGN.replace(
+                '[Result "0-1"]',
+                '[Result "0-1"]\n[CARAAnalysisData "s2:AAAA"]\n[CARANotes "s2:AAAA"]',
+            )
+            game = GameData(game_number=1, pgn=pgn)
+            with self.assertRaises(PayloadCodecUnavailableError):
+                AnalysisDataStorageService.load_analysis_data(game)
+            self.assertEqual(NotesStorageService.load_notes(game), "")
+            self.assertIn("CARAAnalysisData", game.pgn)
+            self.assertIn("CARANotes", game.pgn)
+        finally:
+            pgn_tag_compression._zstd = original
+
+
+class BinaryAnalysisPayloadTests(unittest.TestCase):
+    def test_binary_moves_round_trip(self):
+        moves = _moves()
+        data = encode_moves(moves)
+        self.assertTrue(is_binary_moves(data))
+        self.assertEqual([vars(m) for m in decode_moves(data)], [vars(m) for m in moves])
+        with self.assertRaises(ValueError):
+            decode_moves(data[:100])
+
+    def test_nul_in_text_falls_back_to_json(self):
+        moves = _moves()
+        moves[0].comment = "a\x00b"
+        with self.assertRaises(ValueError):
+            encode_moves(moves)
+        payload = AnalysisDataStorageService._moves_to_payload(moves)
+        self.assertFalse(is_binary_moves(payload))
+        self.assertEqual(AnalysisDataStorageService._moves_from_payload(payload)[0].comment, "a\x00b")
+
+    def test_stored_tag_is_binary_and_smaller(self):
+        game = GameData(game_number=1, pgn=PGN)
+        self.assertTrue(AnalysisDataStorageService.store_analysis_data(game, _moves(), {}))
+        tags = read_header_tag_values(game.pgn, ("CARAAnalysisData", "CARAAnalysisChecksum"))
+        self.assertEqual(payload_format(tags["CARAAnalysisData"]), "zlib")
+        payload = decode_payload(tags["CARAAnalysisData"])
+        self.assertTrue(is_binary_moves(payload))
+        self.assertEqual(tags["CARAAnalysisChecksum"], compute_checksum(payload))
+        legacy = compress_and_encode(AnalysisDataStorageService._moves_to_json(_moves()).encode("utf-8"))
+        self.assertLess(len(tags["CARAAnalysisData"]), len(legacy))
+        loaded = AnalysisDataStorageService.load_analysis_data(game)
+        self.assertEqual([vars(m) for m in loaded], [vars(m) for m in _moves()])
+        self.assertIn('"black_is_top3": true', AnalysisDataStorageService.get_raw_analysis_data(game))
+
+    def test_legacy_json_tag_still_loads(self):
+        json_bytes = AnalysisDataStorageService._moves_to_json(_moves()).encode("utf-8")
+        game = GameData(game_number=1, pgn=PGN.replace(
+            '[Result "0-1"]',
+            f'[Result "0-1"]\n[CARAAnalysisData "{compress_and_encode(json_bytes)}"]\n'
+            f'[CARAAnalysisChecksum "{compute_checksum(json_bytes)}"]',
+        ))
+        loaded = AnalysisDataStorageService.load_analysis_data(game)
+        self.assertEqual([vars(m) for m in loaded], [vars(m) for m in _moves()])
+
+    def test_json_payload_option(self):
+        game = GameData(game_number=1, pgn=PGN)
+        config = {"pgn": {"tag_payload": {"binary_analysis": False}}}
+        AnalysisDataStorageService.store_analysis_data(game, _moves(), config)
+        encoded = read_header_tag_values(game.pgn, ("CARAAnalysisData",))["CARAAnalysisData"]
+        self.assertTrue(decode_payload(encoded).startswith(b"["))
+        self.assertEqual(len(AnalysisDataStorageService.load_analysis_data(game)), len(_moves()))
+
+    def test_batch_api(self):
+        payloads = AnalysisDataStorageService.encode_analysis_payloads([_moves(), _moves()[:2]])
+        payloads.append((payloads[0][0], "bad checksum"))
+        decoded = AnalysisDataStorageService.decode_analysis_payloads(payloads)
+        self.assertEqual([len(m) if m else None for m in decoded], [len(_moves()), 2, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""Tests for the binary analysis sidecar store and its use by AnalysisDataStorageService."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.config.config_loader import ConfigLoader
+from app.models.database_model import GameData
+from app.services import analysis_sidecar_store
+from app.services.analysis_data_storage_service import AnalysisDataStorageService
+from app.services.analysis_sidecar_store import AnalysisSidecarStore, analysis_game_key
+from app.services.highlight_batch_service import HighlightBatchService
+from app.services.player_stats_service import build_stats_job
+from tests.highlight_rules.helpers import moves_from_pgn
+
+SAN = "1. e4 e5 2. Nf3 Nc6 3. Bc4 Nd4 4. Nxe5 Qg5 5. Nxf7 Qxg2 6. Rf1 Qxe4+ 7. Be2 Nf3#"
+PGN = f'[Event "t"]\n[White "A"]\n[Black "B"]\n[Result "0-1"]\n\n{SAN} 0-1\n'
+
+
+def _moves():
+    moves = moves_from_pgn(
+        SAN,
+        analysis={
+            4: {"black": {"cpl": "300", "assess": "Blunder", "eval": "+3.0"}},
+            7: {"black": {"cpl": "0", "assess": "Best Move", "eval": "-M1"}},
+        },
+    )
+    moves[0].comment = "Ünïcode comment"
+    moves[1].white_is_top3 = True
+    moves[2].white_depth = 22
+    return moves
+
+
+class AnalysisSidecarStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "analysis.caraanalysis"
+        self.store = AnalysisSidecarStore(self.path)
+
+    def tearDown(self):
+        AnalysisSidecarStore.set_active(None)
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_round_trip_is_lossless(self):
+        moves = _moves()
+        self.store.put(b"k" * 16, moves)
+        loaded = self.store.get(b"k" * 16)
+        self.assertEqual([vars(m) for m in loaded], [vars(m) for m in moves])
+        self.assertIsNone(self.store.get(b"x" * 16))
+
+    def test_latest_write_wins_and_remove(self):
+        moves = _moves()
+        self.store.put(b"k" * 16, moves[:2])
+        self.store.put(b"k" * 16, moves)
+        self.assertEqual(len(self.store.get(b"k" * 16)), len(moves))
+        self.store.remove(b"k" * 16)
+        self.assertNotIn(b"k" * 16, self.store)
+        self.assertIsNone(self.store.get(b"k" * 16))
+
+    def test_reopen_and_torn_tail(self):
+        moves = _moves()
+        self.store.put(b"a" * 16, moves)
+        self.store.put(b"b" * 16, moves[:3])
+        self.store.remove(b"a" * 16)
+        self.store.close()
+        with open(self.path, "ab") as f:
+            f.write(b"\x00" * 10)  # Interrupted append
+        reopened = AnalysisSidecarStore(self.path)
+        try:
+            self.assertNotIn(b"a" * 16, reopened)
+            self.assertEqual(len(reopened.get(b"b" * 16)), 3)
+            reopened.put(b"c" * 16, moves)
+            self.assertEqual(len(reopened.get(b"c" * 16)), len(moves))
+        finally:
+            reopened.close()
+
+    def test_compaction_keeps_live_segments(self):
+        moves = _moves()
+        for _ in range(5):
+            self.store.put(b"a" * 16, moves)
+        self.store.put(b"b" * 16, moves[:1])
+        size_before = os.path.getsize(self.path)
+        self.store.compact()
+        self.assertLess(os.path.getsize(self.path), size_before)
+        self.assertEqual(len(self.store.get(b"a" * 16)), len(moves))
+        self.assertEqual(len(self.store.get(b"b" * 16)), 1)
+
+    def test_automatic_compaction(self):
+        original = analysis_sidecar_store.COMPACT_MIN_DEAD_BYTES
+        analysis_sidecar_store.COMPACT_MIN_DEAD_BYTES = 0
+        try:
+            for _ in range(4):
+                self.store.put(b"a" * 16, _moves())
+        finally:
+            analysis_sidecar_store.COMPACT_MIN_DEAD_BYTES = original
+        segment_size = len(self.store.get_segment(b"a" * 16))
+        self.assertLess(os.path.getsize(self.path), 3 * segment_size)
+
+    def test_key_ignores_comments_variations_and_analysis_tags(self):
+        key = analysis_game_key(PGN)
+        annotated = PGN.replace("2. Nf3", "{ good } 2. Nf3 (2. f4 exf4) $1").replace(
+            '[Result "0-1"]', '[Result "0-1"]\n[CARAAnalysisData "abc"]\n[Annotator "x"]'
+        )
+        self.assertEqual(analysis_game_key(annotated), key)
+        self.assertNotEqual(analysis_game_key(PGN.replace("6. Rf1", "6. Kf1")), key)
+        self.assertNotEqual(analysis_game_key(PGN.replace('White "A"', 'White "C"')), key)
+
+
+class SidecarStorageServiceTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = ConfigLoader().load()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = AnalysisSidecarStore(Path(self.tmp.name) / "analysis.caraanalysis")
+        AnalysisSidecarStore.set_active(self.store)
+
+    def tearDown(self):
+        AnalysisSidecarStore.set_active(None)
+        self.tmp.cleanup()
+
+    def _config(self, embed):
+        config = dict(self.config)
+        config["game_analysis"] = dict(config.get("game_analysis", {}), analysis_store={"embed_pgn_tag": embed})
+        return config
+
+    def test_sidecar_only_storage(self):
+        game = GameData(game_number=1, white="A", black="B", result="0-1", pgn=PGN)
+        moves = _moves()
+        self.assertTrue(AnalysisDataStorageService.store_analysis_data(game, moves, self._config(False)))
+        self.assertNotIn(AnalysisDataStorageService.TAG_NAME, game.pgn)
+        self.assertTrue(game.analyzed)
+        self.assertTrue(AnalysisDataStorageService.has_analysis_data(game))
+        loaded = AnalysisDataStorageService.load_analysis_data(game)
+        self.assertEqual([vars(m) for m in loaded], [vars(m) for m in moves])
+        self.assertIn('"white_move": "e4"', AnalysisDataStorageService.get_raw_analysis_data(game))
+
+    def test_tag_load_does_not_write_store(self):
+        game = GameData(game_number=1, white="A", black="B", result="0-1", pgn=PGN)
+        AnalysisSidecarStore.set_active(None)
+        AnalysisDataStorageService.store_analysis_data(game, _moves(), self.config)
+        self.assertIn(AnalysisDataStorageService.TAG_NAME, game.pgn)
+        AnalysisSidecarStore.set_active(self.store)
+        self.assertEqual(len(AnalysisDataStorageService.load_analysis_data(game)), len(_moves()))
+        self.assertNotIn(analysis_game_key(game.pgn), self.store)
+
+    def test_header_edit_moves_entry_to_new_key(self):
+        game = GameData(game_number=1, white="A", black="B", result="0-1", pgn=PGN)
+        AnalysisDataStorageService.store_analysis_data(game, _moves(), self._config(False))
+        old_pgn = game.pgn
+        game.pgn = old_pgn.replace('[White "A"]', '[White "Z"]')
+        AnalysisDataStorageService.sync_sidecar_after_pgn_edit(game, old_pgn)
+        self.assertNotIn(analysis_game_key(old_pgn), self.store)
+        self.assertEqual(len(AnalysisDataStorageService.load_analysis_data(game)), len(_moves()))
+
+    def test_removing_tag_removes_entry(self):
+        game = GameData(game_number=1, white="A", black="B", result="0-1", pgn=PGN)
+        AnalysisDataStorageService.store_analysis_data(game, _moves(), self._config(True))
+        old_pgn = game.pgn
+        self.assertTrue(AnalysisDataStorageService._remove_analysis_tags(game))
+        AnalysisDataStorageService.sync_sidecar_after_pgn_edit(game, old_pgn)
+        self.assertFalse(AnalysisDataStorageService.has_analysis_data(game))
+        self.assertIsNone(AnalysisDataStorageService.load_analysis_data(game))
+
+    def test_worker_payload_is_sidecar_segment(self):
+        game = GameData(game_number=1, white="A", black="B", result="0-1", pgn=PGN)
+        AnalysisDataStorageService.store_analysis_data(game, _moves(), self._config(False))
+        job = build_stats_job(game, 0)
+        self.assertIsInstance(job[1], bytes)
+        decoded = AnalysisDataStorageService.decode_analysis_payload(job[1], job[2])
+        self.assertEqual(len(decoded), len(_moves()))
+        self.assertIsNone(AnalysisDataStorageService.decode_analysis_payload(job[1], "sidecar:other"))
+        key = HighlightBatchService.cache_key(job[1], None, "settings")
+        self.assertTrue(key[0].startswith("payload:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Tests for the PDF board-diagram raster cache and batch report export."""
+
+import os
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import chess
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QApplication
+
+from app.config.config_loader import ConfigLoader
+from app.models.database_model import GameData
+from app.services.board_diagram_cache import BoardDiagramCache, DiagramRequest
+from app.services.game_report_pdf_service import GameReportJob, GameReportPDFService
+from app.services.game_summary_service import GameSummaryService
+from app.views.widgets.mini_chessboard_widget import MiniChessBoardWidget
+from tests.highlight_rules.helpers import moves_from_pgn
+
+SAN = "1. e4 e5 2. Nf3 Nc6 3. Bc4 Nd4 4. Nxe5 Qg5 5. Nxf7 Qxg2 6. Rf1 Qxe4+ 7. Be2 Nf3#"
+OTHER_SAN = "1. d4 d5 2. c4 e6 3. Nc3 Nf6 4. Bg5 Be7 5. e3 O-O 6. Nf3 h6 7. Bh4 b6 8. cxd5 Nxd5"
+FEN_BEFORE = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+_APP = None
+
+
+def _ensure_app() -> QApplication:
+    global _APP
+    _APP = QApplication.instance() or QApplication([])
+    return _APP
+
+
+def _pdf_content(path: Path) -> bytes:
+    """PDF bytes without the per-document random ids and timestamps."""
+    data = path.read_bytes()
+    data = re.sub(rb"uuid:[0-9a-f-]+", b"", data)
+    data = re.sub(rb"D:\d{14}[^)]*", b"", data)
+    data = re.sub(rb"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d[^<]*", b"", data)
+    return re.sub(rb"/ID \[[^\]]*\]", b"", data)
+
+
+def _requests():
+    board = chess.Board()
+    requests = []
+    for san in "e4 e5 Nf3 Nc6 Bb5 a6 Ba4 Nf6".split():
+        fen_before = board.fen()
+        board.push_san(san)
+        requests.append(DiagramRequest(board.fen(), 48, fen_before, san))
+    return requests
+
+
+class BoardDiagramCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        _ensure_app()
+        cls.config = ConfigLoader().load()
+
+    def test_key_ignores_move_counters_but_not_arrow_or_size(self):
+        cache = BoardDiagramCache(self.config, render_scale=2)
+        fen = FEN_BEFORE
+        self.assertEqual(cache.key(fen, size=64), cache.key(fen.replace(" 2 3", " 0 9"), size=64))
+        self.assertNotEqual(cache.key(fen, size=64), cache.key(fen, size=72))
+        board = chess.Board(FEN_BEFORE)
+        board.push_san("Bb5")
+        self.assertEqual(cache.key(board.fen(), FEN_BEFORE, "Bb5", size=64)[1], "f1b5")
+        self.assertEqual(cache.key(board.fen(), FEN_BEFORE, "Qh8", size=64)[1], "")
+
+    def test_matches_mini_board_widget(self):
+        board = chess.Board(FEN_BEFORE)
+        move = board.parse_san("Bb5")
+        board.push(move)
+        widget = MiniChessBoardWidget(self.config, board.fen(), embedded=True, size_override=96)
+        widget.set_move(move, True)
+        expected = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+        expected.fill(Qt.GlobalColor.white)
+        widget.render(expected)
+
+        image = BoardDiagramCache(self.config, render_scale=2).image(
+            board.fen(), FEN_BEFORE, "Bb5", size=48
+        )
+        self.assertEqual(image.size(), expected.size())
+        worst = 0
+        for y in range(0, image.height(), 2):
+            for x in range(0, image.width(), 2):
+                a, b = image.pixel(x, y), expected.pixel(x, y)
+                worst = max(worst, max(abs(((a >> s) & 255) - ((b >> s) & 255)) for s in (0, 8, 16)))
+        self.assertLessEqual(worst, 8)
+
+    def test_prepare_renders_each_board_once(self):
+        cache = BoardDiagramCache(self.config, render_scale=2, max_workers=4)
+        requests = _requests()
+        self.assertEqual(cache.prepare(requests + requests), len(requests))
+        self.assertEqual(cache.prepare(requests), 0)
+        first = requests[0]
+        cache.image(first.fen, first.fen_before, first.san, size=first.size)
+        self.assertEqual(cache.rendered, len(requests))
+
+    def test_least_recently_used_boards_are_dropped(self):
+        cache = BoardDiagramCache(self.config, max_entries=3)
+        requests = _requests()
+        cache.prepare(requests)
+        self.assertEqual(len(cache), 3)
+        cache.image(chess.STARTING_FEN, size=40)
+        self.assertEqual(len(cache), 3)
+
+
+class GameReportExportTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        _ensure_app()
+        cls.config = ConfigLoader().load()
+
+    def test_repeated_export_reuses_cached_boards(self):
+        moves = moves_from_pgn(
+            SAN, analysis={4: {"black": {"cpl": "300", "assess": "Blunder", "eval": "+3.0"}}}
+        )
+        summary = GameSummaryService(self.config).calculate_summary(moves, len(moves), "0-1")
+        game = GameData(game_number=1, white="A", black="B", result="0-1", pgn=f"{SAN} 0-1\n")
+        service = GameReportPDFService(self.config)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = service.export(Path(tmp) / "game", summary=summary, moves=moves, game=game)
+            self.assertEqual(path.name, "game.pdf")
+            self.assertTrue(path.read_bytes().startswith(b"%PDF"))
+            rendered = service._diagrams.rendered
+            self.assertGreater(rendered, 0)
+            service.export(Path(tmp) / "again.pdf", summary=summary, moves=moves, game=game)
+            self.assertEqual(service._diagrams.rendered, rendered)
+
+    def test_export_batch_writes_each_game_concurrently(self):
+        jobs_input = []
+        for number, (san, result) in enumerate(((SAN, "0-1"), (OTHER_SAN, "*")), start=1):
+            moves = moves_from_pgn(
+                san, analysis={4: {"black": {"cpl": "300", "assess": "Blunder", "eval": "+3.0"}}}
+            )
+            summary = GameSummaryService(self.config).calculate_summary(moves, len(moves), result)
+            game = GameData(
+                game_number=number, white=f"W{number}", black=f"B{number}", result=result,
+                pgn=f"{san} {result}\n",
+            )
+            jobs_input.append((summary, moves, game))
+        with tempfile.TemporaryDirectory() as tmp:
+            expected = [
+                _pdf_content(GameReportPDFService(self.config).export(
+                    Path(tmp) / f"single{i}", summary=summary, moves=moves, game=game
+                ))
+                for i, (summary, moves, game) in enumerate(jobs_input)
+            ]
+            self.assertNotEqual(expected[0], expected[1])
+            service = GameReportPDFService(self.config)
+            jobs = [
+                GameReportJob(Path(tmp) / f"game{i}", summary, moves, game)
+                for i, (summary, moves, game) in enumerate(jobs_input)
+            ]
+            paths = service.export_batch(jobs, max_workers=2)
+            self.assertEqual([p.name for p in paths], ["game0.pdf", "game1.pdf"])
+            for i, path in enumerate(paths):
+                self.assertTrue(path.exists())
+                self.assertEqual(_pdf_content(path), expected[i])
+
+
+if __name__ == "__main__":
+    unittest.main()
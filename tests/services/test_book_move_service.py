@@ -0,0 +1,110 @@
+"""Hash-based book move detection matches the Polyglot reader / FEN lookup it replaces."""
+
+import random
+import unittest
+
+import chess
+import chess.polyglot
+
+from app.config.config_loader import ConfigLoader
+from app.services.book_move_service import BookMoveService, polyglot_move_codes
+from app.services.opening_service import OpeningService
+
+
+def _reference_is_book_move(service, readers, board, move):
+    board_after = board.copy()
+    board_after.push(move)
+    if service.opening_service.is_book_position(board_after.fen()):
+        return True
+    return any(entry.move == move for reader in readers for entry in reader.find_all(board))
+
+
+class TestBookMoveService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = ConfigLoader().load()
+        opening_service = OpeningService.get_instance(cls.config)
+        opening_service.load()
+        cls.service = BookMoveService(cls.config, opening_service)
+        cls.readers = [chess.polyglot.open_reader(str(p)) for p in cls.service._book_file_paths()]
+
+    @classmethod
+    def tearDownClass(cls):
+        for reader in cls.readers:
+            reader.close()
+
+    def _random_line(self, rng, plies):
+        board = chess.Board()
+        moves = []
+        for _ in range(plies):
+            # Mostly follow the books so Polyglot hits are exercised too
+            entries = [e for reader in self.readers for e in reader.find_all(board)]
+            pool = [e.move for e in entries] if entries and rng.random() < 0.8 else list(board.legal_moves)
+            if not pool:
+                break
+            move = rng.choice(pool)
+            moves.append(move)
+            board.push(move)
+        return moves
+
+    def test_matches_reader_lookup(self):
+        if not self.readers:
+            self.skipTest("No Polyglot books configured")
+        rng = random.Random(7)
+        for _ in range(40):
+            moves = self._random_line(rng, rng.randint(1, 30))
+            board = chess.Board()
+            expected = []
+            for move in moves:
+                expected.append(_reference_is_book_move(self.service, self.readers, board, move))
+                self.assertEqual(self.service.is_book_move(board, move), expected[-1])
+                board.push(move)
+            self.assertEqual(self.service.book_move_flags(chess.Board(), moves), expected)
+
+    def test_precomputed_keys_give_same_flags(self):
+        board = chess.Board()
+        moves = [board.push_san(san) for san in ("e4", "c5", "Nf3", "d6", "Qe2", "a6")]
+        replay = chess.Board()
+        polyglot_keys, book_keys = [], []
+        for move in moves + [None]:
+            polyglot_keys.append(chess.polyglot.zobrist_hash(replay))
+            fuzzy = replay.copy(stack=False)
+            fuzzy.castling_rights = 0
+            fuzzy.ep_square = None
+            book_keys.append(chess.polyglot.zobrist_hash(fuzzy))
+            if move is not None:
+                replay.push(move)
+        flags = self.service.book_move_flags(chess.Board(), moves)
+        self.assertEqual(flags[:4], [True] * 4)
+        self.assertEqual(self.service.book_move_flags(chess.Board(), moves, polyglot_keys, book_keys), flags)
+
+    def test_castling_uses_polyglot_king_takes_rook_encoding(self):
+        self.assertEqual(
+            polyglot_move_codes(chess.Move.from_uci("e1g1"), is_king_move=True),
+            (chess.G1 | chess.E1 << 6, chess.H1 | chess.E1 << 6),
+        )
+        self.assertEqual(len(polyglot_move_codes(chess.Move.from_uci("e1g1"))), 1)
+        self.assertEqual(len(polyglot_move_codes(chess.Move.from_uci("e7e8q"))), 1)
+
+    def test_castling_encoding_only_applies_to_king_moves(self):
+        service = BookMoveService(
+            {"game_analysis": {"book_move_detection": {"use_opening_book": True}}},
+            self.service.opening_service,
+        )
+        king_takes_rook = chess.H1 | chess.E1 << 6
+        castle = chess.Board("4k3/8/8/8/8/8/8/4K2R w K - 0 1")
+        rook = chess.Board("4k3/8/8/8/8/8/7K/4R3 w - - 0 1")
+        service._polyglot_moves = {
+            chess.polyglot.zobrist_hash(castle): (king_takes_rook,),
+            chess.polyglot.zobrist_hash(rook): (king_takes_rook,),
+        }
+        service._is_loaded = True
+        e1g1 = chess.Move.from_uci("e1g1")
+        self.assertTrue(service.is_book_move(castle, e1g1))
+        self.assertFalse(service.is_book_move(rook, e1g1))
+        self.assertEqual(service.book_move_flags(castle, [e1g1]), [True])
+        self.assertEqual(service.book_move_flags(rook, [e1g1]), [False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Tests for the ECO Smart Update worker."""
+
+import unittest
+
+from app.config.config_loader import ConfigLoader
+from app.services.bulk_operation_stats import BulkProcessingOutcome
+from app.services.bulk_replace_service import (
+    _init_eco_worker,
+    _process_eco_batch,
+    _process_game_for_eco,
+)
+from app.services.opening_service import OpeningService
+
+
+def _pgn(eco: str, moves: str) -> str:
+    return (
+        '[Event "Test"]\n[White "A"]\n[Black "B"]\n[Result "*"]\n'
+        f'[ECO "{eco}"]\n\n{moves} *\n'
+    )
+
+
+SICILIAN = "1. e4 c5 2. Nf3 d6 3. d4 cxd4 4. Nxd4 Nf6 5. Nc3 a6"
+
+
+class TestBulkEcoUpdate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = ConfigLoader().load()
+        cls.service = OpeningService.get_instance(cls.config)
+        cls.service.load()
+        cls.expected = cls.service.get_final_eco_for_game(_pgn("A00", SICILIAN))
+
+    def test_rewrites_changed_tag(self):
+        self.assertIsNotNone(self.expected)
+        new_pgn, eco, outcome = _process_game_for_eco(self.service, _pgn("A00", SICILIAN))
+        self.assertEqual(outcome, BulkProcessingOutcome.UPDATED)
+        self.assertEqual(eco, self.expected)
+        self.assertIn(f'[ECO "{self.expected}"]', new_pgn)
+
+    def test_matching_tag_and_unclassified_game_are_skipped(self):
+        for pgn in (_pgn(self.expected, SICILIAN), _pgn("A00", "")):
+            self.assertEqual(
+                _process_game_for_eco(self.service, pgn),
+                (None, None, BulkProcessingOutcome.SKIPPED),
+            )
+
+    def test_worker_batch_keeps_positions(self):
+        _init_eco_worker(None, self.config)
+        results = _process_eco_batch([
+            (3, _pgn("A00", SICILIAN), None),
+            (7, _pgn(self.expected, SICILIAN), None),
+        ])
+        self.assertEqual([r[0] for r in results], [3, 7])
+        self.assertEqual(results[0][2:], (self.expected, BulkProcessingOutcome.UPDATED))
+        self.assertEqual(results[1][3], BulkProcessingOutcome.SKIPPED)
+
+
+if __name__ == "__main__":
+    unittest.main()
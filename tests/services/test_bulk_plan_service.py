@@ -11,7 +11,9 @@ from app.controllers.bulk_operations_controller import (
 )
 from app.services.bulk_operation_stats import BulkProcessingOutcome
 from app.services.bulk_plan_service import (
+    _init_plan_worker,
     _process_game_for_plan,
+    _process_plan_batch,
     plan_step_from_operation,
 )
 
@@ -89,6 +91,17 @@ class TestBulkPlanService(unittest.TestCase):
         self.assertIn('[Annotator "X"]', new_pgn)
         self.assertNotIn("{comment}", new_pgn)
 
+    def test_plan_batch_keeps_positions_and_outcomes(self) -> None:
+        _init_plan_worker(
+            _steps(BulkOperation(mode=MODE_REMOVE_TAGS, tags=("Annotator",)))
+        )
+        no_annotator = SAMPLE_PGN.replace('[Annotator "Old"]\n', "")
+        results = _process_plan_batch([(4, SAMPLE_PGN), (7, no_annotator)])
+        self.assertEqual([r[0] for r in results], [4, 7])
+        self.assertEqual(results[0][3], BulkProcessingOutcome.UPDATED)
+        self.assertNotIn("Annotator", results[0][1] or "")
+        self.assertEqual(results[1][3], BulkProcessingOutcome.SKIPPED)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for streamed database search batches and refinement detection."""
+
+from __future__ import annotations
+
+import unittest
+
+from app.models.database_model import DatabaseModel, GameData
+from app.models.search_criteria import LogicOperator, SearchCriteria, SearchField, SearchOperator
+from app.services.database_search_service import DatabaseSearchService
+
+
+def _database(rows):
+    model = DatabaseModel()
+    games = [
+        GameData(game_number=0, white=white, black=black, white_elo=elo, file_position=i + 1)
+        for i, (white, black, elo) in enumerate(rows)
+    ]
+    model.add_games_batch(games, mark_unsaved=False, tags_list=[[] for _ in games])
+    return model
+
+
+def _white(op, value, logic=None):
+    return SearchCriteria(SearchField.WHITE, op, value, logic)
+
+
+class StreamedSearchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.first = _database([("Carlsen", "Anand", "2850"), ("Caruana", "Carlsen", "2800"), ("Kasparov", "Karpov", "2810")])
+        self.second = _database([("Carlsen", "Nakamura", "2860"), ("Giri", "Carlsen", "2770")])
+        self.criteria = [_white(SearchOperator.CONTAINS, "car")]
+
+    def test_batches_match_full_search(self) -> None:
+        expected = DatabaseSearchService.search_databases([self.first, self.second], self.criteria, ["A", "B"])
+        batches = list(DatabaseSearchService.iter_search_batches(
+            [self.first, self.second], self.criteria, ["A", "B"], scan_chunk=2
+        ))
+        streamed = [item for batch in batches for item in batch.matches]
+        self.assertEqual(streamed, expected)
+        self.assertEqual([(b.database_index, b.scanned) for b in batches], [(0, 2), (0, 3), (1, 5)])
+        self.assertTrue(all(b.total == 5 for b in batches))
+        self.assertEqual([game.white for game, _name in expected], ["Carlsen", "Caruana", "Carlsen"])
+
+    def test_candidates_limit_tested_games(self) -> None:
+        candidates = [[self.first.get_game(1)], None]
+        results = DatabaseSearchService.search_databases(
+            [self.first, self.second], self.criteria, ["A", "B"], candidates=candidates
+        )
+        self.assertEqual([(game.white, name) for game, name in results], [("Caruana", "A"), ("Carlsen", "B")])
+
+
+class RefinementTests(unittest.TestCase):
+    def test_tightened_text_and_numeric_values(self) -> None:
+        elo = SearchCriteria(SearchField.WHITE_ELO, SearchOperator.GREATER_THAN_OR_EQUAL, "2400", LogicOperator.AND)
+        previous = [_white(SearchOperator.CONTAINS, "Carl"), elo]
+        narrower = [_white(SearchOperator.CONTAINS, "carlsen"), SearchCriteria(
+            SearchField.WHITE_ELO, SearchOperator.GREATER_THAN_OR_EQUAL, "2500", LogicOperator.AND)]
+        self.assertTrue(DatabaseSearchService.is_refinement(previous, narrower))
+        self.assertFalse(DatabaseSearchService.is_refinement(narrower, previous))
+
+    def test_appended_and_criterion_is_narrower(self) -> None:
+        previous = [_white(SearchOperator.EQUALS, "Carlsen")]
+        current = previous + [SearchCriteria(SearchField.RESULT, SearchOperator.EQUALS, "1-0", LogicOperator.AND)]
+        self.assertTrue(DatabaseSearchService.is_refinement(previous, current))
+        current[1].logic_operator = LogicOperator.OR
+        self.assertFalse(DatabaseSearchService.is_refinement(previous, current))
+
+    def test_other_changes_are_not_refinements(self) -> None:
+        previous = [_white(SearchOperator.EQUALS, "Carlsen")]
+        self.assertFalse(DatabaseSearchService.is_refinement(previous, [_white(SearchOperator.EQUALS, "Carlsen M")]))
+        self.assertFalse(DatabaseSearchService.is_refinement(previous, [_white(SearchOperator.CONTAINS, "Carlsen")]))
+        self.assertFalse(DatabaseSearchService.is_refinement(
+            [_white(SearchOperator.DOES_NOT_CONTAIN, "a")], [_white(SearchOperator.DOES_NOT_CONTAIN, "ab")]
+        ))
+        self.assertFalse(DatabaseSearchService.is_refinement([], previous))
+
+
+if __name__ == "__main__":
+    unittest.main()
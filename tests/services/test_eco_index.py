@@ -0,0 +1,158 @@
+"""Compiled ECO index: book hashing, exact-FEN collisions and rebuild on source change."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import chess
+import chess.polyglot
+
+from app.services.eco_index import (
+    EcoIndex,
+    book_hash,
+    book_hash_from_fen,
+    child_book_hash,
+    compile_eco_index,
+    filter_reachable,
+    home_pawn_mask,
+    load_eco_index,
+)
+
+_E4 = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+_E4_E5 = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+
+BASE = {
+    _E4: {"eco": "B00", "name": "King's Pawn Game", "moves": "1. e4", "src": "eco_tsv"},
+    _E4_E5: {"eco": "C20", "name": "King's Pawn Game", "moves": "1. e4 e5"},
+    # Same placement + side to move as _E4_E5, reached by a longer line
+    "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 2 4": {
+        "eco": "C20", "name": "Longer Line", "moves": "1. e4 e5 2. Nf3 Nf6 3. Ng1 Ng8",
+    },
+}
+INTERPOLATED = {
+    "rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2": {
+        "eco": "C20", "name": "King's Pawn Game", "moves": "1. e4 e5 2. Nf3",
+    },
+}
+
+
+class TestBookHash(unittest.TestCase):
+    def test_fen_and_board_hashes_agree(self):
+        board = chess.Board()
+        for san in ("e4", "c5", "Nf3", "d6", "d4", "cxd4", "Nxd4", "Nf6", "Nc3", "a6"):
+            board.push_san(san)
+            self.assertEqual(book_hash_from_fen(board.fen()), book_hash(board))
+
+    def test_matches_polyglot_without_castling_or_ep(self):
+        board = chess.Board("8/5k2/8/3p4/8/2N5/5K2/8 w - - 0 40")
+        self.assertEqual(book_hash(board), chess.polyglot.zobrist_hash(board))
+
+    def test_ignores_castling_ep_and_clocks_but_not_side_to_move(self):
+        fields = _E4.split(" ")
+        stripped = f"{fields[0]} b - e3 5 9"
+        self.assertEqual(book_hash_from_fen(stripped), book_hash_from_fen(_E4))
+        self.assertNotEqual(book_hash_from_fen(f"{fields[0]} w KQkq - 0 1"), book_hash_from_fen(_E4))
+
+    def test_child_hash_matches_push(self):
+        fens = (
+            chess.STARTING_FEN,
+            "r3k2r/pPpp1ppp/8/3Pp3/8/8/P1PP1PPP/R3K2R w KQkq e6 0 1",  # castling, ep, promotion captures
+            "r3k2r/8/8/8/3pP3/8/8/R3K2R b KQkq e3 0 1",
+        )
+        for fen in fens:
+            board = chess.Board(fen)
+            key = book_hash(board)
+            for move in board.legal_moves:
+                expected_board = board.copy()
+                expected_board.push(move)
+                self.assertEqual(child_book_hash(board, key, move), book_hash(expected_board), (fen, move))
+
+    def test_malformed_fen_is_none(self):
+        for fen in ("", "not a fen", "8/8/8 w", "9/8/8/8/8/8/8/8 w", "8/8/8/8/8/8/8/7x w", _E4.split(" ")[0]):
+            self.assertIsNone(book_hash_from_fen(fen), fen)
+
+
+class TestEcoIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = EcoIndex(compile_eco_index(BASE, INTERPOLATED, "sig"))
+
+    def test_roundtrip_counts_and_signature(self):
+        self.assertEqual(self.index.signature, "sig")
+        self.assertEqual(self.index.entry_count(), 4)
+        self.assertEqual(self.index.classified_count(), 2)
+        self.assertEqual(self.index.theory_count(), 3)
+        self.assertEqual([e.fen for e in self.index.iter_entries()], list(BASE) + list(INTERPOLATED))
+
+    def test_collision_prefers_exact_fen_then_longest_line(self):
+        key = book_hash_from_fen(_E4_E5)
+        self.assertTrue(self.index.needs_exact_fen(key))
+        self.assertEqual(self.index.classified_entry(key, _E4_E5).name, "King's Pawn Game")
+        self.assertEqual(self.index.classified_entry(key).name, "Longer Line")
+        self.assertEqual(self.index.classified_entry(key, _E4_E5.replace("0 2", "0 9")).name, "Longer Line")
+
+    def test_interpolated_rows_are_theory_only(self):
+        key = book_hash_from_fen(next(iter(INTERPOLATED)))
+        self.assertTrue(self.index.is_theory_key(key))
+        self.assertIsNone(self.index.classified_entry(key))
+        self.assertFalse(self.index.is_theory_key(book_hash(chess.Board())))
+
+    def test_reach_constraints_drop_once_pawns_leave_home(self):
+        board = chess.Board(_E4_E5)
+        reach = self.index.classified_reach
+        self.assertEqual(set(reach), {(home_pawn_mask(board), 32), (home_pawn_mask(chess.Board(_E4)), 32)})
+        self.assertEqual(len(filter_reachable(reach, home_pawn_mask(board), 32)), 1)
+        board.push_san("d4")
+        self.assertEqual(filter_reachable(reach, home_pawn_mask(board), 32), [])
+        self.assertEqual(filter_reachable(reach, home_pawn_mask(chess.Board()), 31), [])
+
+    def test_theory_graph_links_consecutive_book_positions(self):
+        start_children = self.index.theory_children(book_hash(chess.Board()))
+        self.assertEqual(
+            [(move.uci(), child) for move, child in start_children],
+            [("e2e4", book_hash_from_fen(_E4))],
+        )
+        children = self.index.theory_children(book_hash_from_fen(_E4_E5))
+        self.assertEqual([move.uci() for move, _ in children], ["g1f3"])
+        self.assertIsNone(self.index.theory_children(book_hash_from_fen("8/8/8/8/8/8/8/K6k w - - 0 1")))
+
+    def test_rejects_foreign_buffer(self):
+        with self.assertRaises(ValueError):
+            EcoIndex(b"not an index at all")
+
+
+class TestLoadEcoIndex(unittest.TestCase):
+    def test_reuses_file_until_sources_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ecolists = Path(tmp)
+            (ecolists / "eco_base.json").write_text(json.dumps(BASE), encoding="utf-8")
+            (ecolists / "eco_interpolated.json").write_text(json.dumps(INTERPOLATED), encoding="utf-8")
+            index_path = ecolists / "cache" / "eco_index.bin"
+
+            index, rebuilt = load_eco_index(ecolists, index_path)
+            self.assertTrue(rebuilt)
+            self.assertTrue(index_path.exists())
+            index.close()
+
+            index, rebuilt = load_eco_index(ecolists, index_path)
+            self.assertFalse(rebuilt)
+            self.assertEqual(index.classified_count(), 2)
+            index.close()
+
+            base = dict(BASE)
+            base.pop(_E4)
+            (ecolists / "eco_base.json").write_text(json.dumps(base), encoding="utf-8")
+            later = time.time() + 10
+            os.utime(ecolists / "eco_base.json", (later, later))
+            index, rebuilt = load_eco_index(ecolists, index_path)
+            self.assertTrue(rebuilt)
+            self.assertIsNone(index.classified_entry(book_hash_from_fen(_E4)))
+            index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for batch highlight detection and its checksum-keyed cache."""
+
+import unittest
+from unittest import mock
+
+from app.config.config_loader import ConfigLoader
+from app.models.database_model import GameData
+from app.services import highlight_batch_service
+from app.services.analysis_data_storage_service import AnalysisDataStorageService
+from app.services.game_summary_service import GameSummaryService
+from app.services.highlight_batch_service import (
+    HighlightBatchService,
+    _init_highlight_worker,
+    _process_highlight_batch,
+    highlight_settings_hash,
+)
+from app.services import player_stats_service
+from app.services.player_stats_service import _init_stats_worker, _process_game_for_stats, build_stats_job
+from tests.highlight_rules.helpers import moves_from_pgn
+
+
+SAN = (
+    "1. e4 e5 2. Nf3 Nc6 3. Bc4 Nd4 4. Nxe5 Qg5 5. Nxf7 Qxg2 "
+    "6. Rf1 Qxe4+ 7. Be2 Nf3#"
+)
+
+
+def _game(game_number: int, moves, config) -> GameData:
+    game = GameData(
+        game_number=game_number,
+        white="A",
+        black="B",
+        result="0-1",
+        date="2024.01.01",
+        moves=len(moves or []),
+        eco="C50",
+        pgn='[Event "t"]\n[White "A"]\n[Black "B"]\n[Result "0-1"]\n\n1. e4 e5 0-1\n',
+    )
+    if moves is not None:
+        AnalysisDataStorageService.store_analysis_data(game, moves, config)
+    return game
+
+
+class TestHighlightBatchService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = ConfigLoader().load()
+        cls.moves = moves_from_pgn(
+            SAN,
+            analysis={
+                4: {"black": {"cpl": "300", "assess": "Blunder", "eval": "+3.0"}},
+                7: {"black": {"cpl": "0", "assess": "Best Move", "eval": "-M1"}},
+            },
+        )
+
+    def setUp(self):
+        self.service = HighlightBatchService(self.config)
+        self.summary_service = GameSummaryService(self.config)
+        self.settings = self.summary_service.get_highlight_settings()
+
+    def _expected(self):
+        summary = self.summary_service.calculate_summary(self.moves, len(self.moves), "0-1")
+        return [(h.move_number, h.is_white, h.rule_type) for h in summary.highlights]
+
+    def test_matches_summary_highlights(self):
+        games = [_game(1, self.moves, self.config), _game(2, None, self.config)]
+        results = self.service.detect_for_games(games, settings=self.settings)
+        self.assertTrue(self._expected())
+        self.assertEqual(len(results), 2)
+        self.assertIsNone(results[1])
+        self.assertEqual(
+            [(h.move_number, h.is_white, h.rule_type) for h in results[0]],
+            self._expected(),
+        )
+
+    def test_cache_hit_skips_detection(self):
+        games = [_game(1, self.moves, self.config)]
+        first = self.service.detect_for_games(games, settings=self.settings)
+        self.assertEqual(self.service.cache_size(), 1)
+        with mock.patch.object(highlight_batch_service, "_detect_job", side_effect=AssertionError):
+            second = self.service.detect_for_games(games, settings=self.settings)
+        self.assertEqual(
+            [h.description for h in first[0]], [h.description for h in second[0]]
+        )
+
+    def test_settings_change_misses_cache(self):
+        games = [_game(1, self.moves, self.config)]
+        self.service.detect_for_games(games, settings=self.settings)
+        changed = dict(self.settings, detector=dict(self.settings["detector"], max_per_move=1))
+        self.assertNotEqual(highlight_settings_hash(changed), highlight_settings_hash(self.settings))
+        self.service.detect_for_games(games, settings=changed)
+        self.assertEqual(self.service.cache_size(), 2)
+
+    def test_failed_detection_has_no_highlights(self):
+        games = [_game(1, self.moves, self.config)]
+        with mock.patch.object(GameSummaryService, "detect_highlights", side_effect=RuntimeError("boom")):
+            results = self.service.detect_for_games(games, settings=self.settings)
+        self.assertEqual(results, [None])
+        self.assertEqual(self.service.cache_size(), 0)
+
+    def test_worker_batch_keeps_indices(self):
+        game = _game(1, self.moves, self.config)
+        encoded, checksum = AnalysisDataStorageService.read_analysis_payload(game.pgn)
+        _init_highlight_worker(None, self.config, self.settings, False)
+        results, stats, profiled = _process_highlight_batch(
+            [(5, encoded, checksum), (9, "not-a-payload", None)]
+        )
+        self.assertEqual([index for index, _ in results], [5, 9])
+        self.assertIsNone(results[1][1])
+        self.assertEqual(
+            [(h.move_number, h.is_white, h.rule_type) for h in results[0][1]],
+            self._expected(),
+        )
+        self.assertEqual((stats, profiled), ([], 0))
+
+    def test_stats_worker_uses_batch_highlights(self):
+        game = _game(1, self.moves, self.config)
+        _init_stats_worker(None, self.config, self.settings)
+        highlights = self.service.detect_for_games([game], settings=self.settings)[0]
+
+        with mock.patch.object(player_stats_service, "_worker_highlight_detector") as detector:
+            result = _process_game_for_stats(build_stats_job(game, 0, highlights), "A")
+        detector.detect_highlights.assert_not_called()
+        self.assertEqual(result["game_summary"].highlights, highlights)
+
+        result = _process_game_for_stats(build_stats_job(game, 0), "A")
+        self.assertEqual(
+            [(h.move_number, h.is_white, h.rule_type) for h in result["game_summary"].highlights],
+            self._expected(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
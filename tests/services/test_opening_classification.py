@@ -11,7 +11,7 @@ import chess
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from app.config.config_loader import ConfigLoader
-from app.services.opening_service import OpeningService
+from app.services.opening_service import OpeningDisplay, OpeningService
 
 
 def _fen_after(sans: list[str]) -> str:
@@ -133,6 +133,67 @@ class TestOpeningClassification(unittest.TestCase):
         self.assertEqual(last.eco, "C50")
         self.assertIn("Italian", last.name)
 
+    def test_mainline_pass_matches_per_ply_lookup(self) -> None:
+        """One forward pass (variations skipped) equals the last named ply's FEN lookup."""
+        sans = ["e4", "c5", "Nf3", "d6", "d4", "cxd4", "Nxd4", "Nf6", "Nc3", "a6", "Be3", "e5", "Nb3"]
+        pgn = '[Event "?"]\n\n1. e4 (1. d4 d5) 1... c5 2. Nf3 d6 3. d4 cxd4 4. Nxd4 Nf6 ' \
+              "5. Nc3 a6 6. Be3 e5 7. Nb3 *"
+        hit = self.svc.last_named_opening_for_pgn(pgn)
+        self.assertIsNotNone(hit)
+        display, fen = hit
+        self.assertEqual(_last_named(self.svc, sans), (display.eco, display.name))
+        self.assertEqual(self.svc.lookup_opening_display(fen), display)
+
+    def test_precomputed_hashes_match_pgn_replay(self) -> None:
+        from app.services.eco_index import book_hash
+
+        pgn = '[Event "?"]\n\n1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 *'
+        board = chess.Board()
+        hashes = [book_hash(board)]
+        for san in ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7", "Re1", "b5"]:
+            board.push_san(san)
+            hashes.append(book_hash(board))
+        self.assertEqual(
+            self.svc.last_named_opening_for_pgn(pgn, hashes),
+            self.svc.last_named_opening_for_pgn(pgn),
+        )
+        self.assertEqual(self.svc.get_final_eco_for_game(pgn, hashes), self.svc.get_final_eco_for_game(pgn))
+
+    def test_unparseable_pgn_has_no_opening(self) -> None:
+        self.assertIsNone(self.svc.last_named_opening_for_pgn(""))
+        pgn = '[Event "?"]\n\n1. e4 e5 2. Nf3 Qxz9 3. Bb5 *'
+        hit = self.svc.last_named_opening_for_pgn(pgn)
+        # Moves before the illegal token still classify
+        self.assertIsNotNone(hit)
+        self.assertEqual(hit[1], _fen_after(["e4", "e5", "Nf3"]))
+
+    def test_graph_continuations_match_legal_move_scan(self) -> None:
+        fallback = OpeningDisplay("X00", "Fallback")
+        fens = [
+            chess.STARTING_FEN,
+            _fen_after(["e4", "c5", "Nf3", "d6", "d4", "cxd4", "Nxd4", "Nf6", "Nc3"]),
+            _fen_after(["d4", "Nf6", "c4", "e6", "Nc3", "Bb4"]),
+            # Same placement without castling rights: castling moves must drop out
+            _fen_after(["e4", "e5", "Nf3", "Nc6", "Bc4", "Bc5"]).replace("KQkq", "-"),
+            # Off-book position falls back to the scan
+            _fen_after(["a4", "h5", "Ra3"]),
+        ]
+        for fen in fens:
+            board = chess.Board(fen)
+            expected = set()
+            for move in board.legal_moves:
+                board.push(move)
+                fen_after = board.fen()
+                display = self.svc.lookup_opening_display(fen_after)
+                if display is None and self.svc.is_book_position(fen_after):
+                    display = fallback
+                board.pop()
+                if display is not None:
+                    expected.add((move.uci(), fen_after, display))
+            got = self.svc.continuations(fen, limit=100, fallback_display=fallback)
+            self.assertEqual({(c.move_uci, c.fen_after, c.display) for c in got}, expected, fen)
+        self.assertNotIn("e1g1", [c.move_uci for c in self.svc.continuations(fens[3], limit=100)])
+
 
 if __name__ == "__main__":
     unittest.main()
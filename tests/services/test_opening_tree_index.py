@@ -0,0 +1,77 @@
+"""Opening-tree trie: counts, depth/min-games export and path postings."""
+
+import unittest
+from types import SimpleNamespace
+
+from app.services.opening_tree_index import OpeningTreeIndex, flatten_move_list
+
+
+def _moves(*sans):
+    rows = []
+    for i in range(0, len(sans), 2):
+        white = sans[i]
+        black = sans[i + 1] if i + 1 < len(sans) else ""
+        rows.append(SimpleNamespace(
+            white_move=white, black_move=black,
+            fen_white=f"fen:{' '.join(sans[:i + 1])}",
+            fen_black=f"fen:{' '.join(sans[:i + 2])}" if black else "",
+        ))
+    return rows
+
+
+GAMES = [
+    (_moves("e4", "c5", "Nf3", "d6"), True, 80.0, 90.0),
+    (_moves("e4", "e5", "Nf3"), False, 70.0, 60.0),
+    (_moves("e4", "c5", "Nc3"), True, 50.0, 40.0),
+    (_moves("d4", "d5"), False, 65.0, 75.0),
+]
+
+
+class TestOpeningTreeIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = OpeningTreeIndex(12)
+        for gi, (moves, is_white, game_acc, opening_acc) in enumerate(GAMES):
+            self.index.add_game(gi, flatten_move_list(moves, 12), is_white, game_acc, opening_acc)
+
+    def test_flatten_skips_empty_half_moves_and_truncates(self):
+        rows = [SimpleNamespace(white_move="", black_move="e5", fen_white="", fen_black="x")] + _moves("Nf3", "Nc6")
+        self.assertEqual([san for san, _ in flatten_move_list(rows, 2)], ["e5", "Nf3"])
+        self.assertEqual(flatten_move_list(rows, 0), [])
+
+    def test_counts_and_accuracy_sums(self):
+        tree = self.index.to_tree(12)
+        self.assertEqual((tree["games"], tree["white_games"], tree["black_games"]), (4, 2, 2))
+        e4 = tree["children"]["e4"]
+        self.assertEqual((e4["games"], e4["white_games"], e4["black_games"]), (3, 2, 1))
+        self.assertEqual(e4["game_accuracy_sum"], 200.0)
+        self.assertEqual(e4["opening_accuracy_count"], 3)
+        self.assertEqual(list(e4["children"]), ["c5", "e5"])
+
+    def test_depth_and_min_games_export(self):
+        tree = self.index.to_tree(1, min_games=2)
+        self.assertEqual(list(tree["children"]), ["e4"])
+        self.assertEqual(tree["children"]["e4"]["children"], {})
+        deep = self.index.to_tree(3, min_games=2)
+        self.assertEqual(list(deep["children"]["e4"]["children"]["c5"]["children"]), [])
+
+    def test_opening_info_is_looked_up_once_per_node(self):
+        calls = []
+
+        def lookup(fen):
+            calls.append(fen)
+            return ("B20", "Sicilian Defense") if fen == "fen:e4 c5" else (None, None)
+
+        for _ in range(2):
+            c5 = self.index.to_tree(2, opening_info=lookup)["children"]["e4"]["children"]["c5"]
+        self.assertEqual((c5["eco"], c5["opening_name"]), ("B20", "Sicilian Defense"))
+        self.assertEqual(len(calls), len(set(calls)))
+
+    def test_games_for_path(self):
+        self.assertEqual(self.index.games_for_path(["e4"]), [0, 1, 2])
+        self.assertEqual(self.index.games_for_path(["e4", "c5", "Nf3"]), [0])
+        self.assertEqual(self.index.games_for_path(["e4", "d5"]), [])
+        self.assertEqual(OpeningTreeIndex(1).games_for_path(["e4", "c5"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
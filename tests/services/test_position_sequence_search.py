@@ -0,0 +1,99 @@
+"""Tests for position-sequence and pawn-structure search on the position index."""
+
+from __future__ import annotations
+
+import unittest
+
+import chess
+
+from app.models.database_model import DatabaseModel, GameData
+from app.models.search_criteria import SearchCriteria, SearchField, SearchOperator
+from app.services.database_search_service import DatabaseSearchService
+from app.services.pgn_service import PgnService
+from app.services.position_sequence_search import PositionSequence, PositionStep, find_position_sequences
+
+MOVETEXTS = [
+    "1. e4 c5 2. Nf3 d6 3. d4 cxd4 4. Nxd4 Nf6 5. Nc3 a6 *",
+    "1. e4 c5 2. Nc3 d6 3. Nf3 Nf6 4. d4 cxd4 5. Nxd4 a6 *",  # Transposes at ply 10
+    "1. d4 Nf6 2. c4 e6 *",
+    "1. e4 c5 2. Nf3 d6 3. d4 cxd4 4. Qxd4 Nf6 5. Nc3 a6 *",  # Same pawns, queen on d4
+]
+
+
+def _fen_after(movetext: str, plies: int) -> str:
+    board = chess.Board()
+    for san in [token for token in movetext.split() if not token[0].isdigit() and token != "*"][:plies]:
+        board.push_san(san)
+    return board.fen()
+
+
+class PositionSequenceSearchTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        text = "\n\n".join(f'[Event "T"]\n[White "W{i}"]\n[Black "B{i}"]\n[Result "*"]\n\n{m}' for i, m in enumerate(MOVETEXTS))
+        parsed = PgnService.parse_pgn_text(text).games
+        cls.model = DatabaseModel()
+        cls.games = [GameData(game_number=0, white=g["white"], pgn=g["pgn"], file_position=i + 1) for i, g in enumerate(parsed)]
+        cls.model.add_games_batch(
+            cls.games,
+            mark_unsaved=False,
+            tags_list=[g["tags"] for g in parsed],
+            position_hashes_list=[g["position_hashes"] for g in parsed],
+            position_hashes_fuzzy_list=[g["position_hashes_fuzzy"] for g in parsed],
+            position_pawn_keys_list=[g["position_pawn_keys"] for g in parsed],
+        )
+        cls.sicilian = _fen_after(MOVETEXTS[0], 2)
+        cls.najdorf = _fen_after(MOVETEXTS[0], 10)
+
+    def _rows(self, chains):
+        return {row: chains[id(game)] for row, game in enumerate(self.games) if id(game) in chains}
+
+    def test_position_followed_by_position_within_plies(self) -> None:
+        steps = [PositionStep.from_fen(self.sicilian), PositionStep.from_fen(self.najdorf, within=8)]
+        self.assertEqual(self._rows(find_position_sequences(self.model, steps)), {0: [2, 10], 1: [2, 10]})
+        too_close = [steps[0], PositionStep.from_fen(self.najdorf, within=7)]
+        self.assertEqual(find_position_sequences(self.model, too_close), {})
+
+    def test_order_matters(self) -> None:
+        steps = [PositionStep.from_fen(self.najdorf), PositionStep.from_fen(self.sicilian)]
+        self.assertEqual(find_position_sequences(self.model, steps), {})
+
+    def test_position_before_ply(self) -> None:
+        self.assertEqual(find_position_sequences(self.model, [PositionStep.from_fen(self.najdorf, max_ply=9)]), {})
+        reached = find_position_sequences(self.model, [PositionStep.from_fen(self.najdorf, max_ply=10)])
+        self.assertEqual(self._rows(reached), {0: [10], 1: [10]})
+
+    def test_pawn_structure_ignores_pieces(self) -> None:
+        reached = find_position_sequences(self.model, [PositionStep.from_fen(self.najdorf, kind="pawns")])
+        self.assertEqual(self._rows(reached), {0: [10], 1: [10], 3: [10]})
+        # Same pawns with the other side to move is a different structure key
+        black_to_move = self.najdorf.replace(" w ", " b ")
+        self.assertEqual(find_position_sequences(self.model, [PositionStep.from_fen(black_to_move, kind="pawns")]), {})
+
+    def test_pawn_structure_criterion(self) -> None:
+        criteria = [SearchCriteria(SearchField.PAWN_STRUCTURE, SearchOperator.EQUALS, self.najdorf)]
+        results = DatabaseSearchService.search_databases([self.model], criteria, ["DB"])
+        self.assertEqual([(self.games.index(game), ref_ply) for game, _name, ref_ply in results], [(0, 10), (1, 10), (3, 10)])
+
+    def test_position_sequence_criterion(self) -> None:
+        sequence = PositionSequence((self.sicilian, self.najdorf), within=8)
+        criteria = [SearchCriteria(SearchField.POSITION_SEQUENCE, SearchOperator.EQUALS, sequence)]
+        results = DatabaseSearchService.search_databases([self.model], criteria, ["DB"])
+        self.assertEqual([(self.games.index(game), name, ply) for game, name, ply in results], [(0, "DB", 10), (1, "DB", 10)])
+        self.assertTrue(DatabaseSearchService.uses_position_index(criteria))
+        excluded = [SearchCriteria(SearchField.POSITION_SEQUENCE, SearchOperator.NOT_EQUALS, sequence)]
+        results = DatabaseSearchService.search_databases([self.model], excluded, ["DB"])
+        self.assertEqual([self.games.index(game) for game, _name in results], [2, 3])
+        by_ply = PositionSequence((self.najdorf,), max_ply=9)
+        criteria = [SearchCriteria(SearchField.POSITION_SEQUENCE, SearchOperator.EQUALS, by_ply)]
+        self.assertEqual(DatabaseSearchService.search_databases([self.model], criteria, ["DB"]), [])
+
+    def test_invalid_step(self) -> None:
+        with self.assertRaises(ValueError):
+            PositionStep.from_fen("not a fen")
+        with self.assertRaises(ValueError):
+            PositionStep.from_fen(self.najdorf, kind="rooks")
+
+
+if __name__ == "__main__":
+    unittest.main()
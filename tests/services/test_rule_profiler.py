@@ -0,0 +1,153 @@
+"""Unit tests for opt-in per-rule profiling of highlight and heatmap rules."""
+
+import unittest
+from unittest import mock
+
+import chess
+
+from app.config.config_loader import ConfigLoader
+from app.services.game_highlight_rules_service import GameHighlightRulesService
+from app.services.game_highlights.highlight_detector import HighlightDetector
+from app.services.game_highlights.rule_registry import RuleRegistry
+from app.services.positional_heatmap.positional_analyzer import PositionalAnalyzer
+from app.services.positional_heatmap.rule_registry import RuleRegistry as HeatmapRuleRegistry
+from app.services.rule_profiler import (
+    SCOPE_HEATMAP,
+    SCOPE_HIGHLIGHTS,
+    RuleProfiler,
+    get_rule_profile,
+    get_rule_profiler,
+    set_rule_profiling_enabled,
+)
+from tests.highlight_rules.helpers import moves_from_pgn
+
+
+class TestRuleProfiler(unittest.TestCase):
+    """Accumulation, merging and reporting of per-rule timings."""
+
+    def test_record_accumulates_per_rule(self):
+        profiler = RuleProfiler()
+        profiler.record(SCOPE_HIGHLIGHTS, "ForkRule", 0.002, emitted=1)
+        profiler.record(SCOPE_HIGHLIGHTS, "ForkRule", 0.004)
+        profiler.record(SCOPE_HIGHLIGHTS, "PinRule", 0.001, error=ValueError("bad"))
+
+        stats = {s.rule_name: s for s in profiler.snapshot()}
+        self.assertEqual(stats["ForkRule"].calls, 2)
+        self.assertAlmostEqual(stats["ForkRule"].total_s, 0.006)
+        self.assertAlmostEqual(stats["ForkRule"].max_s, 0.004)
+        self.assertEqual(stats["ForkRule"].emitted, 1)
+        self.assertEqual(stats["PinRule"].exceptions, 1)
+        self.assertEqual(stats["PinRule"].last_error, "ValueError: bad")
+        # Slowest cumulative rule first.
+        self.assertEqual(profiler.snapshot()[0].rule_name, "ForkRule")
+
+    def test_p95_from_samples(self):
+        profiler = RuleProfiler()
+        for i in range(1, 101):
+            profiler.record(SCOPE_HEATMAP, "PassedPawnRule", i / 1000.0)
+        stats = profiler.snapshot()[0]
+        self.assertAlmostEqual(stats.p95_s, 0.095, places=3)
+        self.assertAlmostEqual(stats.mean_s, 0.0505, places=4)
+
+    def test_merge_folds_worker_stats(self):
+        worker = RuleProfiler()
+        worker.record(SCOPE_HIGHLIGHTS, "ForkRule", 0.001, emitted=2)
+        worker.count_unit(SCOPE_HIGHLIGHTS)
+
+        main = RuleProfiler()
+        main.record(SCOPE_HIGHLIGHTS, "ForkRule", 0.003)
+        main.merge(worker.snapshot(), {SCOPE_HIGHLIGHTS: worker.units(SCOPE_HIGHLIGHTS)})
+
+        stats = main.snapshot()[0]
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(stats.emitted, 2)
+        self.assertEqual(main.units(SCOPE_HIGHLIGHTS), 1)
+
+    def test_report_and_reset(self):
+        profiler = RuleProfiler()
+        profiler.record(SCOPE_HIGHLIGHTS, "ForkRule", 0.001)
+        profiler.count_unit(SCOPE_HIGHLIGHTS)
+        report = profiler.format_report()
+        self.assertIn("[highlights] 1 games, 1 rule calls", report)
+        self.assertIn("ForkRule", report)
+
+        profiler.reset()
+        self.assertEqual(profiler.snapshot(), [])
+        self.assertIn("No rule calls recorded.", profiler.format_report())
+
+
+class TestRuleProfilingIntegration(unittest.TestCase):
+    """Detector and analyzer record rule calls only while profiling is enabled."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.config = ConfigLoader().load()
+
+    def setUp(self):
+        get_rule_profile().reset()
+        self.addCleanup(get_rule_profile().reset)
+        self.addCleanup(set_rule_profiling_enabled, False)
+
+    def _detector(self) -> HighlightDetector:
+        highlights_config = self.config["ui"]["panels"]["detail"]["summary"]["highlights"]
+        rules_service = GameHighlightRulesService.get_instance()
+        registry = RuleRegistry(
+            {"rules": rules_service.build_registry_config(highlights_config.get("rules", {}))}
+        )
+        return HighlightDetector({}, registry)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_rule_profiler())
+        moves = moves_from_pgn("1. e4 e5 2. Nf3 Nc6 3. Bb5 a6")
+        self._detector().detect_highlights(moves, len(moves), 15, 40)
+        self.assertEqual(get_rule_profile().snapshot(), [])
+
+    def test_detect_highlights_records_rules(self):
+        set_rule_profiling_enabled(True)
+        moves = moves_from_pgn("1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Bxc6 dxc6")
+        self._detector().detect_highlights(moves, len(moves), 15, 40)
+
+        profile = get_rule_profile()
+        stats = [s for s in profile.snapshot() if s.scope == SCOPE_HIGHLIGHTS]
+        self.assertTrue(stats)
+        self.assertEqual(profile.units(SCOPE_HIGHLIGHTS), 1)
+        # Every rule is evaluated once per full-move row.
+        self.assertTrue(all(s.calls == len(moves) for s in stats))
+
+    def test_analyze_position_records_rules(self):
+        set_rule_profiling_enabled(True)
+        heatmap_config = self.config["ui"]["positional_heatmap"]
+        analyzer = PositionalAnalyzer(heatmap_config, HeatmapRuleRegistry(heatmap_config))
+        analyzer.analyze_position(chess.Board(), chess.WHITE)
+
+        profile = get_rule_profile()
+        self.assertEqual(profile.units(SCOPE_HEATMAP), 1)
+        self.assertTrue([s for s in profile.snapshot() if s.scope == SCOPE_HEATMAP])
+
+    def test_failed_heatmap_rules_score_the_same_with_and_without_profiling(self):
+        heatmap_config = dict(self.config["ui"]["positional_heatmap"], cache_enabled=False)
+        analyzer = PositionalAnalyzer(heatmap_config, HeatmapRuleRegistry(heatmap_config))
+
+        def rule(name, weight, evaluate):
+            return mock.Mock(weight=weight, get_name=mock.Mock(return_value=name), evaluate=evaluate)
+
+        def fail(*_):
+            raise RuntimeError("boom")
+
+        scoring = rule("scoring", 1.0, mock.Mock(return_value={chess.E4: 2.0}))
+        rules = [
+            rule("returns_none", 5.0, mock.Mock(return_value=None)),
+            rule("raises", 7.0, fail),
+            scoring,
+        ]
+        expected = analyzer.aggregator.aggregate([{chess.E4: 2.0}], [scoring])
+        with mock.patch.object(analyzer.registry, "get_enabled_rules", return_value=rules):
+            plain = analyzer.analyze_position(chess.Board(), chess.WHITE)
+            set_rule_profiling_enabled(True)
+            profiled = analyzer.analyze_position(chess.Board(), chess.WHITE)
+        self.assertEqual(plain, expected)
+        self.assertEqual(profiled, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
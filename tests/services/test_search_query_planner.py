@@ -0,0 +1,143 @@
+"""Tests for the search query planner: same matches as sequential evaluation, fewer games tested."""
+
+from __future__ import annotations
+
+import random
+import unittest
+
+from app.models.database_model import DatabaseModel, GameData
+from app.models.search_criteria import LogicOperator, SearchCriteria, SearchField, SearchOperator
+from app.services.database_search_service import DatabaseSearchService
+from app.services.search_query_planner import compile_criteria, plan_search
+
+PLAYERS = ["Carlsen", "Caruana", "Anand", "Giri", "", "Nakamura"]
+RESULTS = ["1-0", "0-1", "1/2-1/2", "*"]
+DATES = ["2014.03.01", "2015.??.??", "2019.07.12", "", "2021.11.30"]
+TIME_CONTROLS = ["60", "180+2", "900+10", "5400+30", ""]
+
+LEAF_TEMPLATES = [
+    (SearchField.WHITE, SearchOperator.EQUALS, "carlsen"),
+    (SearchField.WHITE, SearchOperator.CONTAINS, "car"),
+    (SearchField.BLACK, SearchOperator.NOT_EQUALS, "Anand"),
+    (SearchField.BLACK, SearchOperator.IS_EMPTY, None),
+    (SearchField.RESULT, SearchOperator.EQUALS, "1-0"),
+    (SearchField.WHITE_ELO, SearchOperator.GREATER_THAN_OR_EQUAL, "2700"),
+    (SearchField.BLACK_ELO, SearchOperator.LESS_THAN, "2600"),
+    (SearchField.DATE, SearchOperator.DATE_AFTER, "2015.01.01"),
+    (SearchField.DATE, SearchOperator.DATE_CONTAINS, "2019"),
+    (SearchField.TC_TYPE, SearchOperator.EQUALS, "Blitz"),
+    (SearchField.TIMECONTROL, SearchOperator.GREATER_THAN, "300"),
+    (SearchField.ANALYZED, SearchOperator.IS_TRUE, None),
+    (SearchField.ECO, SearchOperator.STARTS_WITH, "B"),
+]
+
+
+def _database(count: int, seed: int) -> DatabaseModel:
+    rng = random.Random(seed)
+    games = [
+        GameData(
+            game_number=0,
+            white=rng.choice(PLAYERS),
+            black=rng.choice(PLAYERS),
+            result=rng.choice(RESULTS),
+            date=rng.choice(DATES),
+            eco=rng.choice(["B90", "C42", "E60", ""]),
+            white_elo=str(rng.randrange(2400, 2900, 50)),
+            black_elo=rng.choice(["", str(rng.randrange(2400, 2900, 50))]),
+            time_control=rng.choice(TIME_CONTROLS),
+            analyzed=rng.random() < 0.3,
+            file_position=i + 1,
+        )
+        for i in range(count)
+    ]
+    model = DatabaseModel()
+    model.add_games_batch(games, mark_unsaved=False, tags_list=[[] for _ in games])
+    return model
+
+
+def _leaf(rng: random.Random, logic) -> SearchCriteria:
+    field, operator, value = rng.choice(LEAF_TEMPLATES)
+    return SearchCriteria(field, operator, value, logic)
+
+
+def _random_criteria(rng: random.Random) -> list:
+    criteria = []
+    level = 0
+    for index in range(rng.randint(1, 7)):
+        logic = None if index == 0 and rng.random() < 0.7 else rng.choice([LogicOperator.AND, LogicOperator.OR, None])
+        criterion = _leaf(rng, logic)
+        roll = rng.random()
+        if roll < 0.15:
+            criterion.is_group_start = True
+            criterion.group_level = level
+            level += 1
+        elif roll < 0.3 and level > 0:
+            level -= 1
+            criterion.is_group_end = True
+            criterion.group_level = level
+        criteria.append(criterion)
+    return criteria
+
+
+def _sequential(games, criteria):
+    return [g for g in games if DatabaseSearchService._evaluate_criteria_list(g, criteria, {})]
+
+
+class QueryPlannerEquivalenceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.database = _database(300, seed=7)
+        self.games = self.database.get_all_games()
+
+    def _planned(self, criteria):
+        plan = plan_search(criteria, self.database, self.games, DatabaseSearchService._evaluate_criterion, {})
+        candidates = plan.candidates
+        return [g for g in self.games if (candidates is None or id(g) in candidates) and plan.matches(g)]
+
+    def test_random_queries_match_sequential_evaluation(self) -> None:
+        rng = random.Random(2024)
+        for _ in range(400):
+            criteria = _random_criteria(rng)
+            with self.subTest(criteria=DatabaseSearchService._format_search_formula(criteria)):
+                self.assertEqual(self._planned(criteria), _sequential(self.games, criteria))
+
+    def test_selective_conjunction_yields_candidate_set(self) -> None:
+        criteria = [
+            SearchCriteria(SearchField.DATE, SearchOperator.DATE_AFTER, "2015.01.01"),
+            SearchCriteria(SearchField.WHITE, SearchOperator.EQUALS, "Giri", LogicOperator.AND),
+        ]
+        plan = plan_search(criteria, self.database, self.games, DatabaseSearchService._evaluate_criterion, {})
+        expected = _sequential(self.games, criteria)
+        self.assertIsNotNone(plan.candidates)
+        self.assertLess(len(plan.candidates), len(self.games) // 4)
+        self.assertTrue({id(g) for g in expected} <= plan.candidates)
+        # The cheap id lookup on the selective player is tested first
+        self.assertTrue(plan.describe().startswith("(white equals"))
+
+    def test_or_with_unindexed_side_scans_everything(self) -> None:
+        criteria = [
+            SearchCriteria(SearchField.WHITE, SearchOperator.EQUALS, "Giri"),
+            SearchCriteria(SearchField.CUSTOM_TAG, SearchOperator.EQUALS, "x", LogicOperator.OR, custom_tag_name="Annotator"),
+        ]
+        plan = plan_search(criteria, self.database, self.games, DatabaseSearchService._evaluate_criterion, {})
+        self.assertIsNone(plan.candidates)
+
+    def test_index_follows_edits(self) -> None:
+        criteria = [SearchCriteria(SearchField.WHITE, SearchOperator.EQUALS, "Kasparov")]
+        self.assertEqual(self._planned(criteria), [])
+        game = self.games[5]
+        game.white = "Kasparov"
+        self.database.dataChanged.emit(self.database.index(5, 0), self.database.index(5, 0))
+        self.assertEqual(self._planned(criteria), [game])
+
+    def test_compile_follows_left_to_right_combination(self) -> None:
+        a = SearchCriteria(SearchField.WHITE, SearchOperator.EQUALS, "a")
+        b = SearchCriteria(SearchField.WHITE, SearchOperator.EQUALS, "b", LogicOperator.OR)
+        c = SearchCriteria(SearchField.WHITE, SearchOperator.EQUALS, "c", LogicOperator.AND)
+        root = compile_criteria([a, b, c])
+        # (a OR b) AND c, not a OR (b AND c)
+        self.assertEqual(root.kind, "and")
+        self.assertEqual(root.children[0].kind, "or")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Background service warm-up: priority order, failure isolation and profiling."""
+
+import threading
+import unittest
+
+from app.services.service_warmup import ServiceWarmup
+from app.utils.startup_profile import StartupProfile
+
+
+class TestServiceWarmup(unittest.TestCase):
+    def test_runs_by_priority_then_insertion_order(self):
+        ran = []
+        warmup = ServiceWarmup(StartupProfile(False))
+        warmup.add("late", lambda: ran.append("late"), priority=20)
+        warmup.add("first", lambda: ran.append("first"), priority=0)
+        warmup.add("second", lambda: ran.append("second"), priority=0)
+        finished = threading.Event()
+        warmup.start(on_finished=finished.set)
+        self.assertTrue(warmup.wait(5))
+        self.assertTrue(finished.is_set())
+        self.assertEqual(ran, ["first", "second", "late"])
+        with self.assertRaises(RuntimeError):
+            warmup.add("too late", lambda: None)
+
+    def test_failing_loader_does_not_stop_the_rest(self):
+        ran = []
+
+        def broken():
+            raise OSError("missing file")
+
+        profile = StartupProfile(True)
+        warmup = ServiceWarmup(profile)
+        warmup.add("broken", broken, priority=0)
+        warmup.add("ok", lambda: ran.append("ok"), priority=1)
+        warmup.start()
+        self.assertTrue(warmup.wait(5))
+        self.assertEqual(ran, ["ok"])
+        report = profile.report()
+        self.assertIn("warm-up: ok [ServiceWarmup]", report)
+        self.assertNotIn("warm-up: broken", report)
+
+    def test_cancel_skips_pending_loaders(self):
+        release = threading.Event()
+        ran = []
+        warmup = ServiceWarmup(StartupProfile(False))
+        warmup.add("blocking", release.wait, priority=0)
+        warmup.add("skipped", lambda: ran.append("skipped"), priority=1)
+        warmup.start()
+        warmup.cancel()
+        release.set()
+        self.assertTrue(warmup.wait(5))
+        self.assertEqual(ran, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ from __future__ import annotations
 import unittest
 
 from app.services.opening_encyclopedia_service import (
+    OpeningEncyclopediaService,
     _SEARCH_RANK_ALIAS,
     _SEARCH_RANK_ECO,
     _SEARCH_RANK_ID_OR_FAMILY,
@@ -169,5 +170,95 @@ class SearchRankTests(unittest.TestCase):
         self.assertIsNone(rank)
 
 
+def _opening(oid: str, name: str, eco: str, family: str = "", ready: bool = True) -> dict:
+    return {
+        "opening_id": oid,
+        "display_name": name,
+        "family_id": family or None,
+        "tier": None,
+        "eco_codes": eco,
+        "summary": "Prose." if ready else "",
+        "content_state": "ready" if ready else "pending",
+    }
+
+
+def _catalog_service() -> OpeningEncyclopediaService:
+    svc = OpeningEncyclopediaService({})
+    openings = [
+        _opening("kings-indian-defense", "King's Indian Defense", "E60 E99"),
+        _opening("kings-indian-defense/saemisch", "King's Indian Defense: Sämisch", "E80", "kings-indian-defense"),
+        _opening("kings-indian-attack", "King's Indian Attack", "A07 A08"),
+        _opening("queens-gambit-declined", "Queen's Gambit Declined", "D30"),
+        _opening("queens-gambit-declined/tarrasch", "Tarrasch Defense", "D32", "queens-gambit-declined"),
+        _opening("grunfeld-defense", "Grünfeld Defense", "D70 D99"),
+        _opening("french-defense/kia-2-d3-d5", "French Defense: KIA", "C00", "french-defense"),
+        _opening("anderssens-opening/polish-gambit", "Polish Gambit", "A00", ready=False),
+    ]
+    svc._openings = {raw["opening_id"]: raw for raw in openings}
+    svc._aliases_by_oid = {
+        "queens-gambit-declined/tarrasch": (_fold_search_text("Queen's Gambit Declined: Tarrasch Defense"),),
+    }
+    svc._search_abbrevs = {
+        "kid": _SearchAbbrev(abbrev="kid", expansion="king's indian", family_id="kings-indian-defense"),
+    }
+    svc._build_search_index()
+    svc._load_attempted = True
+    svc._available = True
+    return svc
+
+
+def _scan_search(svc: OpeningEncyclopediaService, query: str, limit: int):
+    """Reference: rank every ready opening, as search did before indexing."""
+    q, scope = _rewrite_search_query(query.strip(), svc._search_abbrevs)
+    scored = []
+    for raw in svc._openings.values():
+        if not svc._is_ready(raw):
+            continue
+        oid = raw["opening_id"]
+        if scope and not _opening_in_family_scope(
+            opening_id=oid, family_id=raw["family_id"], scope_family_id=scope
+        ):
+            continue
+        rank = _search_match_rank(
+            q,
+            display_name=_fold_search_text(raw["display_name"]),
+            opening_id=_fold_search_text(oid),
+            family_id=_fold_search_text(raw["family_id"] or ""),
+            eco_codes=_fold_search_text(raw["eco_codes"] or ""),
+            aliases=svc._aliases_by_oid.get(oid, ()),
+        )
+        if rank is not None:
+            scored.append((rank, raw["display_name"].lower(), oid))
+    scored.sort(key=lambda item: (item[0], item[1]))
+    return [oid for _, _, oid in scored[:limit]], len(scored)
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.svc = _catalog_service()
+
+    def test_index_matches_full_scan(self) -> None:
+        queries = ["k", "in", "kings", "indian d", "e8", "d3", "tarrasch", "declined t",
+                   "gruenfeld", "kid", "kid s", "polish", "qgd", "zz", "defense"]
+        for raw in self.svc._openings.values():
+            name = _fold_search_text(raw["display_name"])
+            queries.extend(name[i:i + 4] for i in range(0, len(name), 3))
+        for query in queries:
+            for limit in (1, 3, 20):
+                page = self.svc.search(query, limit=limit)
+                self.assertEqual(
+                    ([r.opening_id for r in page.results], page.total),
+                    _scan_search(self.svc, query, limit),
+                    (query, limit),
+                )
+
+    def test_stubs_are_not_indexed(self) -> None:
+        self.assertEqual(self.svc.search("polish gambit").total, 0)
+        self.assertNotIn(
+            "anderssens-opening/polish-gambit",
+            [doc.opening_id for doc in self.svc._search_docs],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,28 @@
+"""Tests for process-pool sizing and batching helpers."""
+
+import unittest
+
+from app.utils.concurrency_utils import get_process_pool_batch_size, iter_batches
+
+
+class TestProcessPoolBatchSize(unittest.TestCase):
+    def test_small_inputs_spread_across_workers(self) -> None:
+        self.assertEqual(get_process_pool_batch_size(10, 4), 1)
+        self.assertEqual(get_process_pool_batch_size(0, 4), 1)
+
+    def test_large_inputs_capped_by_config(self) -> None:
+        config = {"parallel_processing": {"process_pool": {"games_per_task": 16}}}
+        self.assertEqual(get_process_pool_batch_size(100000, 4, config), 16)
+
+    def test_batch_grows_with_input(self) -> None:
+        self.assertEqual(get_process_pool_batch_size(160, 4), 10)
+
+
+class TestIterBatches(unittest.TestCase):
+    def test_batches_cover_items_in_order(self) -> None:
+        batches = list(iter_batches(list(range(7)), 3))
+        self.assertEqual(batches, [[0, 1, 2], [3, 4, 5], [6]])
+
+
+if __name__ == "__main__":
+    unittest.main()
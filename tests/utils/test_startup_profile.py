@@ -0,0 +1,58 @@
+"""Startup profile: opt-in switch, phase timing and import hook."""
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from app.utils.startup_profile import STARTUP_PROFILE_ENV, STARTUP_PROFILE_FLAG, StartupProfile
+
+
+class TestStartupProfile(unittest.TestCase):
+    def test_flag_enables_and_is_removed_from_argv(self):
+        with mock.patch.dict(os.environ, {STARTUP_PROFILE_ENV: ""}):
+            argv = ["cara.py", STARTUP_PROFILE_FLAG, "games.pgn"]
+            self.assertTrue(StartupProfile.from_environment(argv).enabled)
+            self.assertEqual(argv, ["cara.py", "games.pgn"])
+            self.assertFalse(StartupProfile.from_environment(["cara.py"]).enabled)
+        with mock.patch.dict(os.environ, {STARTUP_PROFILE_ENV: "1"}):
+            self.assertTrue(StartupProfile.from_environment(["cara.py"]).enabled)
+
+    def test_disabled_profile_records_nothing(self):
+        profile = StartupProfile(False)
+        with profile.phase("config"):
+            pass
+        profile.install_import_hook()
+        self.assertNotIn("config", profile.report())
+        self.assertFalse(any(type(f).__name__ == "_ImportTimer" for f in sys.meta_path))
+
+    def test_import_hook_times_nested_modules(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "cara_profile_outer.py"), "w", encoding="utf-8") as f:
+                f.write("import cara_profile_inner\nVALUE = cara_profile_inner.VALUE + 1\n")
+            with open(os.path.join(tmp, "cara_profile_inner.py"), "w", encoding="utf-8") as f:
+                f.write("VALUE = 41\n")
+            sys.path.insert(0, tmp)
+            profile = StartupProfile(True)
+            profile.install_import_hook()
+            try:
+                with profile.phase("import outer"):
+                    module = importlib.import_module("cara_profile_outer")
+            finally:
+                profile.remove_import_hook()
+                sys.path.remove(tmp)
+                sys.modules.pop("cara_profile_outer", None)
+                sys.modules.pop("cara_profile_inner", None)
+        self.assertEqual(module.VALUE, 42)
+        report = profile.report()
+        self.assertIn("cara_profile_outer", report)
+        self.assertIn("cara_profile_inner", report)
+        self.assertIn("import outer [MainThread]", report)
+        inclusive, own = profile._imports["cara_profile_outer"]
+        self.assertLessEqual(own, inclusive)
+
+
+if __name__ == "__main__":
+    unittest.main()